@@ -34,19 +34,20 @@ def perceive_phase(memory, governance_level: int) -> dict:
 
     recent_jobs = []
     if JOBS.exists():
-        job_files = sorted(JOBS.glob("*/*/job.json"), reverse=True)[:10]
-        for f in job_files:
-            try:
-                j = json.loads(f.read_text())
-                recent_jobs.append({
-                    "id": j.get("id"),
-                    "workflow": j.get("workflow_id"),
-                    "status": j.get("status"),
-                    "duration_s": j.get("duration_s"),
-                    "error": j.get("error"),
-                })
-            except (json.JSONDecodeError, OSError):
-                pass
+        try:
+            from lib.job_index import open_index
+            with open_index(JOBS) as index:
+                latest = index.latest(10)
+        except Exception:
+            latest = []
+        for _d, j in latest:
+            recent_jobs.append({
+                "id": j.get("id"),
+                "workflow": j.get("workflow_id"),
+                "status": j.get("status"),
+                "duration_s": j.get("duration_s"),
+                "error": j.get("error"),
+            })
     state["recent_jobs"] = recent_jobs
     state["workflows"] = sorted([f.stem for f in WORKFLOWS.glob("*.sh")]) if WORKFLOWS.exists() else []
 
@@ -77,42 +78,25 @@ def perceive_phase(memory, governance_level: int) -> dict:
 
     research_projects = []
     if RESEARCH.exists():
-        def _terminal(s: str) -> bool:
-            return s in ("done", "cancelled", "abandoned", "aem_blocked") or (s or "").startswith("failed")
-
-        for proj_dir in sorted(RESEARCH.iterdir(), reverse=True):
-            if not proj_dir.is_dir() or not proj_dir.name.startswith("proj-"):
-                continue
-            proj_json = proj_dir / "project.json"
-            if not proj_json.exists():
-                continue
-            try:
-                d = json.loads(proj_json.read_text())
-                pid = d.get("id", proj_dir.name)
-                parent_id = d.get("parent_project_id")
-                council_status = d.get("council_status") or ""
-                council_children_running = 0
-                if not parent_id and council_status in ("active", "waiting"):
-                    for other in RESEARCH.iterdir():
-                        if not other.is_dir() or not other.name.startswith("proj-"):
-                            continue
-                        try:
-                            o = json.loads((other / "project.json").read_text())
-                            if o.get("parent_project_id") == pid and not _terminal(o.get("status", "")):
-                                council_children_running += 1
-                        except (json.JSONDecodeError, OSError):
-                            pass
-                research_projects.append({
-                    "id": pid,
-                    "question": (d.get("question", "") or "")[:150],
-                    "phase": d.get("phase", "?"),
-                    "status": d.get("status", "?"),
-                    "last_phase_at": d.get("last_phase_at", d.get("created_at", "")),
-                    "council_status": council_status,
-                    "council_children_running": council_children_running,
-                })
-            except (json.JSONDecodeError, OSError):
-                pass
+        from tools.research_project_catalog import catalog
+
+        # Catalog: one stat per project.json (re-parse only changed ones), indexed parent -> children
+        projects = catalog(RESEARCH)
+        for _name, entry in projects.entries():
+            pid = entry.get("id")
+            council_status = entry.get("council_status") or ""
+            council_children_running = 0
+            if not entry.get("parent_project_id") and council_status in ("active", "waiting"):
+                council_children_running = projects.running_children(pid)
+            research_projects.append({
+                "id": pid,
+                "question": entry.get("question", ""),
+                "phase": entry.get("phase", "?"),
+                "status": entry.get("status", "?"),
+                "last_phase_at": entry.get("last_phase_at", ""),
+                "council_status": council_status,
+                "council_children_running": council_children_running,
+            })
         def _research_sort(p):
             return (0 if p.get("status") != "done" else 1, p.get("last_phase_at", "") or "")
         research_projects.sort(key=_research_sort)
@@ -0,0 +1,207 @@
+"""
+Job index: SQLite catalog of jobs/<day>/<job_id>/job.json (jobs/job_index.db).
+
+bin/op records every job.json it writes (job new, run_job, reconcile). sync() picks up jobs written
+elsewhere: a day directory is only rescanned when its mtime changed (a job dir was added), and
+non-terminal rows (CREATED/RUNNING) are re-read when their job.json changed. Queries — latest N,
+by id, by status, failures by workflow — are indexed instead of globbing and parsing every job.json.
+
+Used by: bin/op (status, get/run/retry lookup, reconcile, healthcheck), lib/brain/perceive (recent
+jobs), lib/plumber (repeated failures, post-fix rollback check).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+INDEX_FILE = "job_index.db"
+_OPEN_STATUSES = ("CREATED", "RUNNING")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id           TEXT PRIMARY KEY,
+        day          TEXT NOT NULL,
+        job_dir      TEXT NOT NULL,
+        workflow_id  TEXT,
+        status       TEXT,
+        created_at   TEXT,
+        mtime_ns     INTEGER NOT NULL DEFAULT 0,
+        size         INTEGER NOT NULL DEFAULT 0,
+        job_json     TEXT NOT NULL DEFAULT '{}'
+    );
+    CREATE TABLE IF NOT EXISTS days (
+        day       TEXT PRIMARY KEY,
+        mtime_ns  INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+    CREATE INDEX IF NOT EXISTS idx_jobs_workflow ON jobs(workflow_id, status, created_at);
+"""
+
+
+def _stat(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class JobIndex:
+    def __init__(self, jobs_dir: Path):
+        self.jobs_dir = Path(jobs_dir)
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.jobs_dir / INDEX_FILE), timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _upsert(self, job_dir: Path, job: dict, sig: tuple[int, int]) -> None:
+        self._conn.execute(
+            """INSERT OR REPLACE INTO jobs (id, day, job_dir, workflow_id, status, created_at, mtime_ns, size, job_json)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                job.get("id") or job_dir.name, job_dir.parent.name, str(job_dir), job.get("workflow_id"),
+                job.get("status"), job.get("created_at") or "", sig[0], sig[1], json.dumps(job),
+            ),
+        )
+
+    def record(self, job_dir: Path, job: dict) -> None:
+        """Index a job right after its job.json was written."""
+        job_dir = Path(job_dir)
+        sig = _stat(job_dir / "job.json") or (0, 0)
+        self._upsert(job_dir, job, sig)
+        self._conn.commit()
+
+    def _load(self, job_dir: Path) -> bool:
+        pj = job_dir / "job.json"
+        sig = _stat(pj)
+        if sig is None:
+            return False
+        try:
+            job = json.loads(pj.read_text())
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            return False
+        if isinstance(job, dict):
+            self._upsert(job_dir, job, sig)
+        return True
+
+    def sync(self) -> int:
+        """Index jobs added or changed outside record(). Returns the number of job.json files parsed."""
+        parsed = 0
+        known_days = {r["day"]: r["mtime_ns"] for r in self._conn.execute("SELECT day, mtime_ns FROM days")}
+        try:
+            day_dirs = [e for e in os.scandir(self.jobs_dir) if e.is_dir()]
+        except OSError:
+            day_dirs = []
+        for day in day_dirs:
+            try:
+                mtime = day.stat().st_mtime_ns
+            except OSError:
+                continue
+            if known_days.get(day.name) == mtime:
+                continue
+            indexed = {
+                Path(r["job_dir"]).name: r["job_dir"]
+                for r in self._conn.execute("SELECT job_dir FROM jobs WHERE day = ?", (day.name,))
+            }
+            complete = True
+            try:
+                present = [e for e in os.scandir(day.path) if e.is_dir()]
+            except OSError:
+                continue
+            names = {e.name for e in present}
+            gone = [(d,) for name, d in indexed.items() if name not in names]
+            if gone:
+                self._conn.executemany("DELETE FROM jobs WHERE job_dir = ?", gone)
+            for entry in (e for e in present if e.name not in indexed):
+                if self._load(Path(entry.path)):
+                    parsed += 1
+                else:
+                    complete = False  # job dir created, job.json not written yet: rescan next time
+            if complete:
+                self._conn.execute("INSERT OR REPLACE INTO days (day, mtime_ns) VALUES (?, ?)", (day.name, mtime))
+        open_rows = self._conn.execute(
+            f"SELECT job_dir, mtime_ns, size FROM jobs WHERE status IN ({','.join('?' * len(_OPEN_STATUSES))})",
+            _OPEN_STATUSES,
+        ).fetchall()
+        for r in open_rows:
+            job_dir = Path(r["job_dir"])
+            sig = _stat(job_dir / "job.json")
+            if sig is None:
+                self._conn.execute("DELETE FROM jobs WHERE job_dir = ?", (r["job_dir"],))
+            elif sig != (r["mtime_ns"], r["size"]) and self._load(job_dir):
+                parsed += 1
+        self._conn.commit()
+        return parsed
+
+    # ------------------------------------------------------------------
+    # Queries (call sync() first for an up-to-date view)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _rows(rows) -> list[tuple[Path, dict]]:
+        out = []
+        for r in rows:
+            try:
+                out.append((Path(r["job_dir"]), json.loads(r["job_json"])))
+            except (json.JSONDecodeError, TypeError):
+                continue
+        return out
+
+    def latest(self, limit: int = 20) -> list[tuple[Path, dict]]:
+        """(job_dir, job) newest first."""
+        return self._rows(self._conn.execute(
+            "SELECT job_dir, job_json FROM jobs ORDER BY created_at DESC, id DESC LIMIT ?", (limit,)
+        ))
+
+    def get(self, job_id: str) -> tuple[Path, dict] | None:
+        rows = self._rows(self._conn.execute("SELECT job_dir, job_json FROM jobs WHERE id = ?", (job_id,)))
+        return rows[0] if rows else None
+
+    def by_status(self, status: str) -> list[tuple[Path, dict]]:
+        """Jobs with this status, oldest first."""
+        return self._rows(self._conn.execute(
+            "SELECT job_dir, job_json FROM jobs WHERE status = ? ORDER BY created_at, id", (status,)
+        ))
+
+    def status_counts(self) -> dict[str, int]:
+        return {r[0]: r[1] for r in self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")}
+
+    def failures_by_workflow(self, window: int, workflow_id: str | None = None) -> dict[str, list[tuple[Path, dict]]]:
+        """FAILED jobs among the `window` most recent jobs, grouped by workflow (newest first)."""
+        rows = self._conn.execute(
+            """SELECT job_dir, job_json, workflow_id FROM (
+                   SELECT * FROM jobs ORDER BY created_at DESC, id DESC LIMIT ?
+               ) WHERE status = 'FAILED' AND (? IS NULL OR workflow_id = ?)
+               ORDER BY created_at DESC, id DESC""",
+            (window, workflow_id, workflow_id),
+        ).fetchall()
+        out: dict[str, list[tuple[Path, dict]]] = {}
+        for r in rows:
+            for item in self._rows([r]):
+                out.setdefault(item[1].get("workflow_id", "unknown"), []).append(item)
+        return out
+
+
+def open_index(jobs_dir: Path, sync: bool = True) -> JobIndex:
+    """Opened (and by default synced) index for a jobs directory."""
+    index = JobIndex(jobs_dir)
+    if sync:
+        index.sync()
+    return index
@@ -13,7 +13,7 @@ Falls back to keyword search when embeddings unavailable.
 
 from pathlib import Path
 
-from .schema import init_schema
+from .schema import init_schema, schema_version, SCHEMA_VERSION
 from .episodes import Episodes
 from .decisions import Decisions
 from .reflections import Reflections
@@ -22,31 +22,41 @@ from .quality import Quality
 from .research_findings import ResearchFindings
 from .entities import Entities
 from .principles import Principles
-from .utility import UtilityTracker
+from .utility import UtilityTracker, utility_cache
 from . import search as search_module
 from . import outcomes as outcomes_module
 from . import source_credibility as source_credibility_module
 from .memory_v2 import MemoryV2
+from .connection import get_pool, close_pools
 
+import atexit as _atexit
 import json as _json
 import os as _os
+import sqlite3
 
 from .embedding import embed_query as _embed_query, EMBEDDING_MODEL, EMBEDDING_DIM
 from .retrieval import retrieve_with_utility_impl
 
 DB_PATH = Path(_os.environ.get("OPERATOR_ROOT", str(Path.home() / "operator"))) / "memory" / "operator.db"
 
+# Pooled connections outlive Memory.close(); close them (checkpointing the WAL) when the process exits.
+_atexit.register(close_pools)
+
 
 class Memory:
-    def __init__(self, db_path: Path | str | None = None):
+    def __init__(self, db_path: Path | str | None = None, read_only: bool = False):
+        """read_only=True: fast open for retrieval-only callers (no schema work, writes raise).
+        Falls back to a normal open when the DB does not exist yet or predates SCHEMA_VERSION."""
         self._path = Path(db_path) if db_path else DB_PATH
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        import sqlite3
-        self._conn = sqlite3.connect(str(self._path))
-        self._conn.row_factory = sqlite3.Row
-        self._conn.execute("PRAGMA journal_mode=WAL")
-        self._conn.execute("PRAGMA foreign_keys=ON")
-        init_schema(self._conn)
+        self._pool = None
+        self._conn = self._open_read_only() if read_only else None
+        self.read_only = self._conn is not None
+        if self._conn is None:
+            self._pool = get_pool(str(self._path))
+            self._conn, fresh = self._pool.acquire()
+            if fresh:
+                init_schema(self._conn)
 
         self._episodes = Episodes(self._conn)
         self._decisions = Decisions(self._conn)
@@ -56,9 +66,31 @@ class Memory:
         self._research = ResearchFindings(self._conn)
         self._entities = Entities(self._conn)
         self._principles = Principles(self._conn)
-        self._utility = UtilityTracker(self._conn)
+        self._utility = UtilityTracker(self._conn, cache=utility_cache(str(self._path.resolve())))
         self._v2 = MemoryV2(self._conn)
 
+    def _open_read_only(self):
+        """Pooled read-only connection (separate from writers), or None to fall back to a normal open."""
+        if not self._path.exists():
+            return None
+        pool = get_pool(str(self._path), read_only=True)
+        try:
+            conn, fresh = pool.acquire()
+        except sqlite3.Error:
+            return None
+        try:
+            if not fresh or schema_version(conn) >= SCHEMA_VERSION:
+                self._pool = pool
+                return conn
+        except sqlite3.Error:
+            pass
+        conn.close()
+        return None
+
+    def batch(self):
+        """Unit of work: writes inside the block commit once at the end (rolled back on error). Nestable."""
+        return self._conn.batch()
+
     # ------------------------------------------------------------------
     # Episodes
     # ------------------------------------------------------------------
@@ -137,6 +169,10 @@ class Memory:
     def insert_research_finding(self, project_id: str, finding_key: str, content_preview: str, embedding_json: str | None = None, url: str | None = None, title: str | None = None, relevance_score: float | None = None, reliability_score: float | None = None, verification_status: str | None = None, evidence_count: int | None = None, critic_score: float | None = None, importance_score: float | None = None, admission_state: str | None = None) -> str:
         return self._research.insert(project_id, finding_key, content_preview, embedding_json, url, title, relevance_score, reliability_score, verification_status, evidence_count, critic_score, importance_score, admission_state)
 
+    def insert_research_findings_bulk(self, rows: list[dict]) -> list[str]:
+        """Insert many findings with one executemany; rows use insert_research_finding's keyword names."""
+        return self._research.insert_bulk(rows)
+
     def record_admission_event(self, project_id: str, finding_key: str, decision: str, reason: str = "", scores: dict | None = None) -> str:
         return self._research.record_admission_event(project_id, finding_key, decision, reason, scores)
 
@@ -161,12 +197,32 @@ class Memory:
     def get_or_create_entity(self, name: str, entity_type: str, properties: dict | None = None, first_seen_project: str | None = None) -> str:
         return self._entities.get_or_create(name, entity_type, properties, first_seen_project)
 
+    def get_or_create_entities_bulk(self, items: list[dict]) -> list[str]:
+        """Resolve/create many entities ({name, type, properties?, first_seen_project?}); ids align with items."""
+        return self._entities.get_or_create_bulk(items)
+
     def insert_entity_relation(self, entity_a_id: str, entity_b_id: str, relation_type: str, source_project: str, evidence: str = "") -> str:
         return self._entities.insert_relation(entity_a_id, entity_b_id, relation_type, source_project, evidence)
 
+    def insert_entity_relations_bulk(self, relations: list[dict]) -> list[str]:
+        """Insert many relations ({entity_a_id, entity_b_id, relation_type, source_project, evidence?})."""
+        return self._entities.insert_relations_bulk(relations)
+
+    def entity_two_hop_paths(self, project_id: str, limit: int = 20) -> list[dict]:
+        """A->B->C relation paths in a project without a direct A->C relation (from the cached project graph)."""
+        return self._entities.two_hop_paths(project_id, limit, cache_key=str(self._path.resolve()))
+
+    def entity_degree_ranking(self, project_id: str, limit: int = 20) -> list[dict]:
+        """Entities of a project ranked by relation count (in + out)."""
+        return self._entities.degree_ranking(project_id, limit, cache_key=str(self._path.resolve()))
+
     def insert_entity_mention(self, entity_id: str, project_id: str, finding_key: str | None = None, context_snippet: str = "") -> str:
         return self._entities.insert_mention(entity_id, project_id, finding_key, context_snippet)
 
+    def insert_mentions_bulk(self, mentions: list[dict]) -> list[str]:
+        """Insert many entity mentions ({entity_id, project_id, finding_key?, context_snippet?})."""
+        return self._entities.insert_mentions_bulk(mentions)
+
     def get_entities(self, entity_type: str | None = None, project_id: str | None = None, limit: int = 100) -> list[dict]:
         return self._entities.get(entity_type, project_id, limit)
 
@@ -473,6 +529,10 @@ class Memory:
             failed_quality_gate=failed_quality_gate,
         )
 
+    def refresh_strategy_features(self, strategy_profile_id: str | None = None) -> int:
+        """Re-materialise strategy selection features (one strategy or all active). Returns rows written."""
+        return self._v2.refresh_strategy_features(strategy_profile_id)
+
     def upsert_empirical_strategy(self, domain: str, min_samples: int = 3) -> str | None:
         return self._v2.upsert_empirical_strategy(domain=domain, min_samples=min_samples)
 
@@ -547,7 +607,14 @@ class Memory:
         return build_state_summary(self)
 
     def close(self):
-        self._conn.close()
+        """Return the connection to the per-process pool (idempotent)."""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if self._pool is not None:
+            self._pool.release(conn)
+        else:
+            conn.close()
 
     def __enter__(self):
         return self
@@ -0,0 +1,148 @@
+"""
+SQLite connections for the Memory facade.
+
+- MemoryConnection: commits can be deferred into one unit-of-work transaction (batch()).
+- Tuned pragmas for many concurrent processes on one WAL DB: busy_timeout, synchronous=NORMAL,
+  mmap_size, cache_size (env: MEMORY_DB_BUSY_TIMEOUT_MS, MEMORY_DB_MMAP_MB, MEMORY_DB_CACHE_MB).
+- ConnectionPool: per-process, thread-safe free list of open connections per (path, read_only), so
+  repeated Memory() opens (e.g. parallel reader workers) reuse connections instead of reconnecting.
+  MEMORY_DB_POOL_SIZE=0 disables pooling.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+class MemoryConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection whose commit() is deferred while a batch is open.
+
+    Domain classes call conn.commit() after every write (one fsync per row). Inside batch() those
+    commits are no-ops; the outermost batch commits once on success and rolls back on error.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._batch_depth = 0
+
+    @property
+    def in_batch(self) -> bool:
+        return self._batch_depth > 0
+
+    def commit(self) -> None:
+        if self._batch_depth:
+            return
+        super().commit()
+
+    @contextmanager
+    def batch(self):
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.rollback()
+            raise
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            super().commit()
+
+
+def _apply_pragmas(conn: sqlite3.Connection, read_only: bool) -> None:
+    conn.execute(f"PRAGMA busy_timeout={max(0, _env_int('MEMORY_DB_BUSY_TIMEOUT_MS', 10000))}")
+    conn.execute(f"PRAGMA mmap_size={max(0, _env_int('MEMORY_DB_MMAP_MB', 256)) * 1024 * 1024}")
+    conn.execute(f"PRAGMA cache_size=-{max(1, _env_int('MEMORY_DB_CACHE_MB', 16)) * 1024}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    if read_only:
+        # mode=ro: no journal/schema writes at open; query_only guards against accidental writes
+        conn.execute("PRAGMA query_only=ON")
+        return
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WAL + NORMAL: durable against app crashes, fsync only at checkpoints instead of every commit
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+
+
+def connect(path: str, read_only: bool = False) -> MemoryConnection:
+    timeout = max(0, _env_int("MEMORY_DB_BUSY_TIMEOUT_MS", 10000)) / 1000
+    if read_only:
+        uri = Path(path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=timeout, factory=MemoryConnection, check_same_thread=False)
+    else:
+        conn = sqlite3.connect(path, timeout=timeout, factory=MemoryConnection, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    _apply_pragmas(conn, read_only)
+    return conn
+
+
+class ConnectionPool:
+    """Free list of idle connections; acquire() never blocks (opens a new connection when none is idle)."""
+
+    def __init__(self, path: str, read_only: bool = False, max_idle: int | None = None):
+        self.path = path
+        self.read_only = read_only
+        self.max_idle = _env_int("MEMORY_DB_POOL_SIZE", 4) if max_idle is None else max_idle
+        self._idle: list[MemoryConnection] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> tuple[MemoryConnection, bool]:
+        """Returns (connection, fresh). fresh=True when newly opened (caller may need schema setup)."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), False
+        return connect(self.path, read_only=self.read_only), True
+
+    def release(self, conn: MemoryConnection) -> None:
+        try:
+            conn._batch_depth = 0
+            if conn.in_transaction:
+                conn.rollback()  # same as close(): uncommitted work is discarded
+        except sqlite3.Error:
+            conn.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_pools: dict[tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path: str, read_only: bool = False) -> ConnectionPool:
+    # keyed by pid: connections must not be shared across fork()
+    key = (os.getpid(), str(Path(path).resolve()), read_only)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(path, read_only=read_only)
+        return pool
+
+
+def close_pools() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
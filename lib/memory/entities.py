@@ -1,10 +1,16 @@
-"""Entities domain: knowledge graph (entities, relations, mentions)."""
+"""Entities domain: knowledge graph (entities, relations, mentions) and per-project graph queries."""
 import json
+import threading
 import time
 import sqlite3
+from collections import OrderedDict
 
 from .common import utcnow, hash_id
 
+# Stay below SQLite's default host-parameter limit (999 on older builds).
+_SQL_CHUNK = 500
+_GRAPH_CACHE_SIZE = 16
+
 
 class Entities:
     def __init__(self, conn: sqlite3.Connection):
@@ -27,12 +33,59 @@ class Entities:
             return row["id"]
         eid = hash_id(f"ent:{name_n}:{entity_type}:{time.time_ns()}")
         now = utcnow()
+        # UNIQUE(name, type): a concurrent writer may have created it since the SELECT
         self._conn.execute(
-            "INSERT INTO entities (id, name, type, properties_json, first_seen_project, created_at) VALUES (?,?,?,?,?,?)",
+            """INSERT INTO entities (id, name, type, properties_json, first_seen_project, created_at) VALUES (?,?,?,?,?,?)
+               ON CONFLICT(name, type) DO NOTHING""",
             (eid, name_n, entity_type, json.dumps(properties or {}), first_seen_project or "", now),
         )
         self._conn.commit()
-        return eid
+        row = self._conn.execute(
+            "SELECT id FROM entities WHERE name = ? AND type = ?", (name_n, entity_type)
+        ).fetchone()
+        return row["id"] if row else eid
+
+    def get_or_create_bulk(self, items: list[dict]) -> list[str]:
+        """
+        Resolve many entities at once: one lookup per chunk of names, one executemany for the new ones.
+        items: {name, type, properties?, first_seen_project?}. Returns ids aligned with items ("" for empty names).
+        """
+        keys = [((it.get("name") or "").strip(), it.get("type") or "") for it in items]
+        wanted = {k for k in keys if k[0]}
+        found = self._lookup_ids(wanted)
+        now = utcnow()
+        ns = time.time_ns()
+        new_rows = []
+        for i, (key, it) in enumerate(zip(keys, items)):
+            if not key[0] or key in found:
+                continue
+            eid = hash_id(f"ent:{key[0]}:{key[1]}:{ns}:{i}")
+            found[key] = eid
+            new_rows.append((eid, key[0], key[1], json.dumps(it.get("properties") or {}), it.get("first_seen_project") or "", now))
+        if new_rows:
+            self._conn.executemany(
+                """INSERT INTO entities (id, name, type, properties_json, first_seen_project, created_at) VALUES (?,?,?,?,?,?)
+                   ON CONFLICT(name, type) DO NOTHING""",
+                new_rows,
+            )
+            self._conn.commit()
+            # rows lost to a concurrent writer keep that writer's id
+            found.update(self._lookup_ids({(r[1], r[2]) for r in new_rows}))
+        return [found.get(k, "") for k in keys]
+
+    def _lookup_ids(self, keys: set[tuple]) -> dict[tuple, str]:
+        found: dict[tuple, str] = {}
+        names = sorted({n for n, _ in keys})
+        for i in range(0, len(names), _SQL_CHUNK):
+            chunk = names[i:i + _SQL_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT id, name, type FROM entities WHERE name IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for row in rows:
+                key = (row["name"], row["type"])
+                if key in keys:
+                    found[key] = row["id"]
+        return found
 
     def insert_relation(
         self,
@@ -50,6 +103,27 @@ class Entities:
         self._conn.commit()
         return rid
 
+    def insert_relations_bulk(self, relations: list[dict]) -> list[str]:
+        """Insert many relations ({entity_a_id, entity_b_id, relation_type, source_project, evidence?}) with one executemany."""
+        ns = time.time_ns()
+        now = utcnow()
+        ids: list[str] = []
+        params = []
+        for i, r in enumerate(relations):
+            rid = hash_id(f"er:{r['entity_a_id']}:{r['entity_b_id']}:{r['relation_type']}:{ns}:{i}")
+            ids.append(rid)
+            params.append((
+                rid, r["entity_a_id"], r["entity_b_id"], r["relation_type"], r["source_project"],
+                (r.get("evidence") or "")[:2000], now,
+            ))
+        if params:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entity_relations (id, entity_a_id, entity_b_id, relation_type, source_project, evidence, created_at) VALUES (?,?,?,?,?,?,?)",
+                params,
+            )
+            self._conn.commit()
+        return ids
+
     def insert_mention(
         self,
         entity_id: str,
@@ -65,6 +139,24 @@ class Entities:
         self._conn.commit()
         return mid
 
+    def insert_mentions_bulk(self, mentions: list[dict]) -> list[str]:
+        """Insert many mentions ({entity_id, project_id, finding_key?, context_snippet?}) with one executemany."""
+        ns = time.time_ns()
+        ids: list[str] = []
+        params = []
+        for i, m in enumerate(mentions):
+            finding_key = m.get("finding_key") or ""
+            mid = hash_id(f"em:{m['entity_id']}:{m['project_id']}:{finding_key}:{ns}:{i}")
+            ids.append(mid)
+            params.append((mid, m["entity_id"], m["project_id"], finding_key, (m.get("context_snippet") or "")[:1000]))
+        if params:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entity_mentions (id, entity_id, project_id, finding_key, context_snippet) VALUES (?,?,?,?,?)",
+                params,
+            )
+            self._conn.commit()
+        return ids
+
     def get(
         self,
         entity_type: str | None = None,
@@ -110,3 +202,110 @@ class Entities:
                 (limit,),
             ).fetchall()
         return [dict(r) for r in rows]
+
+    def project_graph(self, project_id: str, cache_key: str = "") -> "ProjectGraph":
+        """Adjacency view of one project's relations; reused across calls while the project's relations are unchanged."""
+        # covered by idx_entity_relations_project (rowid is part of every index entry)
+        stamp = tuple(self._conn.execute(
+            "SELECT COUNT(*), MAX(rowid) FROM entity_relations WHERE source_project = ?", (project_id,)
+        ).fetchone())
+        key = (cache_key, project_id)
+        with _graph_lock:
+            graph = _graph_cache.get(key)
+            if graph is not None and graph.stamp == stamp:
+                _graph_cache.move_to_end(key)
+                return graph
+        graph = ProjectGraph(self._conn, project_id, stamp)
+        if cache_key:
+            with _graph_lock:
+                _graph_cache[key] = graph
+                while len(_graph_cache) > _GRAPH_CACHE_SIZE:
+                    _graph_cache.popitem(last=False)
+        return graph
+
+    def two_hop_paths(self, project_id: str, limit: int = 20, cache_key: str = "") -> list[dict]:
+        return self.project_graph(project_id, cache_key).two_hop_paths(self._conn, limit)
+
+    def degree_ranking(self, project_id: str, limit: int = 20, cache_key: str = "") -> list[dict]:
+        return self.project_graph(project_id, cache_key).degree_ranking(limit)
+
+
+_graph_cache: "OrderedDict[tuple, ProjectGraph]" = OrderedDict()
+_graph_lock = threading.Lock()
+
+
+class ProjectGraph:
+    """
+    In-memory adjacency lists for one project's entity_relations (one indexed query to build).
+    Graph queries (2-hop paths, degree ranking) then run without self-joins over the relations table.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, project_id: str, stamp: tuple = ()):
+        self.project_id = project_id
+        self.stamp = stamp
+        rows = conn.execute(
+            """SELECT entity_a_id, entity_b_id, relation_type, created_at FROM entity_relations
+               WHERE source_project = ?""",
+            (project_id,),
+        ).fetchall()
+        # edges newest first (ties keep insertion order)
+        self.edges: list[tuple] = sorted(
+            ((r[0], r[1], r[2], r[3] or "") for r in rows), key=lambda e: e[3], reverse=True
+        )
+        self.out: dict[str, list[tuple]] = {}
+        self.degree: dict[str, int] = {}
+        for a, b, rel, _ts in self.edges:
+            self.out.setdefault(a, []).append((b, rel))
+            self.degree[a] = self.degree.get(a, 0) + 1
+            self.degree[b] = self.degree.get(b, 0) + 1
+        self._entities: dict[str, tuple] = {}
+        self._ranked: list[str] | None = None
+        ids = sorted(self.degree)
+        for i in range(0, len(ids), _SQL_CHUNK):
+            chunk = ids[i:i + _SQL_CHUNK]
+            for r in conn.execute(
+                f"SELECT id, name, type FROM entities WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall():
+                self._entities[r[0]] = (r[1], r[2])
+
+    def name(self, entity_id: str) -> str | None:
+        ent = self._entities.get(entity_id)
+        return ent[0] if ent else None
+
+    def two_hop_paths(self, conn: sqlite3.Connection, limit: int = 20) -> list[dict]:
+        """
+        A->B->C paths in this project with no direct A->C relation (in any project), newest A->B first.
+        Direct edges are checked per distinct A with the (entity_a_id, entity_b_id) index.
+        """
+        direct: dict[str, set] = {}
+        out: list[dict] = []
+        if limit <= 0:
+            return out
+        for a, b, rel_ab, _ts in self.edges:
+            if a not in self._entities or b not in self._entities:
+                continue
+            for c, rel_bc in self.out.get(b, ()):
+                if c not in self._entities:
+                    continue
+                if a not in direct:
+                    direct[a] = {r[0] for r in conn.execute(
+                        "SELECT entity_b_id FROM entity_relations WHERE entity_a_id = ?", (a,)
+                    ).fetchall()}
+                if c in direct[a]:
+                    continue
+                out.append({"a": a, "b": b, "c": c, "rel_ab": rel_ab, "rel_bc": rel_bc,
+                            "name_a": self.name(a), "name_b": self.name(b), "name_c": self.name(c)})
+                if len(out) >= limit:
+                    return out
+        return out
+
+    def degree_ranking(self, limit: int = 20) -> list[dict]:
+        """Entities by number of relations (in + out) in this project, highest first."""
+        if self._ranked is None:
+            self._ranked = sorted(
+                (eid for eid in self.degree if eid in self._entities), key=lambda e: (-self.degree[e], self._entities[e][0])
+            )
+        return [
+            {"id": eid, "name": self._entities[eid][0], "type": self._entities[eid][1], "degree": self.degree[eid]}
+            for eid in self._ranked[:limit]
+        ]
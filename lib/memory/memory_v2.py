@@ -8,6 +8,7 @@ import sqlite3
 import time
 from collections import Counter
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from .common import hash_id, utcnow
 
@@ -54,6 +55,43 @@ def _question_signature(question: str) -> str:
     return " ".join(sorted(set(tokens)))
 
 
+@lru_cache(maxsize=4096)
+def _question_tokens(question: str) -> frozenset:
+    """Tokens of a stored episode question (cached: the same recent questions are compared on every selection)."""
+    return frozenset(_tokenize(question))
+
+
+@lru_cache(maxsize=4096)
+def _epoch(ts: str) -> float | None:
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except Exception:
+        return None
+
+
+def _json_list(value) -> list:
+    try:
+        out = json.loads(value or "[]")
+    except Exception:
+        return []
+    return out if isinstance(out, list) else []
+
+
+def _causal_episode_features(row: dict) -> dict:
+    what_helped = [str(x).lower() for x in _json_list(row.get("what_helped_json"))]
+    what_hurt = [str(x).lower() for x in _json_list(row.get("what_hurt_json"))]
+    critic = row.get("critic_score")
+    return {
+        "hurt": sorted(_tokenize(" ".join(what_hurt))),
+        "help": sorted(_tokenize(" ".join(what_helped))),
+        "helped": bool(what_helped),
+        "good": isinstance(critic, (int, float)) and float(critic) >= 0.5,
+    }
+
+
 class MemoryV2:
     def __init__(self, conn: sqlite3.Connection):
         self._conn = conn
@@ -119,6 +157,7 @@ class MemoryV2:
             ),
         )
         if strategy_profile_id:
+            self._invalidate_strategy_features(strategy_profile_id)
             # Keep episode<->strategy graph linkage consistent even if caller forgets.
             self.record_graph_edge(
                 edge_type="used_in",
@@ -205,6 +244,7 @@ class MemoryV2:
                 now,
             ),
         )
+        self._invalidate_strategy_features(pid)
         self._conn.commit()
         return pid
 
@@ -237,8 +277,11 @@ class MemoryV2:
         candidates = self.list_strategy_profiles(domain=domain or None, limit=20)
         if not candidates:
             return None
+        # Materialised per-strategy features (policy tokens, per-domain causal episodes, fail codes):
+        # one lookup for all candidates, then a pure in-memory scoring pass.
+        features = self._load_strategy_features(candidates)
         # Fail-code filter: hard-exclude strategies that had blocking fail_codes in this domain (Priority 3)
-        candidates = [c for c in candidates if not self._strategy_fail_code_blocked(c.get("id") or "", domain)]
+        candidates = [c for c in candidates if not self._strategy_fail_code_blocked(features.get(c.get("id") or ""), domain)]
         if not candidates:
             return None
         q_tokens = _tokenize(question)
@@ -250,13 +293,11 @@ class MemoryV2:
         best = None
         best_score = -1.0
         for c in candidates:
-            policy_text = json.dumps(c.get("policy", {}), ensure_ascii=False)
-            p_tokens = _tokenize(policy_text)
+            feat = features.get(c.get("id") or "") or {}
+            p_tokens = set(feat.get("policy_tokens") or ())
             overlap = len(q_tokens & p_tokens)
             lexical = overlap / max(1, len(q_tokens))
-            causal_score, what_hurt_penalty = self._causal_signal(
-                c.get("id") or "", c.get("domain") or "", question, domain
-            )
+            causal_score, what_hurt_penalty = self._causal_signal(feat, c.get("domain") or "", q_tokens, domain)
             # Weights: 40% historical, 20% lexical, 20% causal, 10% similar episodes, 10% recency+domain (Priority 3)
             combined = (
                 0.40 * float(c.get("score") or 0.5)
@@ -322,23 +363,17 @@ class MemoryV2:
             return 0, 0.0
         similar_count = 0
         weighted = 0.0
+        now = time.time()
         for r in rows:
-            other = _tokenize(r["question"] or "")
+            other = _question_tokens(r["question"] or "")
             if not other:
                 continue
             overlap = len(q_tokens & other) / max(1, len(q_tokens | other))
             if overlap < 0.12:
                 continue
             similar_count += 1
-            ts = str(r["created_at"] or "")
-            age_days = 30.0
-            try:
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                age_days = max(0.0, (datetime.now(timezone.utc) - dt).total_seconds() / 86400.0)
-            except Exception:
-                pass
+            ts = _epoch(str(r["created_at"] or ""))
+            age_days = max(0.0, (now - ts) / 86400.0) if ts is not None else 30.0
             weighted += math.exp(-age_days / 30.0)
         if similar_count <= 0:
             return 0, 0.0
@@ -350,67 +385,130 @@ class MemoryV2:
         "clinical": ["safety_filter_block"],
         "medical": ["safety_filter_block"],
     }
+    _CAUSAL_EPISODE_LIMIT = 20
 
-    def _strategy_episodes_for_causal(
-        self, strategy_profile_id: str, domain: str | None, limit: int = 30
-    ) -> list[dict]:
-        """Episodes that used this strategy in same/similar domain (via graph used_in, fallback strategy_profile_id)."""
+    def compute_strategy_features(self, strategy_profile_id: str, policy_json: str = "{}") -> dict:
+        """
+        Question-independent selection features for one strategy (two queries):
+          policy_tokens: tokens of the serialised policy
+          domains[<domain>|"*"]: causal episodes ({hurt, help, helped, good}) -- the 20 most recent linked via
+            graph edges (used_in), else by strategy_profile_id -- and the fail codes of all its episodes there.
+        """
         try:
-            # Prefer graph: episodes linked by memory_graph_edges (used_in strategy -> episode)
-            episode_ids = self.get_episode_ids_for_strategy(strategy_profile_id, domain=domain, limit=limit)
-            if episode_ids:
-                placeholders = ",".join("?" * len(episode_ids))
-                if domain:
-                    rows = self._conn.execute(
-                        f"""SELECT question, domain, what_helped_json, what_hurt_json, fail_codes_json, critic_score
-                           FROM run_episodes WHERE id IN ({placeholders}) AND domain=?
-                           ORDER BY created_at DESC LIMIT ?""",
-                        (*episode_ids, domain, limit),
-                    ).fetchall()
-                else:
-                    rows = self._conn.execute(
-                        f"""SELECT question, domain, what_helped_json, what_hurt_json, fail_codes_json, critic_score
-                           FROM run_episodes WHERE id IN ({placeholders})
-                           ORDER BY created_at DESC LIMIT ?""",
-                        (*episode_ids, limit),
-                    ).fetchall()
+            policy = json.loads(policy_json or "{}")
+        except Exception:
+            policy = {}
+        features: dict = {
+            "policy_tokens": sorted(_tokenize(json.dumps(policy, ensure_ascii=False))),
+            "domains": {},
+        }
+        try:
+            edges = self._conn.execute(
+                """SELECT to_node_id FROM memory_graph_edges
+                   WHERE from_node_type = 'strategy_profile' AND from_node_id = ? AND to_node_type = 'run_episode'
+                   ORDER BY ts DESC""",
+                (strategy_profile_id,),
+            ).fetchall()
+            rows = self._conn.execute(
+                """SELECT id, domain, strategy_profile_id, what_helped_json, what_hurt_json, fail_codes_json,
+                          critic_score, created_at
+                   FROM run_episodes
+                   WHERE strategy_profile_id = ? OR id IN (
+                     SELECT to_node_id FROM memory_graph_edges
+                     WHERE from_node_type = 'strategy_profile' AND from_node_id = ? AND to_node_type = 'run_episode')""",
+                (strategy_profile_id, strategy_profile_id),
+            ).fetchall()
+        except Exception:
+            return features
+        episodes = {r["id"]: dict(r) for r in rows}
+        edge_ids = [str(r[0]) for r in edges if r and r[0]]
+        limit = self._CAUSAL_EPISODE_LIMIT
+        for key in {"*"} | {str(e["domain"] or "") for e in episodes.values()}:
+            in_domain = (lambda e: True) if key == "*" else (lambda e, k=key: (e["domain"] or "") == k)
+            if key == "*":
+                linked = edge_ids[:limit]
             else:
-                # Fallback when no graph edges yet (e.g. older DBs)
-                if domain:
-                    rows = self._conn.execute(
-                        """SELECT question, domain, what_helped_json, what_hurt_json, fail_codes_json, critic_score
-                           FROM run_episodes WHERE strategy_profile_id=? AND domain=?
-                           ORDER BY created_at DESC LIMIT ?""",
-                        (strategy_profile_id, domain, limit),
-                    ).fetchall()
-                else:
-                    rows = self._conn.execute(
-                        """SELECT question, domain, what_helped_json, what_hurt_json, fail_codes_json, critic_score
-                           FROM run_episodes WHERE strategy_profile_id=?
-                           ORDER BY created_at DESC LIMIT ?""",
-                        (strategy_profile_id, limit),
-                    ).fetchall()
-            out = []
-            for r in rows:
+                linked = [i for i in edge_ids if i in episodes and in_domain(episodes[i])][:limit]
+            if linked:
+                chosen = [episodes[i] for i in dict.fromkeys(linked) if i in episodes and in_domain(episodes[i])]
+            else:
+                chosen = [e for e in episodes.values() if e["strategy_profile_id"] == strategy_profile_id and in_domain(e)]
+            chosen = sorted(chosen, key=lambda e: e["created_at"] or "", reverse=True)[:limit]
+            fail_codes: set[str] = set()
+            if key != "*":
+                for e in episodes.values():
+                    if e["strategy_profile_id"] == strategy_profile_id and in_domain(e):
+                        codes = _json_list(e["fail_codes_json"])
+                        fail_codes.update(str(x) for x in codes)
+            features["domains"][key] = {
+                "episodes": [_causal_episode_features(e) for e in chosen],
+                "fail_codes": sorted(fail_codes),
+            }
+        return features
+
+    def refresh_strategy_features(self, strategy_profile_id: str | None = None) -> int:
+        """(Re)materialise strategy_features for one strategy or all active ones. Returns rows written."""
+        if strategy_profile_id:
+            rows = self._conn.execute(
+                "SELECT id, policy_json, updated_at FROM strategy_profiles WHERE id=?", (strategy_profile_id,)
+            ).fetchall()
+        else:
+            rows = self._conn.execute(
+                "SELECT id, policy_json, updated_at FROM strategy_profiles WHERE status='active'"
+            ).fetchall()
+        for r in rows:
+            self._store_strategy_features(r["id"], r["updated_at"] or "", self.compute_strategy_features(r["id"], r["policy_json"]))
+        self._conn.commit()
+        return len(rows)
+
+    def _store_strategy_features(self, strategy_profile_id: str, profile_updated_at: str, features: dict) -> None:
+        self._conn.execute(
+            """INSERT OR REPLACE INTO strategy_features (strategy_profile_id, profile_updated_at, features_json, updated_at)
+               VALUES (?, ?, ?, ?)""",
+            (strategy_profile_id, profile_updated_at, _safe_json(features, {}), utcnow()),
+        )
+
+    def _invalidate_strategy_features(self, strategy_profile_id: str) -> None:
+        self._conn.execute("DELETE FROM strategy_features WHERE strategy_profile_id=?", (strategy_profile_id,))
+
+    def _load_strategy_features(self, candidates: list[dict]) -> dict[str, dict]:
+        """Features for all candidates in one query; missing/stale rows are recomputed and persisted."""
+        ids = [c.get("id") for c in candidates if c.get("id")]
+        out: dict[str, dict] = {}
+        if not ids:
+            return out
+        try:
+            rows = self._conn.execute(
+                f"""SELECT strategy_profile_id, profile_updated_at, features_json FROM strategy_features
+                    WHERE strategy_profile_id IN ({','.join('?' * len(ids))})""",
+                ids,
+            ).fetchall()
+        except sqlite3.Error:
+            rows = []
+        stored = {r["strategy_profile_id"]: r for r in rows}
+        dirty = False
+        for c in candidates:
+            sid = c.get("id")
+            if not sid:
+                continue
+            row = stored.get(sid)
+            if row is not None and row["profile_updated_at"] == (c.get("updated_at") or ""):
                 try:
-                    what_helped = json.loads(r["what_helped_json"] or "[]")
-                    what_hurt = json.loads(r["what_hurt_json"] or "[]")
-                    fail_codes = json.loads(r["fail_codes_json"] or "[]")
+                    out[sid] = json.loads(row["features_json"] or "{}")
+                    continue
                 except Exception:
-                    what_helped, what_hurt, fail_codes = [], [], []
-                out.append({
-                    "question": r["question"] or "",
-                    "domain": r["domain"] or "",
-                    "what_helped": what_helped if isinstance(what_helped, list) else [],
-                    "what_hurt": what_hurt if isinstance(what_hurt, list) else [],
-                    "fail_codes": fail_codes if isinstance(fail_codes, list) else [],
-                    "critic_score": float(r["critic_score"]) if r["critic_score"] is not None else None,
-                })
-            return out
-        except Exception:
-            return []
+                    pass
+            out[sid] = self.compute_strategy_features(sid, c.get("policy_json") or "{}")
+            try:
+                self._store_strategy_features(sid, c.get("updated_at") or "", out[sid])
+                dirty = True
+            except sqlite3.Error:
+                pass  # read-only connection: use the computed features without persisting
+        if dirty:
+            self._conn.commit()
+        return out
 
-    def _strategy_fail_code_blocked(self, strategy_profile_id: str, domain: str | None) -> bool:
+    def _strategy_fail_code_blocked(self, features: dict | None, domain: str | None) -> bool:
         """True if this strategy should be hard-excluded for this domain (e.g. safety_filter_block on biomedical)."""
         if not domain:
             return False
@@ -421,50 +519,34 @@ class MemoryV2:
                 blocking.extend(codes)
         if not blocking:
             return False
-        try:
-            rows = self._conn.execute(
-                """SELECT fail_codes_json FROM run_episodes
-                   WHERE strategy_profile_id=? AND domain=?""",
-                (strategy_profile_id, domain),
-            ).fetchall()
-            for r in rows:
-                try:
-                    codes = json.loads(r["fail_codes_json"] or "[]")
-                    if isinstance(codes, list) and any(c in blocking for c in (str(x) for x in codes)):
-                        return True
-                except Exception:
-                    pass
-            return False
-        except Exception:
-            return False
+        seen = ((features or {}).get("domains") or {}).get(domain, {}).get("fail_codes") or []
+        return any(c in blocking for c in seen)
 
     def _causal_signal(
-        self, strategy_profile_id: str, strategy_domain: str, question: str, domain: str | None
+        self, features: dict, strategy_domain: str, q_tokens: set[str], domain: str | None
     ) -> tuple[float, bool]:
         """
         Returns (causal_score 0..1, what_hurt_penalty_applied).
         causal_score: higher if past episodes with this strategy had what_helped / good outcomes; lower if what_hurt matches.
         what_hurt_penalty_applied: True if we apply -0.2 elsewhere (similar episode had what_hurt matching question).
         """
-        episodes = self._strategy_episodes_for_causal(strategy_profile_id, domain or strategy_domain, limit=20)
+        key = (domain or strategy_domain) or "*"
+        episodes = ((features or {}).get("domains") or {}).get(key, {}).get("episodes") or []
         if not episodes:
             return 0.5, False  # neutral
-        q_tokens = _tokenize(question)
         hurt_penalty = False
         help_count = 0
         hurt_count = 0
         good_outcome_count = 0
         for ep in episodes:
-            what_hurt = [str(x).lower() for x in ep.get("what_hurt") or []]
-            what_helped = [str(x).lower() for x in ep.get("what_helped") or []]
-            hurt_tokens = _tokenize(" ".join(what_hurt))
-            help_tokens = _tokenize(" ".join(what_helped))
+            hurt_tokens = set(ep.get("hurt") or ())
+            help_tokens = set(ep.get("help") or ())
             if q_tokens and hurt_tokens and len(q_tokens & hurt_tokens) >= 1:
                 hurt_penalty = True
                 hurt_count += 1
-            if what_helped and (not q_tokens or len(q_tokens & help_tokens) >= 1 or len(help_tokens) <= 2):
+            if ep.get("helped") and (not q_tokens or len(q_tokens & help_tokens) >= 1 or len(help_tokens) <= 2):
                 help_count += 1
-            if isinstance(ep.get("critic_score"), (int, float)) and float(ep["critic_score"]) >= 0.5:
+            if ep.get("good"):
                 good_outcome_count += 1
         n = len(episodes)
         causal = 0.5
@@ -535,7 +617,7 @@ class MemoryV2:
         strategy_profile_id: str | None = None,
         confidence: float = 0.5,
     ) -> str:
-        did = hash_id(f"memory-decision:{decision_type}:{project_id or ''}:{phase or ''}:{utcnow()}")
+        did = hash_id(f"memory-decision:{decision_type}:{project_id or ''}:{phase or ''}:{utcnow()}:{time.time_ns()}")
         self._conn.execute(
             """INSERT INTO memory_decision_log
                (id, ts, project_id, phase, decision_type, strategy_profile_id, confidence, details_json)
@@ -588,6 +670,8 @@ class MemoryV2:
     ) -> str:
         base = f"graph-edge:{edge_type}:{from_node_type}:{from_node_id}:{to_node_type}:{to_node_id}:{project_id or ''}"
         ts = utcnow()
+        if from_node_type == "strategy_profile":
+            self._invalidate_strategy_features(from_node_id)
         for attempt in range(3):
             eid = hash_id(f"{base}:{time.time_ns()}:{attempt}")
             try:
@@ -725,6 +809,7 @@ class MemoryV2:
             (score, confidence, usage_count, success_count, fail_count, utcnow(), strategy_profile_id),
         )
         self._conn.commit()
+        self.refresh_strategy_features(strategy_profile_id)
 
     def summarize_query_type_mix(self, queries: list[dict]) -> dict[str, float]:
         c = Counter()
@@ -908,6 +993,7 @@ class MemoryV2:
             return
         qh = self._question_hash(question)
         sig = _question_signature(question)
+        stored_sig = sig[:2000] if sig else ""
         now = utcnow()
         for url in urls:
             u = (url or "").strip()
@@ -916,7 +1002,7 @@ class MemoryV2:
             try:
                 self._conn.execute(
                     "INSERT OR IGNORE INTO read_urls (question_hash, url, created_at, question_signature) VALUES (?, ?, ?, ?)",
-                    (qh, u[:2048], now, sig[:2000] if sig else ""),
+                    (qh, u[:2048], now, stored_sig),
                 )
             except Exception:
                 try:
@@ -926,10 +1012,61 @@ class MemoryV2:
                     )
                 except Exception:
                     pass
+        self._index_question_signature(stored_sig)
         self._conn.commit()
 
+    def _index_question_signature(self, sig: str) -> None:
+        """Add a signature to the token -> signature postings (no-op when already indexed)."""
+        tokens = set((sig or "").split())
+        if not tokens:
+            return
+        try:
+            for t in tokens:
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO read_url_signature_tokens (token, signature, token_count) VALUES (?, ?, ?)",
+                    (t, sig, len(tokens)),
+                )
+                if cur.rowcount:
+                    self._conn.execute(
+                        """INSERT INTO read_url_token_df (token, signature_count) VALUES (?, 1)
+                           ON CONFLICT(token) DO UPDATE SET signature_count = signature_count + 1""",
+                        (t,),
+                    )
+        except sqlite3.Error:
+            pass
+
+    def _similar_signature_candidates(self, tokens: set[str], threshold: float) -> list[str]:
+        """
+        Signatures that can reach Jaccard >= threshold with tokens, via the inverted index.
+        Prefix filter: a match must share at least ceil(t*|A|) tokens with A, so it contains one of the
+        |A| - ceil(t*|A|) + 1 rarest tokens of A; size filter: t*|A| <= |B| <= |A|/t.
+        """
+        n = len(tokens)
+        if threshold <= 0:
+            rows = self._conn.execute("SELECT DISTINCT signature FROM read_url_signature_tokens").fetchall()
+            return [r[0] for r in rows]
+        ordered = sorted(tokens)
+        df_rows = self._conn.execute(
+            f"SELECT token, signature_count FROM read_url_token_df WHERE token IN ({','.join('?' * n)})", ordered
+        ).fetchall()
+        df = {r[0]: int(r[1] or 0) for r in df_rows}
+        present = [t for t in ordered if df.get(t)]
+        min_overlap = max(1, math.ceil(threshold * n - 1e-9))
+        if len(present) < min_overlap:
+            return []
+        prefix = sorted(present, key=lambda t: (df[t], t))[: len(present) - min_overlap + 1]
+        rows = self._conn.execute(
+            f"""SELECT DISTINCT signature FROM read_url_signature_tokens
+                WHERE token IN ({','.join('?' * len(prefix))}) AND token_count BETWEEN ? AND ?""",
+            [*prefix, min_overlap, math.floor(n / threshold + 1e-9)],
+        ).fetchall()
+        return [r[0] for r in rows]
+
     def get_read_urls_for_question(self, question: str, similar_threshold: float = 0.6) -> set[str]:
-        """Return URLs already read for this question (exact hash) or for similar questions (signature token overlap)."""
+        """
+        Return URLs already read for this question (exact hash) or for similar questions (signature token Jaccard).
+        Similar signatures come from the token inverted index; only the few candidates are compared exactly.
+        """
         qh = self._question_hash(question)
         sig = _question_signature(question)
         tokens = set((sig or "").split())
@@ -945,12 +1082,9 @@ class MemoryV2:
         except Exception:
             pass
         try:
-            cur = self._conn.execute(
-                "SELECT DISTINCT question_signature FROM read_urls WHERE question_signature IS NOT NULL AND question_signature != '' LIMIT 5000"
-            )
             similar_sigs: list[str] = []
-            for row in cur.fetchall():
-                s = (row["question_signature"] or "").strip()
+            for s in (self._similar_signature_candidates(tokens, similar_threshold) if tokens else []):
+                s = (s or "").strip()
                 if not s or s == sig:
                     continue
                 row_tokens = set(s.split())
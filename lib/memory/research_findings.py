@@ -43,6 +43,36 @@ class ResearchFindings:
         self._conn.commit()
         return fid
 
+    def insert_bulk(self, rows: list[dict]) -> list[str]:
+        """Insert many findings (keys as in insert()) with one executemany and one commit. Returns ids in order."""
+        now = utcnow()
+        ns = time.time_ns()
+        ids: list[str] = []
+        params = []
+        for i, r in enumerate(rows):
+            project_id = r["project_id"]
+            finding_key = r["finding_key"]
+            fid = hash_id(f"rf:{project_id}:{finding_key}:{ns}:{i}")
+            state = (r.get("admission_state") or "quarantined").lower()
+            if state not in ("accepted", "quarantined", "rejected"):
+                state = "quarantined"
+            ids.append(fid)
+            params.append((
+                fid, project_id, finding_key, (r.get("content_preview") or "")[:4000], r.get("embedding_json"), now,
+                r.get("url"), r.get("title"), r.get("relevance_score"), r.get("reliability_score"),
+                r.get("verification_status"), r.get("evidence_count"), r.get("critic_score"), r.get("importance_score"), state,
+            ))
+        if not params:
+            return ids
+        self._conn.executemany(
+            """INSERT INTO research_findings (id, project_id, finding_key, content_preview, embedding_json, ts, url, title,
+               relevance_score, reliability_score, verification_status, evidence_count, critic_score, importance_score, admission_state)
+               VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""",
+            params,
+        )
+        self._conn.commit()
+        return ids
+
     def record_admission_event(
         self,
         project_id: str,
@@ -152,6 +182,7 @@ class ResearchFindings:
         return [dict(r) for r in rows]
 
     def mark_cross_links_notified(self, link_ids: list[str]) -> None:
-        for lid in link_ids:
-            self._conn.execute("UPDATE cross_links SET notified = 1 WHERE id = ?", (lid,))
+        if not link_ids:
+            return
+        self._conn.executemany("UPDATE cross_links SET notified = 1 WHERE id = ?", [(lid,) for lid in link_ids])
         self._conn.commit()
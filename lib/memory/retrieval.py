@@ -61,12 +61,13 @@ def retrieve_with_utility_impl(
     else:
         return []
 
+    # One batched (and LRU-cached) utility lookup for all candidates instead of 1-2 SELECTs each
+    util_by_id = memory._utility.scores(memory_type, [c["id"] for c in candidates if c.get("id")], context_key=ctx or None)
     for c in candidates:
         mid = c.get("id")
         if not mid:
             continue
-        util_row = memory._utility.get(memory_type, mid, context_key=ctx or None)
-        util_score = util_row["utility_score"] if util_row else 0.5
+        util_score = util_by_id.get(mid, 0.5)
         c["utility_score"] = util_score
         similarity = c.get("similarity_score", c.get("relevance_score", c.get("relevance", 0.5)))
         if not isinstance(similarity, (int, float)):
@@ -81,8 +82,7 @@ def retrieve_with_utility_impl(
 
     candidates.sort(key=lambda x: x.get("combined_score", 0), reverse=True)
     selected = candidates[:k]
-    for c in selected:
-        mid = c.get("id")
-        if mid:
-            memory._utility.record_retrieval(memory_type, str(mid), context_key=ctx or None)
+    memory._utility.record_retrievals(
+        memory_type, [str(c["id"]) for c in selected if c.get("id")], context_key=ctx or None
+    )
     return selected
@@ -1,6 +1,9 @@
 """Schema creation and migrations for the memory DB."""
 import sqlite3
 
+# Bump whenever SCHEMA_SQL or a migrate_* step changes; stored in PRAGMA user_version.
+# init_schema re-runs the (idempotent) script and migrations only when the DB is older.
+SCHEMA_VERSION = 4
 
 SCHEMA_SQL = """
     CREATE TABLE IF NOT EXISTS episodes (
@@ -134,6 +137,10 @@ SCHEMA_SQL = """
     CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type);
     CREATE INDEX IF NOT EXISTS idx_entities_name ON entities(name);
     CREATE INDEX IF NOT EXISTS idx_entity_mentions_project ON entity_mentions(project_id);
+    CREATE INDEX IF NOT EXISTS idx_entity_mentions_entity ON entity_mentions(entity_id, project_id);
+    CREATE INDEX IF NOT EXISTS idx_entity_relations_project ON entity_relations(source_project, entity_a_id);
+    CREATE INDEX IF NOT EXISTS idx_entity_relations_pair ON entity_relations(entity_a_id, entity_b_id);
+    CREATE INDEX IF NOT EXISTS idx_entity_relations_b ON entity_relations(entity_b_id);
 
     CREATE TABLE IF NOT EXISTS strategic_principles (
         id TEXT PRIMARY KEY,
@@ -273,6 +280,23 @@ SCHEMA_SQL = """
         created_at TEXT NOT NULL,
         PRIMARY KEY (question_hash, url)
     );
+    -- Inverted index over read_urls.question_signature tokens (similar-question lookup without a full scan)
+    CREATE TABLE IF NOT EXISTS read_url_signature_tokens (
+        token TEXT NOT NULL,
+        signature TEXT NOT NULL,
+        token_count INTEGER NOT NULL,
+        PRIMARY KEY (token, signature)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS read_url_token_df (
+        token TEXT PRIMARY KEY,
+        signature_count INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS strategy_features (
+        strategy_profile_id TEXT PRIMARY KEY,
+        profile_updated_at TEXT NOT NULL,
+        features_json TEXT NOT NULL DEFAULT '{}',
+        updated_at TEXT NOT NULL
+    );
     CREATE INDEX IF NOT EXISTS idx_read_urls_question ON read_urls(question_hash);
     CREATE INDEX IF NOT EXISTS idx_strategic_principles_domain ON strategic_principles(domain);
     CREATE INDEX IF NOT EXISTS idx_strategic_principles_type ON strategic_principles(principle_type);
@@ -289,7 +313,21 @@ SCHEMA_SQL = """
 """
 
 
+def schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
 def init_schema(conn: sqlite3.Connection) -> None:
+    """Create/migrate the schema once per SCHEMA_VERSION; a DB already at the current version is left untouched."""
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return
+    apply_schema(conn)
+    conn.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+    conn.commit()
+
+
+def apply_schema(conn: sqlite3.Connection) -> None:
+    """Full (idempotent) schema script plus all migrations."""
     conn.executescript(SCHEMA_SQL)
     conn.commit()
     migrate_run_episodes_project_unique(conn)
@@ -297,6 +335,8 @@ def init_schema(conn: sqlite3.Connection) -> None:
     migrate_run_episodes_memory_value(conn)
     migrate_run_episodes_run_index(conn)
     migrate_read_urls_signature(conn)
+    migrate_read_urls_token_index(conn)
+    migrate_entities_unique(conn)
 
 
 def migrate_research_findings_quality(conn: sqlite3.Connection) -> None:
@@ -358,6 +398,52 @@ def migrate_read_urls_signature(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+def migrate_read_urls_token_index(conn: sqlite3.Connection) -> None:
+    """Backfill read_url_signature_tokens / read_url_token_df from existing read_urls signatures (once)."""
+    if conn.execute("SELECT 1 FROM read_url_signature_tokens LIMIT 1").fetchone():
+        return
+    rows = conn.execute(
+        "SELECT DISTINCT question_signature FROM read_urls WHERE question_signature IS NOT NULL AND question_signature != ''"
+    ).fetchall()
+    postings = []
+    for (sig,) in rows:
+        tokens = set(str(sig).split())
+        postings.extend((t, sig, len(tokens)) for t in tokens)
+    if postings:
+        conn.executemany(
+            "INSERT OR IGNORE INTO read_url_signature_tokens (token, signature, token_count) VALUES (?, ?, ?)", postings
+        )
+        conn.execute("DELETE FROM read_url_token_df")
+        conn.execute(
+            """INSERT INTO read_url_token_df (token, signature_count)
+               SELECT token, COUNT(*) FROM read_url_signature_tokens GROUP BY token"""
+        )
+    conn.commit()
+
+
+def migrate_entities_unique(conn: sqlite3.Connection) -> None:
+    """
+    Enforce UNIQUE(name, type) on entities. Older DBs could hold duplicates (racing get_or_create):
+    keep the earliest row per (name, type), repoint relations/mentions to it, drop the rest.
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_entities_name_type'").fetchone():
+        return
+    dupes = conn.execute(
+        """SELECT e.id, (SELECT k.id FROM entities k WHERE k.name = e.name AND k.type = e.type
+                          ORDER BY k.created_at, k.id LIMIT 1) AS keep_id
+           FROM entities e
+           WHERE (SELECT COUNT(*) FROM entities d WHERE d.name = e.name AND d.type = e.type) > 1"""
+    ).fetchall()
+    remap = [(keep, eid) for eid, keep in dupes if keep and keep != eid]
+    if remap:
+        conn.executemany("UPDATE entity_relations SET entity_a_id = ? WHERE entity_a_id = ?", remap)
+        conn.executemany("UPDATE entity_relations SET entity_b_id = ? WHERE entity_b_id = ?", remap)
+        conn.executemany("UPDATE entity_mentions SET entity_id = ? WHERE entity_id = ?", remap)
+        conn.executemany("DELETE FROM entities WHERE id = ?", [(eid,) for _, eid in remap])
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_entities_name_type ON entities(name, type)")
+    conn.commit()
+
+
 def migrate_run_episodes_project_unique(conn: sqlite3.Connection) -> None:
     """
     Remove old UNIQUE(project_id) constraint on run_episodes.
@@ -1,12 +1,86 @@
 """Utility-ranked retrieval (MemRL-inspired): Laplace-smoothed utility scores on memories."""
+import os
 import sqlite3
+import threading
+import time
+from collections import OrderedDict
 
 from .common import utcnow
 
+_SQL_CHUNK = 500
+DEFAULT_UTILITY = 0.5
+
+
+def _ctx_key(context_key: str | None) -> str:
+    return str(context_key).strip().lower()[:180] if context_key else ""
+
+
+class UtilityCache:
+    """
+    In-process LRU of resolved utility scores: (memory_type, memory_id) -> {context_key: (score, expires_at)}.
+    Retrievals and update_from_outcome invalidate the touched ids; the TTL bounds staleness from other processes.
+    """
+
+    def __init__(self, max_items: int = 4096, ttl_s: float | None = None):
+        if ttl_s is None:
+            try:
+                ttl_s = float(os.environ.get("MEMORY_UTILITY_CACHE_TTL_S", "60"))
+            except ValueError:
+                ttl_s = 60.0
+        self.max_items = max_items
+        self.ttl_s = ttl_s
+        self._items: OrderedDict[tuple, dict[str, tuple[float, float]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, memory_type: str, memory_id: str, ctx: str) -> float | None:
+        with self._lock:
+            by_ctx = self._items.get((memory_type, memory_id))
+            if not by_ctx or ctx not in by_ctx:
+                return None
+            score, expires = by_ctx[ctx]
+            if expires < time.monotonic():
+                del by_ctx[ctx]
+                return None
+            self._items.move_to_end((memory_type, memory_id))
+            return score
+
+    def put(self, memory_type: str, memory_id: str, ctx: str, score: float) -> None:
+        if self.ttl_s <= 0:
+            return
+        with self._lock:
+            key = (memory_type, memory_id)
+            self._items.setdefault(key, {})[ctx] = (score, time.monotonic() + self.ttl_s)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate(self, memory_type: str, memory_ids: list[str]) -> None:
+        with self._lock:
+            for mid in memory_ids:
+                self._items.pop((memory_type, mid), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_caches: dict[str, UtilityCache] = {}
+_caches_lock = threading.Lock()
+
+
+def utility_cache(db_key: str) -> UtilityCache:
+    """Process-wide cache per DB, shared by all (short-lived) Memory instances on that DB."""
+    with _caches_lock:
+        cache = _caches.get(db_key)
+        if cache is None:
+            cache = _caches[db_key] = UtilityCache()
+        return cache
+
 
 class UtilityTracker:
-    def __init__(self, conn: sqlite3.Connection):
+    def __init__(self, conn: sqlite3.Connection, cache: UtilityCache | None = None):
         self._conn = conn
+        self._cache = cache
 
     def record_retrieval(self, memory_type: str, memory_id: str, context_key: str | None = None) -> None:
         """Called when a memory is retrieved for use in a project."""
@@ -30,6 +104,79 @@ class UtilityTracker:
                 (memory_type, memory_id, ck, utcnow(), utcnow()),
             )
         self._conn.commit()
+        if self._cache:
+            self._cache.invalidate(memory_type, [memory_id])
+
+    def record_retrievals(self, memory_type: str, memory_ids: list[str], context_key: str | None = None) -> None:
+        """record_retrieval for many memories: two executemany upserts, one commit."""
+        if not memory_ids:
+            return
+        now = utcnow()
+        self._conn.executemany(
+            """INSERT INTO memory_utility (memory_type, memory_id, utility_score, retrieval_count, helpful_count, last_updated)
+               VALUES (?, ?, 0.5, 1, 0, ?)
+               ON CONFLICT(memory_type, memory_id) DO UPDATE SET
+                   retrieval_count = retrieval_count + 1,
+                   last_updated = ?""",
+            [(memory_type, mid, now, now) for mid in memory_ids],
+        )
+        ck = _ctx_key(context_key)
+        if ck:
+            self._conn.executemany(
+                """INSERT INTO memory_utility_context
+                   (memory_type, memory_id, context_key, utility_score, retrieval_count, helpful_count, last_updated)
+                   VALUES (?, ?, ?, 0.5, 1, 0, ?)
+                   ON CONFLICT(memory_type, memory_id, context_key) DO UPDATE SET
+                     retrieval_count = retrieval_count + 1,
+                     last_updated = ?""",
+                [(memory_type, mid, ck, now, now) for mid in memory_ids],
+            )
+        self._conn.commit()
+        if self._cache:
+            self._cache.invalidate(memory_type, memory_ids)
+
+    def scores(self, memory_type: str, memory_ids: list[str], context_key: str | None = None) -> dict[str, float]:
+        """
+        Utility score per id with get()'s resolution (context row, else global row, else DEFAULT_UTILITY).
+        Cache misses are fetched with one IN (...) query per table instead of one or two SELECTs per id.
+        """
+        ck = _ctx_key(context_key)
+        out: dict[str, float] = {}
+        missing: list[str] = []
+        for mid in dict.fromkeys(memory_ids):
+            cached = self._cache.get(memory_type, mid, ck) if self._cache else None
+            if cached is None:
+                missing.append(mid)
+            else:
+                out[mid] = cached
+        if missing:
+            found: dict[str, float] = {}
+            if ck:
+                found.update(self._fetch_scores(
+                    "SELECT memory_id, utility_score FROM memory_utility_context WHERE memory_type = ? AND context_key = ? AND memory_id IN ({})",
+                    (memory_type, ck), missing,
+                ))
+            rest = [m for m in missing if m not in found]
+            if rest:
+                found.update(self._fetch_scores(
+                    "SELECT memory_id, utility_score FROM memory_utility WHERE memory_type = ? AND memory_id IN ({})",
+                    (memory_type,), rest,
+                ))
+            for mid in missing:
+                score = found.get(mid, DEFAULT_UTILITY)
+                out[mid] = score
+                if self._cache:
+                    self._cache.put(memory_type, mid, ck, score)
+        return out
+
+    def _fetch_scores(self, sql: str, params: tuple, ids: list[str]) -> dict[str, float]:
+        found: dict[str, float] = {}
+        for i in range(0, len(ids), _SQL_CHUNK):
+            chunk = ids[i:i + _SQL_CHUNK]
+            rows = self._conn.execute(sql.format(",".join("?" * len(chunk))), params + tuple(chunk)).fetchall()
+            for row in rows:
+                found[row[0]] = row[1]
+        return found
 
     def get_top_utility(self, memory_type: str | None = None, limit: int = 50) -> list[dict]:
         """Get the most helpful memories ranked by utility score."""
@@ -109,3 +256,5 @@ class UtilityTracker:
                         (chelpful, cscore, utcnow(), memory_type, mid, ck),
                     )
         self._conn.commit()
+        if self._cache:
+            self._cache.invalidate(memory_type, memory_ids)
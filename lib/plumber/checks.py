@@ -0,0 +1,391 @@
+# Plumber check runner: content-hash cache of clean checks, pooled compile / bash -n, batched import checks.
+#
+# plumber/check_cache.json remembers files that passed their last check, keyed by SHA-256 of the file
+# (for import checks: of the file, every local module it reaches through imports, and a fingerprint of the
+# tool interpreter's site-packages). Unchanged clean files are
+# skipped; files with issues are never cached and get rechecked every run. Compile checks run with
+# compile() in a process pool (in one child of the tool interpreter when that is a different Python),
+# bash -n in a thread pool, and import checks batched in child interpreters (per-module SIGALRM timeout;
+# a module that hangs, kills the child or changes sys.path / sys.meta_path / sys.modules ends the batch
+# and the rest continues in a fresh child). Modules that fail in a batch are rechecked alone, so an
+# error is never caused by another module's side effects.
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from . import constants
+
+CACHE_VERSION = 2
+
+_START = "@@plumber-start "
+_DONE = "@@plumber-done "
+
+# Runs in the child interpreter: argv = [timeout, module, ...]; results go to stdout as marker lines,
+# module output is redirected to stderr so it cannot interleave with them. The child exits after a
+# module with interpreter-wide side effects so they cannot hide another module's ImportError.
+_IMPORT_CHILD = r"""
+import contextlib, importlib, json, os, signal, sys, traceback
+
+class _Timeout(BaseException):
+    pass
+
+def _alarm(*_):
+    raise _Timeout()
+
+signal.signal(signal.SIGALRM, _alarm)
+def _state():
+    # tools put the repo root on sys.path themselves; only new locations count
+    return set(os.path.realpath(p or ".") for p in sys.path), list(sys.meta_path)
+
+def _real(name):
+    return getattr(sys.modules.get(name), "__spec__", None) is not None
+
+def _stubbed(before):
+    # modules put into sys.modules by hand (no import spec) rather than imported; submodules that a real
+    # package creates itself (typing.io) do not count
+    return any(getattr(m, "__spec__", None) is None and getattr(m, "__file__", None) is None
+               and not ("." in k and _real(k.split(".")[0]))
+               for k, m in list(sys.modules.items()) if k not in before and k not in sys.builtin_module_names)
+
+timeout = int(sys.argv[1])
+out = sys.stdout
+for name in sys.argv[2:]:
+    state, before = _state(), set(sys.modules)
+    out.write("@@plumber-start " + name + "\n")
+    out.flush()
+    res = {"module": name, "error": None, "timeout": False}
+    signal.alarm(timeout)
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            importlib.import_module("tools." + name)
+    except _Timeout:
+        res["timeout"] = True
+    except BaseException:
+        res["error"] = traceback.format_exc()
+    finally:
+        signal.alarm(0)
+    res["side_effects"] = _state() != state or _stubbed(before)
+    out.write("@@plumber-done " + json.dumps(res) + "\n")
+    out.flush()
+    if res["side_effects"]:
+        break
+sys.stderr.flush()
+os._exit(0)
+"""
+
+
+def file_sha(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def tool_python() -> str:
+    venv_python = constants.VENV / "bin" / "python3"
+    return str(venv_python) if venv_python.exists() else "python3"
+
+
+def stamp(python: str) -> str:
+    """Cache is invalidated when the checking interpreters change (venv rebuilt, Python upgraded)."""
+    try:
+        mtime = os.stat(python).st_mtime_ns if os.path.isabs(python) else 0
+    except OSError:
+        mtime = 0
+    return f"{python}|{mtime}|{sys.version_info[0]}.{sys.version_info[1]}"
+
+
+# Runs in the tool interpreter: prints its site-packages directories as JSON.
+_SITE_CHILD = "import json, sys; print(json.dumps([p for p in sys.path if p.endswith(('site-packages', 'dist-packages'))]))"
+
+
+def site_dirs(python: str) -> list[str]:
+    """site-packages / dist-packages directories on the tool interpreter's sys.path."""
+    if (shutil.which(python) or python) == sys.executable:
+        return [p for p in sys.path if p.endswith(("site-packages", "dist-packages"))]
+    try:
+        proc = subprocess.run([python, "-c", _SITE_CHILD], capture_output=True, text=True, timeout=30)
+        dirs = json.loads(proc.stdout or "[]")
+    except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError):
+        return []
+    return [d for d in dirs if isinstance(d, str)]
+
+
+def site_fingerprint(python: str) -> str:
+    """Hash of the site-packages listings: installing, upgrading or removing a package adds, renames
+    or removes its dist-info entry, so import results cached before that are no longer trusted."""
+    h = hashlib.sha256()
+    for d in site_dirs(python):
+        try:
+            names = sorted(os.listdir(d))
+            mtime = os.stat(d).st_mtime_ns
+        except OSError:
+            continue
+        h.update(f"{d}\0{mtime}\0".encode())
+        h.update("\0".join(names).encode())
+    return h.hexdigest()
+
+
+def load_cache(key: str) -> dict:
+    try:
+        data = json.loads(constants.CHECK_CACHE.read_text())
+        if data.get("version") == CACHE_VERSION and data.get("stamp") == key and isinstance(data.get("entries"), dict):
+            return data["entries"]
+    except (json.JSONDecodeError, OSError, AttributeError):
+        pass
+    return {}
+
+
+def save_cache(key: str, entries: dict) -> None:
+    try:
+        constants.CHECK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = constants.CHECK_CACHE.with_name(f"{constants.CHECK_CACHE.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "stamp": key, "entries": entries}))
+        tmp.replace(constants.CHECK_CACHE)
+    except OSError:
+        pass
+
+
+def _resolve_local(module: str, base: Path) -> Path | None:
+    parts = module.split(".")
+    if parts[0] not in ("tools", "lib"):
+        candidate = base / "tools" / f"{parts[0]}.py"
+        return candidate if candidate.exists() else None
+    path = base.joinpath(*parts)
+    for candidate in (path.with_suffix(".py"), path / "__init__.py"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _resolve_relative(node: ast.ImportFrom, path: Path) -> list[Path]:
+    pkg = path.parent
+    for _ in range(node.level - 1):
+        pkg = pkg.parent
+    target = pkg.joinpath(*node.module.split(".")) if node.module else pkg
+    candidates = [target / "__init__.py"] + ([target.with_suffix(".py")] if node.module else [])
+    for a in node.names:
+        candidates += [target / f"{a.name}.py", target / a.name / "__init__.py"]
+    return [c for c in candidates if c.exists()]
+
+
+def _local_imports(tree: ast.AST, base: Path, path: Path | None = None) -> list[str]:
+    """Files of repo modules (tools.*, lib.*, sibling tools) imported directly by a module; relative
+    imports are resolved when the module's path is given."""
+    deps: set[str] = set()
+    for node in ast.walk(tree):
+        names: list[str] = []
+        if isinstance(node, ast.Import):
+            names = [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level:
+            if path is not None:
+                deps.update(str(c) for c in _resolve_relative(node, path))
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names = [node.module] + [f"{node.module}.{a.name}" for a in node.names]
+        for name in names:
+            resolved = _resolve_local(name, base)
+            if resolved is not None:
+                deps.add(str(resolved))
+    return sorted(deps)
+
+
+def file_deps(path: Path, base: Path) -> list[str]:
+    """_local_imports of a file that is not compile-checked itself (lib modules, tools subpackages)."""
+    try:
+        return _local_imports(ast.parse(path.read_bytes(), str(path)), base, path)
+    except (OSError, SyntaxError, ValueError):
+        return []
+
+
+def _package_inits(path: Path, base: Path) -> list[str]:
+    """__init__.py files of the packages containing path (importing a module executes them)."""
+    inits = []
+    pkg = path.parent
+    while pkg != base and base in pkg.parents:
+        init = pkg / "__init__.py"
+        if init.exists():
+            inits.append(str(init))
+        pkg = pkg.parent
+    return inits
+
+
+def local_closure(path: str, deps_of, base: Path) -> list[str]:
+    """Every repo file importing path executes: its local imports, theirs, and so on, plus package
+    __init__ files. deps_of(file) gives a file's direct local imports."""
+    seen = {path}
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        for dep in [*deps_of(current), *_package_inits(Path(current), base)]:
+            if dep not in seen:
+                seen.add(dep)
+                stack.append(dep)
+    seen.discard(path)
+    return sorted(seen)
+
+
+def compile_check(path_str: str, base_str: str) -> dict:
+    """In-process replacement for `python -m py_compile`; also returns the file's local imports."""
+    path = Path(path_str)
+    try:
+        source = path.read_bytes()
+    except OSError as e:
+        return {"file": path_str, "sha": None, "error": f"compile check failed: {e}", "deps": []}
+    sha = hashlib.sha256(source).hexdigest()
+    try:
+        tree = compile(source, path_str, "exec", flags=ast.PyCF_ONLY_AST, dont_inherit=True)
+        compile(tree, path_str, "exec", dont_inherit=True)
+    except (SyntaxError, ValueError) as e:
+        return {"file": path_str, "sha": sha, "error": "".join(traceback.format_exception_only(type(e), e)).strip(), "deps": []}
+    return {"file": path_str, "sha": sha, "error": None, "deps": _local_imports(tree, Path(base_str), path)}
+
+
+# Runs in the tool interpreter: argv = files; prints {file: error or null} as JSON.
+_COMPILE_CHILD = r"""
+import json, sys, traceback
+res = {}
+for path in sys.argv[1:]:
+    try:
+        with open(path, "rb") as f:
+            compile(f.read(), path, "exec", dont_inherit=True)
+        res[path] = None
+    except (SyntaxError, ValueError) as e:
+        res[path] = "".join(traceback.format_exception_only(type(e), e)).strip()
+    except OSError as e:
+        res[path] = "compile check failed: %s" % e
+print(json.dumps(res))
+"""
+
+
+def same_interpreter(python: str) -> bool:
+    """True when python is the binary running the plumber (a venv python links to its base binary);
+    compile results then match the tool interpreter exactly."""
+    resolved = shutil.which(python) or python
+    return os.path.realpath(resolved) == os.path.realpath(sys.executable)
+
+
+def compile_in(python: str, paths: list[Path], base: str) -> list[dict]:
+    """compile_check results with the syntax check done by the given interpreter (its Python version
+    decides what is valid); the local-import scan stays in-process."""
+    args = [str(p) for p in paths]
+    try:
+        proc = subprocess.run([python, "-c", _COMPILE_CHILD, *args], capture_output=True, text=True,
+                              timeout=60 + len(args), cwd=base)
+        errors = json.loads(proc.stdout or "{}")
+    except (OSError, subprocess.TimeoutExpired, json.JSONDecodeError):
+        return [compile_check(a, base) for a in args]  # tool interpreter unusable: check with this one
+    out = []
+    for a in args:
+        try:
+            source = Path(a).read_bytes()
+        except OSError as e:
+            out.append({"file": a, "sha": None, "error": f"compile check failed: {e}", "deps": []})
+            continue
+        sha = hashlib.sha256(source).hexdigest()
+        if a not in errors or errors[a]:
+            out.append({"file": a, "sha": sha, "error": errors.get(a) or "compile check failed", "deps": []})
+            continue
+        try:
+            deps = _local_imports(ast.parse(source, a), Path(base), Path(a))
+        except (SyntaxError, ValueError):
+            deps = []  # syntax newer than this interpreter: no dependency keys
+        out.append({"file": a, "sha": sha, "error": None, "deps": deps})
+    return out
+
+
+def compile_many(paths: list[Path], workers: int | None = None, python: str | None = None) -> list[dict]:
+    workers = constants.CHECK_WORKERS if workers is None else workers
+    args = [str(p) for p in paths]
+    base = str(constants.BASE)
+    if python and args and not same_interpreter(python):
+        return compile_in(python, paths, base)
+    if workers > 1 and len(args) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(args))) as pool:
+                chunk = max(1, len(args) // (workers * 4))
+                return list(pool.map(compile_check, args, [base] * len(args), chunksize=chunk))
+        except (OSError, RuntimeError):
+            pass  # no process pool available here (e.g. restricted sandbox): check inline
+    return [compile_check(a, base) for a in args]
+
+
+def import_check_batch(python: str, modules: list[str], timeout: int | None = None) -> dict[str, dict]:
+    """Import tools.<module> for every module in as few child interpreters as possible. Returns module ->
+    result dict ({"error": traceback or None, "timeout": bool}). A module that failed after other
+    modules were imported into the same child is rechecked in an interpreter of its own."""
+    timeout = constants.IMPORT_CHECK_TIMEOUT if timeout is None else timeout
+    results: dict[str, dict] = {}
+    isolated: set[str] = set()  # checked first in a fresh child
+    pending = list(modules)
+    while pending:
+        isolated.add(pending[0])
+        timed_out = False
+        try:
+            proc = subprocess.run(
+                [python, "-c", _IMPORT_CHILD, str(timeout), *pending],
+                capture_output=True, text=True, timeout=timeout * len(pending) + 10,
+                cwd=str(constants.BASE),
+                env={**os.environ, "PYTHONPATH": str(constants.BASE)},
+            )
+            stdout, stderr = proc.stdout or "", proc.stderr or ""
+        except subprocess.TimeoutExpired as e:
+            timed_out = True
+            stdout, stderr = e.stdout or "", e.stderr or ""
+            if isinstance(stdout, bytes):
+                stdout = stdout.decode(errors="replace")
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode(errors="replace")
+        except OSError as e:
+            for name in pending:
+                results[name] = {"error": f"import check failed: {e}", "timeout": False}
+            return results
+        current = None
+        for line in stdout.splitlines():
+            if line.startswith(_START):
+                current = line[len(_START):]
+            elif line.startswith(_DONE):
+                try:
+                    res = json.loads(line[len(_DONE):])
+                except json.JSONDecodeError:
+                    continue
+                results[res["module"]] = {"error": res.get("error"), "timeout": bool(res.get("timeout"))}
+                current = None
+        if current is not None:
+            # child died (os._exit, segfault) or hung inside this module
+            results[current] = {"error": None if timed_out else stderr.strip()[-300:], "timeout": timed_out}
+        remaining = [m for m in pending if m not in results]
+        if len(remaining) == len(pending):
+            for name in remaining:  # child never got going: report once instead of looping
+                results[name] = {"error": stderr.strip()[-300:], "timeout": timed_out}
+            break
+        pending = remaining
+    for name, res in list(results.items()):
+        if res["error"] and name not in isolated:
+            results[name] = import_check_batch(python, [name], timeout).get(name, res)
+    return results
+
+
+def shell_check_many(scripts: list[Path], check, workers: int | None = None) -> list[dict]:
+    """Run check(script) (bash -n) for every script in a thread pool; results keep the input order."""
+    workers = constants.CHECK_WORKERS if workers is None else workers
+    if workers <= 1 or len(scripts) <= 1:
+        return [check(s) for s in scripts]
+    with ThreadPoolExecutor(max_workers=min(workers, len(scripts))) as pool:
+        return list(pool.map(check, scripts))
+
+
+def import_key(sha: str, deps: list[str], dep_sha, site: str = "") -> str:
+    """Key of a clean import: the file, all local modules it reaches (local_closure) and site_fingerprint."""
+    h = hashlib.sha256(f"{sha}\0{site}".encode())
+    for dep in deps:
+        h.update(f"\0{dep}\0{dep_sha(dep) or ''}".encode())
+    return h.hexdigest()
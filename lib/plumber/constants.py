@@ -61,3 +61,10 @@ LLM_FIX_ENABLED = os.environ.get("PLUMBER_LLM_FIX", "0") in ("1", "true", "yes")
 LLM_FIX_MAX_DIFF_LINES = 50
 LLM_FIX_MAX_ATTEMPTS_PER_FILE = 1
 LLM_FIX_MODEL = os.environ.get("PLUMBER_LLM_MODEL", "codex-5.3")
+
+CHECK_CACHE = PLUMBER_DIR / "check_cache.json"
+IMPORT_CHECK_TIMEOUT = 15
+try:
+    CHECK_WORKERS = int(os.environ.get("PLUMBER_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+except ValueError:
+    CHECK_WORKERS = min(8, os.cpu_count() or 1)
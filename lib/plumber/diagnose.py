@@ -1,7 +1,6 @@
 # Plumber diagnostics: shell, repeated failures, Python tools, dependencies, tool refs, processes, venv.
 from __future__ import annotations
 
-import json
 import os
 import re
 import subprocess
@@ -9,6 +8,7 @@ import sys
 from collections import Counter
 from pathlib import Path
 
+from . import checks
 from . import constants
 
 
@@ -30,25 +30,49 @@ def diagnose_shell_syntax(script_path: Path) -> dict:
     }
 
 
+def diagnose_shell_scripts(scripts: list[Path], use_cache: bool = True) -> list[dict]:
+    """diagnose_shell_syntax for many scripts: unchanged scripts that passed last time are skipped,
+    the rest run bash -n in parallel. Results keep the order of `scripts`."""
+    stamp = checks.stamp(checks.tool_python())
+    cache = checks.load_cache(stamp) if use_cache else {}
+    shas = {str(s): checks.file_sha(s) for s in scripts}
+    todo = [s for s in scripts if not shas[str(s)] or cache.get(str(s), {}).get("sha") != shas[str(s)]]
+    checked = dict(zip((str(s) for s in todo), checks.shell_check_many(todo, diagnose_shell_syntax)))
+    out = []
+    for script in scripts:
+        key = str(script)
+        diag = checked.get(key) or {"ok": True, "script": key}
+        if key in checked:
+            if diag["ok"] and shas[key]:
+                cache[key] = {"sha": shas[key]}
+            else:
+                cache.pop(key, None)
+        out.append(diag)
+    if use_cache and todo:
+        checks.save_cache(stamp, {k: v for k, v in cache.items() if os.path.exists(k)})
+    return out
+
+
 def diagnose_repeated_failures(limit: int = 15) -> list[dict]:
     failures: dict[str, list[dict]] = {}
     if not constants.JOBS.exists():
         return []
-    job_files = sorted(constants.JOBS.glob("*/*/job.json"), reverse=True)[:limit * 3]
-    for f in job_files:
-        try:
-            j = json.loads(f.read_text())
-            if j.get("status") != "FAILED":
-                continue
-            wf = j.get("workflow_id", "unknown")
-            failures.setdefault(wf, []).append({
+    try:
+        from lib.job_index import open_index
+        with open_index(constants.JOBS) as index:
+            by_workflow = index.failures_by_workflow(window=limit * 3)
+    except Exception:
+        return []
+    for wf, jobs in by_workflow.items():
+        failures[wf] = [
+            {
                 "job_id": j.get("id"),
                 "error": (j.get("error") or "")[:200],
                 "duration_s": j.get("duration_s"),
-                "job_dir": str(f.parent),
-            })
-        except (json.JSONDecodeError, OSError):
-            continue
+                "job_dir": str(d),
+            }
+            for d, j in jobs
+        ]
     result = []
     for wf, fails in failures.items():
         if len(fails) >= 2:
@@ -109,59 +133,90 @@ def _get_stdlib_modules() -> list[str]:
     ]
 
 
-def diagnose_python_tools() -> list[dict]:
+def diagnose_python_tools(use_cache: bool = True) -> list[dict]:
     issues = []
     if not constants.TOOLS.exists():
         return issues
-    python = str(constants.VENV / "bin" / "python3") if (constants.VENV / "bin" / "python3").exists() else "python3"
-    for py_file in sorted(constants.TOOLS.glob("*.py")):
-        try:
-            r = subprocess.run(
-                [python, "-m", "py_compile", str(py_file)],
-                capture_output=True, text=True, timeout=10,
-            )
-            if r.returncode != 0:
-                issues.append({
-                    "file": str(py_file),
-                    "check": "compile",
-                    "severity": constants.CRITICAL,
-                    "error": (r.stderr or "").strip()[:300],
-                })
-                continue
-        except Exception as e:
+    python = checks.tool_python()
+    stamp = checks.stamp(python)
+    cache = checks.load_cache(stamp) if use_cache else {}
+    tool_files = sorted(constants.TOOLS.glob("*.py"))
+    order = {str(p): i for i, p in enumerate(tool_files)}
+    shas: dict[str, str | None] = {}
+
+    def sha_of(path: str) -> str | None:
+        if path not in shas:
+            shas[path] = checks.file_sha(Path(path))
+        return shas[path]
+
+    entries: dict[str, dict] = {}
+    to_compile = []
+    for py_file in tool_files:
+        key = str(py_file)
+        cached = cache.get(key)
+        if cached and cached.get("sha") and cached.get("sha") == sha_of(key):
+            entries[key] = cached
+        else:
+            to_compile.append(py_file)
+    for res in checks.compile_many(to_compile, python=python):
+        if res["error"]:
             issues.append({
-                "file": str(py_file),
+                "file": res["file"],
                 "check": "compile",
-                "severity": constants.WARNING,
-                "error": f"compile check failed: {e}",
+                "severity": constants.WARNING if res["sha"] is None else constants.CRITICAL,
+                "error": res["error"][:300],
             })
             continue
-        module_name = py_file.stem
-        try:
-            r = subprocess.run(
-                [python, "-c", f"import importlib; importlib.import_module('tools.{module_name}')"],
-                capture_output=True, text=True, timeout=15,
-                cwd=str(constants.BASE),
-                env={**os.environ, "PYTHONPATH": str(constants.BASE)},
-            )
-            if r.returncode != 0:
-                stderr = (r.stderr or "").strip()
-                if "ModuleNotFoundError" in stderr or "ImportError" in stderr or "SyntaxError" in stderr:
-                    issues.append({
-                        "file": str(py_file),
-                        "check": "import",
-                        "severity": constants.CRITICAL if "ModuleNotFoundError" in stderr else constants.WARNING,
-                        "error": stderr[:300],
-                    })
-        except subprocess.TimeoutExpired:
+        shas[res["file"]] = res["sha"]
+        entries[res["file"]] = {"sha": res["sha"], "deps": res["deps"]}
+
+    # Import keys cover every local module a tool reaches; dep lists of non-tool modules are cached by sha.
+    base = constants.BASE
+    dep_lists: dict[str, list[str]] = {f: e.get("deps", []) for f, e in entries.items()}
+    module_deps: dict[str, dict] = {}
+
+    def deps_of(path: str) -> list[str]:
+        if path not in dep_lists:
+            sha, cached = sha_of(path), cache.get(path) or {}
+            if path not in order and sha and cached.get("module_sha") == sha:
+                dep_lists[path] = cached.get("deps", [])
+            else:
+                dep_lists[path] = checks.file_deps(Path(path), base)
+            if path not in order and sha:
+                module_deps[path] = {"module_sha": sha, "deps": dep_lists[path]}
+        return dep_lists[path]
+
+    site = checks.site_fingerprint(python)
+    import_keys = {f: checks.import_key(e["sha"], checks.local_closure(f, deps_of, base), sha_of, site)
+                   for f, e in entries.items()}
+    to_import = [f for f, e in entries.items() if e.get("import_key") != import_keys[f]]
+    modules = {Path(f).stem: f for f in to_import}
+    results = checks.import_check_batch(python, sorted(modules)) if modules else {}
+    for module_name, res in results.items():
+        py_file = modules[module_name]
+        stderr = (res.get("error") or "").strip()
+        if res.get("timeout"):
             issues.append({
-                "file": str(py_file),
+                "file": py_file,
                 "check": "import",
                 "severity": constants.WARNING,
-                "error": "import timed out (>15s) — possible side effect at import time",
+                "error": f"import timed out (>{constants.IMPORT_CHECK_TIMEOUT}s) — possible side effect at import time",
             })
-        except Exception:
-            pass
+        elif "ModuleNotFoundError" in stderr or "ImportError" in stderr or "SyntaxError" in stderr:
+            issues.append({
+                "file": py_file,
+                "check": "import",
+                "severity": constants.CRITICAL if "ModuleNotFoundError" in stderr else constants.WARNING,
+                "error": stderr[:300],
+            })
+        elif not stderr:
+            entries[py_file]["import_key"] = import_keys[py_file]
+    if use_cache:
+        kept = {k: v for k, v in cache.items() if not k.endswith(".py")}
+        kept.update(module_deps)
+        kept.update(entries)
+        checks.save_cache(stamp, kept)
+    issues.sort(key=lambda i: (order.get(i["file"], len(order)), i["check"] != "compile"))
     return issues
 
 
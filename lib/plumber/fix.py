@@ -427,18 +427,13 @@ def rollback_if_still_failing(patch_meta_path: Path) -> dict | None:
         return None
     post_fix_failures = 0
     if constants.JOBS.exists():
-        for job_file in sorted(constants.JOBS.glob("*/*/job.json"), reverse=True)[:20]:
-            try:
-                j = json.loads(job_file.read_text())
-                if j.get("workflow_id") != wf_name:
-                    continue
-                if j.get("status") != "FAILED":
-                    continue
-                job_ts = j.get("created_at", "")
-                if job_ts > created:
-                    post_fix_failures += 1
-            except (json.JSONDecodeError, OSError):
-                continue
+        try:
+            from lib.job_index import open_index
+            with open_index(constants.JOBS) as index:
+                recent_failed = index.failures_by_workflow(window=20, workflow_id=wf_name).get(wf_name, [])
+        except Exception:
+            recent_failed = []
+        post_fix_failures = sum(1 for _d, j in recent_failed if j.get("created_at", "") > created)
     if post_fix_failures >= 2:
         patch_file = meta.get("patch_file", "")
         if patch_file:
@@ -40,8 +40,8 @@ def run_plumber(
 
     cat_shell = {"status": "clean", "issues": []}
     if constants.WORKFLOWS.exists():
-        for script in sorted(constants.WORKFLOWS.glob("*.sh")):
-            diag = diagnose.diagnose_shell_syntax(script)
+        scripts = sorted(constants.WORKFLOWS.glob("*.sh"))
+        for script, diag in zip(scripts, diagnose.diagnose_shell_scripts(scripts)):
             if not diag["ok"]:
                 issues_found += 1
                 fix_result = fix.fix_shell_syntax(script, governance_level)
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for lib/memory (temp DB, no OPERATOR_ROOT state touched).
+
+Usage:
+  python3 scripts/bench_memory.py writes [--rows N]
+    Rows/sec for per-row writes (commit per row) vs Memory.batch() + bulk variants.
+  python3 scripts/bench_memory.py startup [--sizes 0,1000,10000,50000] [--opens N]
+    Memory() open time as the DB grows: full schema+migrations (pre-versioning behaviour)
+    vs versioned open vs read_only fast open.
+  python3 scripts/bench_memory.py contention [--writers 4] [--readers 4] [--ops 200]
+    N writer + M reader processes on one DB. "legacy" = connection + full schema per open,
+    default pragmas, commit per row; "pooled" = tuned pragmas, pooled connections, read-only
+    readers. Reports wall time, ops/s and "database is locked" errors.
+  python3 scripts/bench_memory.py strategy [--strategies 20] [--episodes 1000] [--calls 50]
+    select_strategy latency: features recomputed on every call (per-candidate queries, as before
+    materialisation) vs materialised strategy_features.
+  python3 scripts/bench_memory.py read_urls [--sizes 1000,10000,50000] [--lookups 50]
+    Similar-question read-URL lookup as the history grows: full signature scan + Python Jaccard
+    (previous behaviour, uncapped) vs the token inverted index.
+  python3 scripts/bench_memory.py graph [--relations 100000] [--entities 20000] [--projects 20]
+    Transitive-pattern query for one project: three-way self-join without / with the relation
+    indexes vs the cached per-project adjacency graph (cold build and warm).
+"""
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from lib.memory import Memory
+from lib.memory.connection import connect
+from lib.memory.episodes import Episodes
+from lib.memory.schema import apply_schema
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def _graph_rows(n: int, tag: str) -> tuple[list[dict], list[dict]]:
+    entities = [{"name": f"{tag}-entity-{i % (n // 3 or 1)}", "type": "concept", "first_seen_project": "proj-bench"} for i in range(n)]
+    findings = [
+        {"project_id": "proj-bench", "finding_key": f"{tag}-f{i}", "content_preview": f"finding {i} " * 20, "admission_state": "accepted"}
+        for i in range(n)
+    ]
+    return entities, findings
+
+
+def bench_writes(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        mem = Memory(db_path=Path(tmp) / "bench.db")
+        entities, findings = _graph_rows(rows, "row")
+
+        def per_row():
+            for e in entities:
+                eid = mem.get_or_create_entity(e["name"], e["type"], None, e["first_seen_project"])
+                mem.insert_entity_mention(eid, "proj-bench", "key", "snippet")
+            for f in findings:
+                mem.insert_research_finding(**f)
+
+        entities_b, findings_b = _graph_rows(rows, "bulk")
+
+        def bulk():
+            with mem.batch():
+                ids = mem.get_or_create_entities_bulk(entities_b)
+                mem.insert_mentions_bulk(
+                    [{"entity_id": eid, "project_id": "proj-bench", "finding_key": "key", "context_snippet": "snippet"} for eid in ids]
+                )
+                mem.insert_research_findings_bulk(findings_b)
+
+        t_row = _timed(per_row)
+        t_bulk = _timed(bulk)
+        mem.close()
+    total = rows * 3  # entity lookup/create + mention + finding per input row
+    print(f"per-row : {t_row * 1000:9.1f} ms  {total / t_row:10.0f} rows/s")
+    print(f"batched : {t_bulk * 1000:9.1f} ms  {total / t_bulk:10.0f} rows/s  ({t_row / t_bulk:.1f}x)")
+
+
+def _open_legacy(db: Path) -> None:
+    conn = connect(str(db))
+    apply_schema(conn)
+    conn.close()
+
+
+def _avg_ms(fn, n: int) -> float:
+    return sum(_timed(fn) for _ in range(n)) / n * 1000
+
+
+def bench_startup(sizes: list[int], opens: int) -> None:
+    print(f"{'findings':>9}  {'full migrate':>13}  {'versioned':>10}  {'read_only':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "bench.db"
+        Memory(db_path=db).close()
+        have = 0
+        for size in sizes:
+            if size > have:
+                mem = Memory(db_path=db)
+                with mem.batch():
+                    mem.insert_research_findings_bulk([
+                        {"project_id": f"proj-{i % 50}", "finding_key": f"k{i}", "content_preview": f"finding {i} " * 30}
+                        for i in range(have, size)
+                    ])
+                mem.close()
+                have = size
+            legacy = _avg_ms(lambda: _open_legacy(db), opens)
+            versioned = _avg_ms(lambda: Memory(db_path=db).close(), opens)
+            read_only = _avg_ms(lambda: Memory(db_path=db, read_only=True).close(), opens)
+            print(f"{size:>9}  {legacy:>10.2f} ms  {versioned:>7.2f} ms  {read_only:>7.2f} ms")
+
+
+def _legacy_conn(db: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db), timeout=1.0)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    apply_schema(conn)
+    return conn
+
+
+def _contention_worker(args) -> tuple[int, int]:
+    mode, role, db, ops, wid = args
+    done = locked = 0
+    for i in range(ops):
+        try:
+            if mode == "legacy":
+                conn = _legacy_conn(db)
+                if role == "writer":
+                    Episodes(conn).record("bench", f"w{wid}-{i}")
+                else:
+                    conn.execute("SELECT * FROM episodes ORDER BY ts DESC LIMIT 20").fetchall()
+                conn.close()
+            else:
+                if role == "writer":
+                    with Memory(db_path=db) as mem:
+                        mem.record_episode("bench", f"w{wid}-{i}")
+                else:
+                    with Memory(db_path=db, read_only=True) as mem:
+                        mem.recent_episodes(limit=20)
+            done += 1
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+    return done, locked
+
+
+def bench_contention(writers: int, readers: int, ops: int) -> None:
+    ctx = multiprocessing.get_context("fork")
+    for mode in ("legacy", "pooled"):
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Path(tmp) / "bench.db"
+            mem = Memory(db_path=db)
+            with mem.batch():
+                mem.insert_research_findings_bulk([
+                    {"project_id": "proj-bench", "finding_key": f"k{i}", "content_preview": f"finding {i} " * 30}
+                    for i in range(5000)
+                ])
+            mem.close()
+            jobs = [(mode, "writer", db, ops, w) for w in range(writers)] + [(mode, "reader", db, ops, r) for r in range(readers)]
+            t0 = time.perf_counter()
+            with ctx.Pool(len(jobs)) as pool:
+                results = pool.map(_contention_worker, jobs)
+            wall = time.perf_counter() - t0
+        done = sum(r[0] for r in results)
+        locked = sum(r[1] for r in results)
+        print(f"{mode:>7}: {wall * 1000:8.0f} ms  {done / wall:8.0f} ops/s  locked errors: {locked}")
+
+
+def bench_strategy(strategies: int, episodes: int, calls: int) -> None:
+    import random
+    rnd = random.Random(7)
+    words = "clinical trial safety vaccine equity valuation market battery grid storage policy cost supply chain".split()
+    domains = ["medical", "finance", "energy", "general"]
+    with tempfile.TemporaryDirectory() as tmp:
+        mem = Memory(db_path=Path(tmp) / "bench.db")
+        with mem.batch():
+            sids = [
+                mem.upsert_strategy_profile(f"s{i}", domains[i % len(domains)], {"focus": " ".join(rnd.sample(words, 4))}, score=rnd.random())
+                for i in range(strategies)
+            ]
+            for j in range(episodes):
+                mem.record_run_episode(
+                    project_id=f"proj-{j}", question=" ".join(rnd.sample(words, 5)), domain=rnd.choice(domains), status="done",
+                    critic_score=rnd.random(), what_helped=[rnd.choice(words)], what_hurt=[rnd.choice(words)],
+                    strategy_profile_id=rnd.choice(sids),
+                )
+        questions = [(" ".join(rnd.sample(words, 5)), rnd.choice(domains)) for _ in range(calls)]
+
+        def cold():
+            for q, d in questions:
+                mem._conn.execute("DELETE FROM strategy_features")
+                mem.select_strategy(q, d)
+
+        def warm():
+            for q, d in questions:
+                mem.select_strategy(q, d)
+
+        t_cold = _timed(cold)
+        mem.refresh_strategy_features()
+        t_warm = _timed(warm)
+        mem.close()
+    print(f"recomputed  : {t_cold / calls * 1000:8.2f} ms/select")
+    print(f"materialised: {t_warm / calls * 1000:8.2f} ms/select  ({t_cold / t_warm:.1f}x)")
+
+
+def _legacy_similar_signatures(conn, question: str, threshold: float = 0.6) -> list[str]:
+    from lib.memory.memory_v2 import _question_signature
+    sig = _question_signature(question)
+    tokens = set(sig.split())
+    out = []
+    for row in conn.execute("SELECT DISTINCT question_signature FROM read_urls WHERE question_signature != ''"):
+        other = set(row[0].split())
+        if row[0] != sig and len(tokens & other) / len(tokens | other) >= threshold:
+            out.append(row[0])
+    return out
+
+
+def bench_read_urls(sizes: list[int], lookups: int) -> None:
+    import random
+    rnd = random.Random(11)
+    vocab = [f"term{i}" for i in range(3000)]
+
+    def question() -> str:
+        return " ".join(rnd.sample(vocab, rnd.randint(4, 9)))
+
+    print(f"{'questions':>9}  {'scan':>10}  {'indexed':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        mem = Memory(db_path=Path(tmp) / "bench.db")
+        have = 0
+        for size in sizes:
+            with mem.batch():
+                for i in range(have, size):
+                    mem.record_read_urls(question(), [f"https://example.com/{i}"])
+            have = size
+            probes = [question() for _ in range(lookups)]
+            scan = _avg_ms(lambda: [_legacy_similar_signatures(mem._conn, q) for q in probes], 1) / lookups
+            indexed = _avg_ms(lambda: [mem.get_read_urls_for_question(q) for q in probes], 1) / lookups
+            print(f"{size:>9}  {scan:>7.2f} ms  {indexed:>7.2f} ms")
+        mem.close()
+
+
+_TRANSITIVE_SQL = """
+    SELECT r1.entity_a_id, r2.entity_b_id
+    FROM entity_relations r1
+    JOIN entity_relations r2 ON r1.entity_b_id = r2.entity_a_id
+    LEFT JOIN entity_relations r3 ON r3.entity_a_id = r1.entity_a_id AND r3.entity_b_id = r2.entity_b_id
+    JOIN entities e1 ON e1.id = r1.entity_a_id
+    JOIN entities e2 ON e2.id = r1.entity_b_id
+    JOIN entities e3 ON e3.id = r2.entity_b_id
+    WHERE r1.source_project = ? AND r2.source_project = ? AND r3.id IS NULL
+    ORDER BY r1.created_at DESC
+    LIMIT 20
+"""
+_RELATION_INDEXES = {
+    "idx_entity_relations_project": "entity_relations(source_project, entity_a_id)",
+    "idx_entity_relations_pair": "entity_relations(entity_a_id, entity_b_id)",
+    "idx_entity_relations_b": "entity_relations(entity_b_id)",
+}
+
+
+def bench_graph(relations: int, entities: int, projects: int) -> None:
+    import random
+    from lib.memory import entities as entities_mod
+    rnd = random.Random(5)
+    with tempfile.TemporaryDirectory() as tmp:
+        mem = Memory(db_path=Path(tmp) / "bench.db")
+        with mem.batch():
+            ids = mem.get_or_create_entities_bulk([{"name": f"entity-{i}", "type": "concept"} for i in range(entities)])
+            mem.insert_entity_relations_bulk([
+                {"entity_a_id": rnd.choice(ids), "entity_b_id": rnd.choice(ids), "relation_type": "related",
+                 "source_project": f"proj-{rnd.randrange(projects)}"}
+                for _ in range(relations)
+            ])
+        conn = mem._conn
+        for name in _RELATION_INDEXES:
+            conn.execute(f"DROP INDEX {name}")
+        t_legacy = _timed(lambda: conn.execute(_TRANSITIVE_SQL, ("proj-0", "proj-0")).fetchall())
+        for name, cols in _RELATION_INDEXES.items():
+            conn.execute(f"CREATE INDEX {name} ON {cols}")
+        conn.execute("ANALYZE")
+        t_indexed = _timed(lambda: conn.execute(_TRANSITIVE_SQL, ("proj-0", "proj-0")).fetchall())
+        entities_mod._graph_cache.clear()
+        both = lambda: (mem.entity_two_hop_paths("proj-0"), mem.entity_degree_ranking("proj-0"))
+        t_cold = _timed(both)
+        t_warm = _timed(both)
+        mem.close()
+    print(f"self-join, no indexes : {t_legacy * 1000:9.1f} ms")
+    print(f"self-join, indexed    : {t_indexed * 1000:9.1f} ms")
+    print(f"adjacency graph, cold : {t_cold * 1000:9.1f} ms  (build + 2-hop paths + degree ranking)")
+    print(f"adjacency graph, warm : {t_warm * 1000:9.1f} ms  (2-hop paths + degree ranking)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="lib/memory micro-benchmarks")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_writes = sub.add_parser("writes", help="per-row commits vs batch() + bulk inserts")
+    p_writes.add_argument("--rows", type=int, default=500)
+    p_startup = sub.add_parser("startup", help="Memory() open time vs DB size")
+    p_startup.add_argument("--sizes", default="0,1000,10000,50000")
+    p_startup.add_argument("--opens", type=int, default=20)
+    p_cont = sub.add_parser("contention", help="concurrent writer/reader processes")
+    p_cont.add_argument("--writers", type=int, default=4)
+    p_cont.add_argument("--readers", type=int, default=4)
+    p_cont.add_argument("--ops", type=int, default=200)
+    p_strat = sub.add_parser("strategy", help="select_strategy latency")
+    p_strat.add_argument("--strategies", type=int, default=20)
+    p_strat.add_argument("--episodes", type=int, default=1000)
+    p_strat.add_argument("--calls", type=int, default=50)
+    p_urls = sub.add_parser("read_urls", help="similar-question read-URL lookup")
+    p_urls.add_argument("--sizes", default="1000,10000,50000")
+    p_urls.add_argument("--lookups", type=int, default=50)
+    p_graph = sub.add_parser("graph", help="entity graph 2-hop query")
+    p_graph.add_argument("--relations", type=int, default=100000)
+    p_graph.add_argument("--entities", type=int, default=20000)
+    p_graph.add_argument("--projects", type=int, default=20)
+    args = parser.parse_args()
+    if args.cmd == "writes":
+        bench_writes(args.rows)
+    elif args.cmd == "startup":
+        bench_startup([int(x) for x in args.sizes.split(",") if x.strip()], args.opens)
+    elif args.cmd == "contention":
+        bench_contention(args.writers, args.readers, args.ops)
+    elif args.cmd == "strategy":
+        bench_strategy(args.strategies, args.episodes, args.calls)
+    elif args.cmd == "read_urls":
+        bench_read_urls([int(x) for x in args.sizes.split(",") if x.strip()], args.lookups)
+    elif args.cmd == "graph":
+        bench_graph(args.relations, args.entities, args.projects)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
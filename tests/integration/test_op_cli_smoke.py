@@ -48,3 +48,25 @@ def test_op_main_requires_subcommand():
     )
     assert result.returncode != 0
     assert "Usage" in (result.stderr or result.stdout or "")
+
+
+def test_op_job_status_and_get_use_job_index(tmp_path):
+    """op job status lists the newest jobs and op job get resolves ids via jobs/job_index.db."""
+    fake_home = tmp_path / "home"
+    jobs = fake_home / "operator" / "jobs"
+    for day, jid, created in (("2026-01-01", "old0000001", "2026-01-01T00:00:00Z"), ("2026-01-02", "new0000001", "2026-01-02T00:00:00Z")):
+        (jobs / day / jid).mkdir(parents=True)
+        (jobs / day / jid / "job.json").write_text(json.dumps(
+            {"id": jid, "workflow_id": "wf", "status": "DONE", "created_at": created, "attempt": 1}
+        ))
+    env = {**os.environ, "HOME": str(fake_home), "OPERATOR_ROOT": str(fake_home / "operator")}
+    run = lambda *args: subprocess.run(
+        [sys.executable, str(ROOT / "bin" / "op"), *args], env=env, capture_output=True, text=True, cwd=str(ROOT), timeout=15
+    )
+    status = run("job", "status", "--limit", "1")
+    assert status.returncode == 0, status.stderr
+    assert status.stdout.startswith("new0000001")
+    assert (jobs / "job_index.db").exists()
+    got = run("job", "get", "old0000001")
+    assert got.returncode == 0, got.stderr
+    assert json.loads(got.stdout.split("\n\nArtifacts")[0])["id"] == "old0000001"
@@ -61,3 +61,14 @@ def test_check_budget_over_limit(tmp_project):
     assert r["ok"] is False
     assert r["current_spend"] == 100.0
     assert r["budget_limit"] == 1.0
+
+
+def test_track_api_call_cache_hits(tmp_project):
+    """track_api_call() records cache hits and savings without adding spend."""
+    from tools.research_common import load_project
+    pid = tmp_project.name
+    track_api_call(pid, "brave_search", count=0, cache_hits=3)
+    proj = load_project(tmp_project)
+    assert proj.get("current_spend", 0) == 0
+    assert proj["api_cache_hits"]["brave_search"] == 3
+    assert proj["api_cost_saved"] == pytest.approx(3 * API_COSTS["brave_search"])
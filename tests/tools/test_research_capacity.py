@@ -0,0 +1,135 @@
+"""Unit tests for tools/research_capacity.py (temp research root; no dispatch)."""
+import json
+import subprocess
+import sys
+
+import pytest
+
+from tools import research_capacity as rc
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESEARCH_CAPACITY_CPU", "2")
+    monkeypatch.setenv("RESEARCH_CAPACITY_MEMORY_MB", "4096")
+    monkeypatch.setenv("RESEARCH_CAPACITY_LLM_TPM", "100000")
+    monkeypatch.setenv("RESEARCH_CAPACITY_MAX_PER_PARENT", "3")
+    monkeypatch.setattr(rc, "available_memory_mb", lambda: None)
+    monkeypatch.setattr(rc, "parent_within_budget", lambda parent_id: parent_id != "proj-broke")
+    m = rc.CapacityManager(tmp_path)
+    yield m
+    m.close()
+
+
+def test_admits_within_capacity_by_priority(manager):
+    low = manager.enqueue("research_cycle", {"question": "low"}, priority=0.1)
+    high = manager.enqueue("research_cycle", {"question": "high"}, priority=0.9)
+    mid = manager.enqueue("research_cycle", {"question": "mid"}, priority=0.5)
+    admitted = manager.admit("research_cycle")
+    assert [a["id"] for a in admitted] == [high, mid]
+    assert admitted[0]["payload"] == {"question": "high"}
+    assert manager.admit("research_cycle") == []
+    manager.release(high)
+    assert [a["id"] for a in manager.admit()] == [low]
+    assert manager.status()["used"]["cpu"] == 2.0
+
+
+def test_tpm_per_parent_and_budget(manager, monkeypatch):
+    monkeypatch.setenv("RESEARCH_CAPACITY_CPU", "10")
+    monkeypatch.setenv("RESEARCH_CAPACITY_MEMORY_MB", "100000")
+    monkeypatch.setenv("RESEARCH_CAPACITY_MAX_PER_PARENT", "2")
+    ids = [manager.enqueue("research_cycle", parent_id="proj-a", priority=1.0) for _ in range(6)]
+    other = manager.enqueue("research_cycle", parent_id="proj-b", priority=0.0)
+    assert [a["id"] for a in manager.admit()] == ids[:2] + [other]
+    # TPM: 100k allows five cycles at 20k each, sandbox runs use none
+    more = [manager.enqueue("research_cycle", parent_id=f"proj-{i}") for i in range(3)]
+    sandbox = manager.enqueue("sandbox", project_id="proj-x")
+    assert [a["id"] for a in manager.admit()] == more[:2] + [sandbox]
+    assert manager.enqueue("research_cycle", parent_id="proj-broke") == ""
+
+
+def test_reap_finished_work(manager, tmp_path):
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    a = manager.enqueue("sandbox", project_id="proj-s")
+    b = manager.enqueue("research_cycle")
+    manager.admit()
+    manager.bind(a, pid=proc.pid)
+    manager.bind(b, project_id="proj-child")
+    (tmp_path / "proj-child").mkdir()
+    (tmp_path / "proj-child" / "project.json").write_text(json.dumps({"phase": "explore"}))
+    assert manager.reap() == 1
+    (tmp_path / "proj-child" / "project.json").write_text(json.dumps({"phase": "done"}))
+    assert manager.reap() == 1
+    assert manager.status()["leases"] == {}
+
+
+def test_acquire_and_drain(manager):
+    first = manager.acquire("sandbox", project_id="p1", timeout=1, poll=0.1)
+    second = manager.acquire("sandbox", project_id="p2", timeout=1, poll=0.1)
+    assert first and second
+    assert manager.acquire("sandbox", project_id="p3", timeout=0.3, poll=0.1) == ""
+    manager.release(first)
+    manager.release(second)
+
+    manager.enqueue("research_cycle", {"question": "ok"})
+    manager.enqueue("research_cycle", {"question": "fails"})
+    started = rc.drain(manager, "research_cycle",
+                       lambda lease: {"project_id": "proj-new"} if lease["payload"]["question"] == "ok" else None)
+    assert [s["project_id"] for s in started] == ["proj-new"]
+    status = manager.status()
+    assert status["leases"] == {"running": {"research_cycle": 1}}
+
+
+def test_research_lease_released_when_project_stalls(manager, tmp_path, monkeypatch):
+    import os
+    import time
+    monkeypatch.setenv("RESEARCH_CAPACITY_STALL_MINUTES", "1")
+    lease = manager.enqueue("research_cycle", parent_id="proj-a")
+    manager.admit()
+    manager.bind(lease, project_id="proj-child")
+    (tmp_path / "proj-child").mkdir()
+    (tmp_path / "proj-child" / "project.json").write_text(json.dumps({"phase": "explore"}))
+    (tmp_path / "proj-child" / "progress.json").write_text("{}")
+    old = time.time() - 3600
+    manager._conn.execute("UPDATE leases SET heartbeat_at = ?, started_at = ?", (old, old))
+    assert manager.reap() == 0  # progress.json was just written
+    for name in ("project.json", "progress.json"):
+        os.utime(tmp_path / "proj-child" / name, (old, old))
+    assert manager.reap() == 1
+
+
+def test_experiment_takes_sandbox_slot_without_inherited_lease(tmp_path, monkeypatch):
+    from tools import research_experiment as rex
+    monkeypatch.setenv("OPERATOR_ROOT", str(tmp_path))
+    monkeypatch.setenv("RESEARCH_CAPACITY_MEMORY_MB", "100000")
+    monkeypatch.delenv("RESEARCH_CAPACITY_LEASE", raising=False)
+    monkeypatch.delenv("RESEARCH_CAPACITY", raising=False)
+    monkeypatch.setattr(rc, "available_memory_mb", lambda: None)
+    monkeypatch.setattr(rex, "SANDBOX_SLOT_WAIT_SECONDS", 1)
+    manager, lease_id = rex._hold_sandbox_slot("p1")
+    try:
+        assert lease_id
+        assert manager.status()["leases"] == {"running": {"sandbox": 1}}
+    finally:
+        manager.release(lease_id)
+        manager.close()
+
+
+def test_orchestrator_questions_get_parent_project(tmp_path, monkeypatch):
+    from tools import research_orchestrator as ro
+    monkeypatch.setattr(ro, "RESEARCH", tmp_path)
+    for pid, q in (("proj-bat", "How does lithium battery recycling scale?"), ("proj-grid", "Grid storage tariffs")):
+        (tmp_path / pid).mkdir()
+        (tmp_path / pid / "project.json").write_text(json.dumps({"question": q}))
+    done = ["proj-bat", "proj-grid"]
+    assert ro.question_parents([
+        {"question": "Which grid tariffs favour storage?", "from_project": "proj-grid"},
+        "What recovery rates does battery recycling reach?",
+        {"question": "Unrelated topic about whales", "from_project": "proj-unknown"},
+        "short",
+    ], done) == [
+        ("Which grid tariffs favour storage?", "proj-grid"),
+        ("What recovery rates does battery recycling reach?", "proj-bat"),
+        ("Unrelated topic about whales", ""),
+    ]
@@ -0,0 +1,91 @@
+"""Unit tests for tools/verify/dedup.py (exact, prefix, LSH near-duplicate and paraphrase merging)."""
+import random
+import time
+
+from tools.verify.dedup import (
+    ClaimDeduper,
+    claim_similarity,
+    merge_dedupe_claims,
+    normalize_claim_for_dedup,
+)
+
+
+def _pairwise_reference(claims: list[dict]) -> list[dict]:
+    """Original O(n^2) rule set (exact, Jaccard >= 0.65, 40-char prefix)."""
+    merged = []
+    for c in claims:
+        norm = normalize_claim_for_dedup(c.get("claim") or "")
+        if not norm:
+            continue
+        dup = False
+        for m in merged:
+            existing = normalize_claim_for_dedup(m["claim"])
+            if norm == existing or (
+                len(norm) >= 30 and len(existing) >= 30 and claim_similarity(norm, existing) >= 0.65
+            ) or norm.startswith(existing[:40]) or existing.startswith(norm[:40]):
+                dup = True
+                break
+        if not dup:
+            merged.append(c)
+    return merged
+
+
+def test_exact_and_prefix_duplicates_dropped():
+    claims = [
+        {"claim": "Drug X achieved a 45% response rate in the phase 2 trial."},
+        {"claim": "drug x achieved a 45% response rate in the phase 2 trial"},
+        {"claim": "Drug X achieved a 45% response rate in the phase 2 trial, per the sponsor's press release."},
+        {"claim": "Revenue grew 12% year over year in Q3 2024."},
+    ]
+    out = merge_dedupe_claims(claims)
+    assert [c["claim"] for c in out] == [claims[0]["claim"], claims[3]["claim"]]
+
+
+def test_paraphrase_with_reordered_words_merges():
+    claims = [
+        {"claim": "In the phase 2 trial, drug X achieved a response rate of 45% in adults"},
+        {"claim": "Drug X response rate of 45% was achieved in adults in the phase 2 trial"},
+    ]
+    assert len(merge_dedupe_claims(claims)) == 1
+
+
+def test_different_numbers_are_not_merged_by_containment():
+    base = "Per the agency report, battery storage capacity installed in Europe reached a total of 45 GW in 2023 across member states"
+    same = {"claim": "Europe battery storage capacity reached 45 GW total installed in 2023"}
+    other = {"claim": "Europe battery storage capacity reached 60 GW total installed in 2023"}
+    assert len(merge_dedupe_claims([{"claim": base}, same])) == 1
+    assert len(merge_dedupe_claims([{"claim": base}, other])) == 2
+
+
+def test_matches_pairwise_reference_on_random_corpus():
+    rng = random.Random(7)
+    vocab = [f"term{i}" for i in range(300)]
+    claims = []
+    for _ in range(400):
+        words = rng.sample(vocab, rng.randint(5, 14))
+        claims.append({"claim": " ".join(words)})
+        if rng.random() < 0.3:
+            variant = words[:]
+            variant[rng.randrange(len(variant))] = rng.choice(vocab)
+            claims.append({"claim": " ".join(variant)})
+    ref = _pairwise_reference(claims)
+    out = merge_dedupe_claims(claims)
+    # LSH is probabilistic; containment may merge a few extra near-dups. Allow tiny drift.
+    assert abs(len(out) - len(ref)) <= max(2, len(ref) // 100)
+
+
+def test_dedup_scales_to_large_claim_sets():
+    rng = random.Random(3)
+    vocab = [f"w{i}" for i in range(2000)]
+    claims = [{"claim": " ".join(rng.sample(vocab, 12))} for _ in range(600)]
+    t0 = time.perf_counter()
+    out = merge_dedupe_claims(claims)
+    assert time.perf_counter() - t0 < 2.0
+    assert len(out) == 600
+
+
+def test_deduper_incremental_add():
+    d = ClaimDeduper()
+    assert d.add("solar module prices fell 30% between 2022 and 2023 worldwide")
+    assert not d.add("solar module prices fell 30% between 2022 and 2023 worldwide")
+    assert d.add("wind turbine orders in china doubled in the first half of 2024")
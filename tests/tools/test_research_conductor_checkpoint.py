@@ -0,0 +1,97 @@
+"""Unit tests for tools/research_conductor_checkpoint.py and checkpointed resume in research_conductor.run_cycle."""
+import json
+
+import pytest
+
+from tools import research_conductor as rcond
+from tools.research_conductor_checkpoint import CycleCheckpoint, fingerprint, key_of
+
+
+def test_checkpoint_sub_steps_and_inputs(tmp_path):
+    (tmp_path / "findings").mkdir()
+    ckpt = CycleCheckpoint(tmp_path)
+    assert ckpt.interrupted_action("verify") == ""
+    ckpt.begin("verify", "verify", 3)
+    ckpt.bind_inputs(fingerprint(tmp_path / "findings"))
+    out = tmp_path / "out.json"
+    out.write_text("{}")
+    ckpt.mark("a")
+
+    again = CycleCheckpoint(tmp_path)
+    assert again.interrupted_action("verify") == "verify"
+    again.bind_inputs(fingerprint(tmp_path / "findings"))
+    assert again.done("a", [out]) and not again.done("b")
+    out.unlink()
+    assert not again.done("a", [out])
+
+    (tmp_path / "findings" / "f1.json").write_text("{}")
+    again.bind_inputs(fingerprint(tmp_path / "findings"))
+    assert not again.done("a")
+    assert key_of(["u1", "u2"]) == key_of(["u1", "u2"]) != key_of(["u2"])
+
+    again.finish()
+    assert CycleCheckpoint(tmp_path).interrupted_action("verify") == ""
+
+
+def test_checkpoint_dropped_on_phase_change(tmp_path):
+    ckpt = CycleCheckpoint(tmp_path)
+    ckpt.begin("read_more", "explore")
+    assert CycleCheckpoint(tmp_path).interrupted_action("focus") == ""
+    assert CycleCheckpoint(tmp_path).interrupted_action("explore") == ""
+
+
+def test_resumes_capped(tmp_path):
+    CycleCheckpoint(tmp_path).begin("read_more", "explore")
+    assert CycleCheckpoint(tmp_path).interrupted_action("explore") == "read_more"
+    assert CycleCheckpoint(tmp_path).interrupted_action("explore") == "read_more"
+    ckpt = CycleCheckpoint(tmp_path)
+    assert ckpt.interrupted_action("explore") == ""
+    assert ckpt.get("abandoned") == "read_more"
+
+
+class Crash(Exception):
+    pass
+
+
+def test_run_cycle_resumes_verify_after_crash(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPERATOR_ROOT", str(tmp_path))
+    proj = tmp_path / "research" / "proj-1"
+    (proj / "findings").mkdir(parents=True)
+    (proj / "sources").mkdir()
+    (proj / "project.json").write_text(json.dumps({"question": "q", "phase": "verify"}))
+    (proj / "verify").mkdir()
+    (proj / "verify" / "source_reliability.json").write_text("{}")  # stale output of an earlier verify.sh run
+    calls, crash = [], {"fact_check": True}
+    decisions = []
+
+    def fake_run_tool(project_id, tool, *args, capture_stdout=False, **kw):
+        sub = args[1] if len(args) > 1 else ""
+        calls.append(sub or tool)
+        if tool == "research_quality_gate.py":
+            return True, json.dumps({"pass": True})
+        if crash.pop(sub, False):
+            raise Crash(sub)
+        return (True, json.dumps({"step": sub})) if capture_stdout else True
+
+    def fake_advance(p, phase):
+        data = json.loads((p / "project.json").read_text())
+        data["phase"] = "done"
+        (p / "project.json").write_text(json.dumps(data))
+
+    monkeypatch.setattr(rcond, "_run_tool", fake_run_tool)
+    monkeypatch.setattr(rcond, "advance_phase", fake_advance)
+    monkeypatch.setattr(rcond, "decide_action", lambda *a, **k: decisions.append(1) or "verify")
+
+    with pytest.raises(Crash):
+        rcond.run_cycle("proj-1")
+    assert calls == ["source_reliability", "claim_verification", "fact_check"]
+    assert len(decisions) == 1
+    assert json.loads((proj / "verify" / "claim_verification.json").read_text()) == {"step": "claim_verification"}
+
+    steps_after_crash = json.loads((proj / "conductor_state.json").read_text())["steps_taken"]
+    calls.clear()
+    assert rcond.run_cycle("proj-1") is True
+    assert json.loads((proj / "conductor_state.json").read_text())["steps_taken"] == steps_after_crash + 1
+    assert calls == ["fact_check", "claim_ledger", "research_quality_gate.py"]
+    assert len(decisions) == 1
+    assert json.loads((proj / "conductor_checkpoint.json").read_text())["last_action"] == "verify"
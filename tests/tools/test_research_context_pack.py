@@ -0,0 +1,44 @@
+"""Unit tests for tools/research_context_pack.py (lexical scoring only; no embeddings)."""
+from tools import research_context_pack as cp
+
+FILLER = "The committee met on Tuesday to discuss the annual schedule and parking rules."
+RELEVANT = "Lithium recycling yields recover ninety percent of cobalt from spent battery cells."
+
+
+def _doc(n: int = 12, relevant_at: tuple = (5, 9)) -> str:
+    return "\n\n".join(RELEVANT if i in relevant_at else f"{FILLER} ({i})" for i in range(n))
+
+
+def test_split_passages_respects_limit():
+    text = "\n\n".join(["Short para."] * 5 + ["A long sentence here. " * 40])
+    pieces = cp.split_passages(text, 200)
+    assert all(len(p) <= 200 for p in pieces)
+    assert pieces[0].count("Short para.") == 5
+    assert "".join(pieces).replace("\n", "").replace(" ", "") == text.replace("\n", "").replace(" ", "")
+
+
+def test_pack_text_short_and_no_question():
+    assert cp.pack_text("battery", "  small text ", 100) == "small text"
+    doc = _doc()
+    assert cp.pack_text("", doc, 50) == doc[:200]
+
+
+def test_pack_text_picks_relevant_passages_in_order():
+    doc = _doc()
+    packed = cp.pack_text("lithium battery recycling cobalt", doc, 60, passage_chars=100)
+    assert len(packed) <= 240
+    assert packed.count(RELEVANT) == 2
+    assert cp.GAP_MARKER in packed
+    assert "(3)" not in packed
+
+
+def test_pack_items_budget_and_order():
+    items = [{"title": f"t{i}", "excerpt": RELEVANT if i in (2, 6) else FILLER} for i in range(8)]
+    render = lambda i, it: f"[{i + 1}] {it['title']}: {it['excerpt']}"
+    out = cp.pack_items("cobalt recycling battery", items, 50, render)
+    assert len(out) <= 200
+    assert "t2" in out and "t6" in out and out.index("t2") < out.index("t6")
+    assert out.startswith("[1] t2")
+    head = cp.pack_items("", items, 50, render)
+    assert head.startswith("[1] t0") and "t7" not in head
+    assert cp.pack_items("q", [], 50, render) == ""
@@ -0,0 +1,77 @@
+"""Unit tests for tools/research_coverage.py (incremental coverage assessment)."""
+import json
+import os
+
+from tools import research_coverage as rc
+
+PLAN = {
+    "entities": ["Lithium"],
+    "topics": [
+        {"id": "t1", "name": "Battery recycling costs", "description": "cost of recycling lithium cells", "min_sources": 1},
+        {"id": "t2", "name": "Grid storage", "description": "utility scale storage deployments", "min_sources": 2},
+        {"id": "t3", "name": "Policy", "description": "subsidies and regulation"},
+    ],
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data))
+
+
+def _seed(proj):
+    _write(proj / "findings" / "f1.json", {"title": "Recycling costs fall", "excerpt": "lithium recycling is cheaper"})
+    _write(proj / "findings" / "f2.json", {"title": "Unrelated", "excerpt": "weather", "topic_id": "t3"})
+    _write(proj / "sources" / "s1.json", {"url": "https://arxiv.org/abs/1", "title": "Grid storage deployments"})
+    _write(proj / "sources" / "s1_content.json", {"text": "recycling recycling"})
+    _write(proj / "sources" / "s2.json", {"url": "https://example.com/a", "description": "utility storage at scale"})
+
+
+def test_incremental_matches_full_assessment(tmp_project):
+    _seed(tmp_project)
+    full = rc.assess_coverage(PLAN, rc._iter_findings(tmp_project), rc._iter_source_meta(tmp_project))
+    inc = rc.assess_coverage_incremental(tmp_project, PLAN)
+    assert inc == full
+    by_id = {t["id"]: t["coverage"] for t in inc["topics"]}
+    assert by_id["t2"]["sources_count"] == 2 and by_id["t2"]["has_primary_source"]
+    assert by_id["t3"]["findings_count"] == 1
+
+
+def test_incremental_only_parses_new_items(tmp_project):
+    _seed(tmp_project)
+    rc.assess_coverage_incremental(tmp_project, PLAN)
+    state = json.loads((tmp_project / rc.COVERAGE_STATE_FILE).read_text())
+    assert state["last_run_parsed"] == 4
+
+    rc.assess_coverage_incremental(tmp_project, PLAN)
+    state = json.loads((tmp_project / rc.COVERAGE_STATE_FILE).read_text())
+    assert state["last_run_parsed"] == 0
+
+    _write(tmp_project / "findings" / "f3.json", {"title": "Subsidies for storage", "excerpt": "policy"})
+    inc = rc.assess_coverage_incremental(tmp_project, PLAN)
+    state = json.loads((tmp_project / rc.COVERAGE_STATE_FILE).read_text())
+    assert state["last_run_parsed"] == 1
+    full = rc.assess_coverage(PLAN, rc._iter_findings(tmp_project), rc._iter_source_meta(tmp_project))
+    assert inc == full
+
+
+def test_incremental_handles_changes_and_deletions(tmp_project):
+    _seed(tmp_project)
+    rc.assess_coverage_incremental(tmp_project, PLAN)
+    f1 = tmp_project / "findings" / "f1.json"
+    _write(f1, {"title": "Grid storage", "excerpt": "deployments only"})
+    st = f1.stat()
+    os.utime(f1, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    (tmp_project / "sources" / "s2.json").unlink()
+    inc = rc.assess_coverage_incremental(tmp_project, PLAN)
+    full = rc.assess_coverage(PLAN, rc._iter_findings(tmp_project), rc._iter_source_meta(tmp_project))
+    assert inc == full
+
+
+def test_plan_change_rebuilds_state(tmp_project):
+    _seed(tmp_project)
+    rc.assess_coverage_incremental(tmp_project, PLAN)
+    plan2 = {"topics": PLAN["topics"] + [{"id": "t4", "name": "Weather effects", "description": "climate"}]}
+    inc = rc.assess_coverage_incremental(tmp_project, plan2)
+    state = json.loads((tmp_project / rc.COVERAGE_STATE_FILE).read_text())
+    assert state["last_run_parsed"] == 4
+    assert inc == rc.assess_coverage(plan2, rc._iter_findings(tmp_project), rc._iter_source_meta(tmp_project))
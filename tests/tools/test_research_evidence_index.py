@@ -0,0 +1,84 @@
+"""Unit tests for tools/research_evidence_index.py (incremental build, claim/evidence inverted index)."""
+import json
+
+import tools.research_contradiction_linking as cl
+from tools.research_evidence_index import (
+    ClaimEvidenceIndex,
+    build_evidence_index,
+    claim_evidence_index,
+    load_claim_evidence_index,
+    load_evidence_index,
+)
+
+
+def _ledger(proj, claims):
+    (proj / "claims").mkdir(exist_ok=True)
+    (proj / "claims" / "ledger.jsonl").write_text("\n".join(json.dumps(c) for c in claims) + "\n")
+
+
+def test_inverted_index_lookups(tmp_project):
+    (tmp_project / "findings" / "f1.json").write_text(json.dumps({"url": "https://a.org/x", "excerpt": "E"}))
+    (tmp_project / "sources" / "s1.json").write_text(json.dumps({"url": "https://b.org/y"}))
+    _ledger(tmp_project, [
+        {"claim_id": "cl_1", "claim_version": 1, "text": "Battery prices fell", "supporting_source_ids": ["https://a.org/x", "https://b.org/y"]},
+        {"claim_id": "cl_2", "claim_version": 1, "text": "Solar prices fell", "supporting_source_ids": ["https://b.org/y"]},
+    ])
+    evidence = build_evidence_index(tmp_project.name)
+    idx = load_claim_evidence_index(tmp_project)
+    ids = {e["source_url"]: e["evidence_id"] for e in evidence}
+    assert idx.evidence_for_claim("cl_1@1") == [ids["https://a.org/x"], ids["https://b.org/y"]]
+    assert idx.claims_citing_source("https://b.org/y") == ["cl_1@1", "cl_2@1"]
+    assert set(idx.claims_sharing_terms("prices fell for batteries", min_shared=2)) == {"cl_1@1", "cl_2@1"}
+    assert idx.claims_sharing_terms("battery prices", min_shared=2) == ["cl_1@1"]
+
+
+def test_incremental_build_parses_only_changed_files(tmp_project):
+    for i in range(3):
+        (tmp_project / "findings" / f"f{i}.json").write_text(json.dumps({"url": f"https://d{i}.org/p"}))
+    first = build_evidence_index(tmp_project.name)
+    assert len(first) == 3
+    (tmp_project / "findings" / "f3.json").write_text(json.dumps({"url": "https://d3.org/p"}))
+    second = build_evidence_index(tmp_project.name)
+    assert [e["evidence_id"] for e in second[:3]] == [e["evidence_id"] for e in first]
+    assert len(second) == 4
+    audit = [json.loads(l) for l in (tmp_project / "audit_log.jsonl").read_text().splitlines()]
+    built = [a for a in audit if a.get("event") == "aem_evidence_index_built"]
+    assert built[-1]["detail"]["files_parsed"] == 1
+    assert len(load_evidence_index(tmp_project)) == 4
+
+
+def test_claim_index_updates_incrementally(tmp_project):
+    (tmp_project / "findings" / "f1.json").write_text(json.dumps({"url": "https://a.org/x"}))
+    claims = [
+        {"claim_id": "cl_1", "text": "Battery prices fell", "supporting_source_ids": ["https://a.org/x"]},
+        {"claim_id": "cl_2", "text": "Solar prices fell", "supporting_source_ids": ["https://b.org/y"]},
+    ]
+    _ledger(tmp_project, claims)
+    build_evidence_index(tmp_project.name)
+    idx = claim_evidence_index(tmp_project)
+    assert idx.update(load_evidence_index(tmp_project), claims) == 0  # unchanged: nothing re-indexed
+
+    changed = [dict(claims[0], text="Battery demand rose"), {"claim_id": "cl_3", "text": "Wind", "supporting_source_ids": ["https://a.org/x"]}]
+    _ledger(tmp_project, changed)
+    idx = claim_evidence_index(tmp_project)
+    assert idx.claims_citing_source("https://b.org/y") == []
+    assert idx.claims_citing_source("https://a.org/x") == ["cl_1@1", "cl_3@1"]
+    assert "prices" not in idx.term_to_claims
+    fresh = ClaimEvidenceIndex.build(load_evidence_index(tmp_project), changed)
+    assert {k: sorted(v) for k, v in idx.url_to_claims.items()} == {k: sorted(v) for k, v in fresh.url_to_claims.items()}
+    assert {k: sorted(v) for k, v in idx.term_to_claims.items()} == {k: sorted(v) for k, v in fresh.term_to_claims.items()}
+    assert idx.claim_to_evidence == fresh.claim_to_evidence
+    assert load_claim_evidence_index(tmp_project).to_dict() == idx.to_dict()
+
+
+def test_contradiction_linking_uses_claim_index(tmp_project, monkeypatch):
+    _ledger(tmp_project, [
+        {"claim_id": "cl_1", "text": "A", "supporting_source_ids": ["https://a.org/x"]},
+        {"claim_id": "cl_2", "text": "B", "supporting_source_ids": ["https://b.org/y"]},
+    ])
+    linked = []
+    monkeypatch.setattr(cl, "contradiction_detection", lambda *a, **k: {"contradictions": [{"source_a": "https://a.org/x", "source_b": "https://b.org/y"}]})
+    monkeypatch.setattr(cl, "add_contradiction", lambda pid, ra, rb, contradiction_strength: linked.append((ra, rb)))
+    out = cl.run_contradiction_linking(tmp_project.name)
+    assert out["links_added"] == 1 and linked == [("cl_1@1", "cl_2@1")]
+    assert (tmp_project / "evidence" / "evidence_links.json").exists()
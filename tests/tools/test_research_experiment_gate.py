@@ -1,11 +1,16 @@
 """
 Regression tests for strict experiment outcome gate parsing.
 """
+import json
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
+import tools.research_experiment as rx
 from tools.research_experiment import derive_experiment_gate
 
 
@@ -94,3 +99,78 @@ PASS: Criterion 3 (Effective Optimization) - Policy is near true target.
     assert gate["criterion_pass_count"] == 3
     assert gate["criterion_fail_count"] == 0
 
+
+
+def test_gate_prefers_structured_results_over_stdout():
+    stdout = "SUCCESS: looks fine\nPerformance Met (> 5.0% improvement): True\n"
+    results = {"success": False, "criteria": {"a": True, "b": False}, "performance_met": False,
+               "improvement_percent": 1.5}
+    gate = derive_experiment_gate(stdout, execution_success=True, results=results)
+    assert gate["objective_met"] is False
+    assert gate["structured_results"] is True
+    assert gate["failure_marker_present"] is True
+    assert (gate["criterion_pass_count"], gate["criterion_fail_count"]) == (1, 1)
+    assert gate["performance_gate_passed"] is False
+    assert gate["achieved_improvement_percent"] == 1.5
+
+    gate = derive_experiment_gate("no markers", execution_success=True, results={"hypothesis": "proven"})
+    assert gate["objective_met"] is True
+    assert derive_experiment_gate("no markers", execution_success=True)["structured_results"] is False
+
+
+class _FakeManager:
+    def __init__(self, lease=""):
+        self.lease = lease
+        self.released = []
+        self.closed = False
+
+    def acquire(self, kind, project_id="", timeout=0):
+        return self.lease
+
+    def bind(self, lease_id, pid=None):
+        pass
+
+    def release(self, lease_id):
+        self.released.append(lease_id)
+
+    def close(self):
+        self.closed = True
+
+
+def _experiment_project(tmp_path, monkeypatch, manager):
+    proj = tmp_path / "research" / "proj-x"
+    (proj / "artifacts").mkdir(parents=True)
+    (proj / "artifacts" / "report.md").write_text("# Report\n")
+    (proj / "project.json").write_text(json.dumps({"id": "proj-x", "question": "Q?"}))
+    monkeypatch.setattr(rx, "_OPERATOR_ROOT", tmp_path)
+    monkeypatch.setattr(rx, "open_manager", lambda: manager)
+    monkeypatch.delenv("RESEARCH_CAPACITY_LEASE", raising=False)
+    monkeypatch.delenv("RESEARCH_ENABLE_EXPERIMENT_LOOP", raising=False)
+    return proj
+
+
+def test_no_sandbox_capacity_skips_instead_of_running_unleased(tmp_path, monkeypatch):
+    manager = _FakeManager(lease="")
+    proj = _experiment_project(tmp_path, monkeypatch, manager)
+    monkeypatch.setattr(rx, "llm_call", lambda *a, **k: (_ for _ in ()).throw(AssertionError("must not run")))
+    monkeypatch.setattr(rx, "run_in_sandbox", lambda *a, **k: (_ for _ in ()).throw(AssertionError("must not run")))
+    rx.run_experiment_loop("proj-x")
+    out = json.loads((proj / "experiment.json").read_text())
+    assert out["status"] == "no_capacity"
+    assert out["gate"]["skipped"] == "no_capacity"
+    assert manager.closed
+
+
+def test_sandbox_lease_released_when_loop_raises(tmp_path, monkeypatch):
+    manager = _FakeManager(lease="lease-1")
+    _experiment_project(tmp_path, monkeypatch, manager)
+    monkeypatch.setattr(rx, "llm_call", lambda *a, **k: SimpleNamespace(text="print(1)"))
+
+    def boom(*a, **k):
+        raise RuntimeError("sandbox down")
+
+    monkeypatch.setattr(rx, "run_in_sandbox", boom)
+    with pytest.raises(RuntimeError):
+        rx.run_experiment_loop("proj-x", max_iterations=1)
+    assert manager.released == ["lease-1"]
+    assert manager.closed
@@ -0,0 +1,74 @@
+"""Unit tests for tools/research_parallel_reader.py (source identity dedup; no network)."""
+import json
+import threading
+
+from tools import research_parallel_reader as pr
+from tools.research_source_identity import open_global_index, open_index, source_id
+
+TEXT = "Battery recycling recovers lithium and cobalt from spent cells. " * 10
+
+
+def _run(proj, urls, index, global_index=None):
+    lock, results, claimed = threading.Lock(), [], {}
+    for i, url in enumerate(urls):
+        pr._run_worker((i, url), proj, "", proj.name, "explore", 0.0, "read", lock, results, len(urls),
+                       index, global_index, claimed)
+    return sorted(results)
+
+
+def test_url_variants_read_once(tmp_path, monkeypatch):
+    proj = tmp_path / "proj-a"
+    (proj / "sources").mkdir(parents=True)
+    (proj / "findings").mkdir()
+    fetched = []
+
+    def fake_read(url, project_id):
+        fetched.append(url)
+        return {"url": url, "title": "t", "text": TEXT, "error": ""}
+
+    monkeypatch.setattr(pr, "_read_one_url", fake_read)
+    index = open_index(proj)
+    results = _run(proj, ["https://www.e.com/a?utm_source=x", "http://e.com/a/", "https://mirror.org/a"], index)
+    assert fetched == ["https://www.e.com/a?utm_source=x", "https://mirror.org/a"]
+    assert [r[3] for r in results] == ["", "dedup", ""]
+    assert (proj / "sources" / f"{source_id('https://e.com/a')}_content.json").exists()
+    # mirror has the same text: content saved, but no second finding
+    assert len(list((proj / "findings").glob("*.json"))) == 1
+
+    results = _run(proj, ["https://e.com/a"], index)
+    assert results == [(0, -1, 0, "dedup")]  # already read: not counted as a read attempt
+    assert len(fetched) == 2
+
+
+def test_failed_variant_falls_back_to_next(tmp_path, monkeypatch):
+    proj = tmp_path / "proj-a"
+    (proj / "sources").mkdir(parents=True)
+    (proj / "findings").mkdir()
+    fetched = []
+
+    def fake_read(url, project_id):
+        fetched.append(url)
+        if "www." in url:
+            return {"url": url, "error": "403"}
+        return {"url": url, "title": "t", "text": TEXT, "error": ""}
+
+    monkeypatch.setattr(pr, "_read_one_url", fake_read)
+    results = _run(proj, ["https://www.e.com/a", "http://e.com/a/", "https://e.com/a"], open_index(proj))
+    assert fetched == ["https://www.e.com/a", "http://e.com/a/"]
+    assert [r[1:] for r in results] == [(0, 0, ""), (1, 1, ""), (-1, 0, "dedup")]
+
+
+def test_global_content_reused(tmp_path, monkeypatch):
+    for name in ("proj-a", "proj-b"):
+        (tmp_path / name / "sources").mkdir(parents=True)
+        (tmp_path / name / "findings").mkdir()
+    monkeypatch.setattr(pr, "_read_one_url", lambda url, pid: {"url": url, "title": "t", "text": TEXT, "error": ""})
+    global_index = open_global_index(tmp_path)
+    _run(tmp_path / "proj-a", ["https://e.com/paper"], open_index(tmp_path / "proj-a"), global_index)
+
+    monkeypatch.setattr(pr, "_read_one_url", lambda url, pid: (_ for _ in ()).throw(AssertionError("fetched")))
+    results = _run(tmp_path / "proj-b", ["http://www.e.com/paper/"], open_index(tmp_path / "proj-b"), global_index)
+    assert results == [(0, 1, 1, "reused")]
+    saved = json.loads((tmp_path / "proj-b" / "sources" / f"{source_id('https://e.com/paper')}_content.json").read_text())
+    assert saved["text"] == TEXT
+    global_index.close()
@@ -48,3 +48,77 @@ def test_extract_text_fallback_to_pypdf(tmp_path):
         if "PdfReadError" in type(e).__name__ or "startxref" in str(e):
             pytest.skip("minimal PDF not valid for pypdf")
         raise
+
+
+class _FakeResponse:
+    def __init__(self, body: bytes, length: str | None = None):
+        self._buf = __import__("io").BytesIO(body)
+        self.headers = {"Content-Length": length} if length else {}
+
+    def read(self, n=-1):
+        return self._buf.read(n)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_download_streams_with_byte_cap(tmp_path):
+    from tools import research_pdf_reader as pr
+    dest = tmp_path / "a.pdf"
+    with patch.object(pr, "urlopen", return_value=_FakeResponse(b"x" * 200_000)):
+        assert pr.download("https://e.com/a.pdf", dest, limit=300_000) == 200_000
+    assert dest.stat().st_size == 200_000
+    with patch.object(pr, "urlopen", return_value=_FakeResponse(b"x" * 200_000)):
+        with pytest.raises(ValueError, match="too large"):
+            pr.download("https://e.com/a.pdf", dest, limit=100_000)
+    with patch.object(pr, "urlopen", return_value=_FakeResponse(b"", length=str(10 * 1024 * 1024))):
+        with pytest.raises(ValueError, match="too large"):
+            pr.download("https://e.com/a.pdf", dest, limit=1024 * 1024)
+
+
+def test_extract_ranges_stops_early_and_keeps_order(monkeypatch):
+    from tools import research_pdf_reader as pr
+    calls = []
+
+    def fake(path, first, last):
+        calls.append((first, last))
+        return f"[{first}-{last}]" + "x" * 100
+
+    text = pr.extract_ranges(fake, Path("doc.pdf"), 35, 250, "")
+    assert calls == [(1, 10), (11, 20), (21, 30)]
+    assert text.startswith("[1-10]") and len(text) == 250
+
+    calls.clear()
+    monkeypatch.setenv("RESEARCH_PDF_WORKERS", "3")
+    text = pr.extract_ranges(fake, Path("doc.pdf"), 200, 10**6, "\n")
+    assert sorted(calls) == pr._ranges(200, pr.PAGE_BATCH)
+    assert [seg[: seg.index("]") + 1] for seg in text.split("\n")] == [f"[{a}-{b}]" for a, b in pr._ranges(200, 10)]
+
+    calls.clear()
+    pr.extract_ranges(fake, Path("doc.pdf"), 200, 500, "")
+    assert len(calls) == 6  # two windows of three ranges
+
+
+def test_read_pdf_caches_by_content_hash(tmp_path, monkeypatch):
+    from tools import research_pdf_reader as pr
+    monkeypatch.setenv("OPERATOR_ROOT", str(tmp_path))
+    pdf = tmp_path / "doc.pdf"
+    pdf.write_bytes(b"%PDF-1.4 fake")
+    extracted = []
+
+    def fake_extract(path, max_chars=pr.MAX_TEXT_CHARS):
+        extracted.append(max_chars)
+        return ("y" * 1000)[:max_chars], 3
+
+    monkeypatch.setattr(pr, "extract_text", fake_extract)
+    first = pr.read_pdf(pdf, max_chars=500)
+    assert first == {"text": "y" * 500, "page_count": 3, "truncated": True, "cached": False}
+    assert pr.read_pdf(pdf, max_chars=200)["cached"] is True
+    assert pr.read_pdf(pdf, max_chars=5000)["cached"] is False  # cached text too short for this cap
+    assert pr.read_pdf(pdf, max_chars=5000) == {"text": "y" * 1000, "page_count": 3, "truncated": False, "cached": True}
+    assert extracted == [500, 5000]
+    monkeypatch.setenv("RESEARCH_PDF_CACHE", "0")
+    assert pr.read_pdf(pdf)["cached"] is False
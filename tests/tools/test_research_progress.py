@@ -26,3 +26,17 @@ def test_done_marks_terminal_done_when_phase_is_explicit(tmp_project):
     assert progress["alive"] is False
     assert progress["phase"] == "done"
     assert progress["step"] == "Done"
+
+
+def test_report_section_records_partial_report_and_event(tmp_project):
+    """report_section exposes streamed synthesis progress in progress.json and events.jsonl."""
+    project_id = tmp_project.name
+    rp.start(project_id, "synthesize")
+    rp.report_section(project_id, "Market Overview", 1, 4, 820, str(tmp_project / "synthesize_partial.md"))
+    progress = json.loads((tmp_project / "progress.json").read_text())
+    assert progress["partial_report"]["sections_done"] == 1
+    assert progress["partial_report"]["sections_total"] == 4
+    assert progress["partial_report"]["last_section"] == "Market Overview"
+    events = [json.loads(l) for l in (tmp_project / "events.jsonl").read_text().splitlines()]
+    assert events[-1]["event"] == "report_section_done"
+    assert events[-1]["words"] == 820
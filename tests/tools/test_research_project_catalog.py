@@ -0,0 +1,60 @@
+"""Unit tests for tools/research_project_catalog.py (incremental project index)."""
+import json
+import os
+
+from tools import research_project_catalog as pc
+from tools.research_common import save_project
+
+
+def _make(research, pid, **fields):
+    proj = research / pid
+    (proj / "findings").mkdir(parents=True, exist_ok=True)
+    (proj / "project.json").write_text(json.dumps({"id": pid, **fields}))
+    return proj
+
+
+def test_catalog_builds_and_indexes_children(mock_operator_root):
+    research = mock_operator_root / "research"
+    _make(research, "proj-a", status="running", phase="explore", council_status="active", question="Q" * 300)
+    _make(research, "proj-b", status="running", phase="focus", parent_project_id="proj-a")
+    _make(research, "proj-c", status="done", phase="done", parent_project_id="proj-a")
+    (research / "proj-empty").mkdir()
+    (research / "playbooks").mkdir()
+
+    cat = pc.catalog(research)
+    assert sorted(cat.projects) == ["proj-a", "proj-b", "proj-c"]
+    assert len(cat.projects["proj-a"]["question"]) == pc.QUESTION_CHARS
+    assert [c["id"] for c in cat.children("proj-a")] == ["proj-b", "proj-c"]
+    assert cat.running_children("proj-a") == 1
+    assert [name for name, _ in cat.entries()] == ["proj-c", "proj-b", "proj-a"]
+    assert (research / pc.CATALOG_FILE).exists()
+
+
+def test_refresh_reparses_only_changed_projects(mock_operator_root, monkeypatch):
+    research = mock_operator_root / "research"
+    _make(research, "proj-a", status="running", phase="explore")
+    _make(research, "proj-b", status="running", phase="explore")
+    pc.catalog(research)
+
+    parsed = []
+    real_parse = pc._parse
+    monkeypatch.setattr(pc, "_parse", lambda d, sig: parsed.append(d.name) or real_parse(d, sig))
+    pj = research / "proj-b" / "project.json"
+    pj.write_text(json.dumps({"id": "proj-b", "status": "done", "phase": "done"}))
+    st = pj.stat()
+    os.utime(pj, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    cat = pc.catalog(research)
+    assert parsed == ["proj-b"]
+    assert cat.projects["proj-b"]["status"] == "done"
+
+    (research / "proj-a" / "project.json").unlink()
+    assert sorted(pc.catalog(research).projects) == ["proj-b"]
+
+
+def test_save_project_updates_catalog_entry(tmp_project):
+    research = tmp_project.parent
+    pc.catalog(research)
+    save_project(tmp_project, {"id": tmp_project.name, "status": "running", "phase": "verify"})
+    stored = json.loads((research / pc.CATALOG_FILE).read_text())["projects"][tmp_project.name]
+    assert stored["phase"] == "verify"
+    assert stored["sig"] == pc._signature(tmp_project / "project.json")
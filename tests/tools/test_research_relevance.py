@@ -0,0 +1,99 @@
+"""Unit tests for tools/research_relevance.py (shared hybrid relevance scoring)."""
+import json
+
+from tools import research_relevance as rr
+
+
+def _f(excerpt, title=""):
+    return {"excerpt": excerpt, "title": title}
+
+
+def test_keyword_score_matches_legacy_overlap():
+    f = _f("Solid-state battery density improvements", "Battery outlook")
+    assert rr.keyword_score(f, "solid state battery density") == 1.0
+    assert rr.keyword_score(_f(""), "battery") == 0.0
+
+
+def test_lexical_scores_rank_relevant_first():
+    question = "lithium battery recycling costs"
+    items = [
+        _f("Weather report for Berlin"),
+        _f("Lithium battery recycling costs fell sharply; recycling plants scale", "Recycling costs"),
+        _f("Battery chemistry overview"),
+    ]
+    ranked = rr.rank_items(question, items)
+    assert ranked[0] is items[1]
+    assert ranked[-1] is items[0]
+
+
+def test_bm25_rewards_rare_terms():
+    docs = [rr.terms("battery battery cathode"), rr.terms("battery market"), rr.terms("battery anode")]
+    scores = rr.bm25_scores({"cathode", "battery"}, docs)
+    assert scores[0] > scores[1]
+
+
+def test_low_relevance_fraction():
+    q = "offshore wind turbine costs"
+    items = [{"title": "Offshore wind turbine costs drop"}, {"title": "Cooking recipes"}, {"title": "Football"}]
+    assert abs(rr.low_relevance_fraction(q, items) - 2 / 3) < 1e-9
+
+
+def _baseline_drift_ratio(question, sources):
+    """The supervisor's original drift arithmetic: 4+ char terms, substring overlap, bad files in total only."""
+    q_terms = {t.strip(".,;:") for t in question.lower().split() if len(t) >= 4}
+    low = 0
+    for d in sources:
+        if d is None:
+            continue
+        text = f"{d.get('title','')} {d.get('description','')}".lower()
+        if sum(1 for t in q_terms if t in text) < 2:
+            low += 1
+    return low / len(sources)
+
+
+def test_drift_matches_baseline(tmp_project):
+    from tools.research_supervisor import _source_relevance_drift
+    q = "How do EV battery costs and gas prices affect fleet adoption?"
+    sources = [
+        {"title": "EV gas car fleet", "description": "the new era"},  # 3-letter words do not count: low
+        {"title": "Battery costs outlook", "description": ""},
+        {"title": "Fleet adoption", "description": "batteries and their costs"},  # fleet + costs
+        {"title": "Prices", "description": "pricing"},  # low
+        None,
+        None,
+        {"title": "Electric fleets", "description": "adoption curves"},  # "adoption?" keeps its "?": low
+    ]
+    assert abs(rr.low_relevance_fraction(q, sources) - _baseline_drift_ratio(q, sources)) < 1e-9
+    assert abs(rr.low_relevance_fraction(q, sources) - 3 / 7) < 1e-9
+
+    src = tmp_project / "sources"
+    for i, d in enumerate(sources):
+        (src / f"s{i}.json").write_text("{broken" if d is None else json.dumps(d))
+    assert _source_relevance_drift(tmp_project, q) == []  # 3/7 low: below the 0.6 drift threshold
+    for i in range(7, 12):
+        (src / f"s{i}.json").write_text(json.dumps({"title": "EV gas car fleet", "description": ""}))
+    assert _source_relevance_drift(tmp_project, q)[0]["type"] == "source_relevance_drift"  # 8/12 low
+
+
+def test_semantic_scores_use_cached_matrix(tmp_project, monkeypatch):
+    calls = []
+
+    def fake_embed(texts, project_id=""):
+        calls.append(list(texts))
+        return [[1.0, 0.0] if "wind" in t.lower() else [0.0, 1.0] for t in texts]
+
+    monkeypatch.setattr(rr, "embed_texts", fake_embed)
+    items = [_f("Wind farms expand"), _f("Unrelated cooking")]
+    s1 = rr.semantic_scores("wind power", items, tmp_project, "proj-test")
+    assert s1[0] > 0.99 and s1[1] < 0.01
+    assert (tmp_project / rr.EMBEDDINGS_CACHE_FILE).exists()
+    # Second run (new process simulated by fresh matrix): only the new finding is embedded
+    s2 = rr.semantic_scores("wind power", items + [_f("Wind turbines")], tmp_project, "proj-test")
+    assert len(s2) == 3
+    assert calls[-1] == ["Wind turbines"]
+
+
+def test_relevance_scores_falls_back_to_lexical_without_embeddings(monkeypatch):
+    monkeypatch.setattr(rr, "embed_texts", lambda texts, project_id="": [])
+    items = [_f("grid storage"), _f("storage grid batteries")]
+    assert rr.relevance_scores("grid storage", items, semantic=True) == rr.lexical_scores("grid storage", items)
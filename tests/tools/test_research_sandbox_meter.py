@@ -0,0 +1,48 @@
+"""Unit tests for tools/research_sandbox_meter.py (runs scripts locally; Linux /proc for RSS)."""
+from tools import research_sandbox_meter as meter
+from tools import research_sandbox_pool as sp
+
+
+def _run(tmp_path, code, **kw):
+    (tmp_path / "script.py").write_text(code)
+    return meter.run_metered("script.py", str(tmp_path), kw.pop("timeout", 10), results_path=str(tmp_path / "r.json"), **kw)
+
+
+def test_usage_and_results_channel(tmp_path):
+    code = (
+        "import json, os\n"
+        "print('x' * 999)\n"
+        "json.dump({'success': True, 'metrics': {'acc': 0.9}}, open(os.environ['RESEARCH_RESULTS_PATH'], 'w'))\n"
+    )
+    res = _run(tmp_path, code)
+    assert res["exit_code"] == 0 and not res["timeout"] and not res["budget_exceeded"]
+    assert res["output_bytes"] == 1000
+    assert res["results"] == {"success": True, "metrics": {"acc": 0.9}}
+    assert res["wall_seconds"] > 0 and res["cpu_seconds"] > 0 and res["peak_rss_mb"] > 1
+
+
+def test_cpu_budget(tmp_path):
+    res = _run(tmp_path, "while True: pass", cpu_seconds=1)
+    assert res["budget_exceeded"] == "cpu"
+    assert res["exit_code"] != 0 and not res["timeout"]
+    assert res["cpu_seconds"] >= 0.9
+
+
+def test_memory_budget_and_timeout(tmp_path):
+    res = _run(tmp_path, "import time\nb = bytearray(200 * 1024 * 1024)\ntime.sleep(5)", memory_mb=100)
+    assert res["budget_exceeded"] == "memory" and res["exit_code"] == 137
+    res = _run(tmp_path, "import time\ntime.sleep(5)", timeout=0.5)
+    assert res["timeout"] and res["wall_seconds"] < 3
+    assert res["results"] is None
+
+
+def test_pool_reports_usage_and_budget():
+    pool = sp.SandboxPool(sp.LocalBackend(), size=1)
+    try:
+        res = pool.run(
+            "import json, os\njson.dump([1, 2], open(os.environ['RESEARCH_RESULTS_PATH'], 'w'))", 10)
+        assert res.results == [1, 2] and res.cpu_seconds > 0 and res.usage()["output_bytes"] == 0
+        res = pool.run("while True: pass", timeout_seconds=10, cpu_seconds=1)
+        assert res.budget_exceeded == "cpu" and "CPU Budget Exceeded" in res.stderr
+    finally:
+        pool.close()
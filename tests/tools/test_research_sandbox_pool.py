@@ -0,0 +1,125 @@
+"""Unit tests for tools/research_sandbox_pool.py (local process backend; no docker)."""
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from tools import research_sandbox_pool as sp
+from tools.research_sandbox import run_in_sandbox
+
+
+@pytest.fixture
+def pool():
+    p = sp.SandboxPool(sp.LocalBackend(), size=1, max_runs=3, max_rss_mb=4096)
+    yield p
+    p.close()
+
+
+def test_pool_runs_and_reuses_worker(pool):
+    res = pool.run("print('hello')", timeout_seconds=10)
+    assert (res.stdout, res.stderr, res.exit_code, res.timeout) == ("hello\n", "", 0, False)
+    res = pool.run("print('missing quote)", timeout_seconds=10)
+    assert res.exit_code != 0 and "SyntaxError" in res.stderr
+    assert pool.started == 1 and pool.recycled == 0
+
+
+def test_runs_are_isolated(pool):
+    pool.run("open('left.txt', 'w').write('x')\nimport builtins\nbuiltins.LEAK = 1", timeout_seconds=10)
+    res = pool.run("import os, builtins\nprint(os.path.exists('left.txt'), hasattr(builtins, 'LEAK'))", 10)
+    assert res.stdout.strip() == "False False"
+
+
+def _alive(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            return "\tZ" not in next(line for line in f if line.startswith("State:"))
+    except (OSError, StopIteration):
+        return False
+
+
+def test_setsid_daemon_is_killed_and_worker_retired(pool):
+    code = (
+        "import os, time\n"
+        "pid = os.fork()\n"
+        "if pid == 0:\n"
+        "    os.setsid()\n"
+        "    time.sleep(30)\n"
+        "    os._exit(0)\n"
+        "time.sleep(0.3)\n"
+        "print(pid)\n"
+    )
+    res = pool.run(code, timeout_seconds=10)
+    daemon = int(res.stdout.strip())
+    assert pool.recycled == 1
+    for _ in range(50):
+        if not _alive(daemon):
+            break
+        time.sleep(0.05)
+    assert not _alive(daemon)
+    assert pool.run("print(1)", timeout_seconds=10).stdout == "1\n"
+    assert pool.recycled == 1
+
+
+def test_docker_workers_read_only_with_tmpfs():
+    cmd = sp.DockerBackend("img").command("w")
+    assert "--read-only" in cmd and cmd[cmd.index("--tmpfs") + 1].startswith("/tmp:")
+    assert "isolated=True" in cmd[-1]
+
+
+def test_recycled_after_max_runs(pool):
+    for _ in range(3):
+        assert pool.run("print(1)", timeout_seconds=10).exit_code == 0
+    assert pool.recycled == 1
+    assert pool.run("print(2)", timeout_seconds=10).stdout == "2\n"
+    assert pool.started == 2
+
+
+def test_memory_breach_and_timeout_recycle():
+    p = sp.SandboxPool(sp.LocalBackend(), size=1, max_runs=50, max_rss_mb=1)
+    try:
+        assert p.run("print('ok')", timeout_seconds=10).exit_code == 0
+        assert p.recycled == 1
+        res = p.run("import time\nwhile True: time.sleep(0.1)", timeout_seconds=1)
+        assert res.timeout and res.exit_code == 124
+        assert "Sandbox Timeout Exceeded" in res.stderr
+    finally:
+        p.close()
+
+
+def test_run_in_sandbox_uses_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESEARCH_SANDBOX_POOL", "local")
+    monkeypatch.setenv("RESEARCH_SANDBOX_POOL_SOCKET", str(tmp_path / "none.sock"))
+    try:
+        res = run_in_sandbox("print(6 * 7)", timeout_seconds=10)
+        assert res.exit_code == 0 and res.stdout.strip() == "42"
+        assert sp.get_pool().started == 1
+    finally:
+        sp.shutdown()
+    monkeypatch.setenv("RESEARCH_SANDBOX_POOL", "0")
+    assert sp.run_pooled("print(1)") is None
+
+
+def test_shared_service_serves_other_processes(tmp_path, monkeypatch):
+    sock = tmp_path / "pool.sock"
+    env = {**os.environ, "RESEARCH_SANDBOX_POOL": "local", "RESEARCH_SANDBOX_POOL_SOCKET": str(sock)}
+    script = Path(sp.__file__).resolve()
+    proc = subprocess.Popen([sys.executable, str(script), "serve"], env=env)
+    try:
+        deadline = time.monotonic() + 20
+        while not sock.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        monkeypatch.setenv("RESEARCH_SANDBOX_POOL", "local")
+        monkeypatch.setenv("RESEARCH_SANDBOX_POOL_SOCKET", str(sock))
+        res = sp.run_pooled("print(6 * 7)", timeout_seconds=10)
+        assert res.exit_code == 0 and res.stdout.strip() == "42"
+        assert not sp._POOLS  # served by the shared service, no pool in this process
+        sp.warm_pool()
+        assert not sp._POOLS
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=20)
+    assert not sock.exists()
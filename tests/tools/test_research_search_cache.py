@@ -0,0 +1,35 @@
+"""Unit tests for tools/research_search_cache.py."""
+import time
+
+from tools import research_search_cache as sc
+
+
+def test_query_signature_collapses_variants():
+    assert sc.query_signature("Costs of battery recycling") == sc.query_signature("battery  recycling cost")
+    assert sc.query_signature("AI chips") != sc.query_signature("chips")
+    assert sc.query_signature("the") == "the"
+
+
+def test_get_put_ttl_and_max_results(tmp_path, monkeypatch):
+    results = [{"url": f"https://e.com/{i}", "title": str(i)} for i in range(10)]
+    with sc.SearchCache(tmp_path) as cache:
+        assert cache.get("brave", "battery recycling", 5) is None
+        cache.put("brave", "battery recycling", 10, results)
+        assert cache.get("brave", "recycling of battery", 5) == results[:5]
+        assert cache.get("brave", "battery recycling", 20) is None
+        assert cache.get("serper", "battery recycling", 5) is None
+        assert cache.get("brave", "battery recycling", 5, max_age_hours=0) is None
+        cache.put("brave", "empty query", 5, [])
+        assert cache.get("brave", "empty query", 5) is None
+
+        cache._conn.execute("UPDATE search_cache SET created_at = ?", (time.time() - 5 * 3600,))
+        assert cache.get("brave", "battery recycling", 5) == results[:5]
+        assert cache.get("brave", "battery recycling", 5, max_age_hours=1) is None
+        monkeypatch.setenv("RESEARCH_SEARCH_CACHE_TTL_HOURS", "2")
+        assert cache.get("brave", "battery recycling", 5) is None
+        assert cache.purge(older_than_days=0) == 1
+
+
+def test_open_cache_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("RESEARCH_SEARCH_CACHE", "0")
+    assert sc.open_cache(tmp_path) is None
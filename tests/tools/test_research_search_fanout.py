@@ -0,0 +1,94 @@
+"""Unit tests for tools/research_search_fanout.py (fusion, deadlines, quorum, cache)."""
+import threading
+
+import pytest
+
+from tools import research_search_fanout as fo
+from tools.research_search_cache import SearchCache
+
+
+def _r(url, doi="", title=""):
+    return {"url": url, "doi": doi, "title": title or url}
+
+
+def test_fuse_rrf_and_identity_merge():
+    rankings = {
+        "semantic_scholar": [_r("https://www.semanticscholar.org/p/1", doi="10.1/x"), _r("https://a.org/2")],
+        "arxiv": [_r("https://arxiv.org/abs/9", doi="10.1/X"), _r("http://www.a.org/2/")],
+        "pubmed": [_r("https://pubmed.ncbi.nlm.nih.gov/5/")],
+    }
+    fused = fo.fuse(rankings)
+    assert [d["url"] for d in fused] == [
+        "https://www.semanticscholar.org/p/1", "https://a.org/2", "https://pubmed.ncbi.nlm.nih.gov/5/",
+    ]
+    assert fused[0]["backends"] == ["semantic_scholar", "arxiv"]
+    assert fused[0]["rrf_score"] == pytest.approx(2 / 61, abs=1e-6)
+    assert len(fo.fuse(rankings, max_results=2)) == 2
+
+
+def _fake_backends(monkeypatch, blocked=(), calls=None):
+    """Backends in `blocked` wait until the returned event is set (or 5 s), the others answer at once."""
+    release = threading.Event()
+
+    def call(backend, query, max_results, secrets):
+        if calls is not None:
+            calls.append(backend)
+        if backend in blocked:
+            release.wait(5)
+        return [_r(f"https://{backend}.example/{i}") for i in range(max_results)]
+    monkeypatch.setattr(fo, "_call_backend", call)
+    return release
+
+
+def test_slow_backend_does_not_gate_results(monkeypatch):
+    monkeypatch.setenv("RESEARCH_SEARCH_DEADLINE_ARXIV", "0.2")
+    release = _fake_backends(monkeypatch, blocked=("arxiv",))
+    results, report = fo.fan_out("q", "academic", 3, secrets={})
+    assert not release.is_set()  # returned while arxiv was still blocked
+    release.set()
+    assert report["arxiv"]["status"] == "timeout"
+    assert report["semantic_scholar"]["status"] == "ok"
+    assert all(r["backends"] == ["semantic_scholar"] for r in results) and len(results) == 3
+
+
+def test_quorum_returns_early_and_all_backends_fused_otherwise(monkeypatch):
+    release = _fake_backends(monkeypatch, blocked=("semantic_scholar",))
+    results, report = fo.fan_out("q", "medical", 2, secrets={}, quorum=1)
+    assert report["semantic_scholar"]["status"] == "pending"
+    release.set()
+    fo.wait_stragglers()
+
+    _fake_backends(monkeypatch)
+    results, report = fo.fan_out("q", "medical", 4, secrets={})
+    assert {r["backends"][0] for r in results} == {"pubmed", "semantic_scholar"}
+
+
+def test_wait_stragglers_lets_pending_backends_fill_the_cache(monkeypatch, tmp_path):
+    release = _fake_backends(monkeypatch, blocked=("semantic_scholar",))
+    with SearchCache(tmp_path) as cache:
+        _, report = fo.fan_out("q", "medical", 2, secrets={}, cache=cache, quorum=1)
+        assert report["semantic_scholar"]["status"] == "pending"
+        release.set()
+        fo.wait_stragglers()
+        assert cache.get("semantic_scholar", "q", 2) is not None
+    assert fo._STRAGGLERS == []
+
+
+def test_cache_hits_skip_backends(monkeypatch, tmp_path):
+    calls = []
+    _fake_backends(monkeypatch, calls=calls)
+    with SearchCache(tmp_path) as cache:
+        first, _ = fo.fan_out("battery recycling", "academic", 2, secrets={}, cache=cache)
+        second, report = fo.fan_out("recycling battery", "academic", 2, secrets={}, cache=cache)
+    assert sorted(calls) == ["arxiv", "semantic_scholar"]
+    assert {b["status"] for b in report.values()} == {"cached"}
+    assert second == first
+
+
+def test_web_backend_requires_engine_key(monkeypatch):
+    monkeypatch.setenv("RESEARCH_SEARCH_BACKENDS_WEB", "web,semantic_scholar")
+    _fake_backends(monkeypatch)
+    _, report = fo.fan_out("q", "web", 2, secrets={})
+    assert list(report) == ["semantic_scholar"]
+    _, report = fo.fan_out("q", "web", 2, secrets={"SERPER_API_KEY": "k"}, quorum=2)
+    assert report["web"]["provider"] == "serper"
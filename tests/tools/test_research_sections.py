@@ -0,0 +1,98 @@
+"""Unit tests for tools/research_sections.py."""
+import json
+
+from tools import research_sections as rs
+
+PAPER = """Deep Learning for Battery Health
+Jane Doe, John Roe
+University of Somewhere
+
+Abstract
+We study battery degradation in lithium cells.
+
+1. Introduction
+Batteries matter for grid storage.
+
+2 Methods
+We cycled 40 cells at 25C.
+
+Table 1: Cell capacity after cycling
+Cell  Cap
+A     0.88
+
+
+3. RESULTS
+Capacity fade averaged 12% after 500 cycles.
+
+4. Conclusions
+Fade is predictable from early cycles.
+
+References
+[1] Foo et al. 2020.
+"""
+
+
+def test_split_sections_paper_and_structured_abstract():
+    sections = rs.split_sections(PAPER)
+    assert [s["kind"] for s in sections] == [
+        "front", "abstract", "introduction", "methods", "tables", "results", "conclusions", "references",
+    ]
+    assert sections[4]["text"].startswith("Table 1") and "0.88" in sections[4]["text"]
+    assert rs.is_structured(sections)
+
+    pubmed = "BACKGROUND: Statins lower LDL. METHODS: 400 patients were randomised. RESULTS: LDL fell 30%."
+    assert [(s["kind"], s["heading"]) for s in rs.split_sections(pubmed)] == [
+        ("introduction", "BACKGROUND"), ("methods", "METHODS"), ("results", "RESULTS"),
+    ]
+    assert not rs.is_structured(rs.split_sections("Just a news article.\n\nWith two paragraphs."))
+
+
+def test_chunks_drop_front_matter_and_split_long_sections():
+    long_results = "Results\n" + " ".join(f"Sentence {i} reports a value." for i in range(200))
+    chunks = rs.chunk_sections(rs.split_sections(PAPER + "\n" + long_results), "sid", max_chars=500)
+    assert all(c["kind"] not in ("front", "references") for c in chunks)
+    assert all(len(c["text"]) <= 500 for c in chunks)
+    assert [c["id"] for c in chunks] == [f"sid:{i}" for i in range(len(chunks))]
+
+
+def test_index_and_select_relevant_chunks(tmp_path):
+    url = "https://arxiv.org/abs/2401.01234"
+    assert rs.index_source(tmp_path, url, {"text": "Plain page without headings. " * 50}) == []
+    chunks = rs.index_source(tmp_path, url, {"text": PAPER, "title": "Battery"})
+    assert chunks and rs.load_chunks(tmp_path, url="http://arxiv.org/pdf/2401.01234v2.pdf") == chunks
+
+    ctx = rs.section_context(tmp_path, "capacity fade after cycles", 200, url=url)
+    assert "Capacity fade averaged 12%" in ctx
+    assert "Jane Doe" not in ctx and "Foo et al" not in ctx
+    assert rs.section_context(tmp_path, "anything", 500, url="https://e.com/unindexed") == ""
+
+
+def test_select_truncates_best_chunk_instead_of_picking_unrelated_small_one():
+    results = "Battery recycling recovers cobalt and nickel at high yield. " * 21
+    chunks = [
+        {"id": "s:0", "kind": "methods", "heading": "Methods", "text": "Samples were stored at room temperature."},
+        {"id": "s:1", "kind": "results", "heading": "Results", "text": results},
+    ]
+    picked = rs.select_chunks(chunks, "battery recycling recovers cobalt", 600, require_match=True)
+    assert [c["id"] for c in picked] == ["s:1"]
+    assert 0 < len(picked[0]["text"]) <= 580 and "cobalt" in picked[0]["text"]
+    assert rs.select_chunks(chunks[:1], "battery recycling recovers cobalt", 600, require_match=True) == []
+
+
+def test_given_sections_from_source_file(tmp_path):
+    url = "https://pubmed.ncbi.nlm.nih.gov/123/"
+    sid = rs.source_id(url)
+    (tmp_path / "sources").mkdir()
+    (tmp_path / "sources" / f"{sid}.json").write_text(json.dumps({"url": url, "sections": [
+        {"kind": "methods", "heading": "METHODS", "text": "Randomised trial."},
+        {"kind": "results", "heading": "RESULTS", "text": "LDL fell by 30%."},
+    ]}))
+    chunks = rs.index_source(tmp_path, url, {"text": "PubMed page text without headings."})
+    assert [c["kind"] for c in chunks] == ["methods", "results"]
+
+
+def test_full_text_url(monkeypatch):
+    assert rs.full_text_url("https://arxiv.org/abs/2401.01234v3") == "https://arxiv.org/pdf/2401.01234.pdf"
+    assert rs.full_text_url("https://e.com/a") == "https://e.com/a"
+    monkeypatch.setenv("RESEARCH_ARXIV_FULLTEXT", "0")
+    assert rs.full_text_url("https://arxiv.org/abs/2401.01234") == "https://arxiv.org/abs/2401.01234"
@@ -0,0 +1,99 @@
+"""Unit tests for tools/research_source_identity.py."""
+import json
+
+import pytest
+
+from tools import research_source_identity as si
+
+
+@pytest.mark.parametrize("variant", [
+    "https://example.com/article",
+    "http://example.com/article/",
+    "https://www.example.com/article?utm_source=x&utm_medium=y",
+    "https://m.example.com/article#comments",
+    "https://example.com/article/amp",
+    "https://example.com:443/article?fbclid=abc",
+    "https://example-com.cdn.ampproject.org/c/s/example.com/article",
+])
+def test_canonical_url_variants(variant):
+    assert si.canonical_url(variant) == "https://example.com/article"
+    assert si.source_id(variant) == si.source_id("https://example.com/article")
+
+
+def test_canonical_url_keeps_meaningful_query_and_special_hosts():
+    assert si.canonical_url("https://e.com/s?b=2&a=1&utm_campaign=z") == "https://e.com/s?a=1&b=2"
+    assert si.canonical_url("https://e.com/s?id=1") != si.canonical_url("https://e.com/s?id=2")
+    assert si.canonical_url("http://arxiv.org/pdf/2401.01234v2.pdf") == "https://arxiv.org/abs/2401.01234"
+    assert si.canonical_url("https://arxiv.org/abs/2401.01234v1") == "https://arxiv.org/abs/2401.01234"
+    assert si.canonical_url("http://dx.doi.org/10.1000/ABC.123") == "https://doi.org/10.1000/abc.123"
+    assert si.extract_doi("https://doi.org/10.1000/abc.123") == "10.1000/abc.123"
+    assert si.canonical_url("not a url") == "not a url"
+    assert si.canonical_url("https://github.com/o/r/blob/x.md?ref=v2") != si.canonical_url("https://github.com/o/r/blob/x.md")
+
+
+def test_save_source_reuses_legacy_id(tmp_path):
+    sources = tmp_path / "sources"
+    sources.mkdir()
+    legacy = sources / f"{si.legacy_source_id('http://www.e.com/a/')}.json"
+    legacy.write_text(json.dumps({"url": "http://www.e.com/a/"}))
+    with si.open_index(tmp_path) as index:
+        fid = index.save_source({"url": "https://e.com/a", "title": "new"})
+    assert sorted(p.name for p in sources.glob("*.json")) == [legacy.name]
+    assert fid == legacy.stem and json.loads(legacy.read_text())["title"] == "new"
+
+
+def test_unique_count_merges_legacy_and_doi(tmp_path):
+    sources = tmp_path / "sources"
+    sources.mkdir()
+    # legacy writer: raw-URL id; new writer: canonical id of a URL variant
+    (sources / f"{si.legacy_source_id('http://www.e.com/a/')}.json").write_text(json.dumps({"url": "http://www.e.com/a/"}))
+    (sources / f"{si.source_id('https://e.com/a')}.json").write_text(json.dumps({"url": "https://e.com/a"}))
+    (sources / "x_content.json").write_text(json.dumps({"url": "https://e.com/a", "text": "t"}))
+    (sources / f"{si.source_id('https://e.com/b')}.json").write_text(json.dumps({"url": "https://e.com/b"}))
+    assert si.unique_source_count(tmp_path) == 2
+
+    with si.open_index(tmp_path) as index:
+        first = index.save_source({"url": "https://journal.org/p/1", "doi": "10.1038/Nature123"})
+        merged = index.save_source({"url": "https://arxiv.org/abs/1234.5678", "doi": "10.1038/nature123"})
+    assert merged == first
+    assert not (sources / f"{si.source_id('https://arxiv.org/abs/1234.5678')}.json").exists()
+    assert json.loads((sources / f"{first}.json").read_text())["doi"] == "10.1038/nature123"
+    assert si.unique_source_count(tmp_path) == 3
+
+    (sources / f"{first}.json").unlink()
+    assert si.unique_source_count(tmp_path) == 2
+
+
+def test_content_path_and_hash_duplicates(tmp_path):
+    sources = tmp_path / "sources"
+    sources.mkdir()
+    legacy = sources / f"{si.legacy_source_id('http://e.com/old/')}_content.json"
+    legacy.write_text("{}")
+    assert si.content_path(tmp_path, "http://e.com/old/") == legacy
+    assert si.content_path(tmp_path, "https://e.com/missing") is None
+
+    text = "same article text " * 20
+    with si.open_index(tmp_path) as index:
+        index.save_source({"url": "https://a.com/x"})
+        index.save_source({"url": "https://mirror.org/x"})
+        index.record(si.source_id("https://a.com/x"), "https://a.com/x", chash=si.content_hash(text))
+        index.record(si.source_id("https://mirror.org/x"), "https://mirror.org/x", chash=si.content_hash(text.upper()))
+        assert index.lookup(chash=si.content_hash(text)) == si.source_id("https://a.com/x")
+        assert index.unique_count() == 1
+    assert si.content_hash("short") == ""
+
+
+def test_global_index_reuses_content(tmp_path, monkeypatch):
+    url = "https://www.e.com/paper?utm_source=feed"
+    sid = si.source_id(url)
+    src = tmp_path / "proj-a" / "sources"
+    src.mkdir(parents=True)
+    (src / f"{sid}_content.json").write_text(json.dumps({"url": url, "text": "body"}))
+    index = si.open_global_index(tmp_path)
+    index.record(url, "proj-a", sid, doi="10.5555/y")
+    assert index.find_content("http://e.com/paper/")["text"] == "body"
+    assert index.find_content("https://other.org/copy", doi="10.5555/y")["text"] == "body"
+    assert index.find_content("https://other.org/copy") is None
+    monkeypatch.setenv("RESEARCH_SOURCE_REUSE_DAYS", "0")
+    assert index.find_content(url) is None
+    index.close()
@@ -0,0 +1,33 @@
+"""Streaming partial report: finished sections written immediately, unfinished ones marked pending."""
+from tools.synthesis.stream import (
+    PENDING_MARKER,
+    _clear_partial_report,
+    _load_partial_report,
+    _render_sections,
+    _write_partial_report,
+)
+
+
+def test_render_sections_marks_unfinished_as_pending():
+    out = _render_sections(["Intro", "Results", "Outlook"], ["Intro body."])
+    assert "## Intro\n\nIntro body." in out
+    assert f"## Results\n\n{PENDING_MARKER}" in out
+    assert f"## Outlook\n\n{PENDING_MARKER}" in out
+
+
+def test_partial_report_roundtrip_and_clear(tmp_project):
+    _write_partial_report(tmp_project, "# Research Report\n\n## Intro\n\nDone.", ["Methodology"])
+    text = _load_partial_report(tmp_project)
+    assert "Partial report" in text
+    assert "## Intro\n\nDone." in text
+    assert f"## Methodology\n\n{PENDING_MARKER}" in text
+    # Must not be picked up as a final report by report_*.md globs
+    assert not list((tmp_project / "reports").glob("report_*.md"))
+    _clear_partial_report(tmp_project)
+    assert _load_partial_report(tmp_project) == ""
+
+
+def test_critic_falls_back_to_partial_report(tmp_project):
+    from tools.research_critic import _load_report
+    _write_partial_report(tmp_project, "## Intro\n\nStreamed section.", [])
+    assert "Streamed section." in _load_report(tmp_project, None)
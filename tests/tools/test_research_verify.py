@@ -158,3 +158,21 @@ def test_build_claim_ledger_supporting_evidence_and_credibility(tmp_project):
         assert "snippet" in c["supporting_evidence"][0]
     assert "credibility_weight" in c
     assert 0 <= c["credibility_weight"] <= 1
+
+
+def test_fact_matcher_equals_pairwise_similarity():
+    """Indexed fact matching returns the same answer as the pairwise Jaccard scan."""
+    from tools.verify.ledger import _FactMatcher, _claim_fact_similarity
+    facts = [
+        {"statement": "Revenue grew 40% in Q3 2024", "verification_status": "confirmed"},
+        {"statement": "The trial enrolled 300 adults", "verification_status": "disputed"},
+        {"statement": "Unrelated statement about weather", "verification_status": "confirmed"},
+    ]
+    confirmed = _FactMatcher(facts, ("confirmed", "supported"))
+    claims = ["Revenue grew 40% in Q3 2024 per filings", "The trial enrolled 300 adults", "Nothing in common here"]
+    for claim in claims:
+        expected = any(
+            _claim_fact_similarity(claim, f["statement"]) >= 0.4
+            for f in facts if f["verification_status"] == "confirmed"
+        )
+        assert confirmed.matches(claim) is expected
@@ -33,3 +33,61 @@ def test_main_outputs_json_array_when_no_keys(monkeypatch):
     data = json.loads(out.getvalue())
     assert isinstance(data, list)
     assert data == []
+
+
+def _run_batch(monkeypatch, tmp_path, queries, extra=()):
+    qfile = tmp_path / "queries.json"
+    qfile.write_text(json.dumps({"queries": queries}))
+    monkeypatch.setattr("sys.argv", ["research_web_search.py", "--queries-file", str(qfile), *extra])
+    out = StringIO()
+    monkeypatch.setattr("sys.stdout", out)
+    from tools.research_web_search import main
+    main()
+    return json.loads(out.getvalue())
+
+
+def test_collapse_keeps_same_query_of_other_topic():
+    from tools.research_web_search import collapse_queries
+    queries = [
+        (1, {"query": "battery recycling costs", "topic_id": "t1"}),
+        (2, {"query": "Costs of battery recycling", "topic_id": "t1"}),
+        (3, {"query": "battery recycling costs", "topic_id": "t2"}),
+        (4, {"query": "battery recycling costs", "topic_id": "t1", "type": "academic"}),
+    ]
+    kept, dropped = collapse_queries(queries)
+    assert [i for i, _ in kept] == [1, 3, 4]
+    assert dropped == 1
+
+
+def test_batch_collapses_duplicates_and_uses_cache(monkeypatch, tmp_project, mock_env):
+    """Near-duplicate queries are dispatched once; a repeat run is served from the cache and accounted."""
+    import tools.research_web_search as ws
+    from tools.research_common import load_project
+    calls = []
+
+    def fake_brave(query, max_results=20):
+        calls.append(query)
+        return [{"url": f"https://example.com/{query.replace(' ', '-')}", "title": query, "source": "brave"}]
+
+    monkeypatch.setattr(ws, "load_secrets", lambda: {"BRAVE_API_KEY": "k"})
+    monkeypatch.setattr(ws, "search_brave", fake_brave)
+    monkeypatch.setattr(ws, "_progress_step", lambda *a: None)
+    queries = [
+        {"query": "battery recycling costs", "topic_id": "t1"},
+        {"query": "Costs of battery recycling", "topic_id": "t1"},
+        {"query": "grid storage", "topic_id": "t2"},
+    ]
+    first = _run_batch(monkeypatch, tmp_project.parent, queries)
+    assert sorted(calls) == ["battery recycling costs", "grid storage"]
+    assert len(first) == 2
+
+    second = _run_batch(monkeypatch, tmp_project.parent, queries)
+    assert len(calls) == 2
+    assert sorted(r["url"] for r in second) == sorted(r["url"] for r in first)
+    proj = load_project(tmp_project)
+    assert proj["api_cache_hits"]["brave_search"] == 2
+    assert proj["spend_breakdown"]["brave_search"] > 0
+    assert proj["api_cost_saved"] > 0
+
+    _run_batch(monkeypatch, tmp_project.parent, queries, extra=("--fresh",))
+    assert len(calls) == 4
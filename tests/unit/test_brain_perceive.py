@@ -46,3 +46,25 @@ def test_perceive_phase_ignores_missing_control_plane_log(mock_operator_root):
     assert "last_control_plane_event" not in state
     assert state["governance"]["level"] == 2
     assert "research_projects" in state
+
+
+def test_perceive_phase_counts_running_council_children(mock_operator_root, monkeypatch):
+    import lib.brain.perceive as perceive
+    research = mock_operator_root / "research"
+    monkeypatch.setattr(perceive, "RESEARCH", research)
+    projects = {
+        "proj-parent": {"status": "running", "phase": "explore", "council_status": "active"},
+        "proj-child1": {"status": "running", "phase": "focus", "parent_project_id": "proj-parent"},
+        "proj-child2": {"status": "failed_quality", "phase": "verify", "parent_project_id": "proj-parent"},
+        "proj-done": {"status": "done", "phase": "done"},
+    }
+    for pid, data in projects.items():
+        (research / pid).mkdir()
+        (research / pid / "project.json").write_text(json.dumps({"id": pid, **data}))
+
+    state = perceive_phase(_DummyMemory(), governance_level=2)
+
+    by_id = {p["id"]: p for p in state["research_projects"]}
+    assert by_id["proj-parent"]["council_children_running"] == 1
+    assert by_id["proj-child1"]["council_children_running"] == 0
+    assert state["research_projects"][-1]["id"] == "proj-done"
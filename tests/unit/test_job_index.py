@@ -0,0 +1,67 @@
+"""Unit tests for lib/job_index.py (SQLite index over jobs/*/*/job.json)."""
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from lib.job_index import JobIndex, open_index
+
+
+def _job(jobs, day, jid, status="DONE", workflow="wf-a", created="2026-01-01T00:00:00Z"):
+    d = jobs / day / jid
+    d.mkdir(parents=True, exist_ok=True)
+    job = {"id": jid, "workflow_id": workflow, "status": status, "created_at": created}
+    (d / "job.json").write_text(json.dumps(job))
+    return d, job
+
+
+def test_sync_indexes_existing_jobs_and_queries(tmp_path):
+    jobs = tmp_path / "jobs"
+    _job(jobs, "2026-01-01", "a1", "DONE", created="2026-01-01T01:00:00Z")
+    _job(jobs, "2026-01-01", "a2", "FAILED", created="2026-01-01T02:00:00Z")
+    _job(jobs, "2026-01-02", "b1", "RUNNING", "wf-b", created="2026-01-02T01:00:00Z")
+    _job(jobs, "2026-01-02", "b2", "FAILED", created="2026-01-02T02:00:00Z")
+    with open_index(jobs) as index:
+        assert [j["id"] for _d, j in index.latest(3)] == ["b2", "b1", "a2"]
+        assert index.get("a1")[0] == jobs / "2026-01-01" / "a1"
+        assert [j["id"] for _d, j in index.by_status("RUNNING")] == ["b1"]
+        assert index.status_counts() == {"DONE": 1, "FAILED": 2, "RUNNING": 1}
+        failures = index.failures_by_workflow(window=10)
+        assert [j["id"] for _d, j in failures["wf-a"]] == ["b2", "a2"]
+        assert index.failures_by_workflow(window=1) == {"wf-a": failures["wf-a"][:1]}
+        assert index.sync() == 0
+
+
+def test_sync_only_rescans_changed_days_and_open_jobs(tmp_path):
+    jobs = tmp_path / "jobs"
+    d_run, job = _job(jobs, "2026-01-01", "r1", "RUNNING")
+    _job(jobs, "2026-01-01", "d1", "DONE")
+    with open_index(jobs) as index:
+        _job(jobs, "2026-01-02", "n1", "CREATED")
+        job["status"] = "FAILED"
+        (d_run / "job.json").write_text(json.dumps(job) + " ")
+        assert index.sync() == 2
+        assert index.get("r1")[1]["status"] == "FAILED"
+        assert index.get("n1") is not None
+
+        pending = jobs / "2026-01-02" / "n2"
+        pending.mkdir()
+        index.sync()
+        (pending / "job.json").write_text(json.dumps({"id": "n2", "status": "CREATED", "created_at": "x"}))
+        os.utime(jobs / "2026-01-02", ns=(0, 0))
+        index.sync()
+        assert index.get("n2") is not None
+
+
+def test_record_updates_without_rescan(tmp_path):
+    jobs = tmp_path / "jobs"
+    d, job = _job(jobs, "2026-01-01", "x1", "CREATED")
+    with JobIndex(jobs) as index:
+        index.record(d, job)
+        job["status"] = "DONE"
+        (d / "job.json").write_text(json.dumps(job))
+        index.record(d, job)
+        assert index.get("x1")[1]["status"] == "DONE"
+        assert index.by_status("CREATED") == []
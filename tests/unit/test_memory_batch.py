@@ -0,0 +1,118 @@
+"""Unit tests for lib/memory/connection.py — Memory.batch() unit of work and the connection pool."""
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+import pytest
+from lib.memory import Memory
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_batch_defers_commit_until_exit(tmp_path):
+    """Writes inside batch() are invisible to other connections until the block ends."""
+    db = tmp_path / "operator.db"
+    mem = Memory(db_path=db)
+    with mem.batch():
+        mem.record_episode("test", "one")
+        mem.record_episode("test", "two")
+        assert len(mem.recent_episodes(kind="test")) == 2
+        assert _count(db, "episodes") == 0
+    assert _count(db, "episodes") == 2
+    mem.close()
+
+
+def test_batch_rolls_back_on_error(tmp_path):
+    """An exception inside batch() discards every write of the unit of work."""
+    db = tmp_path / "operator.db"
+    mem = Memory(db_path=db)
+    mem.record_episode("test", "kept")
+    with pytest.raises(RuntimeError):
+        with mem.batch():
+            mem.record_episode("test", "dropped")
+            mem.get_or_create_entities_bulk([{"name": "X", "type": "tech"}])
+            raise RuntimeError("boom")
+    assert [e["content"] for e in mem.recent_episodes(kind="test")] == ["kept"]
+    assert mem.get_entities() == []
+    mem.close()
+
+
+def test_batch_nested_commits_once(tmp_path):
+    """Nested batch() blocks commit only when the outermost block exits."""
+    db = tmp_path / "operator.db"
+    mem = Memory(db_path=db)
+    with mem.batch():
+        with mem.batch():
+            mem.insert_research_findings_bulk([{"project_id": "p", "finding_key": "k", "content_preview": "x"}])
+        assert _count(db, "research_findings") == 0
+    assert _count(db, "research_findings") == 1
+    mem.record_episode("test", "after")
+    assert _count(db, "episodes") == 1
+    mem.close()
+
+
+def test_pool_reuses_connection_and_applies_pragmas(tmp_path):
+    """Memory() reuses a released connection; tuned pragmas are set on it."""
+    db = tmp_path / "operator.db"
+    mem = Memory(db_path=db)
+    conn = mem._conn
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    mem.close()
+    mem.close()  # idempotent
+    mem2 = Memory(db_path=db)
+    assert mem2._conn is conn
+    mem3 = Memory(db_path=db)  # pool has no idle connection left -> new one, no blocking
+    assert mem3._conn is not conn
+    mem2.close()
+    mem3.close()
+
+
+def test_pool_release_discards_uncommitted_work(tmp_path):
+    """A connection returned with an open transaction is rolled back, like close() would."""
+    db = tmp_path / "operator.db"
+    mem = Memory(db_path=db)
+    mem._conn.execute("INSERT INTO episodes (id, ts, kind, content) VALUES ('x', 't', 'test', 'pending')")
+    mem.close()
+    with Memory(db_path=db) as mem2:
+        assert mem2.recent_episodes(kind="test") == []
+
+
+def test_pool_threads_get_distinct_connections(tmp_path):
+    """Concurrent threads each hold their own connection and all writes land."""
+    import threading
+    db = tmp_path / "operator.db"
+    Memory(db_path=db).close()
+
+    def work(n):
+        for i in range(20):
+            with Memory(db_path=db) as mem:
+                mem.record_episode("thread", f"{n}-{i}")
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert _count(db, "episodes") == 80
+
+
+def test_pool_size_zero_disables_pooling(tmp_path, monkeypatch):
+    """MEMORY_DB_POOL_SIZE=0: close() really closes the connection."""
+    from lib.memory.connection import close_pools
+    monkeypatch.setenv("MEMORY_DB_POOL_SIZE", "0")
+    close_pools()
+    db = tmp_path / "operator.db"
+    mem = Memory(db_path=db)
+    conn = mem._conn
+    mem.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+    close_pools()
@@ -58,3 +58,80 @@ def test_entities_get_by_type_returns_created(memory_conn):
 def test_entities_get_relations_empty_returns_empty(memory_conn):
     """get_relations() on empty returns []."""
     assert Entities(memory_conn).get_relations(limit=10) == []
+
+
+def test_entities_get_or_create_bulk_matches_single(memory_conn):
+    """get_or_create_bulk reuses existing ids, dedupes within the batch and aligns ids with items."""
+    e = Entities(memory_conn)
+    existing = e.get_or_create("Alice", "person")
+    ids = e.get_or_create_bulk([
+        {"name": "Alice", "type": "person"},
+        {"name": " Acme ", "type": "org", "first_seen_project": "p1"},
+        {"name": "Acme", "type": "org"},
+        {"name": "Alice", "type": "concept"},
+        {"name": "", "type": "person"},
+    ])
+    assert ids[0] == existing
+    assert ids[1] == ids[2] and ids[1]
+    assert ids[3] not in ("", existing)
+    assert ids[4] == ""
+    assert e.get_or_create("Acme", "org") == ids[1]
+    assert memory_conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 3
+
+
+def test_entities_insert_mentions_bulk(memory_conn):
+    """insert_mentions_bulk writes one row per mention; get(project_id=...) sees the entities."""
+    e = Entities(memory_conn)
+    ids = e.get_or_create_bulk([{"name": "Alice", "type": "person"}, {"name": "Bob", "type": "person"}])
+    mids = e.insert_mentions_bulk([
+        {"entity_id": ids[0], "project_id": "p1", "finding_key": "k", "context_snippet": "x" * 2000},
+        {"entity_id": ids[0], "project_id": "p1", "finding_key": "k"},
+        {"entity_id": ids[1], "project_id": "p1"},
+    ])
+    assert len(set(mids)) == 3
+    assert memory_conn.execute("SELECT COUNT(*) FROM entity_mentions WHERE project_id = 'p1'").fetchone()[0] == 3
+    assert {r["name"] for r in e.get(project_id="p1")} == {"Alice", "Bob"}
+    assert e.insert_mentions_bulk([]) == []
+
+
+def test_entities_unique_name_type(memory_conn):
+    """entities has UNIQUE(name, type); the same name with another type is a separate entity."""
+    import sqlite3
+    ent = Entities(memory_conn)
+    a = ent.get_or_create("Mercury", "concept")
+    b = ent.get_or_create("Mercury", "org")
+    assert a != b
+    with pytest.raises(sqlite3.IntegrityError):
+        memory_conn.execute(
+            "INSERT INTO entities (id, name, type, created_at) VALUES ('dup', 'Mercury', 'concept', 't')"
+        )
+
+
+def test_entities_insert_relations_bulk_and_graph_queries(memory_conn):
+    """Bulk relations feed two_hop_paths (A->B->C without direct A->C) and degree_ranking."""
+    ent = Entities(memory_conn)
+    a, b, c, d = ent.get_or_create_bulk([{"name": n, "type": "concept"} for n in "ABCD"])
+    ent.insert_relations_bulk([
+        {"entity_a_id": a, "entity_b_id": b, "relation_type": "uses", "source_project": "p1"},
+        {"entity_a_id": b, "entity_b_id": c, "relation_type": "part_of", "source_project": "p1"},
+        {"entity_a_id": b, "entity_b_id": d, "relation_type": "part_of", "source_project": "p1"},
+        {"entity_a_id": a, "entity_b_id": d, "relation_type": "uses", "source_project": "p2"},
+    ])
+    paths = ent.two_hop_paths("p1")
+    assert [(p["name_a"], p["name_b"], p["name_c"], p["rel_bc"]) for p in paths] == [("A", "B", "C", "part_of")]
+    ranking = ent.degree_ranking("p1")
+    assert ranking[0]["name"] == "B" and ranking[0]["degree"] == 3
+    assert ent.two_hop_paths("p1", limit=0) == []
+
+
+def test_entities_project_graph_cache_refreshes_on_new_relation(memory_conn):
+    """A cached project graph is rebuilt when the project's relations change."""
+    ent = Entities(memory_conn)
+    a, b, c = ent.get_or_create_bulk([{"name": n, "type": "concept"} for n in "XYZ"])
+    ent.insert_relation(a, b, "uses", "p1")
+    g1 = ent.project_graph("p1", cache_key="db")
+    assert ent.project_graph("p1", cache_key="db") is g1
+    ent.insert_relation(b, c, "uses", "p1")
+    g2 = ent.project_graph("p1", cache_key="db")
+    assert g2 is not g1
+    assert [(p["name_a"], p["name_c"]) for p in ent.two_hop_paths("p1", cache_key="db")] == [("X", "Z")]
@@ -92,3 +92,17 @@ def test_research_findings_mark_cross_links_notified(memory_conn):
     rows = rf.get_cross_links_unnotified(limit=10)
     ids = [r["id"] for r in rows]
     assert lid not in ids
+
+
+def test_research_findings_insert_bulk(memory_conn):
+    """insert_bulk stores all rows with insert()'s defaults (state normalisation, preview cap)."""
+    rf = ResearchFindings(memory_conn)
+    ids = rf.insert_bulk([
+        {"project_id": "p1", "finding_key": "k1", "content_preview": "a" * 5000, "admission_state": "ACCEPTED"},
+        {"project_id": "p1", "finding_key": "k2", "content_preview": "b", "admission_state": "bogus", "url": "https://x"},
+    ])
+    assert len(set(ids)) == 2
+    rows = {r["finding_key"]: dict(r) for r in memory_conn.execute("SELECT * FROM research_findings").fetchall()}
+    assert rows["k1"]["admission_state"] == "accepted" and len(rows["k1"]["content_preview"]) == 4000
+    assert rows["k2"]["admission_state"] == "quarantined" and rows["k2"]["url"] == "https://x"
+    assert rf.insert_bulk([]) == []
@@ -44,3 +44,80 @@ def test_migrate_on_existing_db_no_crash(memory_conn):
     """DB with tables already; init_schema(conn) again: no crash, migration runs."""
     init_schema(memory_conn)
     init_schema(memory_conn)
+
+
+def test_init_schema_records_version_and_skips_when_current(memory_conn, monkeypatch):
+    """init_schema stores SCHEMA_VERSION; a DB at the current version does not re-run migrations."""
+    from lib.memory import schema
+    assert schema.schema_version(memory_conn) == schema.SCHEMA_VERSION
+    monkeypatch.setattr(schema, "apply_schema", lambda conn: pytest.fail("migrations re-ran"))
+    init_schema(memory_conn)
+
+
+def test_init_schema_migrates_older_version(memory_conn):
+    """A DB below SCHEMA_VERSION (e.g. pre-versioning user_version=0) is migrated and stamped."""
+    from lib.memory import schema
+    memory_conn.execute("PRAGMA user_version = 0")
+    memory_conn.execute("DROP INDEX idx_read_urls_signature")
+    memory_conn.execute("ALTER TABLE read_urls DROP COLUMN question_signature")
+    init_schema(memory_conn)
+    cols = {row[1] for row in memory_conn.execute("PRAGMA table_info(read_urls)").fetchall()}
+    assert "question_signature" in cols
+    assert schema.schema_version(memory_conn) == schema.SCHEMA_VERSION
+
+
+def test_migrate_read_urls_token_index_backfills(memory_conn):
+    """Signatures recorded before the token index existed are indexed on upgrade."""
+    from lib.memory import schema
+    memory_conn.execute(
+        "INSERT INTO read_urls (question_hash, url, created_at, question_signature) VALUES ('h', 'https://a', 't', 'battery grid storage')"
+    )
+    memory_conn.execute("PRAGMA user_version = 2")
+    init_schema(memory_conn)
+    rows = memory_conn.execute("SELECT token, token_count FROM read_url_signature_tokens ORDER BY token").fetchall()
+    assert [(r[0], r[1]) for r in rows] == [("battery", 3), ("grid", 3), ("storage", 3)]
+    df = dict(memory_conn.execute("SELECT token, signature_count FROM read_url_token_df").fetchall())
+    assert df == {"battery": 1, "grid": 1, "storage": 1}
+    assert schema.schema_version(memory_conn) == schema.SCHEMA_VERSION
+
+
+def test_migrate_entities_unique_merges_duplicates(memory_conn):
+    """Pre-constraint duplicate entities are merged into the oldest row; relations and mentions follow."""
+    memory_conn.execute("DROP INDEX idx_entities_name_type")
+    memory_conn.executemany(
+        "INSERT INTO entities (id, name, type, created_at) VALUES (?, 'Acme', 'org', ?)",
+        [("old", "2024-01-01"), ("new", "2024-02-01")],
+    )
+    memory_conn.execute(
+        "INSERT INTO entity_relations (id, entity_a_id, entity_b_id, relation_type, source_project, created_at) VALUES ('r', 'new', 'old', 'x', 'p', 't')"
+    )
+    memory_conn.execute("INSERT INTO entity_mentions (id, entity_id, project_id) VALUES ('m', 'new', 'p')")
+    memory_conn.execute("PRAGMA user_version = 3")
+    init_schema(memory_conn)
+    assert [r[0] for r in memory_conn.execute("SELECT id FROM entities WHERE name='Acme'").fetchall()] == ["old"]
+    assert tuple(memory_conn.execute("SELECT entity_a_id, entity_b_id FROM entity_relations").fetchone()) == ("old", "old")
+    assert memory_conn.execute("SELECT entity_id FROM entity_mentions").fetchone()[0] == "old"
+
+
+def test_memory_read_only_open(tmp_path):
+    """Memory(read_only=True) reads an existing DB without schema work and rejects writes."""
+    import sqlite3
+    from lib.memory import Memory
+    db = tmp_path / "operator.db"
+    with Memory(db_path=db) as mem:
+        mem.record_episode("test", "hello")
+    with Memory(db_path=db, read_only=True) as ro:
+        assert ro.read_only
+        assert [e["content"] for e in ro.recent_episodes(kind="test")] == ["hello"]
+        with pytest.raises(sqlite3.OperationalError):
+            ro.record_episode("test", "nope")
+
+
+def test_memory_read_only_falls_back_for_new_db(tmp_path):
+    """read_only on a missing DB falls back to a normal open that creates the schema."""
+    from lib.memory import Memory
+    db = tmp_path / "fresh.db"
+    with Memory(db_path=db, read_only=True) as mem:
+        assert not mem.read_only
+        assert mem.recent_episodes() == []
+    assert db.exists()
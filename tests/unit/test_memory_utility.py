@@ -102,3 +102,65 @@ def test_get_top_utility_without_memory_type(memory_conn):
     u.record_retrieval("reflection", "r1")
     rows = u.get_top_utility(memory_type=None, limit=10)
     assert len(rows) == 2
+
+
+def test_scores_match_get_resolution(memory_conn):
+    """scores() resolves context row, then global row, then 0.5 — same as get() per id."""
+    u = UtilityTracker(memory_conn)
+    u.record_retrieval("principle", "a", context_key="Ctx")
+    u.record_retrieval("principle", "b")
+    u.update_from_outcome("principle", ["a"], 0.9, context_key="ctx")
+    u.update_from_outcome("principle", ["b"], 0.1)
+    scores = u.scores("principle", ["a", "b", "c"], context_key="ctx")
+    for mid in ("a", "b"):
+        assert abs(scores[mid] - u.get("principle", mid, context_key="ctx")["utility_score"]) < 1e-9
+    assert scores["c"] == 0.5
+
+
+def test_record_retrievals_matches_single_calls(memory_conn):
+    """record_retrievals(ids) leaves the same counts as record_retrieval per id."""
+    u = UtilityTracker(memory_conn)
+    u.record_retrieval("finding", "x", context_key="q")
+    u.record_retrievals("finding", ["x", "y"], context_key="q")
+    assert u.get("finding", "x")["retrieval_count"] == 2
+    assert u.get("finding", "x", context_key="q")["retrieval_count"] == 2
+    assert u.get("finding", "y", context_key="q")["retrieval_count"] == 1
+    u.record_retrievals("finding", [])
+
+
+def test_utility_cache_hits_and_invalidation(memory_conn):
+    """Cached scores skip the DB; update_from_outcome invalidates the changed ids."""
+    from lib.memory.utility import UtilityCache
+    u = UtilityTracker(memory_conn, cache=UtilityCache())
+    u.record_retrievals("principle", ["a", "b"])
+    u.scores("principle", ["a", "b"])
+    statements = []
+    memory_conn.set_trace_callback(statements.append)
+    try:
+        assert u.scores("principle", ["a", "b"]) == {"a": 0.5, "b": 0.5}
+        assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    finally:
+        memory_conn.set_trace_callback(None)
+    u.update_from_outcome("principle", ["a"], 0.9)
+    assert abs(u.scores("principle", ["a"])["a"] - 2 / 3) < 1e-9
+
+
+def test_utility_cache_invalidated_by_context_retrieval(memory_conn):
+    """A retrieval that creates a context row drops the cached global fallback for that id."""
+    from lib.memory.utility import UtilityCache
+    u = UtilityTracker(memory_conn, cache=UtilityCache())
+    u.record_retrieval("principle", "a")
+    u.update_from_outcome("principle", ["a"], 0.9)
+    assert abs(u.scores("principle", ["a"], context_key="q")["a"] - 2 / 3) < 1e-9
+    u.record_retrieval("principle", "a", context_key="q")
+    assert u.scores("principle", ["a"], context_key="q")["a"] == 0.5
+    u.record_retrievals("principle", ["a"], context_key="r")
+    assert u.scores("principle", ["a"], context_key="r")["a"] == 0.5
+
+
+def test_utility_cache_ttl_zero_disables(memory_conn):
+    """ttl_s=0 never stores entries."""
+    from lib.memory.utility import UtilityCache
+    cache = UtilityCache(ttl_s=0)
+    cache.put("principle", "a", "", 0.7)
+    assert cache.get("principle", "a", "") is None
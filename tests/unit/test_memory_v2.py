@@ -144,3 +144,58 @@ def test_memory_v2_read_urls_signature_handles_reordered_question(tmp_path):
     urls = mem.get_read_urls_for_question("Improve EV fleet battery life how")
     mem.close()
     assert "https://example.com/a" in urls
+
+
+def test_memory_v2_read_urls_similar_lookup_uses_token_index(tmp_path):
+    mem = Memory(db_path=str(tmp_path / "operator.db"))
+    mem.record_read_urls("lithium battery recycling costs europe", ["https://example.com/close"])
+    mem.record_read_urls("lithium battery recycling costs asia", ["https://example.com/close2"])
+    mem.record_read_urls("vaccine trial safety outcomes", ["https://example.com/far"])
+    mem.record_read_urls("lithium battery recycling costs europe", ["https://example.com/close3"])
+    df = dict(mem._conn.execute("SELECT token, signature_count FROM read_url_token_df").fetchall())
+    assert df["lithium"] == 2 and df["europe"] == 1 and df["vaccine"] == 1
+    urls = mem.get_read_urls_for_question("recycling costs of lithium battery in europe")
+    mem.close()
+    assert {"https://example.com/close", "https://example.com/close2", "https://example.com/close3"} <= urls
+    assert "https://example.com/far" not in urls
+
+
+def _feature_rows(mem):
+    return {r[0] for r in mem._conn.execute("SELECT strategy_profile_id FROM strategy_features").fetchall()}
+
+
+def test_memory_v2_strategy_features_materialised_and_invalidated(tmp_path):
+    mem = Memory(db_path=str(tmp_path / "operator.db"))
+    sid = mem.upsert_strategy_profile("energy-default", "energy", {"preferred_query_types": {"web": 1.0}}, score=0.6)
+    mem.record_run_episode(
+        project_id="proj-e1", question="grid storage costs", domain="energy", status="done", strategy_profile_id=sid,
+    )
+    assert sid not in _feature_rows(mem)
+    assert mem.select_strategy("grid storage battery costs", domain="energy")["id"] == sid
+    assert sid in _feature_rows(mem)
+
+    mem.record_run_episode(
+        project_id="proj-e2", question="battery storage", domain="energy", status="done", strategy_profile_id=sid,
+    )
+    assert sid not in _feature_rows(mem)
+    mem.select_strategy("grid storage", domain="energy")
+    mem.upsert_strategy_profile("energy-default", "energy", {"preferred_query_types": {"academic": 1.0}}, score=0.7)
+    assert sid not in _feature_rows(mem)
+    assert mem.refresh_strategy_features() == 1
+    assert sid in _feature_rows(mem)
+    mem.close()
+
+
+def test_memory_v2_fail_code_block_uses_materialised_features(tmp_path):
+    mem = Memory(db_path=str(tmp_path / "operator.db"))
+    blocked = mem.upsert_strategy_profile("medical-blocked", "medical", {"focus": "trials"}, score=0.9)
+    ok = mem.upsert_strategy_profile("medical-ok", "medical", {"focus": "trials"}, score=0.5)
+    mem.record_run_episode(
+        project_id="proj-m1", question="vaccine trial safety", domain="medical", status="failed",
+        strategy_profile_id=blocked, fail_codes=["safety_filter_block"],
+    )
+    mem.refresh_strategy_features()
+    for _ in range(2):  # cold and warm path agree
+        selected = mem.select_strategy("vaccine trial safety", domain="medical")
+        assert selected is not None and selected["id"] == ok
+    mem.close()
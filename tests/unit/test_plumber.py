@@ -1,4 +1,4 @@
-"""Unit tests for lib/plumber.py — classify_non_repairable (pure function, no I/O)."""
+"""Unit tests for lib/plumber — classify_non_repairable (pure) and tool/script diagnostics (hash cache, batched import checks)."""
 import sys
 from pathlib import Path
 
@@ -50,3 +50,137 @@ def test_classify_repairable_returns_none():
 def test_classify_empty_string_returns_none():
     """Empty or whitespace-only error text returns None."""
     assert classify_non_repairable("") is None
+
+
+# --- diagnose_python_tools / diagnose_shell_scripts (hash cache, batched checks) ---
+
+@pytest.fixture
+def plumber_root(tmp_path, monkeypatch):
+    from lib.plumber import constants
+    (tmp_path / "tools").mkdir()
+    (tmp_path / "workflows").mkdir()
+    monkeypatch.setattr(constants, "BASE", tmp_path)
+    monkeypatch.setattr(constants, "TOOLS", tmp_path / "tools")
+    monkeypatch.setattr(constants, "WORKFLOWS", tmp_path / "workflows")
+    monkeypatch.setattr(constants, "VENV", tmp_path / ".venv")
+    monkeypatch.setattr(constants, "CHECK_CACHE", tmp_path / "plumber" / "check_cache.json")
+    monkeypatch.setattr(constants, "CHECK_WORKERS", 2)
+    return tmp_path
+
+
+def test_python_tools_checks_and_cache(plumber_root, monkeypatch):
+    from lib.plumber import checks, diagnose
+    tools = plumber_root / "tools"
+    (tools / "helper.py").write_text("VALUE = 1\n")
+    (tools / "good.py").write_text("from tools.helper import VALUE\n")
+    (tools / "broken.py").write_text("def f(:\n")
+    (tools / "missing.py").write_text("import no_such_module_xyz\n")
+    (tools / "exits.py").write_text("import os\nos._exit(3)\n")
+    (tools / "noisy.py").write_text("print('@@plumber-done {}')\n")
+
+    issues = diagnose.diagnose_python_tools()
+    by_file = {(Path(i["file"]).name, i["check"]): i for i in issues}
+    assert set(by_file) == {("broken.py", "compile"), ("missing.py", "import")}
+    assert by_file[("broken.py", "compile")]["severity"] == "critical"
+    assert "SyntaxError" in by_file[("broken.py", "compile")]["error"]
+    assert by_file[("missing.py", "import")]["severity"] == "critical"
+
+    compiled, imported = [], []
+    real_compile, real_import = checks.compile_many, checks.import_check_batch
+    monkeypatch.setattr(checks, "compile_many", lambda paths, workers=None, python=None: compiled.extend(p.name for p in paths) or real_compile(paths, workers, python))
+    monkeypatch.setattr(checks, "import_check_batch", lambda py, mods, timeout=None: imported.extend(mods) or real_import(py, mods, timeout))
+    assert diagnose.diagnose_python_tools() == issues
+    assert compiled == ["broken.py"]
+    assert imported == ["missing"]
+
+    # a changed dependency re-runs the import check of its importers
+    compiled.clear(), imported.clear()
+    (tools / "helper.py").write_text("VALUE = 2\n")
+    diagnose.diagnose_python_tools()
+    assert "helper.py" in compiled and "good.py" not in compiled
+    assert {"helper", "good"} <= set(imported)
+
+
+def test_import_cache_covers_transitive_deps_and_site_packages(plumber_root, monkeypatch):
+    from lib.plumber import checks, diagnose
+    tools, deep = plumber_root / "tools", plumber_root / "lib" / "deep"
+    deep.mkdir(parents=True)
+    (plumber_root / "lib" / "__init__.py").write_text("")
+    (deep / "__init__.py").write_text("from .leaf import V\n")
+    (deep / "leaf.py").write_text("V = 1\n")
+    (tools / "helper.py").write_text("from lib.deep import V\n")
+    (tools / "good.py").write_text("from tools.helper import V\n")
+    assert diagnose.diagnose_python_tools() == []
+
+    imported = []
+    real_import = checks.import_check_batch
+    monkeypatch.setattr(checks, "import_check_batch", lambda py, mods, timeout=None: imported.extend(mods) or real_import(py, mods, timeout))
+    assert diagnose.diagnose_python_tools() == [] and imported == []
+
+    # a module reached only through lib/deep/__init__.py breaks: both tools are rechecked and fail
+    (deep / "leaf.py").write_text("import no_such_module_xyz\nV = 1\n")
+    issues = diagnose.diagnose_python_tools()
+    assert {Path(i["file"]).name for i in issues} == {"helper.py", "good.py"}
+    (deep / "leaf.py").write_text("V = 1\n")
+    assert diagnose.diagnose_python_tools() == []
+
+    # installed packages changed: cached clean imports are no longer trusted
+    imported.clear()
+    monkeypatch.setattr(checks, "site_fingerprint", lambda python: "changed")
+    diagnose.diagnose_python_tools()
+    assert set(imported) == {"helper", "good"}
+
+
+def test_import_batch_timeout_continues(plumber_root):
+    from lib.plumber import checks
+    tools = plumber_root / "tools"
+    (tools / "slow.py").write_text("import time\ntime.sleep(30)\n")
+    (tools / "after.py").write_text("import no_such_module_xyz\n")
+    res = checks.import_check_batch(sys.executable, ["slow", "after"], timeout=1)
+    assert res["slow"]["timeout"] is True
+    assert "ModuleNotFoundError" in res["after"]["error"]
+
+
+def test_import_batch_isolates_side_effects(plumber_root):
+    from lib.plumber import checks
+    tools = plumber_root / "tools"
+    (tools / "a_stubber.py").write_text("import sys, types\nsys.modules['no_such_module_xyz'] = types.ModuleType('x')\n")
+    (tools / "b_path.py").write_text("import sys\nsys.path.insert(0, '/nonexistent')\n")
+    (tools / "c_needs.py").write_text("import no_such_module_xyz\n")
+    (tools / "d_fails_after.py").write_text("import sys\nif 'tools.a_stubber' in sys.modules: raise ImportError('side effect')\n")
+    (tools / "e_env.py").write_text("import os\nos.environ['PLUMBER_T'] = '1'\n")
+    (tools / "f_env_fails.py").write_text("import os\nif os.environ.get('PLUMBER_T'): raise ImportError('env')\n")
+    res = checks.import_check_batch(sys.executable, ["a_stubber", "b_path", "c_needs", "d_fails_after", "e_env", "f_env_fails"])
+    assert res["a_stubber"]["error"] is None and res["b_path"]["error"] is None
+    assert "ModuleNotFoundError" in res["c_needs"]["error"]
+    assert res["d_fails_after"]["error"] is None
+    assert res["f_env_fails"]["error"] is None  # failed in the batch, passes alone
+
+
+def test_compile_in_tool_interpreter(plumber_root):
+    from lib.plumber import checks
+    tools = plumber_root / "tools"
+    (tools / "ok.py").write_text("from tools.helper import X\n")
+    (tools / "helper.py").write_text("X = 1\n")
+    (tools / "bad.py").write_text("def f(:\n")
+    res = {Path(r["file"]).name: r for r in checks.compile_in(sys.executable, [tools / "ok.py", tools / "bad.py"], str(plumber_root))}
+    assert res["ok.py"]["error"] is None and res["ok.py"]["deps"] == [str(tools / "helper.py")]
+    assert "SyntaxError" in res["bad.py"]["error"] and res["bad.py"]["sha"]
+    assert checks.same_interpreter(sys.executable)
+
+
+def test_shell_scripts_parallel_and_cached(plumber_root, monkeypatch):
+    from lib.plumber import diagnose
+    wf = plumber_root / "workflows"
+    (wf / "a.sh").write_text("echo ok\n")
+    (wf / "b.sh").write_text("if true; then\n")
+    scripts = sorted(wf.glob("*.sh"))
+    diags = diagnose.diagnose_shell_scripts(scripts)
+    assert [d["ok"] for d in diags] == [True, False]
+    assert diags[1]["script"] == str(wf / "b.sh")
+
+    calls = []
+    real = diagnose.diagnose_shell_syntax
+    monkeypatch.setattr(diagnose, "diagnose_shell_syntax", lambda s: calls.append(s.name) or real(s))
+    assert [d["ok"] for d in diagnose.diagnose_shell_scripts(scripts)] == [True, False]
+    assert calls == ["b.sh"]
@@ -5,6 +5,7 @@ Offline memory consolidation job (wake-sleep style).
 What it does:
 - Build/update empirical strategy profiles from run_episodes per domain.
 - Synthesize conservative guiding/cautionary principles from repeated what_helped/what_hurt signals.
+- Refresh materialised strategy-selection features (strategy_features).
 - Run Auto-Prompt Optimization: mutate and test system prompts to find the best instructions.
 - Emit a summary JSON for observability.
 
@@ -194,6 +195,8 @@ def main() -> None:
                     "auto_prompt_optimization": prompt_opt
                 }
             )
+        # Strategy selection reads these materialised features instead of re-deriving them per call
+        summary["strategy_features_refreshed"] = mem.refresh_strategy_features()
         mem.record_memory_decision(
             decision_type="memory_consolidation_run",
             details=summary,
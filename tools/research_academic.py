@@ -28,7 +28,7 @@ def fetch_json(url: str, headers: dict | None = None, timeout: int = 15) -> dict
 
 
 def semantic_scholar(query: str, max_results: int = 10) -> list[dict]:
-    url = f"https://api.semanticscholar.org/graph/v1/paper/search?query={quote(query)}&limit={min(max_results, 100)}&fields=title,url,abstract,year,authors,venue"
+    url = f"https://api.semanticscholar.org/graph/v1/paper/search?query={quote(query)}&limit={min(max_results, 100)}&fields=title,url,abstract,year,authors,venue,externalIds"
     try:
         data = fetch_json(url)
     except Exception as e:
@@ -43,6 +43,7 @@ def semantic_scholar(query: str, max_results: int = 10) -> list[dict]:
             "year": p.get("year"),
             "authors": [a.get("name") for a in p.get("authors", [])],
             "venue": p.get("venue", ""),
+            "doi": ((p.get("externalIds") or {}).get("DOI") or "").lower(),
             "source": "semantic_scholar",
         })
     return results
@@ -66,14 +67,18 @@ def arxiv(query: str, max_results: int = 10) -> list[dict]:
                 if e.get("type") == "text/html":
                     link = e.get("href", "")
                     break
+            pdf_url = next((e.get("href", "") for e in entry.findall("atom:link", ns) if e.get("title") == "pdf"), "")
             summary = entry.findtext("atom:summary", "", ns) or ""
             summary = summary.replace("\n", " ").strip()[:2000]
             published = entry.findtext("atom:published", "", ns) or ""
+            doi = entry.findtext("{http://arxiv.org/schemas/atom}doi", "") or ""
             results.append({
                 "title": title,
                 "url": link,
                 "abstract": summary,
                 "published": published[:10] if published else "",
+                "doi": doi.strip().lower(),
+                "pdf_url": pdf_url,
                 "source": "arxiv",
             })
         return results
@@ -88,8 +93,9 @@ def _ncbi_api_key_param() -> str:
     return f"&api_key={key}" if key else ""
 
 
-def _pubmed_fetch_abstracts(id_list: list[str]) -> dict[str, str]:
-    """Fetch abstracts for PubMed IDs via efetch XML API."""
+def _pubmed_fetch_abstracts(id_list: list[str], sections_out: dict | None = None) -> dict[str, str]:
+    """Fetch abstracts for PubMed IDs via efetch XML API. Labelled parts of structured abstracts
+    (BACKGROUND, METHODS, RESULTS, ...) also go to sections_out[pmid] as research_sections sections."""
     if not id_list:
         return {}
     base = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
@@ -106,15 +112,22 @@ def _pubmed_fetch_abstracts(id_list: list[str]) -> dict[str, str]:
                 continue
             pmid = pmid_el.text or ""
             abstract_parts = []
+            sections = []
             for text_el in article.findall(".//AbstractText"):
                 label = text_el.get("Label", "")
                 content = (text_el.text or "").strip()
                 if label and content:
                     abstract_parts.append(f"{label}: {content}")
+                    kind = (text_el.get("NlmCategory") or "").lower()
+                    kind = {"background": "introduction", "objective": "introduction", "conclusions": "conclusions",
+                            "methods": "methods", "results": "results"}.get(kind, "abstract")
+                    sections.append({"kind": kind, "heading": label, "text": content})
                 elif content:
                     abstract_parts.append(content)
             if abstract_parts:
                 abstracts[pmid] = " ".join(abstract_parts)[:3000]
+            if sections and sections_out is not None:
+                sections_out[pmid] = sections
     except Exception as e:
         print(f"WARN: PubMed efetch: {e}", file=sys.stderr)
     return abstracts
@@ -131,12 +144,17 @@ def pubmed(query: str, max_results: int = 10) -> list[dict]:
             return []
         summary_url = f"{base}/esummary.fcgi?db=pubmed&id={','.join(id_list)}&retmode=json{api_key}"
         sum_data = fetch_json(summary_url)
-        abstracts = _pubmed_fetch_abstracts(id_list)
+        sections: dict[str, list] = {}
+        abstracts = _pubmed_fetch_abstracts(id_list, sections)
         results = []
         for uid in id_list:
             s = sum_data.get("result", {}).get(uid, {})
             authors = s.get("authors", [])
             author_names = [a.get("name", "") if isinstance(a, dict) else str(a) for a in authors]
+            doi = next(
+                (a.get("value", "") for a in s.get("articleids", []) if isinstance(a, dict) and a.get("idtype") == "doi"),
+                "",
+            )
             results.append({
                 "title": s.get("title", ""),
                 "url": f"https://pubmed.ncbi.nlm.nih.gov/{uid}/",
@@ -146,7 +164,9 @@ def pubmed(query: str, max_results: int = 10) -> list[dict]:
                 "authors": author_names,
                 "source": "pubmed",
                 "pmid": uid,
+                "doi": doi.lower(),
                 "source_quality": "peer_reviewed",
+                **({"sections": sections[uid]} if uid in sections else {}),
             })
         return results
     except Exception as e:
@@ -11,6 +11,8 @@ import sys
 from pathlib import Path
 from datetime import datetime, timezone
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 
 def advance(proj_dir: Path, new_phase: str) -> None:
     p = proj_dir / "project.json"
@@ -57,6 +59,11 @@ def advance(proj_dir: Path, new_phase: str) -> None:
         d["completed_at"] = now_str
 
     p.write_text(json.dumps(d, indent=2))
+    try:
+        from tools.research_project_catalog import record_project
+        record_project(proj_dir, d)
+    except ImportError:
+        pass
 
 
 def main() -> None:
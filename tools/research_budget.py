@@ -72,18 +72,27 @@ def track_usage(project_id: str, model: str, input_tokens: int, output_tokens: i
     return data["current_spend"]
 
 
-def track_api_call(project_id: str, api_name: str, count: int = 1) -> float:
-    """Track API cost (web search, reader, etc.) and add to project spend. Returns new current_spend."""
+def track_api_call(project_id: str, api_name: str, count: int = 1, cache_hits: int = 0) -> float:
+    """Track API cost (web search, reader, etc.) and add to project spend. Returns new current_spend.
+
+    cache_hits: calls answered from a local cache instead; recorded in api_cache_hits and, at the
+    price of the call, in api_cost_saved (not added to current_spend)."""
     cost = API_COSTS.get(api_name, 0.0) * count
-    if cost <= 0:
+    if cost <= 0 and cache_hits <= 0:
         return load_project(project_dir(project_id)).get("current_spend", 0.0)
     proj_path = project_dir(project_id)
     data = load_project(proj_path)
-    data["current_spend"] = round(data.get("current_spend", 0.0) + cost, 8)
-    data.setdefault("spend_breakdown", {})
-    data["spend_breakdown"][api_name] = round(data["spend_breakdown"].get(api_name, 0.0) + cost, 8)
+    if cost > 0:
+        data["current_spend"] = round(data.get("current_spend", 0.0) + cost, 8)
+        data.setdefault("spend_breakdown", {})
+        data["spend_breakdown"][api_name] = round(data["spend_breakdown"].get(api_name, 0.0) + cost, 8)
+    if cache_hits > 0:
+        data.setdefault("api_cache_hits", {})
+        data["api_cache_hits"][api_name] = data["api_cache_hits"].get(api_name, 0) + cache_hits
+        saved = API_COSTS.get(api_name, 0.0) * cache_hits
+        data["api_cost_saved"] = round(data.get("api_cost_saved", 0.0) + saved, 8)
     save_project(proj_path, data)
-    return data["current_spend"]
+    return data.get("current_spend", 0.0)
 
 
 def check_budget(project_id: str) -> dict:
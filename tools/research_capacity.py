@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Global research capacity manager (research/capacity.db, shared by all processes on the box).
+
+Research cycles and sandbox runs are queued as leases with a resource demand: CPU slots, memory,
+LLM tokens-per-minute and (optionally) estimated USD. admit() moves queued leases to running in
+priority order while the running total fits the capacity; a lease that does not fit stays queued
+and smaller ones may pass it. Priority is the expected information gain of the parent project
+(research_token_governor.expected_ig_heuristic); at most RESEARCH_CAPACITY_MAX_PER_PARENT leases of one
+parent run at a time, so a council spawning six children does not take every slot. Work for a parent
+that is over budget is not queued.
+
+Running leases are released explicitly, or by reap() once their process is gone, their project has
+reached a terminal phase, or their heartbeat is older than RESEARCH_CAPACITY_LEASE_HOURS. Research
+cycles run through the control plane without a pid of their own; their project's progress.json
+(written on every step) is their heartbeat, and they are released once it is older than
+RESEARCH_CAPACITY_STALL_MINUTES.
+
+Env:
+  RESEARCH_CAPACITY=0                 disable (callers dispatch directly, as before)
+  RESEARCH_CAPACITY_CPU               CPU slots (default: cpu count)
+  RESEARCH_CAPACITY_MEMORY_MB         memory for admitted work (default: 75% of MemTotal)
+  RESEARCH_CAPACITY_LLM_TPM=400000    LLM tokens per minute across running work
+  RESEARCH_CAPACITY_BUDGET_USD=0      USD estimate of running work (0 = no limit)
+  RESEARCH_CAPACITY_MAX_PER_PARENT=3
+  RESEARCH_CAPACITY_LEASE_HOURS=6
+  RESEARCH_CAPACITY_STALL_MINUTES=60  research cycle without project activity for this long is released
+  RESEARCH_CAPACITY_SANDBOX_WAIT=900  seconds research_experiment waits for a sandbox slot
+
+Usage:
+  research_capacity.py status | reap | drain
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CAPACITY_FILE = "capacity.db"
+RESOURCES = ("cpu", "memory_mb", "tpm", "budget_usd")
+DEMANDS = {
+    "research_cycle": {"cpu": 1.0, "memory_mb": 1024.0, "tpm": 20000.0, "budget_usd": 0.5},
+    "sandbox": {"cpu": 1.0, "memory_mb": 512.0, "tpm": 0.0, "budget_usd": 0.0},
+}
+DEFAULT_TPM = 400000.0
+DEFAULT_MAX_PER_PARENT = 3
+DEFAULT_LEASE_HOURS = 6.0
+DEFAULT_STALL_MINUTES = 60.0
+QUEUE_TTL_HOURS = 48.0
+TERMINAL_PHASES = ("done", "failed", "cancelled", "abandoned", "aborted")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS leases (
+        id           TEXT PRIMARY KEY,
+        kind         TEXT NOT NULL,
+        state        TEXT NOT NULL,
+        project_id   TEXT NOT NULL DEFAULT '',
+        parent_id    TEXT NOT NULL DEFAULT '',
+        priority     REAL NOT NULL DEFAULT 0,
+        cpu          REAL NOT NULL,
+        memory_mb    REAL NOT NULL,
+        tpm          REAL NOT NULL,
+        budget_usd   REAL NOT NULL,
+        pid          INTEGER NOT NULL DEFAULT 0,
+        payload_json TEXT NOT NULL DEFAULT '{}',
+        enqueued_at  REAL NOT NULL,
+        started_at   REAL,
+        heartbeat_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_leases_state ON leases(state, priority);
+"""
+
+
+def enabled() -> bool:
+    return os.environ.get("RESEARCH_CAPACITY", "1").strip().lower() not in ("0", "false", "no")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name) or default)
+    except ValueError:
+        return default
+
+
+def _meminfo_mb(field: str) -> float | None:
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def available_memory_mb() -> float | None:
+    """MemAvailable of the host, None when unknown (non-Linux)."""
+    return _meminfo_mb("MemAvailable")
+
+
+def capacity() -> dict:
+    total = _meminfo_mb("MemTotal")
+    return {
+        "cpu": _env_float("RESEARCH_CAPACITY_CPU", float(os.cpu_count() or 1)),
+        "memory_mb": _env_float("RESEARCH_CAPACITY_MEMORY_MB", total * 0.75 if total else 8192.0),
+        "tpm": _env_float("RESEARCH_CAPACITY_LLM_TPM", DEFAULT_TPM),
+        "budget_usd": _env_float("RESEARCH_CAPACITY_BUDGET_USD", 0.0),
+    }
+
+
+def expected_gain(project_id: str) -> float:
+    """Expected information gain of a project (token governor heuristic); 0.0 when unknown."""
+    if not project_id:
+        return 0.0
+    try:
+        from tools.research_token_governor import expected_ig_heuristic
+        return float(expected_ig_heuristic(project_id))
+    except Exception:
+        return 0.0
+
+
+def parent_within_budget(parent_id: str) -> bool:
+    if not parent_id:
+        return True
+    try:
+        from tools.research_token_governor import within_budget
+        return within_budget(parent_id, "followup")
+    except Exception:
+        return True
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _default_root() -> Path:
+    from tools.research_common import research_root
+    return research_root()
+
+
+class CapacityManager:
+    def __init__(self, root: Path | None = None):
+        self.root = Path(root) if root else _default_root()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.root / CAPACITY_FILE), timeout=30, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict | None = None,
+        project_id: str = "",
+        parent_id: str = "",
+        priority: float | None = None,
+        demand: dict | None = None,
+    ) -> str:
+        """Queue one unit of work; returns the lease id, or "" when the parent is over budget."""
+        if not parent_within_budget(parent_id):
+            return ""
+        need = {**DEMANDS.get(kind, DEMANDS["research_cycle"]), **(demand or {})}
+        if priority is None:
+            priority = expected_gain(parent_id or project_id)
+        lease_id = uuid.uuid4().hex[:16]
+        self._conn.execute(
+            """INSERT INTO leases (id, kind, state, project_id, parent_id, priority, cpu, memory_mb, tpm, budget_usd,
+                                   payload_json, enqueued_at)
+               VALUES (?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (lease_id, kind, project_id, parent_id, float(priority), need["cpu"], need["memory_mb"], need["tpm"],
+             need["budget_usd"], json.dumps(payload or {}, ensure_ascii=False), time.time()),
+        )
+        return lease_id
+
+    def _finished(self, row: sqlite3.Row, now: float, lease_ttl: float, stall_ttl: float) -> bool:
+        if row["pid"] and not _pid_alive(row["pid"]):
+            return True
+        beat = row["heartbeat_at"] or row["started_at"] or now
+        if row["project_id"] and row["kind"] == "research_cycle":
+            proj = self.root / row["project_id"]
+            try:
+                phase = json.loads((proj / "project.json").read_text()).get("phase", "")
+            except (OSError, ValueError):
+                phase = ""
+            if phase in TERMINAL_PHASES:
+                return True
+            if not row["pid"]:
+                return now - max(beat, _mtime(proj / "progress.json"), _mtime(proj / "project.json")) > stall_ttl
+        return now - beat > lease_ttl
+
+    def _reap(self) -> int:
+        now = time.time()
+        lease_ttl = _env_float("RESEARCH_CAPACITY_LEASE_HOURS", DEFAULT_LEASE_HOURS) * 3600
+        stall_ttl = _env_float("RESEARCH_CAPACITY_STALL_MINUTES", DEFAULT_STALL_MINUTES) * 60
+        gone = [r["id"] for r in self._conn.execute("SELECT * FROM leases WHERE state = 'running'")
+                if self._finished(r, now, lease_ttl, stall_ttl)]
+        self._conn.executemany("DELETE FROM leases WHERE id = ?", [(i,) for i in gone])
+        cur = self._conn.execute("DELETE FROM leases WHERE state = 'queued' AND enqueued_at < ?",
+                                 (now - QUEUE_TTL_HOURS * 3600,))
+        return len(gone) + cur.rowcount
+
+    def reap(self) -> int:
+        """Release finished or stale running leases and drop expired queue entries."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            n = self._reap()
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return n
+
+    def admit(self, kind: str | None = None, limit: int = 0, only: str = "") -> list[dict]:
+        """Move queued leases (of kind) that fit the free capacity to running, best priority first.
+        With only, just that lease is admitted; better-ranked leases that fit keep their share reserved."""
+        cap = capacity()
+        max_per_parent = int(_env_float("RESEARCH_CAPACITY_MAX_PER_PARENT", DEFAULT_MAX_PER_PARENT))
+        host_free = available_memory_mb()
+        admitted: list[dict] = []
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reap()
+            used = dict.fromkeys(RESOURCES, 0.0)
+            per_parent: dict[str, int] = {}
+            for r in self._conn.execute("SELECT * FROM leases WHERE state = 'running'"):
+                for res in RESOURCES:
+                    used[res] += r[res]
+                if r["parent_id"]:
+                    per_parent[r["parent_id"]] = per_parent.get(r["parent_id"], 0) + 1
+            queued = self._conn.execute(
+                "SELECT * FROM leases WHERE state = 'queued' ORDER BY priority DESC, enqueued_at ASC"
+            ).fetchall()
+            now = time.time()
+            for r in queued:
+                if kind and r["kind"] != kind:
+                    continue
+                if limit and len(admitted) >= limit:
+                    break
+                parent = r["parent_id"]
+                if parent and per_parent.get(parent, 0) >= max_per_parent:
+                    continue
+                if any(cap[res] > 0 and used[res] + r[res] > cap[res] for res in RESOURCES):
+                    continue
+                if host_free is not None and r["memory_mb"] > host_free:
+                    continue
+                for res in RESOURCES:
+                    used[res] += r[res]
+                if host_free is not None:
+                    host_free -= r["memory_mb"]
+                if parent:
+                    per_parent[parent] = per_parent.get(parent, 0) + 1
+                if only and r["id"] != only:
+                    continue
+                self._conn.execute(
+                    "UPDATE leases SET state = 'running', started_at = ?, heartbeat_at = ? WHERE id = ?",
+                    (now, now, r["id"]),
+                )
+                admitted.append({**dict(r), "state": "running", "payload": json.loads(r["payload_json"] or "{}")})
+                if only:
+                    break
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return admitted
+
+    def acquire(self, kind: str, project_id: str = "", parent_id: str = "", timeout: float = 600,
+                poll: float = 2.0, demand: dict | None = None) -> str:
+        """Queue and wait until admitted; the running lease id, or "" on timeout or budget rejection."""
+        lease_id = self.enqueue(kind, project_id=project_id, parent_id=parent_id, demand=demand)
+        if not lease_id:
+            return ""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.admit(kind, only=lease_id):
+                self.bind(lease_id, pid=os.getpid())
+                return lease_id
+            if time.monotonic() >= deadline:
+                self.release(lease_id)
+                return ""
+            time.sleep(poll)
+
+    def bind(self, lease_id: str, project_id: str = "", pid: int = 0) -> None:
+        """Attach the running work (child project, process) so reap() can tell when it ends."""
+        sets, args = ["heartbeat_at = ?"], [time.time()]
+        if project_id:
+            sets.append("project_id = ?")
+            args.append(project_id)
+        if pid:
+            sets.append("pid = ?")
+            args.append(pid)
+        self._conn.execute(f"UPDATE leases SET {', '.join(sets)} WHERE id = ?", (*args, lease_id))
+
+    def heartbeat(self, lease_id: str) -> None:
+        self._conn.execute("UPDATE leases SET heartbeat_at = ? WHERE id = ?", (time.time(), lease_id))
+
+    def release(self, lease_id: str) -> None:
+        self._conn.execute("DELETE FROM leases WHERE id = ?", (lease_id,))
+
+    def status(self) -> dict:
+        cap = capacity()
+        used = dict.fromkeys(RESOURCES, 0.0)
+        counts: dict[str, dict[str, int]] = {}
+        for r in self._conn.execute("SELECT * FROM leases"):
+            counts.setdefault(r["state"], {}).setdefault(r["kind"], 0)
+            counts[r["state"]][r["kind"]] += 1
+            if r["state"] == "running":
+                for res in RESOURCES:
+                    used[res] += r[res]
+        return {"capacity": cap, "used": {k: round(v, 3) for k, v in used.items()}, "leases": counts}
+
+
+def open_manager(root: Path | None = None) -> CapacityManager | None:
+    """Manager for the research root, or None when disabled or not openable (work is then dispatched directly)."""
+    if not enabled():
+        return None
+    try:
+        return CapacityManager(root)
+    except (sqlite3.Error, OSError):
+        return None
+
+
+def drain(manager: CapacityManager, kind: str, start: Callable[[dict], dict | None]) -> list[dict]:
+    """Admit queued work of kind and start it. start(lease) returns {"project_id"/"pid": ...} to bind
+    the lease to, or None on failure (the lease is released)."""
+    started = []
+    for lease in manager.admit(kind):
+        try:
+            bound = start(lease)
+        except Exception as e:
+            print(f"Capacity: failed to start {kind} {lease['id']}: {e}", file=sys.stderr)
+            bound = None
+        if not bound:
+            manager.release(lease["id"])
+            continue
+        manager.bind(lease["id"], project_id=str(bound.get("project_id") or ""), pid=int(bound.get("pid") or 0))
+        started.append({**lease, **bound})
+    return started
+
+
+def start_research(lease: dict) -> dict | None:
+    """Start a queued research cycle through the June control plane (payload = submit_research_start args)."""
+    from tools.june_handoff_client import submit_research_start
+    p = dict(lease.get("payload") or {})
+    question = p.pop("question", "")
+    payload = submit_research_start(question, **p)
+    child_id = str(payload.get("projectId") or "").strip()
+    return {"project_id": child_id, "question": question} if child_id else None
+
+
+def drain_research(manager: CapacityManager) -> list[dict]:
+    return drain(manager, "research_cycle", start_research)
+
+
+def main() -> None:
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "status"
+    with CapacityManager() as manager:
+        if cmd == "status":
+            print(json.dumps(manager.status(), indent=2))
+        elif cmd == "reap":
+            print(json.dumps({"released": manager.reap()}))
+        elif cmd == "drain":
+            started = drain_research(manager)
+            print(json.dumps({"started": [s.get("project_id") for s in started]}))
+        else:
+            print("Usage: research_capacity.py status | reap | drain", file=sys.stderr)
+            sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
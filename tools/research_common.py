@@ -51,6 +51,11 @@ def load_project(proj_path: Path) -> dict:
 
 def save_project(proj_path: Path, data: dict) -> None:
     (proj_path / "project.json").write_text(json.dumps(data, indent=2) + "\n")
+    try:
+        from tools.research_project_catalog import record_project
+        record_project(proj_path, data)
+    except ImportError:
+        pass
 
 
 def model_for_lane(context: str) -> str:
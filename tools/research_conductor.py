@@ -34,13 +34,17 @@ from tools.research_common import (
     audit_log,
 )
 from tools.research_budget import check_budget, get_budget_limit
-from tools.research_coverage import assess_coverage
-from tools.research_coverage import _load_json, _iter_findings, _iter_source_meta
+from tools.research_coverage import assess_coverage_incremental
+from tools.research_coverage import _load_json
+from tools.research_conductor_checkpoint import CycleCheckpoint, fingerprint, key_of
+from tools.research_source_identity import content_path, open_index as open_source_index, unique_source_count
 
 # Bounded state: 6 metrics only (no raw findings)
 CONDUCTOR_ACTIONS = ["search_more", "read_more", "verify", "synthesize"]
 MAX_STEPS = 25
 MAX_CONSECUTIVE_TOOL_FAILURES = 3
+VERIFY_STEPS = ["source_reliability", "claim_verification", "fact_check", "claim_ledger"]
+READ_BATCH = 15
 
 
 @dataclass
@@ -76,11 +80,11 @@ def read_state(project_id: str) -> ConductorState:
     findings_dir = proj / "findings"
     findings_count = len(list(findings_dir.glob("*.json"))) if findings_dir.exists() else 0
 
-    # source_count (unique sources, exclude _content)
+    # source_count (unique sources: URL variants, DOI and content duplicates count once)
     sources_dir = proj / "sources"
     source_count = 0
     if sources_dir.exists():
-        source_count = len([f for f in sources_dir.glob("*.json") if not f.name.endswith("_content.json")])
+        source_count = unique_source_count(proj)
 
     # coverage_score 0-1 from latest coverage or coverage tool (conductor-written first when in run_cycle)
     coverage_score = 0.0
@@ -95,9 +99,7 @@ def read_state(project_id: str) -> ConductorState:
                 pass
     if coverage_score == 0.0 and (proj / "research_plan.json").exists():
         plan = _load_json(proj / "research_plan.json", {})
-        findings = _iter_findings(proj)
-        sources = _iter_source_meta(proj)
-        result = assess_coverage(plan, findings, sources)
+        result = assess_coverage_incremental(proj, plan)
         coverage_score = float(result.get("coverage_rate", 0))
     if coverage_score >= 1.0 and findings_count < 40:
         coverage_score = min(0.95, findings_count / 50.0)
@@ -507,12 +509,43 @@ def _run_tool(project_id: str, tool: str, *args: str, cwd: Path | None = None, c
         return (False, "") if capture_stdout else False
 
 
+def _write_conductor_coverage(proj: Path) -> None:
+    """Refresh coverage_conductor.json in-process (incremental: only new findings/sources are tokenised)."""
+    plan_path = proj / "research_plan.json"
+    if not plan_path.exists():
+        return
+    try:
+        result = assess_coverage_incremental(proj, _load_json(plan_path, {}))
+        (proj / "coverage_conductor.json").write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+    except Exception:
+        pass
+
+
+def _unread_sources(proj: Path) -> list[dict]:
+    """[{"path", "url"}] of saved sources without content yet."""
+    sources_dir = proj / "sources"
+    unread = []
+    if sources_dir.exists():
+        for f in sources_dir.glob("*.json"):
+            if f.name.endswith("_content.json"):
+                continue
+            try:
+                url = (json.loads(f.read_text()).get("url") or "").strip()
+            except (json.JSONDecodeError, OSError):
+                continue
+            if url and content_path(proj, url) is None:
+                unread.append({"path": str(f), "url": url})
+    return unread
+
+
 def run_cycle(project_id: str) -> bool:
     """
     Phase C: Conductor as master. Loop until synthesize complete or max steps.
     Executes actions via existing Python tools; context manager + supervisor after steps.
     Returns True if cycle completed (synthesize done or done phase).
     Stops after MAX_CONSECUTIVE_TOOL_FAILURES consecutive tool failures and sets status.
+    Each action and sub-step is checkpointed (research_conductor_checkpoint): a restarted cycle resumes
+    the interrupted action and skips sub-steps already completed against unchanged inputs.
     """
     root = Path(__file__).resolve().parent.parent
     proj = project_dir(project_id)
@@ -521,6 +554,7 @@ def run_cycle(project_id: str) -> bool:
     project = load_project(proj)
     question = (project.get("question") or "")[:2000]
     consecutive_failures: list[int] = [0]
+    ckpt = CycleCheckpoint(proj)
 
     def run_tool(tool: str, *args: str, capture_stdout: bool = False) -> Any:
         out = _run_tool(project_id, tool, *args, capture_stdout=capture_stdout)
@@ -552,14 +586,25 @@ def run_cycle(project_id: str) -> bool:
             return True
         if state.budget_spent_pct >= 0.95 or state.steps_taken >= MAX_STEPS:
             break
-        try:
-            from tools.research_context_manager import get_compressed_context, add_compressed_batch
-            compressed = get_compressed_context(project_id) or ""
-        except Exception:
-            compressed = ""
-        action = decide_action(state, question, compressed, phase=phase, project_id=project_id)
-        save_conductor_state(project_id, state)
-        write_conductor_step_count(project_id, state.steps_taken + 1)
+        action = ckpt.interrupted_action(phase)
+        if action:
+            audit_log(proj, "conductor_resume", {"phase": phase, "action": action, "steps": sorted(ckpt.get("steps") or {}),
+                                                 "resumed": ckpt.get("resumed")})
+            # a resumed attempt is a step too, so an action that keeps dying still runs into MAX_STEPS
+            save_conductor_state(project_id, state)
+            write_conductor_step_count(project_id, state.steps_taken + 1)
+        else:
+            if ckpt.get("abandoned"):
+                audit_log(proj, "conductor_resume_abandoned", {"phase": phase, "action": ckpt.get("abandoned")})
+            try:
+                from tools.research_context_manager import get_compressed_context
+                compressed = get_compressed_context(project_id) or ""
+            except Exception:
+                compressed = ""
+            action = decide_action(state, question, compressed, phase=phase, project_id=project_id)
+            save_conductor_state(project_id, state)
+            write_conductor_step_count(project_id, state.steps_taken + 1)
+            ckpt.begin(action, phase, state.steps_taken + 1)
 
         if action == "synthesize":
             try:
@@ -567,20 +612,42 @@ def run_cycle(project_id: str) -> bool:
                 progress_step(project_id, "Conductor: synthesizing report")
             except Exception:
                 pass
-            ok_syn, out_syn = run_tool("research_synthesize.py", project_id, capture_stdout=True)
-            if ok_syn and out_syn.strip():
+            ckpt.bind_inputs(fingerprint(proj / "findings", proj / "sources"))
+            report = ckpt.step_info("synthesize").get("report", "")
+            if not ckpt.done("synthesize", [report] if report else []):
+                ok_syn, out_syn = run_tool("research_synthesize.py", project_id, capture_stdout=True)
                 from datetime import datetime, timezone
                 ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-                (proj / "reports").mkdir(parents=True, exist_ok=True)
-                (proj / "reports" / f"report_{ts}.md").write_text(out_syn, encoding="utf-8")
-                run_tool("research_synthesize_postprocess.py", project_id)
-            try:
-                from tools.research_critic import critique_report
-                project = load_project(proj)
-                critique_report(proj, project, None, project_id=project_id)
-            except Exception:
-                pass
+                report = ""
+                if ok_syn and out_syn.strip():
+                    (proj / "reports").mkdir(parents=True, exist_ok=True)
+                    report_path = proj / "reports" / f"report_{ts}.md"
+                    report_path.write_text(out_syn, encoding="utf-8")
+                    report = str(report_path)
+                else:
+                    # Synthesis died mid-way: keep the sections it streamed so far as a usable partial report.
+                    try:
+                        from tools.synthesis.stream import _load_partial_report
+                        partial = _load_partial_report(proj)
+                        if partial.strip():
+                            (proj / "reports").mkdir(parents=True, exist_ok=True)
+                            (proj / "reports" / f"partial_report_{ts}.md").write_text(partial, encoding="utf-8")
+                    except Exception:
+                        pass
+                ckpt.mark("synthesize", report=report)
+            if report and not ckpt.done("postprocess"):
+                if run_tool("research_synthesize_postprocess.py", project_id):
+                    ckpt.mark("postprocess")
+            if not ckpt.done("critique"):
+                try:
+                    from tools.research_critic import critique_report
+                    project = load_project(proj)
+                    critique_report(proj, project, None, project_id=project_id)
+                except Exception:
+                    pass
+                ckpt.mark("critique")
             advance_phase(proj, "done")
+            ckpt.finish()
             return True
 
         if action == "verify":
@@ -589,10 +656,20 @@ def run_cycle(project_id: str) -> bool:
                 progress_step(project_id, "Conductor: running verification")
             except Exception:
                 pass
-            run_tool("research_verify.py", project_id, "source_reliability")
-            run_tool("research_verify.py", project_id, "claim_verification")
-            run_tool("research_verify.py", project_id, "fact_check")
-            run_tool("research_verify.py", project_id, "claim_ledger")
+            # sub-steps read sources/findings (and earlier verify/*.json); unchanged inputs keep a finished
+            # sub-step valid. research_verify prints its result: it is saved here before the step is marked.
+            ckpt.bind_inputs(fingerprint(proj / "sources", proj / "findings"))
+            for sub in VERIFY_STEPS:
+                out_path = proj / "verify" / f"{sub}.json"
+                if ckpt.done(sub, [out_path]):
+                    continue
+                ok_sub, out_sub = run_tool("research_verify.py", project_id, sub, capture_stdout=True)
+                if ok_sub and out_sub.strip():
+                    out_path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+                    tmp.write_text(out_sub, encoding="utf-8")
+                    tmp.replace(out_path)
+                    ckpt.mark(sub)
             gate_ok, gate_out = run_tool("research_quality_gate.py", project_id, capture_stdout=True)
             if check_abort():
                 return False
@@ -608,6 +685,7 @@ def run_cycle(project_id: str) -> bool:
                     pass
             if check_abort():
                 return False
+            ckpt.finish()
             continue
 
         if action == "read_more":
@@ -616,36 +694,39 @@ def run_cycle(project_id: str) -> bool:
                 progress_step(project_id, "Conductor: reading more sources")
             except Exception:
                 pass
-            # Build list of unread source paths
-            sources_dir = proj / "sources"
-            read_list = []
-            if sources_dir.exists():
-                for f in sources_dir.glob("*.json"):
-                    if f.name.endswith("_content.json"):
-                        continue
-                    if not (sources_dir / (f.stem + "_content.json")).exists():
-                        read_list.append(str(f))
-            if read_list:
-                order_file = proj / "conductor_read_order.txt"
-                order_file.write_text("\n".join(read_list[:15]))
-                run_tool("research_parallel_reader.py", project_id, "explore", "--input-file", str(order_file), "--read-limit", "10", "--workers", "8")
-            run_tool("research_deep_extract.py", project_id)
-            try:
-                add_compressed_batch(project_id)
-                from tools.research_dynamic_outline import merge_evidence_into_outline
-                merge_evidence_into_outline(project_id)
-                from tools.research_supervisor import run_supervisor
-                run_supervisor(project_id)
-            except Exception:
-                pass
-            ok_cov, out_cov = _run_tool(project_id, "research_coverage.py", project_id, capture_stdout=True)
-            if ok_cov and out_cov and out_cov.strip():
+            # The batch is fixed when the action begins; a resumed run only reads its still-unread URLs
+            batch = ckpt.get("batch")
+            if batch is None:
+                batch = _unread_sources(proj)[:READ_BATCH]
+                ckpt.set("batch", batch)
+            ckpt.bind_inputs(key_of([b["url"] for b in batch]))
+            if not ckpt.done("read"):
+                read_list = [b["path"] for b in batch if content_path(proj, b["url"]) is None]
+                ok_read = True
+                if read_list:
+                    order_file = proj / "conductor_read_order.txt"
+                    order_file.write_text("\n".join(read_list))
+                    ok_read = run_tool("research_parallel_reader.py", project_id, "explore", "--input-file", str(order_file), "--read-limit", "10", "--workers", "8")
+                if ok_read:
+                    ckpt.mark("read")
+            if not ckpt.done("deep_extract"):
+                if run_tool("research_deep_extract.py", project_id):
+                    ckpt.mark("deep_extract")
+            if not ckpt.done("compress"):
                 try:
-                    (proj / "coverage_conductor.json").write_text(out_cov, encoding="utf-8")
+                    from tools.research_context_manager import add_compressed_batch
+                    add_compressed_batch(project_id)
+                    from tools.research_dynamic_outline import merge_evidence_into_outline
+                    merge_evidence_into_outline(project_id)
+                    from tools.research_supervisor import run_supervisor
+                    run_supervisor(project_id)
                 except Exception:
                     pass
+                ckpt.mark("compress")
+            _write_conductor_coverage(proj)
             if check_abort():
                 return False
+            ckpt.finish()
             continue
 
         if action == "search_more":
@@ -659,28 +740,25 @@ def run_cycle(project_id: str) -> bool:
                 run_tool("research_planner.py", question, project_id)
             plan_path = proj / "research_plan.json"
             if plan_path.exists():
+                ckpt.bind_inputs(fingerprint(plan_path))
+            if plan_path.exists() and not ckpt.done("search"):
                 ok, out = run_tool("research_web_search.py", "--queries-file", str(plan_path), "--max-per-query", "5", capture_stdout=True)
                 if ok and out.strip():
                     try:
-                        import hashlib
                         results = json.loads(out) if out.strip().startswith("[") else json.loads(out)
                         if isinstance(results, list):
-                            for item in results[:25]:
-                                url = (item.get("url") or "").strip()
-                                if url:
-                                    fid = hashlib.sha256(url.encode()).hexdigest()[:12]
-                                    (proj / "sources").mkdir(parents=True, exist_ok=True)
-                                    (proj / "sources" / f"{fid}.json").write_text(json.dumps({**item, "confidence": 0.5}))
+                            with open_source_index(proj) as index:
+                                for item in results[:25]:
+                                    if (item.get("url") or "").strip():
+                                        index.save_source(item, confidence=0.5)
                     except Exception:
                         pass
-            ok_cov, out_cov = _run_tool(project_id, "research_coverage.py", project_id, capture_stdout=True)
-            if ok_cov and out_cov and out_cov.strip():
-                try:
-                    (proj / "coverage_conductor.json").write_text(out_cov, encoding="utf-8")
-                except Exception:
-                    pass
+                if ok:
+                    ckpt.mark("search")
+            _write_conductor_coverage(proj)
             if check_abort():
                 return False
+            ckpt.finish()
             continue
     return False
 
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Checkpoints for research_conductor.run_cycle (<project>/conductor_checkpoint.json).
+
+begin() records the chosen action before it runs; every sub-step that completes is marked with the
+idempotency key of the inputs it ran against. A cycle restarted after a crash, preemption or OOM kill
+resumes the interrupted action (no new conductor decision, no extra step) and skips the sub-steps
+already done against unchanged inputs, e.g. the URLs of a read batch that were read, or verify
+sub-steps whose sources/findings did not change since. finish() clears the action.
+
+A checkpoint is ignored once the project phase differs from the one it was taken in or it is older
+than MAX_AGE_HOURS. An action is resumed at most MAX_RESUMES times: one that dies the same way on every
+restart (e.g. OOM in the reader) is then abandoned and the conductor decides afresh.
+
+Usage:
+  research_conductor_checkpoint.py show <project_id>
+  research_conductor_checkpoint.py clear <project_id>
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CHECKPOINT_FILE = "conductor_checkpoint.json"
+MAX_AGE_HOURS = 24.0
+MAX_RESUMES = 2
+
+
+def fingerprint(*paths: Path) -> str:
+    """Key of the current contents of files/directories (name, size, mtime; directories one level deep)."""
+    h = hashlib.sha256()
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            try:
+                entries = sorted((e.name, e.stat().st_size, e.stat().st_mtime_ns) for e in os.scandir(p) if e.is_file())
+            except OSError:
+                entries = []
+        elif p.is_file():
+            st = p.stat()
+            entries = [(p.name, st.st_size, st.st_mtime_ns)]
+        else:
+            entries = []
+        h.update(f"{p.name}:{entries}".encode())
+    return h.hexdigest()[:16]
+
+
+def key_of(value) -> str:
+    """Key of a JSON-serialisable value (e.g. the URL list of a read batch)."""
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class CycleCheckpoint:
+    def __init__(self, proj: Path):
+        self.path = Path(proj) / CHECKPOINT_FILE
+        try:
+            self.data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.data = {}
+        if not isinstance(self.data, dict):
+            self.data = {}
+
+    def _save(self) -> None:
+        self.data["updated_at"] = time.time()
+        try:
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(self.data, indent=2, ensure_ascii=False))
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+    def interrupted_action(self, phase: str) -> str:
+        """The action a previous run began in this phase and did not finish, else "". After MAX_RESUMES
+        resumes the action is abandoned (get("abandoned") names it)."""
+        action = self.data.get("action") or ""
+        if not action:
+            return ""
+        fresh = time.time() - float(self.data.get("updated_at") or 0) <= MAX_AGE_HOURS * 3600
+        if self.data.get("phase") != phase or not fresh:
+            self.data = {}
+            self._save()
+            return ""
+        if int(self.data.get("resumed") or 0) >= MAX_RESUMES:
+            self.data = {"last_action": action, "abandoned": action, "finished_at": time.time()}
+            self._save()
+            return ""
+        self.data["resumed"] = int(self.data.get("resumed") or 0) + 1
+        self._save()
+        return action
+
+    def begin(self, action: str, phase: str, step: int = 0) -> None:
+        self.data = {"action": action, "phase": phase, "step": step, "started_at": time.time(), "steps": {}}
+        self._save()
+
+    def bind_inputs(self, key: str) -> None:
+        """Inputs of the current action; completed sub-steps are forgotten when they changed."""
+        if self.data.get("inputs") != key:
+            self.data["inputs"] = key
+            self.data["steps"] = {}
+            self._save()
+
+    def done(self, sub: str, outputs: list[Path] | tuple = ()) -> bool:
+        """True when sub completed for the current inputs and its output files still exist."""
+        entry = (self.data.get("steps") or {}).get(sub)
+        if not entry or entry.get("inputs") != self.data.get("inputs"):
+            return False
+        return all(Path(o).exists() for o in outputs)
+
+    def mark(self, sub: str, **extra) -> None:
+        self.data.setdefault("steps", {})[sub] = {"inputs": self.data.get("inputs"), "at": time.time(), **extra}
+        self._save()
+
+    def get(self, key: str, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key: str, value) -> None:
+        self.data[key] = value
+        self._save()
+
+    def step_info(self, sub: str) -> dict:
+        return dict((self.data.get("steps") or {}).get(sub) or {})
+
+    def finish(self) -> None:
+        self.data = {"last_action": self.data.get("action", ""), "finished_at": time.time()}
+        self._save()
+
+
+def main() -> None:
+    if len(sys.argv) < 3 or sys.argv[1] not in ("show", "clear"):
+        print("Usage: research_conductor_checkpoint.py show|clear <project_id>", file=sys.stderr)
+        sys.exit(2)
+    from tools.research_common import project_dir
+    proj = project_dir(sys.argv[2])
+    if sys.argv[1] == "clear":
+        (proj / CHECKPOINT_FILE).unlink(missing_ok=True)
+        print(json.dumps({"cleared": True}))
+    else:
+        print(json.dumps(CycleCheckpoint(proj).data, indent=2))
+
+
+if __name__ == "__main__":
+    main()
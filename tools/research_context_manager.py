@@ -18,6 +18,7 @@ from typing import Any
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from tools.research_common import project_dir, load_project, llm_call
+from tools.research_context_pack import pack_items, pack_text
 
 TARGET_TOKENS = 500
 APPROX_CHARS_PER_TOKEN = 4
@@ -25,6 +26,7 @@ MAX_SUMMARY_CHARS = TARGET_TOKENS * APPROX_CHARS_PER_TOKEN  # ~2000 chars
 # Reserve ~40% for critical (preserved), ~60% for summary (Report: protect critical state)
 MAX_CRITICAL_CHARS = 800
 MAX_SUMMARY_PART_CHARS = 1200
+FINDING_TOKENS = 150  # per finding in the compression input (was a 600-char head)
 
 
 def _load_findings_since(proj: Path, since_ts: str | None) -> list[dict]:
@@ -45,17 +47,16 @@ def _load_findings_since(proj: Path, since_ts: str | None) -> list[dict]:
     return out
 
 
-def _findings_to_text(findings: list[dict], max_chars: int = 12000) -> str:
-    """Serialize findings to text for LLM summarization."""
-    parts = []
-    for i, f in enumerate(findings[:80]):
+def _findings_to_text(findings: list[dict], max_chars: int = 12000, question: str = "") -> str:
+    """Serialize findings to text for LLM summarization: the findings most relevant to the question
+    (research_context_pack) within max_chars, else the first ones."""
+    def render(i: int, f: dict) -> str:
         title = (f.get("title") or "")[:200]
-        excerpt = (f.get("excerpt") or f.get("text") or "")[:600]
+        excerpt = pack_text(question, f.get("excerpt") or f.get("text") or "", FINDING_TOKENS)
         url = (f.get("url") or "")[:120]
-        parts.append(f"[{i+1}] {title}\nURL: {url}\n{excerpt}")
-        if sum(len(p) for p in parts) >= max_chars:
-            break
-    return "\n\n".join(parts)[:max_chars]
+        return f"[{i+1}] {title}\nURL: {url}\n{excerpt}"
+
+    return pack_items(question, findings[:80], max_chars // APPROX_CHARS_PER_TOKEN, render)
 
 
 def compress_findings(project_id: str, findings_text: str, project_id_for_budget: str = "") -> tuple[str, str]:
@@ -103,7 +104,11 @@ def add_compressed_batch(project_id: str) -> str:
     findings = _load_findings_since(proj, None)
     if not findings:
         return get_compressed_context(project_id) or ""
-    text = _findings_to_text(findings)
+    try:
+        question = (load_project(proj).get("question") or "").strip()
+    except Exception:
+        question = ""
+    text = _findings_to_text(findings, question=question)
     critical_part, summary_part = compress_findings(project_id, text)
     context_path = proj / "conductor_context.json"
     data: dict[str, Any] = {"summaries": [], "critical_snippets": [], "updated_at": ""}
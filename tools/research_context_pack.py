@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Shared chunker and token-budgeted context packer for LLM calls.
+
+split_passages() cuts a document into paragraph-bounded passages (long paragraphs at sentence ends).
+pack_text() scores the passages against the question — lexical BM25 + keyword overlap from
+research_relevance, blended with cached embeddings when RESEARCH_CONTEXT_SEMANTIC=1 — and keeps the best
+ones that fit a token budget, in document order. A document that already fits is returned unchanged;
+without a question the leading passages are kept (the old head truncation). pack_items() does the same
+for lists of findings rendered one per entry.
+
+Used by: research_parallel_reader (relevance gate input, finding excerpt), research_deep_extract,
+research_entity_extract, research_context_manager, research_sections (chunking).
+
+Usage:
+  research_context_pack.py <question> <file> [--tokens 2000]   print the packed context of a text file
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.research_relevance import relevance_scores
+
+CHARS_PER_TOKEN = 4
+PASSAGE_CHARS = 1200
+LEAD_PRIOR = 0.1
+GAP_MARKER = "\n[…]\n"
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def split_passages(text: str, max_chars: int = PASSAGE_CHARS) -> list[str]:
+    """Paragraph-bounded passages of at most max_chars; consecutive short paragraphs are merged."""
+    paras = [p.strip() for p in re.split(r"\n\s*\n", text or "") if p.strip()]
+    pieces: list[str] = []
+    buf = ""
+    for para in paras:
+        while len(para) > max_chars:
+            cut = para.rfind(". ", 0, max_chars)
+            cut = cut + 1 if cut > max_chars // 2 else max_chars
+            if buf:
+                pieces.append(buf)
+                buf = ""
+            pieces.append(para[:cut].strip())
+            para = para[cut:].strip()
+        if buf and len(buf) + len(para) + 2 > max_chars:
+            pieces.append(buf)
+            buf = ""
+        buf = f"{buf}\n\n{para}" if buf else para
+    if buf:
+        pieces.append(buf)
+    return pieces
+
+
+def _semantic_enabled() -> bool:
+    return os.environ.get("RESEARCH_CONTEXT_SEMANTIC", "0") == "1"
+
+
+def score_passages(question: str, passages: list[str], proj_path: Path | None = None, project_id: str = "") -> list[float]:
+    items = [{"excerpt": p} for p in passages]
+    return relevance_scores(
+        question, items, semantic=_semantic_enabled() and proj_path is not None,
+        proj_path=proj_path, project_id=project_id,
+    )
+
+
+def select(scores: list[float], sizes: list[int], budget: int, priors: list[float] | None = None) -> list[int]:
+    """Indices of the best-scoring entries whose sizes fit the budget, in original order."""
+    priors = priors or [0.0] * len(scores)
+    order = sorted(range(len(scores)), key=lambda i: (-(scores[i] + priors[i]), i))
+    picked, used = [], 0
+    for i in order:
+        if used + sizes[i] > budget:
+            continue
+        picked.append(i)
+        used += sizes[i]
+    return sorted(picked)
+
+
+def pack_text(
+    question: str,
+    text: str,
+    max_tokens: int,
+    proj_path: Path | None = None,
+    project_id: str = "",
+    passage_chars: int = PASSAGE_CHARS,
+) -> str:
+    """The passages of text most relevant to question within max_tokens, joined in document order."""
+    text = (text or "").strip()
+    budget = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= budget:
+        return text
+    if not (question or "").strip():
+        return text[:budget]
+    passages = split_passages(text, min(passage_chars, budget))
+    scores = score_passages(question, passages, proj_path, project_id)
+    sizes = [len(p) + len(GAP_MARKER) for p in passages]
+    priors = [LEAD_PRIOR if i == 0 else 0.0 for i in range(len(passages))]
+    picked = select(scores, sizes, budget, priors)
+    out, prev = [], None
+    for i in picked:
+        if prev is not None:
+            out.append(GAP_MARKER if i != prev + 1 else "\n\n")
+        out.append(passages[i])
+        prev = i
+    return "".join(out)[:budget]
+
+
+def pack_items(
+    question: str,
+    items: list[dict],
+    max_tokens: int,
+    render: Callable[[int, dict], str],
+    sep: str = "\n\n",
+    proj_path: Path | None = None,
+    project_id: str = "",
+) -> str:
+    """Render the items most relevant to question (all items when no question) until max_tokens is
+    used; entries keep their input order. render(i, item) gets the item's position in the output."""
+    if not items:
+        return ""
+    budget = max_tokens * CHARS_PER_TOKEN
+    if (question or "").strip():
+        scores = relevance_scores(
+            question, items, semantic=_semantic_enabled() and proj_path is not None,
+            proj_path=proj_path, project_id=project_id,
+        )
+    else:
+        scores = [-float(i) for i in range(len(items))]  # keep the head
+    sizes = [len(render(i, it)) + len(sep) for i, it in enumerate(items)]
+    picked = select(scores, sizes, budget)
+    return sep.join(render(n, items[i]) for n, i in enumerate(picked))[:budget]
+
+
+def main() -> None:
+    if len(sys.argv) < 3:
+        print("Usage: research_context_pack.py <question> <file> [--tokens 2000]", file=sys.stderr)
+        sys.exit(2)
+    tokens = int(sys.argv[sys.argv.index("--tokens") + 1]) if "--tokens" in sys.argv[:-1] else 2000
+    print(pack_text(sys.argv[1], Path(sys.argv[2]).read_text(errors="replace"), tokens))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 AEM: Contradiction linking in operational flow. After ledger is ready, run contradiction detection
-(source-level), map source_a/source_b to claim_refs via supporting_source_ids, and call add_contradiction.
+(source-level), map source_a/source_b to claim_refs via the claim/evidence index (url -> claims, updated
+incrementally from the ledger), and call add_contradiction.
 Ensures contradiction_review_required is enforceable in settlement (market scoring blocks PASS_STABLE).
 """
 from __future__ import annotations
@@ -13,29 +14,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from tools.research_common import project_dir, load_project, audit_log
 from tools.research_claim_state_machine import load_ledger_jsonl, add_contradiction
+from tools.research_evidence_index import claim_evidence_index
 from tools.research_reason import contradiction_detection
 
 
-def _claim_ref(c: dict) -> str:
-    return f"{c.get('claim_id', '')}@{c.get('claim_version', 1)}"
-
-
-def _source_to_claim_refs(claims: list[dict]) -> dict[str, list[str]]:
-    """Map source url (or title used as key) -> list of claim_ref that cite it (supporting_source_ids)."""
-    out: dict[str, list[str]] = {}
-    for c in claims:
-        ref = _claim_ref(c)
-        for sid in c.get("supporting_source_ids") or []:
-            key = (sid if isinstance(sid, str) else str(sid)).strip()
-            if not key:
-                continue
-            if key not in out:
-                out[key] = []
-            if ref not in out[key]:
-                out[key].append(ref)
-    return out
-
-
 def _normalize_source_key(url_or_title: str) -> str:
     return (url_or_title or "").strip().lower()[:200]
 
@@ -50,7 +32,7 @@ def run_contradiction_linking(project_id: str) -> dict:
     claims = load_ledger_jsonl(proj_path)
     if not claims:
         return {"ok": True, "links_added": 0, "contradictions_processed": 0}
-    source_to_refs = _source_to_claim_refs(claims)
+    source_to_refs = claim_evidence_index(proj_path, claims).url_to_claims
     # Also build by normalized url/title for matching reason output (source_a, source_b)
     by_norm: dict[str, list[str]] = {}
     for k, refs in source_to_refs.items():
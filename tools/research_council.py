@@ -15,6 +15,7 @@ from pathlib import Path
 OPERATOR_ROOT = Path(os.environ.get("OPERATOR_ROOT", "/root/operator"))
 sys.path.insert(0, str(OPERATOR_ROOT))
 from tools.june_handoff_client import submit_research_start
+from tools.research_capacity import drain_research, expected_gain, open_manager
 from tools.research_common import llm_call, model_for_lane
 from lib.memory import Memory
 
@@ -35,31 +36,68 @@ def load_json(path: Path):
     except Exception:
         return {}
 
+def _dispatch_followup(parent_id: str, q: str, h: str) -> None:
+    print(f"Spawning follow-up: {q[:60]}...")
+    try:
+        payload = submit_research_start(
+            q,
+            source_command="research_council",
+            research_mode="discovery",
+            run_until_done=True,
+            parent_project_id=parent_id,
+            hypothesis_to_test=h,
+        )
+    except Exception as exc:
+        print(f"Init failed: {exc}")
+        return
+    child_id = str(payload.get("projectId") or "").strip()
+    if not child_id:
+        print("Failed to read project_id from follow-up init.")
+        return
+    print(f"-> Dispatched agent {child_id}")
+
+
 def spawn_followups(parent_id: str, missions: list):
-    """Spawns follow-up agents through June-owned control plane."""
-    for mission in missions:
-        q = mission.get("question", "").strip()
-        h = mission.get("hypothesis_to_test", "").strip()
-        if not q: continue
-        
-        print(f"Spawning follow-up: {q[:60]}...")
-        try:
-            payload = submit_research_start(
-                q,
-                source_command="research_council",
-                research_mode="discovery",
-                run_until_done=True,
-                parent_project_id=parent_id,
-                hypothesis_to_test=h,
+    """Spawns follow-up agents through June-owned control plane. With the capacity manager the missions are
+    queued (priority: the parent's expected information gain) and only those that fit are started now;
+    the rest are started by later drains (council, orchestrator, research_capacity.py drain)."""
+    manager = open_manager()
+    if manager is None:
+        for mission in missions:
+            q = mission.get("question", "").strip()
+            if q:
+                _dispatch_followup(parent_id, q, mission.get("hypothesis_to_test", "").strip())
+        return
+    with manager:
+        priority = expected_gain(parent_id)
+        queued = 0
+        for mission in missions:
+            q = mission.get("question", "").strip()
+            if not q:
+                continue
+            lease_id = manager.enqueue(
+                "research_cycle",
+                payload={
+                    "question": q,
+                    "source_command": "research_council",
+                    "research_mode": "discovery",
+                    "run_until_done": True,
+                    "parent_project_id": parent_id,
+                    "hypothesis_to_test": mission.get("hypothesis_to_test", "").strip(),
+                },
+                parent_id=parent_id,
+                priority=priority,
             )
-        except Exception as exc:
-            print(f"Init failed: {exc}")
-            continue
-        child_id = str(payload.get("projectId") or "").strip()
-        if not child_id:
-            print("Failed to read project_id from follow-up init.")
-            continue
-        print(f"-> Dispatched agent {child_id}")
+            if not lease_id:
+                print(f"Parent {parent_id} over budget; not spawning: {q[:60]}")
+                continue
+            queued += 1
+        started = drain_research(manager)
+        for s in started:
+            print(f"-> Dispatched agent {s['project_id']} ({s.get('question', '')[:60]})")
+        waiting = manager.status()["leases"].get("queued", {}).get("research_cycle", 0)
+        if waiting:
+            print(f"{queued} follow-up(s) queued, {waiting} research cycle(s) waiting for capacity.")
 
 def main():
     if len(sys.argv) < 2:
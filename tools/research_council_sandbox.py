@@ -18,6 +18,28 @@ from tools.research_sandbox import run_in_sandbox
 RESEARCH = OPERATOR_ROOT / "research"
 
 
+def _normalize_metrics(data: dict) -> dict:
+    out = {}
+    if "utility_history" in data:
+        uh = data["utility_history"]
+        out["utility_history"] = [float(x) for x in uh] if isinstance(uh, list) else []
+    out["boundary_violations"] = int(data.get("boundary_violations", -1))
+    out["accepted_mutations"] = int(data.get("accepted_mutations", -1))
+    return out
+
+
+def _metrics_from_results(results) -> dict | None:
+    """Metrics from the JSON results file the script wrote ($RESEARCH_RESULTS_PATH)."""
+    if not isinstance(results, dict) or not any(
+        k in results for k in ("utility_history", "boundary_violations", "accepted_mutations")
+    ):
+        return None
+    try:
+        return _normalize_metrics(results)
+    except (TypeError, ValueError):
+        return None
+
+
 def _parse_metrics_from_stdout(stdout: str) -> dict | None:
     """Extract METRICS_JSON from sandbox stdout (may span multiple lines)."""
     import re
@@ -35,14 +57,7 @@ def _parse_metrics_from_stdout(stdout: str) -> dict | None:
             depth -= 1
             if depth == 0:
                 try:
-                    data = json.loads(stdout[start : i + 1])
-                    out = {}
-                    if "utility_history" in data:
-                        uh = data["utility_history"]
-                        out["utility_history"] = [float(x) for x in uh] if isinstance(uh, list) else []
-                    out["boundary_violations"] = int(data.get("boundary_violations", -1))
-                    out["accepted_mutations"] = int(data.get("accepted_mutations", -1))
-                    return out
+                    return _normalize_metrics(json.loads(stdout[start : i + 1]))
                 except (json.JSONDecodeError, TypeError, ValueError):
                     return None
     return None
@@ -72,6 +87,7 @@ def main() -> int:
    - Track: utility per step (or every Nth step to keep list size under 300), count of boundary violations, count of accepted mutations
    - Print at the end either "PASS" or "FAIL" and a one-line result
    - On the last line of output, print exactly: METRICS_JSON: {"utility_history": [list of floats], "boundary_violations": int, "accepted_mutations": int}
+   - Also write that same JSON object to the file named by the environment variable RESEARCH_RESULTS_PATH, if it is set
    - Start with 'import' or 'print'
 
 Output format exactly:
@@ -113,9 +129,11 @@ CODE:
             "stderr": (sb.stderr or "")[-1000:],
             "exit_code": sb.exit_code,
             "passed": passed,
+            "usage": sb.usage(),
         }
-        # Parse METRICS_JSON for long-term stability (utility trajectory, boundary violations, monotonicity)
-        metrics = _parse_metrics_from_stdout(sb.stdout or "")
+        # Metrics for long-term stability (utility trajectory, boundary violations, monotonicity):
+        # the structured results file, else METRICS_JSON in stdout
+        metrics = _metrics_from_results(sb.results) or _parse_metrics_from_stdout(sb.stdout or "")
         if metrics:
             result["metrics"] = metrics
             # Derived: monotonicity over full run, drift (second half vs first half)
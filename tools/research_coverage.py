@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 """
 Assess source/finding coverage against research_plan.json.
+Incremental: per-item topic matches are cached in coverage_state.json, so each run only
+tokenises findings/sources added or changed since the previous run.
 
 Usage:
   research_coverage.py <project_id>
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
@@ -14,6 +17,8 @@ import sys
 from pathlib import Path
 from typing import Any
 
+COVERAGE_STATE_FILE = "coverage_state.json"
+
 
 def _tokens(text: str) -> set[str]:
     return {
@@ -88,11 +93,15 @@ def _topic_keywords(topic: dict[str, Any], entities: list[str]) -> set[str]:
     return kws
 
 
-def _match_item(topic_id: str, item: dict[str, Any], keywords: set[str]) -> bool:
+def _item_tokens(item: dict[str, Any]) -> set[str]:
+    return _tokens(f"{item.get('title','')} {item.get('description','')} {item.get('excerpt','')} {item.get('abstract','')}")
+
+
+def _match_item(topic_id: str, item: dict[str, Any], keywords: set[str], itoks: set[str] | None = None) -> bool:
     if str(item.get("topic_id") or "") == topic_id:
         return True
-    text = f"{item.get('title','')} {item.get('description','')} {item.get('excerpt','')} {item.get('abstract','')}"
-    itoks = _tokens(text)
+    if itoks is None:
+        itoks = _item_tokens(item)
     overlap = len(keywords & itoks)
     return overlap >= 1
 
@@ -103,6 +112,9 @@ def assess_coverage(plan: dict[str, Any], findings: list[dict[str, Any]], source
     if not isinstance(topics, list):
         topics = []
 
+    # Tokenise each item once, not once per topic
+    finding_toks = [_item_tokens(f) for f in findings]
+    source_toks = [_item_tokens(s) for s in sources]
     topic_out: list[dict[str, Any]] = []
     for raw in topics:
         if not isinstance(raw, dict):
@@ -111,8 +123,8 @@ def assess_coverage(plan: dict[str, Any], findings: list[dict[str, Any]], source
         tid = str(topic.get("id") or "")
         min_sources = max(1, int(topic.get("min_sources") or 2))
         keywords = _topic_keywords(topic, entities)
-        topic_findings = [f for f in findings if _match_item(tid, f, keywords)]
-        topic_sources = [s for s in sources if _match_item(tid, s, keywords)]
+        topic_findings = [f for f, t in zip(findings, finding_toks) if _match_item(tid, f, keywords, t)]
+        topic_sources = [s for s, t in zip(sources, source_toks) if _match_item(tid, s, keywords, t)]
 
         cov = {
             "findings_count": len(topic_findings),
@@ -122,7 +134,11 @@ def assess_coverage(plan: dict[str, Any], findings: list[dict[str, Any]], source
         }
         topic["coverage"] = cov
         topic_out.append(topic)
+    return _summarize(topic_out)
+
 
+def _summarize(topic_out: list[dict[str, Any]]) -> dict[str, Any]:
+    """Gate metrics over topics that already carry a coverage block."""
     covered = sum(1 for t in topic_out if t.get("coverage", {}).get("is_covered"))
     total = len(topic_out)
     coverage_rate = (covered / total) if total else 0.0
@@ -152,6 +168,115 @@ def assess_coverage(plan: dict[str, Any], findings: list[dict[str, Any]], source
     }
 
 
+def _plan_hash(plan: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(plan, sort_keys=True, ensure_ascii=False, default=str).encode()).hexdigest()[:16]
+
+
+def _plan_topics(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    topics = plan.get("topics") if isinstance(plan, dict) else []
+    return [t for t in topics if isinstance(t, dict)] if isinstance(topics, list) else []
+
+
+def _topic_postings(plan: dict[str, Any]) -> dict[str, list[int]]:
+    """token -> indices (into _plan_topics) of topics whose keywords contain the token."""
+    entities = [str(e) for e in (plan.get("entities") or [])] if isinstance(plan, dict) else []
+    postings: dict[str, list[int]] = {}
+    for i, topic in enumerate(_plan_topics(plan)):
+        for kw in _topic_keywords(topic, entities):
+            postings.setdefault(kw, []).append(i)
+    return postings
+
+
+def _item_record(kind: str, item: Any, postings: dict[str, list[int]]) -> dict[str, Any]:
+    if not isinstance(item, dict):
+        return {"skip": True}
+    matched: set[int] = set()
+    for tok in _item_tokens(item):
+        matched.update(postings.get(tok, ()))
+    rec: dict[str, Any] = {"tid": str(item.get("topic_id") or ""), "topics": sorted(matched)}
+    if kind == "sources":
+        rec["primary"] = _is_primary_source(item)
+    return rec
+
+
+def assess_coverage_incremental(project_dir: Path, plan: dict[str, Any]) -> dict[str, Any]:
+    """
+    Same result schema as assess_coverage, but only parses/tokenises findings and sources that are new or
+    changed since the last run. Per-item topic matches are kept in coverage_state.json together with the
+    per-file signature watermark (mtime_ns, size); a plan change invalidates the state.
+    """
+    state_path = project_dir / COVERAGE_STATE_FILE
+    phash = _plan_hash(plan if isinstance(plan, dict) else {})
+    state = _load_json(state_path, {}) if state_path.exists() else {}
+    if not isinstance(state, dict) or state.get("plan_hash") != phash:
+        state = {"plan_hash": phash, "items": {}}
+    old_items: dict[str, Any] = state.get("items") or {}
+    postings = _topic_postings(plan if isinstance(plan, dict) else {})
+    items: dict[str, Any] = {}
+    parsed = 0
+    for kind in ("findings", "sources"):
+        for f in sorted((project_dir / kind).glob("*.json")):
+            if kind == "sources" and f.name.endswith("_content.json"):
+                continue
+            rel = f"{kind}/{f.name}"
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            sig = [st.st_mtime_ns, st.st_size]
+            prev = old_items.get(rel)
+            if prev and prev.get("sig") == sig:
+                items[rel] = prev
+                continue
+            parsed += 1
+            rec = _item_record(kind, _load_json(f, None), postings)
+            rec["sig"] = sig
+            items[rel] = rec
+
+    topics = _plan_topics(plan)
+    counts = [{"findings": 0, "sources": 0, "primary": False} for _ in topics]
+    by_tid: dict[str, list[int]] = {}
+    for i, topic in enumerate(topics):
+        by_tid.setdefault(str(topic.get("id") or ""), []).append(i)
+    for rel, rec in items.items():
+        if rec.get("skip"):
+            continue
+        hit = set(rec.get("topics") or [])
+        hit.update(by_tid.get(rec.get("tid"), ()))
+        is_source = rel.startswith("sources/")
+        for i in hit:
+            if i >= len(counts):
+                continue
+            c = counts[i]
+            if is_source:
+                c["sources"] += 1
+                c["primary"] = c["primary"] or bool(rec.get("primary"))
+            else:
+                c["findings"] += 1
+
+    topic_out: list[dict[str, Any]] = []
+    for raw, c in zip(topics, counts):
+        topic = dict(raw)
+        min_sources = max(1, int(topic.get("min_sources") or 2))
+        topic["coverage"] = {
+            "findings_count": c["findings"],
+            "sources_count": c["sources"],
+            "has_primary_source": c["primary"],
+            "is_covered": c["sources"] >= min_sources,
+        }
+        topic_out.append(topic)
+
+    state["items"] = items
+    state["last_run_parsed"] = parsed
+    try:
+        tmp = state_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False))
+        tmp.replace(state_path)
+    except Exception:
+        pass
+    return _summarize(topic_out)
+
+
 def main() -> None:
     if len(sys.argv) < 2:
         print("Usage: research_coverage.py <project_id>", file=sys.stderr)
@@ -164,9 +289,7 @@ def main() -> None:
         print(json.dumps({"pass": False, "error": "research_plan.json not found", "coverage_rate": 0.0}, indent=2))
         return
     plan = _load_json(plan_path, {})
-    findings = _iter_findings(project_dir)
-    sources = _iter_source_meta(project_dir)
-    result = assess_coverage(plan, findings, sources)
+    result = assess_coverage_incremental(project_dir, plan)
     print(json.dumps(result, indent=2, ensure_ascii=False))
 
 
@@ -36,7 +36,9 @@ def _load_report(proj_path: Path, art_path: Path | None) -> str:
             return reports[0].read_text(encoding="utf-8", errors="replace")
     if art_path and (art_path / "report.md").exists():
         return (art_path / "report.md").read_text(encoding="utf-8", errors="replace")
-    return ""
+    # Synthesis still running (or crashed): critique the sections streamed so far
+    from tools.synthesis.stream import _load_partial_report
+    return _load_partial_report(proj_path)
 
 
 def _llm_json(system: str, user: str, project_id: str = "") -> dict:
@@ -16,8 +16,12 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from tools.research_common import project_dir, load_project, llm_call
+from tools.research_context_pack import pack_text
+from tools.research_sections import section_context
 
 MIN_CONTENT_LEN = 3000
+EXTRACT_CHARS = 8000
+EXTRACT_TOKENS = EXTRACT_CHARS // 4
 EXTRACT_MODEL = "gpt-4.1-mini"
 
 
@@ -100,7 +104,10 @@ Each fact should be a single sentence or short paragraph. Be specific (numbers,
                 continue
         if not existing_relevant:
             continue
-        user = f"TEXT:\n{text[:8000]}\n\nReturn only valid JSON with key 'facts'."
+        # papers: abstract/results/tables/conclusions chunks matching the question instead of front matter
+        excerpt = (section_context(proj_path, question, EXTRACT_CHARS, url=url, sid=base_id, data=d)
+                   or pack_text(question, text, EXTRACT_TOKENS, proj_path, project_id))
+        user = f"TEXT:\n{excerpt}\n\nReturn only valid JSON with key 'facts'."
         work.append((len(work), system_tpl, user, url, title))
     if not work:
         return 0
@@ -15,23 +15,7 @@ sys.path.insert(0, str(ROOT))
 def _find_transitive_patterns(mem, project_id: str) -> list[dict]:
     """Find A->B and B->C where no direct A->C exists (novel transitive connections)."""
     try:
-        rows = mem._conn.execute(
-            """
-            SELECT r1.entity_a_id AS a, r1.entity_b_id AS b, r1.relation_type AS rel_ab,
-                   r2.entity_b_id AS c, r2.relation_type AS rel_bc,
-                   e1.name AS name_a, e2.name AS name_b, e3.name AS name_c
-            FROM entity_relations r1
-            JOIN entity_relations r2 ON r1.entity_b_id = r2.entity_a_id
-            LEFT JOIN entity_relations r3 ON r3.entity_a_id = r1.entity_a_id AND r3.entity_b_id = r2.entity_b_id
-            JOIN entities e1 ON e1.id = r1.entity_a_id
-            JOIN entities e2 ON e2.id = r1.entity_b_id
-            JOIN entities e3 ON e3.id = r2.entity_b_id
-            WHERE r1.source_project = ? AND r2.source_project = ? AND r3.id IS NULL
-            ORDER BY r1.created_at DESC
-            LIMIT 20
-            """,
-            (project_id, project_id),
-        ).fetchall()
+        rows = mem.entity_two_hop_paths(project_id, limit=20)
         return [
             {
                 "entity_a": r["name_a"],
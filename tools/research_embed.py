@@ -88,6 +88,12 @@ def main():
         findings_dir = proj_dir / "findings"
         if not findings_dir.exists():
             continue
+        existing_keys = {
+            r["finding_key"]
+            for r in memory._conn.execute("SELECT finding_key FROM research_findings WHERE project_id=?", (project_id,)).fetchall()
+        }
+        rows: list[dict] = []
+        events: list[tuple] = []
         for f in findings_dir.glob("*.json"):
             try:
                 data = json.loads(f.read_text())
@@ -97,11 +103,9 @@ def main():
             if not content:
                 continue
             finding_key = f.stem
-            existing = memory._conn.execute(
-                "SELECT id FROM research_findings WHERE project_id=? AND finding_key=?", (project_id, finding_key)
-            ).fetchone()
-            if existing:
+            if finding_key in existing_keys:
                 continue
+            existing_keys.add(finding_key)
             scores = _scores_for_finding(proj_dir, data)
             decision = decide(scores)
             rev = reason(scores, decision)
@@ -123,23 +127,30 @@ def main():
                     rev = "embedding_failed"
             else:
                 emb_json = None
-            memory.insert_research_finding(
-                project_id=project_id,
-                finding_key=finding_key,
-                content_preview=content[:500],
-                embedding_json=emb_json,
-                url=data.get("url"),
-                title=data.get("title"),
-                relevance_score=scores.get("relevance_score"),
-                reliability_score=scores.get("reliability_score"),
-                verification_status=scores.get("verification_status"),
-                evidence_count=scores.get("evidence_count"),
-                importance_score=scores.get("importance_score"),
-                admission_state=decision,
-            )
-            memory.record_admission_event(project_id, finding_key, decision, rev, scores)
+            rows.append({
+                "project_id": project_id,
+                "finding_key": finding_key,
+                "content_preview": content[:500],
+                "embedding_json": emb_json,
+                "url": data.get("url"),
+                "title": data.get("title"),
+                "relevance_score": scores.get("relevance_score"),
+                "reliability_score": scores.get("reliability_score"),
+                "verification_status": scores.get("verification_status"),
+                "evidence_count": scores.get("evidence_count"),
+                "importance_score": scores.get("importance_score"),
+                "admission_state": decision,
+            })
+            events.append((finding_key, decision, rev, scores))
             if decision == "accepted":
                 indexed += 1
+        if not rows:
+            continue
+        # One commit per project instead of two per finding
+        with memory.batch():
+            memory.insert_research_findings_bulk(rows)
+            for finding_key, decision, rev, scores in events:
+                memory.record_admission_event(project_id, finding_key, decision, rev, scores)
     print(f"Indexed {indexed} findings (accepted)", file=sys.stderr)
     return 0
 
@@ -15,6 +15,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 import re
 from tools.research_common import project_dir, load_project, ensure_project_layout, llm_call
+from tools.research_context_pack import pack_items, pack_text
+
+EXCERPT_TOKENS = 2000
+RELATION_TOKENS = 3000  # extract_relations reads 12000 chars
 
 
 def _model():
@@ -101,7 +105,7 @@ def run_for_project(project_id: str) -> dict:
     name_to_id: dict[str, str] = {}
     work = []
     for i, f in enumerate(findings):
-        excerpt = (f.get("excerpt") or "")[:8000]
+        excerpt = pack_text(question, f.get("excerpt") or "", EXCERPT_TOKENS, proj_path, project_id)
         if not excerpt:
             continue
         work.append((i, f, excerpt))
@@ -131,30 +135,53 @@ def run_for_project(project_id: str) -> dict:
                 total_work,
             )
     all_text = []
+    items: list[dict] = []
+    item_context: list[tuple[str, str]] = []
     for i in sorted(results_by_index.keys()):
         f, excerpt, entities = results_by_index[i]
         all_text.append(excerpt)
         finding_key = (f.get("url") or "")[:200]
         for e in entities:
             name = (e.get("name") or "").strip()
+            if not name:
+                continue
             etype = (e.get("type") or "concept").lower()
             if etype not in ("person", "org", "tech", "concept", "event"):
                 etype = "concept"
-            try:
-                eid = mem.get_or_create_entity(name, etype, e.get("properties"), project_id)
-                name_to_id[name] = eid
-                mem.insert_entity_mention(eid, project_id, finding_key, excerpt[:300])
-            except Exception:
-                pass
-    combined = "\n\n".join(all_text)[:20000]
+            items.append({"name": name, "type": etype, "properties": e.get("properties"), "first_seen_project": project_id})
+            item_context.append((finding_key, excerpt[:300]))
+    # One transaction for the whole graph: bulk entity resolution + bulk mentions instead of a commit per row
+    try:
+        with mem.batch():
+            ids = mem.get_or_create_entities_bulk(items)
+            mentions = []
+            for it, eid, (finding_key, snippet) in zip(items, ids, item_context):
+                if not eid:
+                    continue
+                name_to_id[it["name"]] = eid
+                mentions.append({"entity_id": eid, "project_id": project_id, "finding_key": finding_key, "context_snippet": snippet})
+            mem.insert_mentions_bulk(mentions)
+    except Exception:
+        name_to_id.clear()
+    # relation context: the question-relevant passages of all excerpts (extract_relations reads 12000 chars)
+    combined = pack_items(
+        question, [{"excerpt": t} for t in all_text], RELATION_TOKENS, lambda _i, it: it["excerpt"],
+        proj_path=proj_path, project_id=project_id,
+    )
     entities_list = list(name_to_id.keys())
     if entities_list:
         progress_step(project_id, "Knowledge graph: extracting relations between entities")
         rels = extract_relations([{"name": n} for n in entities_list], combined, project_id=project_id, question=question)
+        relations = []
         for r in rels:
             a, b = name_to_id.get(r["from"]), name_to_id.get(r["to"])
             if a and b:
-                mem.insert_entity_relation(a, b, (r.get("relation") or "related")[:100], project_id, combined[:500])
+                relations.append({
+                    "entity_a_id": a, "entity_b_id": b, "relation_type": (r.get("relation") or "related")[:100],
+                    "source_project": project_id, "evidence": combined[:500],
+                })
+        with mem.batch():
+            mem.insert_entity_relations_bulk(relations)
     count_entities = len(name_to_id)
     count_relations = mem._conn.execute("SELECT COUNT(*) as c FROM entity_relations WHERE source_project = ?", (project_id,)).fetchone()["c"]
     count_mentions = mem._conn.execute("SELECT COUNT(*) as c FROM entity_mentions WHERE project_id = ?", (project_id,)).fetchone()["c"]
@@ -4,11 +4,14 @@ AEM: Evidence index — research/proj-*/evidence/evidence_index.jsonl.
 Required fields: source_cluster_id, independence_score, primary_source_flag, evidence_scope,
 scope_overlap_score, directness_score, method_rigor_score, conflict_of_interest_flag.
 Built from findings + sources + verify (source_reliability); used by portfolio scoring and scope/contradiction logic.
+evidence/evidence_links.json: inverted index url->evidence, claim->evidence, url->claims, term->claims, updated
+incrementally (only claims whose text or sources changed are re-indexed); contradiction linking reads url->claims.
 """
 from __future__ import annotations
 
 import hashlib
 import json
+import re
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
@@ -19,7 +22,10 @@ from tools.research_claim_state_machine import load_ledger_jsonl
 
 EVIDENCE_DIR = "evidence"
 EVIDENCE_INDEX_FILENAME = "evidence_index.jsonl"
+EVIDENCE_LINKS_FILENAME = "evidence_links.json"
+EVIDENCE_FILES_CACHE = "evidence_files.json"
 SCOPE_KEYS = ("population", "geography", "timeframe", "domain")
+_TERM_RE = re.compile(r"\b[a-z0-9\-\.\%]{2,}\b")
 
 
 def _default_evidence_scope() -> dict:
@@ -54,10 +60,269 @@ def _scope_overlap(claim_scope: dict, evidence_scope: dict) -> float:
     return round(match / total, 4) if total else 0.0
 
 
+def _file_sig(path: Path) -> list[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _finding_entry(url: str, stem: str, d: dict, ts: str) -> dict:
+    return {
+        "evidence_id": f"e-{hashlib.sha256((url + stem).encode()).hexdigest()[:12]}",
+        "source_url": url,
+        "source_type": (d.get("source_type") or "primary").strip().lower() if d.get("source_type") else "primary",
+        "source_cluster_id": _source_cluster_id(url),
+        "independence_score": 0.7,  # Default; same cluster => lower independence when we have multiple from same domain
+        "primary_source_flag": (d.get("source_type") or "primary").strip().lower() == "primary",
+        "evidence_scope": _default_evidence_scope(),
+        "scope_overlap_score": 0.0,  # Filled when linked to claim
+        "directness_score": 0.6,
+        "method_rigor_score": 0.5,
+        "conflict_of_interest_flag": False,
+        "reliability_score": 0.5,
+        "ts": ts,
+    }
+
+
+def _source_entry(url: str, stem: str, ts: str) -> dict:
+    return {
+        "evidence_id": f"e-{hashlib.sha256((url + stem).encode()).hexdigest()[:12]}",
+        "source_url": url,
+        "source_type": "secondary",
+        "source_cluster_id": _source_cluster_id(url),
+        "independence_score": 0.5,
+        "primary_source_flag": False,
+        "evidence_scope": _default_evidence_scope(),
+        "scope_overlap_score": 0.0,
+        "directness_score": 0.4,
+        "method_rigor_score": 0.5,
+        "conflict_of_interest_flag": False,
+        "reliability_score": 0.5,
+        "ts": ts,
+    }
+
+
+def _load_file_cache(proj_path: Path) -> dict:
+    path = proj_path / EVIDENCE_DIR / EVIDENCE_FILES_CACHE
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _base_entries(proj_path: Path, ts: str) -> tuple[list[dict], dict, int]:
+    """
+    Base evidence entries (before reliability/scope/independence) in build order: findings, then sources.
+    Per-file results are cached by (mtime_ns, size), so only new or changed files are parsed.
+    Returns (entries, new_file_cache, parsed_count).
+    """
+    old_cache = _load_file_cache(proj_path)
+    new_cache: dict[str, dict] = {}
+    entries: list[dict] = []
+    seen_urls: set[str] = set()
+    parsed = 0
+    listing = [("findings", f) for f in sorted((proj_path / "findings").glob("*.json"))]
+    listing += [("sources", s) for s in sorted((proj_path / "sources").glob("*.json")) if "_content" not in s.name]
+    for kind, f in listing:
+        rel = f"{kind}/{f.name}"
+        try:
+            sig = _file_sig(f)
+        except OSError:
+            continue
+        cached = old_cache.get(rel)
+        if cached and cached.get("sig") == sig:
+            entry = cached.get("entry")
+        else:
+            parsed += 1
+            try:
+                d = json.loads(f.read_text())
+            except Exception:
+                d = None
+            url = (d.get("url") or "").strip() if isinstance(d, dict) else ""
+            entry = None
+            if url:
+                entry = _finding_entry(url, f.stem, d, ts) if kind == "findings" else _source_entry(url, f.stem, ts)
+        new_cache[rel] = {"sig": sig, "entry": entry}
+        if not entry:
+            continue
+        url = entry["source_url"]
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        entries.append(dict(entry, evidence_scope=dict(entry.get("evidence_scope") or _default_evidence_scope())))
+    return entries, new_cache, parsed
+
+
+def _claim_terms(text: str) -> set[str]:
+    return set(_TERM_RE.findall((text or "").lower()))
+
+
+def _claim_ref(c: dict) -> str:
+    return f"{c.get('claim_id', '')}@{c.get('claim_version', 1)}"
+
+
+def _claim_records(claims: list[dict]) -> dict[str, dict]:
+    """claim_ref -> {"h", "urls", "terms"}; claims sharing a ref are merged. h is the signature of urls + terms."""
+    grouped: dict[str, dict] = {}
+    for c in claims:
+        rec = grouped.setdefault(_claim_ref(c), {"urls": [], "terms": set()})
+        for sid in c.get("supporting_source_ids") or []:
+            url = (sid if isinstance(sid, str) else str(sid)).strip()
+            if url and url not in rec["urls"]:
+                rec["urls"].append(url)
+        rec["terms"].update(_claim_terms(c.get("text") or c.get("claim") or ""))
+    out = {}
+    for ref, rec in grouped.items():
+        terms = sorted(rec["terms"])
+        h = hashlib.sha256(json.dumps([rec["urls"], terms]).encode("utf-8")).hexdigest()[:16]
+        out[ref] = {"h": h, "urls": rec["urls"], "terms": terms}
+    return out
+
+
+def _evidence_map(evidence_list: list[dict]) -> dict[str, str]:
+    out = {}
+    for e in evidence_list:
+        url = (e.get("source_url") or "").strip()
+        if url:
+            out[url] = e.get("evidence_id") or ""
+    return out
+
+
+class ClaimEvidenceIndex:
+    """
+    Inverted index over evidence and claims: url -> evidence_id, claim_ref -> evidence_ids,
+    url -> claim_refs, term -> claim_refs. Persisted as evidence/evidence_links.json together with the
+    per-claim records (urls, terms, signature) that update() diffs against.
+    """
+
+    def __init__(self, data: dict | None = None) -> None:
+        data = data or {}
+        if "claims" not in data:
+            data = {}  # written before per-claim records existed: rebuild from scratch
+        self.url_to_evidence: dict[str, str] = dict(data.get("url_to_evidence") or {})
+        self.claim_to_evidence: dict[str, list[str]] = dict(data.get("claim_to_evidence") or {})
+        self.url_to_claims: dict[str, list[str]] = dict(data.get("url_to_claims") or {})
+        self.term_to_claims: dict[str, list[str]] = dict(data.get("term_to_claims") or {})
+        self.claims: dict[str, dict] = dict(data.get("claims") or {})
+
+    @classmethod
+    def build(cls, evidence_list: list[dict], claims: list[dict]) -> "ClaimEvidenceIndex":
+        idx = cls()
+        idx.update(evidence_list, claims)
+        return idx
+
+    def _unlink(self, ref: str, rec: dict) -> None:
+        for postings, keys in ((self.url_to_claims, rec.get("urls")), (self.term_to_claims, rec.get("terms"))):
+            for key in keys or []:
+                refs = postings.get(key)
+                if refs and ref in refs:
+                    refs.remove(ref)
+                    if not refs:
+                        del postings[key]
+        self.claim_to_evidence.pop(ref, None)
+
+    def _link_evidence(self, ref: str, rec: dict) -> None:
+        ev_ids: list[str] = []
+        for url in rec["urls"]:
+            eid = self.url_to_evidence.get(url)
+            if eid and eid not in ev_ids:
+                ev_ids.append(eid)
+        self.claim_to_evidence[ref] = ev_ids
+
+    def update(self, evidence_list: list[dict], claims: list[dict]) -> int:
+        """Bring the index in line with evidence_list and claims; only new, changed or removed claims touch
+        the postings. Returns the number of claims re-indexed (0: nothing changed)."""
+        records = _claim_records(claims)
+        evidence = _evidence_map(evidence_list)
+        evidence_changed = evidence != self.url_to_evidence
+        self.url_to_evidence = evidence
+        changed = 0
+        for ref in [r for r in self.claims if r not in records]:
+            self._unlink(ref, self.claims.pop(ref))
+            changed += 1
+        for ref, rec in records.items():
+            prev = self.claims.get(ref)
+            if prev and prev.get("h") == rec["h"]:
+                if evidence_changed:
+                    self._link_evidence(ref, rec)
+                continue
+            if prev:
+                self._unlink(ref, prev)
+            for url in rec["urls"]:
+                self.url_to_claims.setdefault(url, []).append(ref)
+            for t in rec["terms"]:
+                self.term_to_claims.setdefault(t, []).append(ref)
+            self._link_evidence(ref, rec)
+            self.claims[ref] = rec
+            changed += 1
+        return changed + (1 if evidence_changed else 0)
+
+    def to_dict(self) -> dict:
+        return {
+            "url_to_evidence": self.url_to_evidence,
+            "claim_to_evidence": self.claim_to_evidence,
+            "url_to_claims": self.url_to_claims,
+            "term_to_claims": self.term_to_claims,
+            "claims": self.claims,
+        }
+
+    def evidence_for_claim(self, claim_ref: str) -> list[str]:
+        """Evidence ids supporting claim_ref (claim_id@version)."""
+        return list(self.claim_to_evidence.get(claim_ref, []))
+
+    def claims_citing_source(self, url: str) -> list[str]:
+        """Claim refs whose supporting_source_ids include url."""
+        return list(self.url_to_claims.get((url or "").strip(), []))
+
+    def claims_sharing_terms(self, text: str, min_shared: int = 1) -> list[str]:
+        """Claim refs sharing at least min_shared terms with text, most shared first."""
+        counts: dict[str, int] = {}
+        for t in _claim_terms(text):
+            for ref in self.term_to_claims.get(t, ()):
+                counts[ref] = counts.get(ref, 0) + 1
+        return [r for r, n in sorted(counts.items(), key=lambda x: -x[1]) if n >= min_shared]
+
+
+def load_claim_evidence_index(proj_path: Path) -> ClaimEvidenceIndex:
+    path = proj_path / EVIDENCE_DIR / EVIDENCE_LINKS_FILENAME
+    if not path.exists():
+        return ClaimEvidenceIndex()
+    try:
+        return ClaimEvidenceIndex(json.loads(path.read_text(encoding="utf-8")))
+    except Exception:
+        return ClaimEvidenceIndex()
+
+
+def _save_claim_evidence_index(proj_path: Path, idx: ClaimEvidenceIndex) -> None:
+    (proj_path / EVIDENCE_DIR).mkdir(parents=True, exist_ok=True)
+    path = proj_path / EVIDENCE_DIR / EVIDENCE_LINKS_FILENAME
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(idx.to_dict(), ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def claim_evidence_index(proj_path: Path, claims: list[dict] | None = None,
+                         evidence_list: list[dict] | None = None) -> ClaimEvidenceIndex:
+    """
+    The persisted index, updated for the current ledger (claims) and evidence_index.jsonl (evidence_list);
+    both are loaded when not given. Saved only when something changed.
+    """
+    idx = load_claim_evidence_index(proj_path)
+    claims = load_ledger_jsonl(proj_path) if claims is None else claims
+    evidence_list = load_evidence_index(proj_path) if evidence_list is None else evidence_list
+    if idx.update(evidence_list, claims):
+        _save_claim_evidence_index(proj_path, idx)
+    return idx
+
+
 def build_evidence_index(project_id: str) -> list[dict]:
     """
     Build evidence_index.jsonl from findings, sources, verify/source_reliability.
     One line per evidence item (per finding or per source with content). Required fields present.
+    Incremental: unchanged findings/sources files are not re-parsed (evidence/evidence_files.json).
+    Also updates the claim/evidence inverted index (evidence/evidence_links.json) for changed claims.
     """
     proj_path = project_dir(project_id)
     project = load_project(proj_path)
@@ -73,62 +338,10 @@ def build_evidence_index(project_id: str) -> list[dict]:
                     rel_by_url[u] = float(s.get("reliability_score", 0.5))
         except Exception:
             pass
-    evidence_list: list[dict] = []
-    seen_urls: set[str] = set()
-    # From findings
-    for f in sorted((proj_path / "findings").glob("*.json")):
-        try:
-            d = json.loads(f.read_text())
-        except Exception:
-            continue
-        url = (d.get("url") or "").strip()
-        if not url or url in seen_urls:
-            continue
-        seen_urls.add(url)
-        cluster = _source_cluster_id(url)
-        evidence_list.append({
-            "evidence_id": f"e-{hashlib.sha256((url + f.stem).encode()).hexdigest()[:12]}",
-            "source_url": url,
-            "source_type": (d.get("source_type") or "primary").strip().lower() if d.get("source_type") else "primary",
-            "source_cluster_id": cluster,
-            "independence_score": 0.7,  # Default; same cluster => lower independence when we have multiple from same domain
-            "primary_source_flag": (d.get("source_type") or "primary").strip().lower() == "primary",
-            "evidence_scope": _default_evidence_scope(),
-            "scope_overlap_score": 0.0,  # Filled when linked to claim
-            "directness_score": 0.6,
-            "method_rigor_score": 0.5,
-            "conflict_of_interest_flag": False,
-            "reliability_score": rel_by_url.get(url, 0.5),
-            "ts": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        })
-    # From sources (no _content) not already in findings
-    for s in sorted((proj_path / "sources").glob("*.json")):
-        if "_content" in s.name:
-            continue
-        try:
-            d = json.loads(s.read_text())
-        except Exception:
-            continue
-        url = (d.get("url") or "").strip()
-        if not url or url in seen_urls:
-            continue
-        seen_urls.add(url)
-        cluster = _source_cluster_id(url)
-        evidence_list.append({
-            "evidence_id": f"e-{hashlib.sha256((url + s.stem).encode()).hexdigest()[:12]}",
-            "source_url": url,
-            "source_type": "secondary",
-            "source_cluster_id": cluster,
-            "independence_score": 0.5,
-            "primary_source_flag": False,
-            "evidence_scope": _default_evidence_scope(),
-            "scope_overlap_score": 0.0,
-            "directness_score": 0.4,
-            "method_rigor_score": 0.5,
-            "conflict_of_interest_flag": False,
-            "reliability_score": rel_by_url.get(url, 0.5),
-            "ts": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-        })
+    ts = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    evidence_list, file_cache, parsed = _base_entries(proj_path, ts)
+    for e in evidence_list:
+        e["reliability_score"] = rel_by_url.get(e["source_url"], 0.5)
     # Claim/evidence scope overlap and independence from ledger
     claims = load_ledger_jsonl(proj_path)
     url_to_refs: dict[str, list[dict]] = {}
@@ -161,7 +374,9 @@ def build_evidence_index(project_id: str) -> list[dict]:
     path = proj_path / EVIDENCE_DIR / EVIDENCE_INDEX_FILENAME
     lines = [json.dumps(e, ensure_ascii=False) for e in evidence_list]
     path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
-    audit_log(proj_path, "aem_evidence_index_built", {"evidence_count": len(evidence_list)})
+    (proj_path / EVIDENCE_DIR / EVIDENCE_FILES_CACHE).write_text(json.dumps(file_cache, ensure_ascii=False), encoding="utf-8")
+    claim_evidence_index(proj_path, claims, evidence_list)
+    audit_log(proj_path, "aem_evidence_index_built", {"evidence_count": len(evidence_list), "files_parsed": parsed})
     return evidence_list
 
 
@@ -182,7 +397,7 @@ def load_evidence_index(proj_path: Path) -> list[dict]:
 
 def main() -> None:
     if len(sys.argv) < 3:
-        print("Usage: research_evidence_index.py build <project_id>", file=sys.stderr)
+        print("Usage: research_evidence_index.py build|claims-for-source|evidence-for-claim <project_id> [url|claim_ref]", file=sys.stderr)
         sys.exit(2)
     cmd, project_id = sys.argv[1].strip().lower(), sys.argv[2].strip()
     proj_path = project_dir(project_id)
@@ -192,8 +407,13 @@ def main() -> None:
     if cmd == "build":
         out = build_evidence_index(project_id)
         print(json.dumps({"ok": True, "evidence_count": len(out)}))
+    elif cmd in ("claims-for-source", "evidence-for-claim") and len(sys.argv) >= 4:
+        idx = load_claim_evidence_index(proj_path)
+        key = sys.argv[3].strip()
+        out = idx.claims_citing_source(key) if cmd == "claims-for-source" else idx.evidence_for_claim(key)
+        print(json.dumps(out))
     else:
-        print("Unknown command: use build", file=sys.stderr)
+        print("Unknown command: use build | claims-for-source <url> | evidence-for-claim <claim_ref>", file=sys.stderr)
         sys.exit(2)
 
 
@@ -20,7 +20,20 @@ _OPERATOR_ROOT = Path(os.environ.get("OPERATOR_ROOT", Path.home() / "operator"))
 sys.path.insert(0, str(_OPERATOR_ROOT))
 
 from tools.research_common import llm_call, model_for_lane, load_project
+from tools.research_capacity import open_manager
 from tools.research_sandbox import run_in_sandbox
+from tools.research_sandbox_pool import warm_pool
+
+try:
+    SANDBOX_SLOT_WAIT_SECONDS = float(os.environ.get("RESEARCH_CAPACITY_SANDBOX_WAIT") or 900)
+except ValueError:
+    SANDBOX_SLOT_WAIT_SECONDS = 900.0
+
+RESULTS_SCHEMA_HINT = (
+    '{"success": bool, "hypothesis": "proven" | "not_proven" | "partially_proven", '
+    '"criteria": {"<criterion>": bool}, "performance_met": bool, "replication_met": bool, '
+    '"stability_met": bool, "improvement_percent": float, "metrics": {"<name>": number}}'
+)
 
 
 def _parse_bool_from_stdout(stdout: str, label_regex: str) -> bool | None:
@@ -40,10 +53,18 @@ def _parse_percent_from_stdout(stdout: str, label_regex: str) -> float | None:
         return None
 
 
-def derive_experiment_gate(stdout: str, execution_success: bool) -> dict:
+def _structured_bool(results: dict, key: str) -> bool | None:
+    v = results.get(key)
+    return v if isinstance(v, bool) else None
+
+
+def derive_experiment_gate(stdout: str, execution_success: bool, results: dict | None = None) -> dict:
     """
     Derive strict experiment gate signals from sandbox stdout.
     Execution success (exit_code=0) is necessary but not sufficient.
+
+    results is the JSON the script wrote to $RESEARCH_RESULTS_PATH (see RESULTS_SCHEMA_HINT); keys it
+    sets take precedence over the markers parsed from stdout.
     """
     success_declared = bool(re.search(r"^\s*SUCCESS:", stdout, flags=re.MULTILINE))
     failure_declared = bool(re.search(r"^\s*FAILURE:", stdout, flags=re.MULTILINE))
@@ -63,6 +84,29 @@ def derive_experiment_gate(stdout: str, execution_success: bool) -> dict:
     std_met = _parse_bool_from_stdout(stdout, r"Robustness \(std dev acceptable\):")
     achieved_improvement_percent = _parse_percent_from_stdout(stdout, r"Achieved mean improvement:")
 
+    structured = isinstance(results, dict) and bool(results)
+    if structured:
+        success = _structured_bool(results, "success")
+        if success is not None:
+            success_declared, failure_declared = success, not success
+        hypothesis = str(results.get("hypothesis") or "").strip().lower().replace(" ", "_")
+        if hypothesis in ("proven", "not_proven", "partially_proven"):
+            hypothesis_proven = hypothesis == "proven"
+            hypothesis_not_proven = hypothesis == "not_proven"
+            hypothesis_partially_proven = hypothesis == "partially_proven"
+        criteria = results.get("criteria")
+        if isinstance(criteria, dict) and criteria:
+            criterion_pass_count = sum(1 for v in criteria.values() if v is True)
+            criterion_fail_count = sum(1 for v in criteria.values() if v is False)
+        v = _structured_bool(results, "performance_met")
+        performance_met = performance_met if v is None else v
+        v = _structured_bool(results, "replication_met")
+        replication_met = replication_met if v is None else v
+        v = _structured_bool(results, "stability_met")
+        std_met = std_met if v is None else v
+        if isinstance(results.get("improvement_percent"), (int, float)):
+            achieved_improvement_percent = float(results["improvement_percent"])
+
     # Objective is met only when execution is successful and either:
     # - explicit SUCCESS marker exists and no FAILURE marker, or
     # - explicit "Hypothesis PROVEN" marker exists and no negative hypothesis marker, or
@@ -119,6 +163,7 @@ def derive_experiment_gate(stdout: str, execution_success: bool) -> dict:
         "conclusion_not_supported_marker_present": conclusion_not_supported,
         "criterion_pass_count": criterion_pass_count,
         "criterion_fail_count": criterion_fail_count,
+        "structured_results": structured,
         "reasons": reasons,
     }
 
@@ -208,6 +253,41 @@ def spawn_subagent(parent_id: str, question: str) -> str:
         return f"Sub-agent report not found. Tail of logs:\n{log_path.read_text()[-1000:]}"
     return "Sub-agent failed to produce a report."
 
+def _hold_sandbox_slot(project_id: str):
+    """(manager, lease_id) for this run: the lease the orchestrator admitted (RESEARCH_CAPACITY_LEASE),
+    else a newly queued one once capacity allows. lease_id is "" if no slot opened within
+    SANDBOX_SLOT_WAIT_SECONDS; the caller must then skip the sandbox instead of running unleased."""
+    manager = open_manager()
+    if manager is None:
+        return None, ""
+    lease_id = os.environ.get("RESEARCH_CAPACITY_LEASE", "").strip()
+    if lease_id:
+        manager.bind(lease_id, pid=os.getpid())
+        return manager, lease_id
+    lease_id = manager.acquire("sandbox", project_id=project_id, timeout=SANDBOX_SLOT_WAIT_SECONDS)
+    return manager, lease_id
+
+
+def _save_no_capacity(proj_dir: Path) -> None:
+    """experiment.json for a run skipped because no sandbox slot opened; the gate treats it as skipped, not crashed."""
+    gate = {
+        "execution_success": None,
+        "objective_met": False,
+        "skipped": "no_capacity",
+        "reasons": [f"no sandbox capacity within {SANDBOX_SLOT_WAIT_SECONDS:.0f}s"],
+    }
+    (proj_dir / "experiment.json").write_text(json.dumps({
+        "success": False,
+        "status": "no_capacity",
+        "objective_met": False,
+        "gate": gate,
+        "results": None,
+        "iterations": 0,
+        "subagents_spawned": 0,
+        "history": [],
+    }, indent=2))
+
+
 def run_experiment_loop(project_id: str, max_iterations: int = 5, max_subagents: int = 3):
     proj_dir = _OPERATOR_ROOT / "research" / project_id
     if not proj_dir.exists():
@@ -252,6 +332,7 @@ CRITICAL RULES FOR THE PYTHON CODE:
 5. Do NOT use UI libraries or web frameworks. Just pure CLI/logic.
 6. OUTPUT ONLY VALID PYTHON CODE. No markdown formatting like ```python ... ``` around the final answer, JUST the raw code text starting with import. If you must explain, use python comments.
 7. The sandbox has Python 3.11 with numpy and scipy available (no torch, no pip at runtime, no network). Use numpy/scipy for arrays, math, stats, and simulations. If you get an import or runtime error, fix the code within these constraints. You cannot start further research rounds from here; only the Research Council may start new research rounds.
+8. At the end, also write the outcome as JSON to the file path in the environment variable RESEARCH_RESULTS_PATH (if set), with any of these keys: {RESULTS_SCHEMA_HINT}
 """
     if hypothesis:
         system_prompt += f"\n\nPI DIRECTIVE (CRITICAL): Your specific mission from the Council is to test this exact hypothesis in the sandbox:\n'{hypothesis}'\nYou must structure your code to actively prove or disprove this specific claim."
@@ -264,24 +345,32 @@ Research Report:
 Write the Python code to test the core ideas from this report.
 """
 
-    print(f"Starting Experiment Loop for {project_id} (max {max_iterations} iterations)...")
+    manager, lease_id = _hold_sandbox_slot(project_id)
+    if manager is not None and not lease_id:
+        manager.close()
+        print(f"No sandbox capacity after {SANDBOX_SLOT_WAIT_SECONDS:.0f}s; skipping experiment.")
+        _save_no_capacity(proj_dir)
+        return
+    try:
+        print(f"Starting Experiment Loop for {project_id} (max {max_iterations} iterations)...")
+        warm_pool()  # pooled workers start while the first code is generated
     
-    experiment_history = []
-    current_code = ""
-    subagents_spawned = 0
-    sandbox_result = None
+        experiment_history = []
+        current_code = ""
+        subagents_spawned = 0
+        sandbox_result = None
     
-    for iteration in range(1, max_iterations + 1):
-        print(f"\n--- Iteration {iteration} ---")
+        for iteration in range(1, max_iterations + 1):
+            print(f"\n--- Iteration {iteration} ---")
         
-        # Generate code
-        if iteration == 1:
-            print("Generating initial code hypothesis...")
-            result = llm_call(model, system_prompt, user_prompt, project_id=project_id)
-            current_code = result.text.strip()
-        else:
-            print("Refining code based on error...")
-            error_feedback = f"""The previous code failed or had issues. 
+            # Generate code
+            if iteration == 1:
+                print("Generating initial code hypothesis...")
+                result = llm_call(model, system_prompt, user_prompt, project_id=project_id)
+                current_code = result.text.strip()
+            else:
+                print("Refining code based on error...")
+                error_feedback = f"""The previous code failed or had issues. 
 Previous Code:
 ```python
 {current_code}
@@ -295,60 +384,76 @@ Sandbox Exit Code: {sandbox_result.exit_code if sandbox_result else 'Unknown'}
 
 Please fix the error and provide the updated complete, raw Python code. Sandbox has numpy and scipy (no torch, no network).
 """
-            result = llm_call(model, system_prompt, error_feedback, project_id=project_id)
-            current_code = result.text.strip()
-
-        # No sub-agent spawning: further research rounds may only be initiated by the Council.
-        if "SPAWN_AGENT:" in current_code:
-            print("LLM requested sub-agent; not allowed. Only the Council may start new research rounds.")
-            error_feedback = "You attempted to spawn a sub-agent. That is disabled. The sandbox has numpy and scipy (no torch). Rewrite the code using numpy/scipy or stdlib. Output only valid Python code."
-            result = llm_call(model, system_prompt, error_feedback, project_id=project_id)
-            current_code = result.text.strip()
-
-        # Clean the output just in case the LLM ignored the instruction
-        if current_code.startswith("```python"):
-            current_code = current_code[9:]
-        if current_code.startswith("```"):
-            current_code = current_code[3:]
-        if current_code.endswith("```"):
-            current_code = current_code[:-3]
-        current_code = current_code.strip()
-
-        print("Executing code in secure sandbox...")
-        sandbox_result = run_in_sandbox(current_code, timeout_seconds=30)
+                result = llm_call(model, system_prompt, error_feedback, project_id=project_id)
+                current_code = result.text.strip()
+
+            # No sub-agent spawning: further research rounds may only be initiated by the Council.
+            if "SPAWN_AGENT:" in current_code:
+                print("LLM requested sub-agent; not allowed. Only the Council may start new research rounds.")
+                error_feedback = "You attempted to spawn a sub-agent. That is disabled. The sandbox has numpy and scipy (no torch). Rewrite the code using numpy/scipy or stdlib. Output only valid Python code."
+                result = llm_call(model, system_prompt, error_feedback, project_id=project_id)
+                current_code = result.text.strip()
+
+            # Clean the output just in case the LLM ignored the instruction
+            if current_code.startswith("```python"):
+                current_code = current_code[9:]
+            if current_code.startswith("```"):
+                current_code = current_code[3:]
+            if current_code.endswith("```"):
+                current_code = current_code[:-3]
+            current_code = current_code.strip()
+
+            print("Executing code in secure sandbox...")
+            sandbox_result = run_in_sandbox(current_code, timeout_seconds=30)
         
-        entry = {
-            "iteration": iteration,
-            "code": current_code,
-            "stdout": sandbox_result.stdout,
-            "stderr": sandbox_result.stderr,
-            "exit_code": sandbox_result.exit_code,
-            "timeout": sandbox_result.timeout
-        }
-        experiment_history.append(entry)
+            entry = {
+                "iteration": iteration,
+                "code": current_code,
+                "stdout": sandbox_result.stdout,
+                "stderr": sandbox_result.stderr,
+                "exit_code": sandbox_result.exit_code,
+                "timeout": sandbox_result.timeout,
+                "usage": sandbox_result.usage(),
+                "results": sandbox_result.results,
+            }
+            experiment_history.append(entry)
         
-        if sandbox_result.exit_code == 0:
-            print("SUCCESS! The code executed perfectly.")
-            print(f"Output:\n{sandbox_result.stdout.strip()}")
-            break
-        else:
-            print(f"FAILED (Exit code {sandbox_result.exit_code}).")
-            print(f"Error:\n{sandbox_result.stderr.strip()}")
-
-    # Save experiment results
-    out_file = proj_dir / "experiment.json"
-    execution_success = (sandbox_result.exit_code == 0 if sandbox_result else False)
-    final_stdout = (sandbox_result.stdout if sandbox_result else "") or ""
-    gate = derive_experiment_gate(final_stdout, execution_success)
-    out_file.write_text(json.dumps({
-        "success": execution_success,
-        "objective_met": gate.get("objective_met", False),
-        "gate": gate,
-        "iterations": iteration,
-        "subagents_spawned": subagents_spawned,
-        "history": experiment_history
-    }, indent=2))
-    print(f"\nExperiment saved to {out_file}")
+            if sandbox_result.exit_code == 0:
+                print("SUCCESS! The code executed perfectly.")
+                print(f"Output:\n{sandbox_result.stdout.strip()}")
+                break
+            else:
+                print(f"FAILED (Exit code {sandbox_result.exit_code}).")
+                print(f"Error:\n{sandbox_result.stderr.strip()}")
+
+        # Save experiment results
+        out_file = proj_dir / "experiment.json"
+        execution_success = (sandbox_result.exit_code == 0 if sandbox_result else False)
+        final_stdout = (sandbox_result.stdout if sandbox_result else "") or ""
+        final_results = sandbox_result.results if sandbox_result and isinstance(sandbox_result.results, dict) else None
+        gate = derive_experiment_gate(final_stdout, execution_success, final_results)
+        usage = {
+            "wall_seconds": round(sum(e["usage"]["wall_seconds"] for e in experiment_history), 3),
+            "cpu_seconds": round(sum(e["usage"]["cpu_seconds"] for e in experiment_history), 3),
+            "peak_rss_mb": max((e["usage"]["peak_rss_mb"] for e in experiment_history), default=0.0),
+            "output_bytes": sum(e["usage"]["output_bytes"] for e in experiment_history),
+            "runs": len(experiment_history),
+        }
+        out_file.write_text(json.dumps({
+            "success": execution_success,
+            "objective_met": gate.get("objective_met", False),
+            "gate": gate,
+            "results": final_results,
+            "usage": usage,
+            "iterations": iteration,
+            "subagents_spawned": subagents_spawned,
+            "history": experiment_history
+        }, indent=2))
+        print(f"\nExperiment saved to {out_file}")
+    finally:
+        if manager is not None:
+            manager.release(lease_id)
+            manager.close()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
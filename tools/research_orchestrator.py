@@ -4,6 +4,12 @@ Research Orchestrator (June-level autonomy).
 Runs periodically (e.g. via cron). Gathers done reports + sandbox results + running projects,
 asks an LLM what to do next, then starts new research runs and/or sandbox experiments in background.
 
+Research runs and sandbox experiments go through the capacity manager (research_capacity): each run first
+starts queued work that now fits, then queues its own and starts what fits. A new research question is
+queued under the done project it follows up on (named by the LLM, else the best lexical match), so it
+gets that project's priority and per-parent cap. The MAX_* variables cap how many new actions the LLM
+may suggest per run.
+
 Usage: research_orchestrator.py [--dry-run]
 Env: OPERATOR_ROOT, OPENAI_API_KEY (or uses Gemini fallback), RESEARCH_ORCHESTRATOR_MAX_RESEARCH=3, RESEARCH_ORCHESTRATOR_MAX_SANDBOX=2
 """
@@ -17,6 +23,7 @@ from pathlib import Path
 OPERATOR_ROOT = Path(os.environ.get("OPERATOR_ROOT", "/root/operator"))
 sys.path.insert(0, str(OPERATOR_ROOT))
 from tools.june_handoff_client import submit_research_start
+from tools.research_capacity import drain, drain_research, expected_gain, open_manager
 
 RESEARCH = OPERATOR_ROOT / "research"
 TOOLS = OPERATOR_ROOT / "tools"
@@ -74,11 +81,11 @@ def gather_context() -> tuple[str, list[str], list[str]]:
     running = []
     parts = []
 
-    for d in sorted(RESEARCH.iterdir()):
-        if not d.is_dir() or not d.name.startswith("proj-"):
-            continue
-        pid = d.name
-        phase = get_project_phase(d)
+    from tools.research_project_catalog import catalog
+
+    for pid, entry in catalog(RESEARCH).entries(newest_first=False):
+        d = RESEARCH / pid
+        phase = entry.get("phase", "")
         if phase == "done":
             done_ids.append(pid)
             report_excerpt = get_latest_report_excerpt(d)
@@ -105,10 +112,10 @@ Context:
 {context[:12000]}
 
 Output ONLY valid JSON with this structure (no markdown, no explanation):
-{{"research_questions": ["concrete research question 1", "question 2"], "sandbox_project_ids": ["proj-YYYYMMDD-xxxx"]}}
+{{"research_questions": [{{"question": "concrete research question 1", "from_project": "proj-YYYYMMDD-xxxx"}}], "sandbox_project_ids": ["proj-YYYYMMDD-xxxx"]}}
 
 Rules:
-- research_questions: 0 to {MAX_RESEARCH} new follow-up research questions (specific, one sentence, researchable). Only suggest if there are clear gaps or "Suggested Next Steps" not yet covered.
+- research_questions: 0 to {MAX_RESEARCH} new follow-up research questions (specific, one sentence, researchable). Only suggest if there are clear gaps or "Suggested Next Steps" not yet covered. from_project is the done project ID whose report the question follows up on.
 - sandbox_project_ids: 0 to {MAX_SANDBOX} done project IDs that should get an additional sandbox experiment run to validate or deepen results. Only include IDs that are in the "Done" list above and would benefit from more sandbox validation.
 - If nothing useful to do, return {{"research_questions": [], "sandbox_project_ids": []}}.
 """
@@ -150,7 +157,31 @@ Rules:
         return {"research_questions": [], "sandbox_project_ids": []}
 
 
-def start_research_question(question: str, dry_run: bool) -> str | None:
+def question_parents(questions: list, done_ids: list[str]) -> list[tuple[str, str]]:
+    """(question, parent project id) per LLM entry (a string or {"question", "from_project"}). A missing or
+    unknown from_project falls back to the done project whose question matches best; "" if none does."""
+    from tools.research_relevance import lexical_scores
+    done = []
+    for pid in done_ids:
+        try:
+            done.append((pid, json.loads((RESEARCH / pid / "project.json").read_text(encoding="utf-8")).get("question") or ""))
+        except (OSError, ValueError):
+            done.append((pid, ""))
+    out = []
+    for item in questions:
+        q = str((item.get("question") if isinstance(item, dict) else item) or "").strip()
+        parent = str(item.get("from_project") or "").strip() if isinstance(item, dict) else ""
+        if len(q) < 10:
+            continue
+        if parent not in done_ids:
+            scores = lexical_scores(q, [{"excerpt": dq} for _pid, dq in done]) if done else []
+            best = max(range(len(scores)), key=lambda i: scores[i], default=-1)
+            parent = done[best][0] if best >= 0 and scores[best] > 0 else ""
+        out.append((q, parent))
+    return out
+
+
+def start_research_question(question: str, dry_run: bool, parent_project_id: str = "") -> str | None:
     """Start research through June-owned control plane. Returns new project_id or None."""
     if dry_run:
         print(f"[dry-run] Would start research: {question[:60]}...", file=sys.stderr)
@@ -160,6 +191,7 @@ def start_research_question(question: str, dry_run: bool) -> str | None:
             question,
             source_command="research_orchestrator",
             run_until_done=True,
+            parent_project_id=parent_project_id,
         )
         new_project_id = str(payload.get("projectId") or "").strip()
         if not new_project_id:
@@ -171,28 +203,38 @@ def start_research_question(question: str, dry_run: bool) -> str | None:
         return None
 
 
-def start_sandbox_for_project(project_id: str, dry_run: bool) -> bool:
+def start_sandbox_for_project(project_id: str, dry_run: bool, lease_id: str = "") -> int:
+    """Start the experiment loop in background; returns its pid (1 in dry-run), 0 when not started.
+    lease_id is handed to the child (RESEARCH_CAPACITY_LEASE) so it holds the admitted sandbox slot."""
     if dry_run:
         print(f"[dry-run] Would run sandbox for {project_id}", file=sys.stderr)
-        return True
+        return 1
     proj_dir = RESEARCH / project_id
     if not proj_dir.is_dir() or get_project_phase(proj_dir) != "done":
         print(f"Skip sandbox for {project_id} (not done or missing)", file=sys.stderr)
-        return False
+        return 0
+    env = dict(os.environ)
+    if lease_id:
+        env["RESEARCH_CAPACITY_LEASE"] = lease_id
     try:
-        subprocess.Popen(
+        proc = subprocess.Popen(
             [sys.executable, str(TOOLS / "research_experiment.py"), project_id],
             cwd=str(OPERATOR_ROOT),
-            env=os.environ,
+            env=env,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
             start_new_session=True,
         )
         print(f"Started sandbox experiment for {project_id}", file=sys.stderr)
-        return True
+        return proc.pid
     except Exception as e:
         print(f"Failed to start sandbox for {project_id}: {e}", file=sys.stderr)
-        return False
+        return 0
+
+
+def _start_sandbox_lease(lease: dict) -> dict | None:
+    pid = start_sandbox_for_project(lease["project_id"], False, lease["id"])
+    return {"pid": pid} if pid else None
 
 
 def main():
@@ -206,17 +248,34 @@ def main():
         return 0
 
     decision = llm_decide(context)
-    questions = [q.strip() for q in (decision.get("research_questions") or []) if q and len(q) >= 10]
+    questions = question_parents(decision.get("research_questions") or [], done_ids)
     sandbox_ids = [s for s in (decision.get("sandbox_project_ids") or []) if s in done_ids]
 
     started = []
-    for q in questions:
-        pid = start_research_question(q, dry_run)
-        if pid:
-            started.append(("research", pid, q[:50]))
-    for sid in sandbox_ids:
-        if start_sandbox_for_project(sid, dry_run):
-            started.append(("sandbox", sid, ""))
+    manager = None if dry_run else open_manager()
+    if manager is None:
+        for q, parent in questions:
+            pid = start_research_question(q, dry_run, parent)
+            if pid:
+                started.append(("research", pid, q[:50]))
+        for sid in sandbox_ids:
+            if start_sandbox_for_project(sid, dry_run):
+                started.append(("sandbox", sid, ""))
+    else:
+        with manager:
+            for q, parent in questions:
+                manager.enqueue(
+                    "research_cycle",
+                    payload={"question": q, "source_command": "research_orchestrator", "run_until_done": True,
+                             "parent_project_id": parent},
+                    parent_id=parent,
+                )
+            for sid in sandbox_ids:
+                manager.enqueue("sandbox", project_id=sid, priority=expected_gain(sid))
+            for s in drain_research(manager):
+                started.append(("research", s["project_id"], s.get("question", "")[:50]))
+            for s in drain(manager, "sandbox", _start_sandbox_lease):
+                started.append(("sandbox", s["project_id"], ""))
 
     if started:
         print(json.dumps({"started": started, "dry_run": dry_run}))
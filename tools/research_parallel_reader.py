@@ -10,6 +10,11 @@ Usage:
   input-file: path to file with one URL or one path-to-source-JSON per line
   read-limit: max URLs to read (default: mode-dependent)
   workers: 1-12 (default 8)
+
+Sources are named by canonical URL (research_source_identity): URL variants in one run are read once,
+URLs already read for the project are not fetched again, content another project fetched recently is
+reused, and text identical to an already-read source does not produce a second finding.
+Output adds read_deduped / read_reused counts.
 """
 import json
 import os
@@ -20,9 +25,25 @@ import threading
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools.research_source_identity import (
+    GlobalSourceIndex,
+    SourceIndex,
+    canonical_url,
+    content_hash,
+    content_path,
+    item_doi,
+    open_global_index,
+    open_index,
+    source_id,
+)
+from tools.research_context_pack import pack_text
+from tools.research_sections import full_text_url, index_source as index_sections
 
 OPERATOR_ROOT = Path(os.environ.get("OPERATOR_ROOT", Path(__file__).resolve().parent.parent))
 TOOLS = OPERATOR_ROOT / "tools"
+# Question-relevant passages (research_context_pack) instead of the text head
+GATE_TOKENS = 2000
+EXCERPT_TOKENS = 1000
 
 
 def _get_url_from_line(line: str, proj_dir: Path) -> str:
@@ -99,11 +120,14 @@ def _save_result(
     rel_threshold: float,
     source_label: str,
     lock: threading.Lock,
+    index: SourceIndex,
+    global_index: GlobalSourceIndex | None = None,
 ) -> bool:
     """Apply relevance gate and write content + finding to proj_dir. Returns True if saved (success + relevant).
     Gate only runs when RESEARCH_ENABLE_RELEVANCE_GATE=1 to avoid concurrent LLM load in parallel workers."""
     import hashlib
-    text = (data.get("text") or data.get("abstract") or "")[:8000]
+    raw = data.get("text") or data.get("abstract") or ""
+    text = raw[:8000]
     title = data.get("title", "")
     relevant = True
     rel_score = 10.0
@@ -112,7 +136,7 @@ def _save_result(
     if text and question and enable_gate and not skip_gate:
         try:
             from tools.research_relevance_gate import check_relevance
-            gate = check_relevance(question, title, text, project_id="")
+            gate = check_relevance(question, title, pack_text(question, raw, GATE_TOKENS), project_id="")
             relevant = gate.get("relevant", True)
             rel_score = float(gate.get("score", 10))
             if not relevant:
@@ -124,12 +148,29 @@ def _save_result(
         print(f"FILTERED (below threshold={rel_threshold:.2f}, score={rel_score}): {url[:80]}", file=sys.stderr)
     if not relevant:
         return False
-    sid = hashlib.sha256(url.encode()).hexdigest()[:12]
+    sid = source_id(url)
+    chash = content_hash(text)
+    doi = item_doi({**data, "url": url})
     with lock:
+        duplicate = index.lookup(chash=chash) if chash else None
         (proj_dir / "sources" / f"{sid}_content.json").write_text(json.dumps(data, ensure_ascii=False))
+        index.record(sid, url, doi, chash)
+        try:
+            index_sections(proj_dir, url, data, sid)
+        except Exception as e:
+            print(f"WARN: section indexing failed for {url[:80]}: {e}", file=sys.stderr)
+        if global_index is not None:
+            try:
+                global_index.record(url, proj_dir.name, sid, doi, chash)
+            except Exception:
+                pass
+        if duplicate and duplicate != sid:
+            # same text already read under another URL (mirror, DOI redirect): no second finding
+            print(f"DUPLICATE_CONTENT: {url[:80]} (same as source {duplicate})", file=sys.stderr)
+            return True
         if text:
             confidence = min(0.9, 0.4 + rel_score * 0.05) if mode != "counter" else min(0.8, 0.3 + rel_score * 0.05)
-            fid = hashlib.sha256((url + text[:200]).encode()).hexdigest()[:12]
+            fid = hashlib.sha256((canonical_url(url) + text[:200]).encode()).hexdigest()[:12]
             finding_id = f"f_{fid}"
             search_query = os.environ.get("RESEARCH_SEARCH_QUERY", "")
             findings_dir = proj_dir / "findings"
@@ -142,11 +183,12 @@ def _save_result(
                         existing_findings.append({"excerpt": d.get("excerpt", "")})
                     except Exception:
                         pass
-            novelty = _compute_novelty(text[:4000], existing_findings)
+            excerpt = pack_text(question, raw, EXCERPT_TOKENS)
+            novelty = _compute_novelty(excerpt, existing_findings)
             if novelty < 0.15:
                 print(f"LOW_NOVELTY (score={novelty:.2f}): {url[:80]}", file=sys.stderr)
             finding_payload = {
-                "url": url, "title": title, "excerpt": text[:4000], "source": source_label,
+                "url": url, "title": title, "excerpt": excerpt, "source": source_label,
                 "confidence": confidence, "relevance_score": rel_score,
                 "finding_id": finding_id, "search_query": search_query, "read_phase": mode,
                 "novelty_score": round(novelty, 4),
@@ -155,6 +197,21 @@ def _save_result(
     return True
 
 
+def _claim(claimed: dict, canon: str, lock: threading.Lock) -> dict | None:
+    """Claim a canonical URL for this worker. Waits while another variant of it is being read; None
+    when a variant was read successfully, so only failed reads are retried with the next variant."""
+    while True:
+        with lock:
+            entry = claimed.get(canon)
+            if entry is None or (entry["done"].is_set() and not entry["ok"]):
+                entry = {"done": threading.Event(), "ok": False}
+                claimed[canon] = entry
+                return entry
+            if entry["done"].is_set():
+                return None
+        entry["done"].wait()
+
+
 def _run_worker(
     item: tuple[int, str],
     proj_dir: Path,
@@ -166,31 +223,80 @@ def _run_worker(
     lock: threading.Lock,
     results: list,
     total: int,
+    index: SourceIndex,
+    global_index: GlobalSourceIndex | None = None,
+    claimed: dict | None = None,
 ) -> None:
     idx, line = item
     url = _get_url_from_line(line, proj_dir)
     if not url:
-        results.append((idx, -1, 0))  # skipped (not an attempt)
+        results.append((idx, -1, 0, ""))  # skipped (not an attempt)
         return
+    entry = None
+    if claimed is not None:
+        entry = _claim(claimed, canonical_url(url), lock)
+        if entry is None:
+            results.append((idx, -1, 0, "dedup"))  # variant of a URL already read in this run
+            return
+    try:
+        if content_path(proj_dir, url) is not None:
+            results.append((idx, -1, 0, "dedup"))  # already read for this project: no second fetch
+            if entry is not None:
+                entry["ok"] = True
+            return
+        success, saved, reused = _read_and_save(
+            url, proj_dir, question, project_id, mode, rel_threshold, source_label, lock, total, idx, index, global_index,
+        )
+        if entry is not None:
+            entry["ok"] = success
+        results.append((idx, 1 if success else 0, 1 if saved else 0, "reused" if reused else ""))
+    finally:
+        if entry is not None:
+            entry["done"].set()
+
+
+def _read_and_save(
+    url: str,
+    proj_dir: Path,
+    question: str,
+    project_id: str,
+    mode: str,
+    rel_threshold: float,
+    source_label: str,
+    lock: threading.Lock,
+    total: int,
+    idx: int,
+    index: SourceIndex,
+    global_index: GlobalSourceIndex | None,
+) -> tuple[bool, bool, bool]:
+    """Fetch (or reuse) one URL and save it; (success, saved, reused)."""
     step_msg = f"Reading source {idx + 1}/{total}"
     try:
         from tools.research_progress import step_start
         step_start(project_id, step_msg, idx + 1, total)
     except Exception:
         pass
-    data = _read_one_url(url, project_id)
+    data = None
+    if global_index is not None:
+        try:
+            data = global_index.find_content(url, item_doi({"url": url}))
+        except Exception:
+            data = None
+    reused = data is not None
+    if data is None:
+        data = _read_one_url(full_text_url(url), project_id)
     text = (data.get("text") or data.get("abstract") or "").strip()
     err = (data.get("error") or "").strip()
     success = bool(text and not err)
     saved = False
     if success:
-        saved = _save_result(proj_dir, url, data, question, mode, rel_threshold, source_label, lock)
+        saved = _save_result(proj_dir, url, data, question, mode, rel_threshold, source_label, lock, index, global_index)
     try:
         from tools.research_progress import step_finish
         step_finish(project_id, step_msg)
     except Exception:
         pass
-    results.append((idx, 1 if success else 0, 1 if saved else 0))
+    return success, saved, reused
 
 
 def main() -> None:
@@ -245,7 +351,10 @@ def main() -> None:
         return
 
     lock = threading.Lock()
-    results: list[tuple[int, int, int]] = []
+    results: list[tuple[int, int, int, str]] = []
+    index = open_index(proj_dir)
+    global_index = open_global_index(proj_dir.parent)
+    claimed: dict[str, dict] = {}
     try:
         from tools.research_progress import step_summary
     except Exception:
@@ -269,6 +378,9 @@ def main() -> None:
             lock,
             results,
             total,
+            index,
+            global_index,
+            claimed,
         ): i for i, line in enumerate(lines)}
         completed = 0
         for future in as_completed(futures):
@@ -279,15 +391,20 @@ def main() -> None:
             except Exception as e:
                 print(f"WARN: parallel read worker failed: {e}", file=sys.stderr)
     # Results list is appended by workers; sort by idx and aggregate
+    index.save()
     results.sort(key=lambda x: x[0])
-    for _idx, succ, saved in results:
+    kinds = {"dedup": 0, "reused": 0}
+    for _idx, succ, saved, kind in results:
         if succ >= 0:  # valid URL was attempted
             attempts += 1
             if succ:
                 successes += 1
         if saved:
             saved_count += 1
-    out = {"read_attempts": attempts, "read_successes": successes, "read_failures": attempts - successes}
+        if kind:
+            kinds[kind] += 1
+    out = {"read_attempts": attempts, "read_successes": successes, "read_failures": attempts - successes,
+           "read_deduped": kinds["dedup"], "read_reused": kinds["reused"]}
     print(json.dumps(out))
 
 
@@ -1,68 +1,247 @@
 #!/usr/bin/env python3
 """
 Extract text from a PDF file. Input: path to PDF or URL (downloaded to temp).
-Output: JSON { "path"|"url", "text", "error", "page_count" }.
+Output: JSON { "path"|"url", "text", "error", "page_count", "truncated", "cached" }.
+
+URLs are streamed to a temp file and aborted past RESEARCH_PDF_MAX_MB (default 50). Text is extracted
+in page ranges (pdftotext -f/-l, else pypdf) and extraction stops once MAX_TEXT_CHARS are collected;
+PDFs with PARALLEL_MIN_PAGES or more pages extract their ranges in parallel (RESEARCH_PDF_WORKERS).
+Extracted text is cached by SHA-256 of the PDF in research/pdf_cache/ (RESEARCH_PDF_CACHE=0 disables).
 
 Usage:
   research_pdf_reader.py <path_or_url>
 """
+import hashlib
 import json
 import os
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from urllib.request import urlopen, Request
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+MAX_TEXT_CHARS = 300000
+DEFAULT_MAX_MB = 50
+PAGE_BATCH = 10
+PARALLEL_MIN_PAGES = 40
+CHUNK_BYTES = 1 << 16
+CACHE_DIR = "pdf_cache"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def max_bytes() -> int:
+    return _env_int("RESEARCH_PDF_MAX_MB", DEFAULT_MAX_MB) * 1024 * 1024
+
+
+def workers() -> int:
+    return max(1, _env_int("RESEARCH_PDF_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+def download(url: str, dest: Path, limit: int | None = None, timeout: int = 30) -> int:
+    """Stream url to dest; raises ValueError once the body exceeds limit bytes. Returns bytes written."""
+    limit = max_bytes() if limit is None else limit
+    req = Request(url, headers={"User-Agent": "OperatorResearch/1.0"})
+    written = 0
+    with urlopen(req, timeout=timeout) as r, open(dest, "wb") as f:
+        length = r.headers.get("Content-Length") if getattr(r, "headers", None) else None
+        if length and length.isdigit() and int(length) > limit:
+            raise ValueError(f"PDF too large ({int(length) // (1024 * 1024)} MB > {limit // (1024 * 1024)} MB)")
+        while True:
+            chunk = r.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > limit:
+                raise ValueError(f"PDF too large (> {limit // (1024 * 1024)} MB)")
+            f.write(chunk)
+    return written
+
+
+def file_sha(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_path(sha: str) -> Path | None:
+    if os.environ.get("RESEARCH_PDF_CACHE", "1").strip().lower() in ("0", "false", "no"):
+        return None
+    try:
+        from tools.research_common import research_root
+        return research_root() / CACHE_DIR / f"{sha}.json"
+    except Exception:
+        return None
+
+
+def load_cached(sha: str, max_chars: int = MAX_TEXT_CHARS) -> dict | None:
+    """Cached extraction of this PDF if it covers max_chars (or the whole document)."""
+    p = _cache_path(sha)
+    if p is None:
+        return None
+    try:
+        data = json.loads(p.read_text())
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return None
+    if not isinstance(data, dict) or not data.get("text"):
+        return None
+    if data.get("truncated") and data.get("max_chars", 0) < max_chars:
+        return None
+    return data
+
+
+def save_cached(sha: str, data: dict) -> None:
+    p = _cache_path(sha)
+    if p is None or not data.get("text"):
+        return
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False))
+        tmp.replace(p)
+    except OSError:
+        pass
+
 
-def extract_pdftotext(pdf_path: Path) -> tuple[str, int]:
-    """Use pdftotext (poppler-utils) if available."""
+def pdf_page_count(pdf_path: Path) -> int:
+    """Page count from pdfinfo; 0 when pdfinfo is missing or fails."""
+    try:
+        r = subprocess.run(["pdfinfo", str(pdf_path)], capture_output=True, text=True, timeout=5)
+    except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
+        return 0
+    for line in r.stdout.splitlines():
+        if line.startswith("Pages:"):
+            try:
+                return int(line.split(":", 1)[1].strip())
+            except ValueError:
+                return 0
+    return 0
+
+
+def _pdftotext_range(pdf_path: str, first: int, last: int) -> str:
     result = subprocess.run(
-        ["pdftotext", "-layout", str(pdf_path), "-"],
+        ["pdftotext", "-layout", "-f", str(first), "-l", str(last), pdf_path, "-"],
         capture_output=True,
         text=True,
         timeout=60,
     )
     if result.returncode != 0:
         raise RuntimeError(result.stderr or "pdftotext failed")
-    # Page count: pdftotext doesn't give it; use pdfinfo if available
+    return result.stdout
+
+
+def _pypdf_range(pdf_path: str, first: int, last: int) -> str:
+    from pypdf import PdfReader
+    reader = PdfReader(pdf_path)
+    parts = []
+    for i in range(first - 1, min(last, len(reader.pages))):
+        text = reader.pages[i].extract_text()
+        if text:
+            parts.append(text)
+    return "\n\n".join(parts)
+
+
+def _ranges(page_count: int, batch: int) -> list[tuple[int, int]]:
+    return [(p, min(p + batch - 1, page_count)) for p in range(1, page_count + 1, batch)]
+
+
+def extract_ranges(extract, pdf_path: Path, page_count: int, max_chars: int, sep: str, pool_cls=ThreadPoolExecutor) -> str:
+    """Run extract(path, first, last) over page ranges in order and stop once max_chars are collected.
+    Documents with PARALLEL_MIN_PAGES or more pages run one window of ranges per pool round."""
+    ranges = _ranges(page_count, PAGE_BATCH)
+    n_workers = workers() if page_count >= PARALLEL_MIN_PAGES else 1
+    pool = None
+    if n_workers > 1 and len(ranges) > 1:
+        try:
+            pool = pool_cls(max_workers=min(n_workers, len(ranges)))
+        except (OSError, NotImplementedError):
+            pool = None  # no process pool available here (e.g. restricted sandbox): extract inline
+    parts: list[str] = []
+    total = 0
     try:
-        r2 = subprocess.run(
-            ["pdfinfo", str(pdf_path)],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        n = 0
-        for line in r2.stdout.splitlines():
-            if line.startswith("Pages:"):
-                n = int(line.split(":", 1)[1].strip())
+        step = n_workers if pool is not None else 1
+        for i in range(0, len(ranges), step):
+            window = ranges[i:i + step]
+            if pool is not None:
+                texts = pool.map(extract, [str(pdf_path)] * len(window), *zip(*window))
+            else:
+                texts = [extract(str(pdf_path), *window[0])]
+            for text in texts:
+                if text:
+                    parts.append(text)
+                    total += len(text) + len(sep)
+            if total >= max_chars:
                 break
-        return result.stdout[:300000], n or 1
-    except Exception:
-        return result.stdout[:300000], 1
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    return sep.join(parts)[:max_chars]
+
+
+def _pdftotext_all(pdf_path: Path, max_chars: int) -> str:
+    result = subprocess.run(["pdftotext", "-layout", str(pdf_path), "-"], capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr or "pdftotext failed")
+    return result.stdout[:max_chars]
+
+
+def extract_pdftotext(pdf_path: Path, max_chars: int = MAX_TEXT_CHARS) -> tuple[str, int]:
+    """Use pdftotext (poppler-utils) if available; page ranges need pdfinfo for the page count."""
+    n = pdf_page_count(pdf_path)
+    if n <= 0:
+        return _pdftotext_all(pdf_path, max_chars), 1
+    return extract_ranges(_pdftotext_range, pdf_path, n, max_chars, ""), n
 
 
-def extract_pypdf(pdf_path: Path) -> tuple[str, int]:
+def extract_pypdf(pdf_path: Path, max_chars: int = MAX_TEXT_CHARS) -> tuple[str, int]:
     try:
         from pypdf import PdfReader
     except ImportError:
         raise RuntimeError("pypdf not installed; install with: pip install pypdf")
     reader = PdfReader(str(pdf_path))
     n = len(reader.pages)
+    if n >= PARALLEL_MIN_PAGES and workers() > 1:
+        return extract_ranges(_pypdf_range, pdf_path, n, max_chars, "\n\n", ProcessPoolExecutor), n
     parts = []
+    total = 0
     for p in reader.pages:
         text = p.extract_text()
         if text:
             parts.append(text)
-    return "\n\n".join(parts)[:300000], n
+            total += len(text) + 2
+            if total >= max_chars:
+                break
+    return "\n\n".join(parts)[:max_chars], n
 
 
-def extract_text(pdf_path: Path) -> tuple[str, int]:
+def extract_text(pdf_path: Path, max_chars: int = MAX_TEXT_CHARS) -> tuple[str, int]:
     try:
-        return extract_pdftotext(pdf_path)
+        return extract_pdftotext(pdf_path, max_chars)
     except (FileNotFoundError, RuntimeError):
-        return extract_pypdf(pdf_path)
+        return extract_pypdf(pdf_path, max_chars)
+
+
+def read_pdf(pdf_path: Path, max_chars: int = MAX_TEXT_CHARS) -> dict:
+    """{"text", "page_count", "truncated", "cached"} for a PDF file, served from the text cache when possible."""
+    sha = file_sha(pdf_path)
+    cached = load_cached(sha, max_chars)
+    if cached is not None:
+        return {"text": cached["text"][:max_chars], "page_count": cached.get("page_count", 0),
+                "truncated": bool(cached.get("truncated")) or len(cached["text"]) > max_chars, "cached": True}
+    text, page_count = extract_text(pdf_path, max_chars)
+    truncated = len(text) >= max_chars
+    save_cached(sha, {"text": text, "page_count": page_count, "truncated": truncated, "max_chars": max_chars})
+    return {"text": text, "page_count": page_count, "truncated": truncated, "cached": False}
 
 
 def main():
@@ -70,19 +249,20 @@ def main():
         print("Usage: research_pdf_reader.py <path_or_url>", file=sys.stderr)
         sys.exit(2)
     src = sys.argv[1].strip()
-    out = {"path": None, "url": None, "text": "", "page_count": 0, "error": ""}
+    out = {"path": None, "url": None, "text": "", "page_count": 0, "truncated": False, "cached": False, "error": ""}
     pdf_path = None
+    downloaded = False
     if src.startswith("http://") or src.startswith("https://"):
         out["url"] = src
+        fd, tmp_name = tempfile.mkstemp(suffix=".pdf")
+        os.close(fd)
+        pdf_path = Path(tmp_name)
+        downloaded = True
         try:
-            req = Request(src, headers={"User-Agent": "OperatorResearch/1.0"})
-            with urlopen(req, timeout=30) as r:
-                raw = r.read()
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
-                f.write(raw)
-                pdf_path = Path(f.name)
+            download(src, pdf_path)
         except Exception as e:
             out["error"] = str(e)
+            pdf_path.unlink(missing_ok=True)
             print(json.dumps(out, indent=2, ensure_ascii=False))
             sys.exit(1)
     else:
@@ -93,13 +273,11 @@ def main():
             print(json.dumps(out, indent=2, ensure_ascii=False))
             sys.exit(1)
     try:
-        text, page_count = extract_text(pdf_path)
-        out["text"] = text
-        out["page_count"] = page_count
+        out.update(read_pdf(pdf_path))
     except Exception as e:
         out["error"] = str(e)
     finally:
-        if out.get("url") and pdf_path and pdf_path.exists() and "/tmp" in str(pdf_path):
+        if downloaded:
             try:
                 pdf_path.unlink()
             except OSError:
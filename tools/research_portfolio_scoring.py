@@ -35,14 +35,23 @@ def run_portfolio_scoring(project_id: str) -> dict:
         scopes = [json.dumps(c.get("claim_scope") or {}, sort_keys=True) for c in claims]
         texts = [(c.get("text") or "").lower().split() for c in claims]
         dup_pairs = 0
-        for i in range(len(claims)):
-            for j in range(i + 1, len(claims)):
-                if scopes[i] == scopes[j] and scopes[i] != "{}":
-                    words_i, words_j = set(texts[i]), set(texts[j])
-                    if words_i and words_j:
-                        overlap = len(words_i & words_j) / max(len(words_i | words_j), 1)
-                        if overlap >= 0.5:
-                            dup_pairs += 1
+        # Candidate pairs via (scope, word) postings instead of all i<j pairs: a pair with
+        # Jaccard >= 0.5 must share a scope and at least one word.
+        word_sets = [set(t) for t in texts]
+        postings: dict[tuple[str, str], list[int]] = {}
+        for j in range(len(claims)):
+            if scopes[j] == "{}" or not word_sets[j]:
+                continue
+            candidates: set[int] = set()
+            for w in word_sets[j]:
+                candidates.update(postings.get((scopes[j], w), ()))
+            for i in candidates:
+                words_i, words_j = word_sets[i], word_sets[j]
+                overlap = len(words_i & words_j) / max(len(words_i | words_j), 1)
+                if overlap >= 0.5:
+                    dup_pairs += 1
+            for w in word_sets[j]:
+                postings.setdefault((scopes[j], w), []).append(j)
         if dup_pairs > 0:
             duplicate_penalty = min(0.3, dup_pairs * 0.05)
     score = max(0, 1.0 - flood_penalty - duplicate_penalty)
@@ -154,6 +154,29 @@ def step_summary(project_id: str, message: str, completed: int, total: int) -> N
         _write_progress(progress_file, data)
 
 
+def report_section(project_id: str, title: str, index: int, total: int, words: int, path: str) -> None:
+    """Record a finished report section so the UI/critic can read the partial report while synthesis runs."""
+    progress_file = _get_progress_file(project_id)
+    with _progress_lock(project_id):
+        data = _read_progress(progress_file)
+        if data:
+            data["heartbeat"] = _now_iso()
+            data["partial_report"] = {
+                "path": path,
+                "sections_done": index,
+                "sections_total": total,
+                "last_section": (title or "")[:200],
+            }
+            _write_progress(progress_file, data)
+    _append_event(project_id, "report_section_done", {
+        "section": (title or "")[:200],
+        "section_index": index,
+        "section_total": total,
+        "words": words,
+        "path": path,
+    })
+
+
 def step(project_id: str, message: str, index: int = None, total: int = None) -> None:
     progress_file = _get_progress_file(project_id)
     with _progress_lock(project_id):
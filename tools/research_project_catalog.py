@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Project catalog: compact index of research/proj-*/project.json (research/project_catalog.json).
+
+Holds per project: status, phase, parent_project_id, council_status, question, last_phase_at and
+counts (findings/sources/reports files), plus the project.json signature [mtime_ns, size].
+save_project() and research_advance_phase record the project they write; every other writer is
+picked up by refresh(), which stats each project.json and re-parses only changed ones. Parent ->
+children lookups come from an in-memory index instead of re-reading every project.
+
+Used by: lib/brain/perceive (research_projects, council children), research_orchestrator (gather_context).
+
+Usage:
+  research_project_catalog.py [--children <parent_id>]
+  Prints the refreshed catalog (or the children of one project) as JSON.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CATALOG_FILE = "project_catalog.json"
+CATALOG_VERSION = 1
+QUESTION_CHARS = 150
+_COUNTED_DIRS = ("findings", "sources", "reports")
+
+
+def is_terminal(status: str) -> bool:
+    return status in ("done", "cancelled", "abandoned", "aem_blocked") or (status or "").startswith("failed")
+
+
+def _signature(pj: Path) -> list[int] | None:
+    try:
+        st = pj.stat()
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _count_files(path: Path) -> int:
+    try:
+        with os.scandir(path) as it:
+            return sum(1 for e in it if e.name.endswith(".json") or e.name.endswith(".md"))
+    except OSError:
+        return 0
+
+
+def _entry(proj_dir: Path, data: dict, sig: list[int]) -> dict:
+    entry = {
+        "id": data.get("id", proj_dir.name),
+        "sig": sig,
+        "parent_project_id": data.get("parent_project_id") or "",
+        "council_status": data.get("council_status") or "",
+        "question": (data.get("question", "") or "")[:QUESTION_CHARS],
+        "last_phase_at": data.get("last_phase_at", data.get("created_at", "")),
+        "counts": {name: _count_files(proj_dir / name) for name in _COUNTED_DIRS},
+    }
+    # status/phase only when set, so readers keep their own defaults for missing keys
+    for key in ("status", "phase"):
+        if key in data:
+            entry[key] = data[key]
+    return entry
+
+
+def _parse(proj_dir: Path, sig: list[int]) -> dict | None:
+    try:
+        data = json.loads((proj_dir / "project.json").read_text())
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return None
+    return _entry(proj_dir, data if isinstance(data, dict) else {}, sig)
+
+
+def _default_root() -> Path:
+    from tools.research_common import research_root
+    return research_root()
+
+
+class ProjectCatalog:
+    """Catalog entries keyed by project directory name, with a parent -> children index."""
+
+    def __init__(self, root: Path, projects: dict[str, dict] | None = None):
+        self.root = Path(root)
+        self.projects: dict[str, dict] = projects or {}
+        self._children: dict[str, list[str]] | None = None
+
+    @property
+    def path(self) -> Path:
+        return self.root / CATALOG_FILE
+
+    @classmethod
+    def load(cls, root: Path | None = None) -> "ProjectCatalog":
+        """Catalog as last written (no validation against project.json; see refresh())."""
+        root = Path(root) if root else _default_root()
+        try:
+            data = json.loads((root / CATALOG_FILE).read_text())
+            if data.get("version") == CATALOG_VERSION and isinstance(data.get("projects"), dict):
+                return cls(root, data["projects"])
+        except (json.JSONDecodeError, OSError, AttributeError):
+            pass
+        return cls(root)
+
+    def save(self) -> None:
+        try:
+            tmp = self.path.with_name(f"{CATALOG_FILE}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": CATALOG_VERSION, "projects": self.projects}, ensure_ascii=False))
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+    def refresh(self) -> "ProjectCatalog":
+        """Sync with disk: stat every proj-*/project.json, re-parse changed ones, drop removed ones."""
+        seen: set[str] = set()
+        changed = False
+        try:
+            dirs = [e for e in os.scandir(self.root) if e.name.startswith("proj-") and e.is_dir()]
+        except OSError:
+            dirs = []
+        for d in dirs:
+            proj_dir = Path(d.path)
+            sig = _signature(proj_dir / "project.json")
+            if sig is None:
+                continue
+            seen.add(d.name)
+            cur = self.projects.get(d.name)
+            if cur is not None and cur.get("sig") == sig:
+                continue
+            entry = _parse(proj_dir, sig)
+            if entry is None:
+                if cur is not None:
+                    del self.projects[d.name]
+                    changed = True
+                seen.discard(d.name)
+                continue
+            self.projects[d.name] = entry
+            changed = True
+        for name in [n for n in self.projects if n not in seen]:
+            del self.projects[name]
+            changed = True
+        if changed:
+            self._children = None
+            self.save()
+        return self
+
+    def children(self, parent_id: str) -> list[dict]:
+        if self._children is None:
+            index: dict[str, list[str]] = {}
+            for name, entry in self.projects.items():
+                parent = entry.get("parent_project_id")
+                if parent:
+                    index.setdefault(parent, []).append(name)
+            self._children = index
+        return [self.projects[n] for n in sorted(self._children.get(parent_id, ()))]
+
+    def running_children(self, parent_id: str) -> int:
+        return sum(1 for c in self.children(parent_id) if not is_terminal(c.get("status", "")))
+
+    def entries(self, newest_first: bool = True) -> list[tuple[str, dict]]:
+        """(directory name, entry) pairs ordered by directory name."""
+        return sorted(self.projects.items(), key=lambda kv: kv[0], reverse=newest_first)
+
+
+def catalog(root: Path | None = None) -> ProjectCatalog:
+    """Loaded and refreshed catalog for a research root (default: research_root())."""
+    return ProjectCatalog.load(root).refresh()
+
+
+def record_project(proj_dir: Path, data: dict | None = None) -> None:
+    """Update the catalog entry of one project right after its project.json was written."""
+    try:
+        proj_dir = Path(proj_dir)
+        if not proj_dir.name.startswith("proj-"):
+            return
+        sig = _signature(proj_dir / "project.json")
+        if sig is None:
+            return
+        cat = ProjectCatalog.load(proj_dir.parent)
+        if not cat.projects and not cat.path.exists():
+            return  # no catalog yet: the first refresh() builds it from disk
+        entry = _entry(proj_dir, data, sig) if isinstance(data, dict) else _parse(proj_dir, sig)
+        if entry is None:
+            return
+        cat.projects[proj_dir.name] = entry
+        cat.save()
+    except Exception:
+        pass
+
+
+def main() -> None:
+    cat = catalog()
+    if "--children" in sys.argv:
+        idx = sys.argv.index("--children")
+        parent = sys.argv[idx + 1] if idx + 1 < len(sys.argv) else ""
+        print(json.dumps(cat.children(parent), indent=2, ensure_ascii=False))
+        return
+    print(json.dumps(cat.projects, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
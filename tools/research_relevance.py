@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Shared relevance scoring for findings/sources: hybrid BM25 + keyword overlap + (optional) semantic score.
+
+One scoring pass per call instead of per-finding keyword loops in every phase. Finding embeddings are kept
+in a per-project matrix cache (research/<id>/relevance_embeddings.json) keyed by content hash, so a finding
+is embedded once per project rather than on every synthesis/verify run.
+
+Used by: synthesis.data (finding sort), verify.common (finding sort), research_supervisor (relevance drift),
+research_orchestrator and research_sections (lexical scores), research_context_pack (relevance scores),
+verify.dedup (embed_texts).
+
+Usage:
+  research_relevance.py <project_id> [--semantic]
+  Prints the top findings with their scores (debugging aid).
+"""
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import math
+import operator
+import os
+import re
+import sys
+from array import array
+from functools import lru_cache
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+EMBEDDINGS_CACHE_FILE = "relevance_embeddings.json"
+EMBED_CHARS = 8000
+EMBED_BATCH_SIZE = 20
+BM25_K1 = 1.2
+BM25_B = 0.75
+LEXICAL_OVERLAP_WEIGHT = 0.5
+_WORD_RE = re.compile(r"\b[a-z]{3,}\b")
+
+
+@lru_cache(maxsize=16384)
+def terms(text: str) -> tuple:
+    """Lowercased 3+ letter words (with repeats, for term frequency). Cached per distinct text."""
+    return tuple(_WORD_RE.findall((text or "").lower()))
+
+
+def item_text(item: dict) -> str:
+    """Text a finding/source is scored on: excerpt (or description/abstract) + title."""
+    body = item.get("excerpt") or item.get("description") or item.get("abstract") or ""
+    return f"{body} {item.get('title') or ''}"
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8", errors="replace")).hexdigest()[:16]
+
+
+def keyword_score(item: dict, question: str) -> float:
+    """Fraction of question words present in the item (legacy per-finding keyword score)."""
+    q_words = set(terms(question))
+    f_words = set(terms(item_text(item)))
+    if not q_words or not f_words:
+        return 0.0
+    return len(q_words & f_words) / len(q_words)
+
+
+def bm25_scores(query_terms: set, docs: list[tuple]) -> list[float]:
+    """Okapi BM25 of each tokenised doc against the query terms, corpus = docs."""
+    n = len(docs)
+    if not n or not query_terms:
+        return [0.0] * n
+    avgdl = (sum(len(d) for d in docs) / n) or 1.0
+    df = {t: 0 for t in query_terms}
+    tfs = []
+    for d in docs:
+        tf: dict[str, int] = {}
+        for t in d:
+            if t in df:
+                tf[t] = tf.get(t, 0) + 1
+        for t in tf:
+            df[t] += 1
+        tfs.append(tf)
+    idf = {t: math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5)) for t in query_terms}
+    out = []
+    for d, tf in zip(docs, tfs):
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * len(d) / avgdl)
+        out.append(sum(idf[t] * f * (BM25_K1 + 1) / (f + norm) for t, f in tf.items()))
+    return out
+
+
+def lexical_scores(question: str, items: list[dict]) -> list[float]:
+    """Hybrid lexical score per item: keyword overlap blended with max-normalised BM25 (both in [0, 1])."""
+    q_terms = set(terms(question))
+    docs = [terms(item_text(it)) for it in items]
+    if not q_terms:
+        return [0.0] * len(items)
+    bm = bm25_scores(q_terms, docs)
+    top = max(bm) if bm else 0.0
+    out = []
+    for d, b in zip(docs, bm):
+        overlap = len(q_terms & set(d)) / len(q_terms) if d else 0.0
+        bm_norm = (b / top) if top > 0 else 0.0
+        out.append(LEXICAL_OVERLAP_WEIGHT * overlap + (1 - LEXICAL_OVERLAP_WEIGHT) * bm_norm)
+    return out
+
+
+def embed_texts(texts: list[str], project_id: str = "") -> list[list[float]]:
+    """Embed texts with OpenAI text-embedding-3-small. Returns one embedding per input; [] on failure or if disabled."""
+    if not texts:
+        return []
+    try:
+        from openai import OpenAI
+        from tools.research_common import load_secrets
+        secrets = load_secrets()
+        key = secrets.get("OPENAI_API_KEY")
+        if not key:
+            return []
+        client = OpenAI(api_key=key)
+        model = os.environ.get("RESEARCH_EMBEDDING_MODEL", "text-embedding-3-small")
+        out: list[list[float]] = []
+        for i in range(0, len(texts), EMBED_BATCH_SIZE):
+            slice_ = texts[i : i + EMBED_BATCH_SIZE]
+            batch = [t[:EMBED_CHARS] for t in slice_ if (t or "").strip()]
+            if not batch:
+                out.extend([[]] * len(slice_))
+                continue
+            resp = client.embeddings.create(model=model, input=batch)
+            by_idx = {item.index: item.embedding for item in resp.data}
+            idx_in_batch = 0
+            for t in slice_:
+                if (t or "").strip():
+                    out.append(by_idx.get(idx_in_batch, []))
+                    idx_in_batch += 1
+                else:
+                    out.append([])
+        if project_id and out:
+            try:
+                from tools.research_budget import track_usage
+                total = sum(len(e) for e in out) * 4  # rough token estimate
+                track_usage(project_id, "embedding", total, 0)
+            except Exception:
+                pass
+        return out[:len(texts)]
+    except Exception:
+        return []
+
+
+def _unit(vec) -> array:
+    n = math.sqrt(sum(x * x for x in vec))
+    return array("f", (x / n for x in vec)) if n else array("f")
+
+
+class EmbeddingMatrix:
+    """Per-project cache of unit-normalised embeddings keyed by content hash (persisted as base64 float32)."""
+
+    def __init__(self, proj_path: Path | None, project_id: str = "") -> None:
+        self.path = (proj_path / EMBEDDINGS_CACHE_FILE) if proj_path else None
+        self.project_id = project_id
+        self.model = os.environ.get("RESEARCH_EMBEDDING_MODEL", "text-embedding-3-small")
+        self.vectors: dict[str, array] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+            if data.get("model") != self.model:
+                return
+            for h, b64 in (data.get("vectors") or {}).items():
+                v = array("f")
+                v.frombytes(base64.b64decode(b64))
+                self.vectors[h] = v
+        except Exception:
+            self.vectors = {}
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        payload = {
+            "model": self.model,
+            "vectors": {h: base64.b64encode(v.tobytes()).decode("ascii") for h, v in self.vectors.items()},
+        }
+        try:
+            tmp = self.path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(payload))
+            tmp.replace(self.path)
+            self._dirty = False
+        except Exception:
+            pass
+
+    def get_many(self, texts: list[str]) -> list[array] | None:
+        """Vectors for texts, embedding only cache misses (one batched API call). None if embedding fails."""
+        keys = [content_hash(t[:EMBED_CHARS]) for t in texts]
+        missing = [i for i, k in enumerate(keys) if k not in self.vectors]
+        if missing:
+            embs = embed_texts([texts[i] for i in missing], self.project_id)
+            if len(embs) != len(missing) or not all(embs):
+                return None
+            for i, e in zip(missing, embs):
+                self.vectors[keys[i]] = _unit(e)
+            self._dirty = True
+            self.save()
+        return [self.vectors[k] for k in keys]
+
+
+def semantic_scores(question: str, items: list[dict], proj_path: Path | None = None, project_id: str = "") -> list[float] | None:
+    """Cosine(question, item) for all items in one pass over the cached matrix. None when unavailable."""
+    if not question or not items:
+        return None
+    matrix = EmbeddingMatrix(proj_path, project_id)
+    texts = [item_text(it)[:EMBED_CHARS].strip() for it in items]
+    vecs = matrix.get_many([question] + texts)
+    if not vecs:
+        return None
+    q = vecs[0]
+    if not q:
+        return None
+    return [max(0.0, sum(map(operator.mul, q, v))) if len(v) == len(q) else 0.0 for v in vecs[1:]]
+
+
+def semantic_weight(env_name: str = "RESEARCH_SYNTHESIS_SEMANTIC_WEIGHT") -> float:
+    try:
+        return max(0.0, min(1.0, float(os.environ.get(env_name, "0.5"))))
+    except ValueError:
+        return 0.5
+
+
+def relevance_scores(
+    question: str,
+    items: list[dict],
+    *,
+    semantic: bool = False,
+    proj_path: Path | None = None,
+    project_id: str = "",
+    alpha: float | None = None,
+) -> list[float]:
+    """Hybrid score per item: lexical (BM25 + overlap), optionally blended with semantic cosine."""
+    lex = lexical_scores(question, items)
+    if not semantic:
+        return lex
+    sem = semantic_scores(question, items, proj_path, project_id)
+    if sem is None:
+        return lex
+    a = semantic_weight() if alpha is None else alpha
+    return [a * s + (1 - a) * k for k, s in zip(lex, sem)]
+
+
+def rank_items(question: str, items: list[dict], **kwargs) -> list[dict]:
+    """Items sorted by relevance_scores (stable for ties)."""
+    if not question or not items:
+        return items
+    scores = relevance_scores(question, items, **kwargs)
+    order = sorted(range(len(items)), key=lambda i: scores[i], reverse=True)
+    return [items[i] for i in order]
+
+
+def drift_terms(question: str) -> set[str]:
+    """Question words the drift check looks for: whitespace tokens of 4+ characters, edge punctuation stripped."""
+    return {t.strip(".,;:") for t in (question or "").lower().split() if len(t) >= 4}
+
+
+def low_relevance_fraction(question: str, items: list[dict | None], min_terms: int = 2) -> float:
+    """Share of items whose title + description contain fewer than min_terms drift_terms (substring match;
+    relevance drift signal). None entries (unreadable sources) count towards the total but never as low."""
+    q_terms = drift_terms(question)
+    if not q_terms or not items:
+        return 0.0
+    low = 0
+    for it in items:
+        if it is None:
+            continue
+        text = f"{it.get('title', '')} {it.get('description', '')}".lower()
+        if sum(1 for t in q_terms if t in text) < min_terms:
+            low += 1
+    return low / len(items)
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: research_relevance.py <project_id> [--semantic]", file=sys.stderr)
+        sys.exit(2)
+    from tools.research_common import project_dir, load_project
+    project_id = sys.argv[1]
+    proj = project_dir(project_id)
+    if not proj.exists():
+        print(f"Project not found: {project_id}", file=sys.stderr)
+        sys.exit(1)
+    question = load_project(proj).get("question", "")
+    findings = []
+    for f in sorted((proj / "findings").glob("*.json")):
+        try:
+            findings.append(json.loads(f.read_text()))
+        except Exception:
+            pass
+    scores = relevance_scores(question, findings, semantic="--semantic" in sys.argv, proj_path=proj, project_id=project_id)
+    ranked = sorted(zip(scores, findings), key=lambda x: x[0], reverse=True)[:20]
+    print(json.dumps([{"score": round(s, 4), "url": f.get("url"), "title": f.get("title")} for s, f in ranked], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,28 @@ Runs code in an isolated Docker container without network access.
 Default image includes numpy and scipy so agents can run typical report experiments.
 Build once: docker build -t operator-research-sandbox:latest -f docker/research-sandbox/Dockerfile docker/research-sandbox/
 Override: RESEARCH_SANDBOX_IMAGE=myimage:tag
+RESEARCH_SANDBOX_POOL=1 runs code on warm pooled containers instead (research_sandbox_pool).
+
+Every run is metered by research_sandbox_meter (wall/CPU time, peak RSS, output size) under a CPU budget
+(RESEARCH_SANDBOX_CPU_SECONDS, default: the timeout) and a memory budget (RESEARCH_SANDBOX_MEMORY_MB,
+default 512). Scripts can write structured results as JSON to $RESEARCH_RESULTS_PATH (SandboxResult.results).
 """
 
 import subprocess
 import tempfile
 import json
 import os
+import shutil
+import time
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Any
+
+FALLBACK_IMAGE = "python:3.11-slim"
+DEFAULT_MEMORY_MB = 512
+METER_FILE = Path(__file__).resolve().parent / "research_sandbox_meter.py"
+HOST_GRACE_SECONDS = 10  # container start/teardown on top of the metered timeout
+
 
 @dataclass
 class SandboxResult:
@@ -21,51 +35,138 @@ class SandboxResult:
     stderr: str
     exit_code: int
     timeout: bool
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: float = 0.0
+    output_bytes: int = 0
+    budget_exceeded: str = ""  # "cpu" | "memory" | ""
+    results: Any = None  # JSON the script wrote to $RESEARCH_RESULTS_PATH
+
+    def usage(self) -> dict:
+        return {
+            "wall_seconds": self.wall_seconds,
+            "cpu_seconds": self.cpu_seconds,
+            "peak_rss_mb": self.peak_rss_mb,
+            "output_bytes": self.output_bytes,
+            "budget_exceeded": self.budget_exceeded,
+        }
+
+
+def sandbox_image() -> str:
+    return os.environ.get("RESEARCH_SANDBOX_IMAGE", "operator-research-sandbox:latest")
+
+
+def sandbox_memory_mb() -> int:
+    try:
+        return int(os.environ.get("RESEARCH_SANDBOX_MEMORY_MB", DEFAULT_MEMORY_MB))
+    except ValueError:
+        return DEFAULT_MEMORY_MB
+
+
+def sandbox_cpu_seconds(timeout_seconds: float) -> float:
+    try:
+        return float(os.environ.get("RESEARCH_SANDBOX_CPU_SECONDS") or timeout_seconds)
+    except ValueError:
+        return float(timeout_seconds)
+
 
-def run_in_sandbox(code: str, timeout_seconds: int = 30) -> SandboxResult:
+def result_from_meter(msg: dict, timeout_seconds: float) -> SandboxResult:
+    """SandboxResult from a research_sandbox_meter report; timeouts and budget breaches are noted in stderr."""
+    exit_code = int(msg.get("exit_code", 1))
+    timed_out = bool(msg.get("timeout"))
+    exceeded = msg.get("budget_exceeded") or ""
+    stderr = msg.get("stderr") or ""
+    if timed_out:
+        stderr += f"\n[!] Sandbox Timeout Exceeded ({timeout_seconds}s)."
+        exit_code = 124
+    elif exceeded == "cpu":
+        stderr += f"\n[!] Sandbox CPU Budget Exceeded ({msg.get('cpu_seconds', 0)}s CPU)."
+    elif exceeded == "memory":
+        stderr += f"\n[!] Sandbox Memory Budget Exceeded ({msg.get('peak_rss_mb', 0)} MB peak RSS)."
+    stdout = msg.get("stdout") or ""
+    return SandboxResult(
+        stdout=stdout,
+        stderr=stderr,
+        exit_code=exit_code,
+        timeout=timed_out,
+        wall_seconds=float(msg.get("wall_seconds") or 0.0),
+        cpu_seconds=float(msg.get("cpu_seconds") or 0.0),
+        peak_rss_mb=float(msg.get("peak_rss_mb") or 0.0),
+        output_bytes=int(msg.get("output_bytes") or len(stdout.encode()) + len((msg.get("stderr") or "").encode())),
+        budget_exceeded=exceeded,
+        results=msg.get("results"),
+    )
+
+
+def image_missing(stderr: str) -> bool:
+    """True when docker failed because the image is not available locally or in the registry."""
+    err = (stderr or "").lower()
+    return ("no such image" in err or "cannot find image" in err
+            or "pull access denied" in err or "repository does not exist" in err)
+
+
+def run_in_sandbox(
+    code: str,
+    timeout_seconds: int = 30,
+    cpu_seconds: float | None = None,
+    memory_mb: int | None = None,
+) -> SandboxResult:
     """
     Executes Python code in a secure, ephemeral Docker container.
     
     Security Constraints:
     - --network none: No internet access (prevents API abuse, downloading malware)
-    - --memory 512m: Prevents memory bombs
-    - --cpus 1: Prevents CPU hogging
+    - --memory (memory budget, default 512m): Prevents memory bombs
+    - --cpus 1 and a CPU-seconds budget: Prevents CPU hogging
     - timeout: Prevents infinite loops
-    - read-only volume mount for the code
+    - read-only volume mount for the code; /out is the only writable mount (results, meter report)
+
+    With RESEARCH_SANDBOX_POOL set, a warm pooled worker runs the code; if no worker can be started
+    the one-shot container below is used.
     """
-    
-    image = os.environ.get("RESEARCH_SANDBOX_IMAGE", "operator-research-sandbox:latest")
-    fallback_image = "python:3.11-slim"
+    from tools.research_sandbox_pool import run_pooled
+
+    cpu_seconds = sandbox_cpu_seconds(timeout_seconds) if cpu_seconds is None else cpu_seconds
+    memory_mb = sandbox_memory_mb() if memory_mb is None else memory_mb
+    pooled = run_pooled(code, timeout_seconds, cpu_seconds, memory_mb)
+    if pooled is not None:
+        return pooled
+
+    image = sandbox_image()
+    fallback_image = FALLBACK_IMAGE
 
     # We write the code to a temporary directory
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory(ignore_cleanup_errors=True) as tmpdir:
         tmp_path = Path(tmpdir)
         script_path = tmp_path / "script.py"
         script_path.write_text(code, encoding="utf-8")
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+        out_dir.chmod(0o777)
+        shutil.copyfile(METER_FILE, tmp_path / METER_FILE.name)
         
         def run_with_image(img: str):
             cmd = [
                 "docker", "run",
-                "--rm", "--network", "none", "--memory", "512m", "--cpus", "1.0",
-                "-v", f"{tmp_path}:/app:ro", "-w", "/app",
-                img, "python", "script.py"
+                "--rm", "--network", "none", "--memory", f"{memory_mb}m", "--cpus", "1.0",
+                "-v", f"{tmp_path}:/app:ro", "-v", f"{out_dir}:/out", "-w", "/app",
+                img, "python", METER_FILE.name, "script.py",
+                str(timeout_seconds), str(cpu_seconds), str(memory_mb), "/out/results.json", "/out/meter.json",
             ]
-            return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_seconds)
+            return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout_seconds + HOST_GRACE_SECONDS)
         
+        started = time.monotonic()
         try:
             process = run_with_image(image)
             # If image missing, fall back to stdlib-only so sandbox still works
-            if process.returncode != 0 and process.stderr and (
-                "no such image" in process.stderr.lower() or "cannot find image" in process.stderr.lower()
-                or "pull access denied" in process.stderr.lower() or "repository does not exist" in process.stderr.lower()
-            ):
+            if process.returncode != 0 and image_missing(process.stderr):
                 process = run_with_image(fallback_image)
-            return SandboxResult(
-                stdout=process.stdout or "",
-                stderr=process.stderr or "",
-                exit_code=process.returncode,
-                timeout=False
-            )
+            try:
+                meter = json.loads((out_dir / "meter.json").read_text())
+            except (OSError, ValueError):
+                meter = {"wall_seconds": round(time.monotonic() - started, 3)}
+            meter.update(stdout=process.stdout or "", stderr=process.stderr or "", exit_code=process.returncode)
+            return result_from_meter(meter, timeout_seconds)
         except subprocess.TimeoutExpired as e:
             # If the subprocess times out, the container might still be running.
             # We should ideally kill it, but --rm and docker's own handling often cleans it up.
@@ -75,7 +176,8 @@ def run_in_sandbox(code: str, timeout_seconds: int = 30) -> SandboxResult:
                 stdout=(e.stdout.decode('utf-8') if isinstance(e.stdout, bytes) else (e.stdout or "")),
                 stderr=(e.stderr.decode('utf-8') if isinstance(e.stderr, bytes) else (e.stderr or "")) + f"\n[!] Sandbox Timeout Exceeded ({timeout_seconds}s).",
                 exit_code=124, # Standard timeout exit code
-                timeout=True
+                timeout=True,
+                wall_seconds=round(time.monotonic() - started, 3),
             )
         except Exception as e:
             return SandboxResult(
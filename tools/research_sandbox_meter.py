@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Metered execution of one sandbox script. Runs inside the sandbox (stdlib only, no tools imports):
+research_sandbox copies this file next to the script for one-shot containers, and research_sandbox_pool
+starts its workers with this source and serve().
+
+run_metered() executes the script in a fresh interpreter and process group and reports wall and CPU
+time, peak RSS and output size. It enforces the run's budgets: wall timeout, CPU seconds (RLIMIT_CPU)
+and memory (RSS polled from /proc, the process group is killed past the budget). The script may write
+structured results as JSON to the path in RESEARCH_RESULTS_PATH; they come back as "results".
+
+A pool worker serves many runs. After each run it looks for processes the script left behind outside
+its process group (fork + setsid) and kills them; the reply's "stray_processes" tells the pool to retire
+the worker. In a container (isolated=True) every process besides the runner counts and leftover files
+in the scratch dirs are removed; as a local process only processes carrying the run's marker count.
+
+Usage:
+  research_sandbox_meter.py <script.py> <timeout> <cpu_seconds> <memory_mb> <results_path> <meter_json>
+"""
+import json
+import os
+import resource
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+RUN_MARKER_ENV = "RESEARCH_SANDBOX_RUN"
+SCRATCH_DIRS = ("/tmp", "/dev/shm")
+POLL_SECONDS = 0.02
+OUTPUT_MAX_BYTES = 1 << 20  # captured per stream; output_bytes still counts everything
+RESULTS_MAX_BYTES = 1 << 20
+
+
+def _rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0.0
+
+
+def _drain(stream, buf, counter):
+    while True:
+        chunk = stream.read1(65536)  # not read(): returns what is there instead of waiting for 64 KiB or EOF
+        if not chunk:
+            break
+        counter[0] += len(chunk)
+        if len(buf) < OUTPUT_MAX_BYTES:
+            buf.extend(chunk[:OUTPUT_MAX_BYTES - len(buf)])
+
+
+def _kill_group(pid):
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _load_results(path):
+    try:
+        if path and os.path.getsize(path) <= RESULTS_MAX_BYTES:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _pids():
+    try:
+        return {int(n) for n in os.listdir("/proc") if n.isdigit()}
+    except OSError:
+        return set()
+
+
+def _has_marker(pid, marker):
+    try:
+        with open(f"/proc/{pid}/environ", "rb") as f:
+            return marker in f.read().split(b"\0")
+    except OSError:
+        return False
+
+
+def reap_strays(baseline, token, isolated):
+    """Kill processes a run left behind; returns how many there were."""
+    marker = f"{RUN_MARKER_ENV}={token}".encode()
+    strays = [pid for pid in _pids() - baseline - {os.getpid()} if isolated or _has_marker(pid, marker)]
+    for pid in strays:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+    return len(strays)
+
+
+def _scratch_entries():
+    entries = set()
+    for d in SCRATCH_DIRS:
+        try:
+            entries.update(os.path.join(d, n) for n in os.listdir(d))
+        except OSError:
+            pass
+    return entries
+
+
+def clean_scratch(baseline):
+    """Remove files a run left in the scratch dirs; returns how many entries were removed."""
+    residue = _scratch_entries() - baseline
+    for path in residue:
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    return len(residue)
+
+
+def run_metered(script, cwd, timeout, cpu_seconds=0, memory_mb=0, results_path="", env_extra=None, reap=None):
+    """Run `python script` in cwd under the budgets; dict with output, exit code and usage. reap() is
+    called once the script's process group is gone and returns the number of leftover processes it
+    killed (they may hold the output pipes open)."""
+    def limits():
+        if cpu_seconds:
+            cpu = int(max(1, cpu_seconds))
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+
+    env = dict(os.environ)
+    env.update(env_extra or {})
+    if results_path:
+        env["RESEARCH_RESULTS_PATH"] = results_path
+    start = time.monotonic()
+    p = subprocess.Popen([sys.executable, script], cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True, preexec_fn=limits)
+    out, err, n_out, n_err = bytearray(), bytearray(), [0], [0]
+    readers = [threading.Thread(target=_drain, args=(p.stdout, out, n_out), daemon=True),
+               threading.Thread(target=_drain, args=(p.stderr, err, n_err), daemon=True)]
+    for t in readers:
+        t.start()
+    timed_out, exceeded, peak = False, "", 0.0
+    while True:
+        pid, status, usage = os.wait4(p.pid, os.WNOHANG)
+        if pid:
+            break
+        if time.monotonic() - start > timeout:
+            timed_out = True
+        else:
+            peak = max(peak, _rss_mb(p.pid))
+            if memory_mb and peak > memory_mb:
+                exceeded = "memory"
+        if timed_out or exceeded:
+            _kill_group(p.pid)
+            pid, status, usage = os.wait4(p.pid, 0)
+            break
+        time.sleep(POLL_SECONDS)
+    wall = time.monotonic() - start
+    _kill_group(p.pid)  # background processes the script left behind
+    strays = reap() if reap else 0
+    for t in readers:
+        t.join(timeout=2)
+    code = os.waitstatus_to_exitcode(status)
+    p.returncode = code
+    if code < 0:
+        code = 128 - code
+    cpu = usage.ru_utime + usage.ru_stime
+    if not exceeded and cpu_seconds and (code in (128 + signal.SIGXCPU, 137) and cpu >= cpu_seconds - 0.5):
+        exceeded = "cpu"
+    peak = max(peak, usage.ru_maxrss / 1024)
+    if not exceeded and memory_mb and peak > memory_mb:
+        exceeded = "memory"
+    return {
+        "stdout": out.decode("utf-8", "replace"),
+        "stderr": err.decode("utf-8", "replace"),
+        "exit_code": code,
+        "timeout": timed_out,
+        "wall_seconds": round(wall, 3),
+        "cpu_seconds": round(cpu, 3),
+        "peak_rss_mb": round(peak, 1),
+        "output_bytes": n_out[0] + n_err[0],
+        "budget_exceeded": exceeded,
+        "results": _load_results(results_path),
+        "stray_processes": strays,
+    }
+
+
+def serve(isolated=False):
+    """Pool worker loop: one JSON request per stdin line, one JSON reply per stdout line. Every run gets
+    a fresh temp dir (also its TMPDIR) that is removed afterwards."""
+    reply = sys.stdout
+    sys.stdout = sys.stderr
+    pids = _pids()
+    scratch = _scratch_entries() if isolated else set()
+
+    def send(msg):
+        reply.write(json.dumps(msg) + "\n")
+        reply.flush()
+
+    send({"ready": True})
+    for line in iter(sys.stdin.readline, ""):
+        try:
+            req = json.loads(line)
+        except ValueError:
+            continue
+        tmp = tempfile.mkdtemp(prefix="run-")
+        token = os.path.basename(tmp)
+        try:
+            with open(os.path.join(tmp, "script.py"), "w", encoding="utf-8") as f:
+                f.write(req.get("code") or "")
+            res = run_metered("script.py", tmp, req.get("timeout") or 30, req.get("cpu_seconds") or 0,
+                              req.get("memory_mb") or 0, os.path.join(tmp, "results.json"),
+                              {"TMPDIR": tmp, RUN_MARKER_ENV: token}, lambda: reap_strays(pids, token, isolated))
+        except Exception as exc:
+            res = {"stdout": "", "stderr": "[!] Sandbox Internal Error: %s" % exc, "exit_code": 1, "timeout": False,
+                   "stray_processes": reap_strays(pids, token, isolated)}
+        shutil.rmtree(tmp, ignore_errors=True)
+        if isolated:
+            res["scratch_residue"] = clean_scratch(scratch)
+        send(res)
+
+
+def main():
+    if len(sys.argv) < 7:
+        print("Usage: research_sandbox_meter.py <script.py> <timeout> <cpu_seconds> <memory_mb> <results_path> <meter_json>",
+              file=sys.stderr)
+        sys.exit(2)
+    script, timeout, cpu, mem, results_path, meter_json = sys.argv[1:7]
+    res = run_metered(script, os.getcwd(), float(timeout), float(cpu), float(mem), results_path)
+    sys.stdout.write(res.pop("stdout"))
+    sys.stderr.write(res.pop("stderr"))
+    with open(meter_json, "w", encoding="utf-8") as f:
+        json.dump(res, f)
+    sys.exit(res["exit_code"])
+
+
+if __name__ == "__main__":
+    main()
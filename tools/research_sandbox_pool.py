@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Warm pool of sandbox workers for research_sandbox.run_in_sandbox.
+
+A worker is one long-lived, network-isolated container (`docker run -i --network none ...`) running
+research_sandbox_meter.serve(). The host sends one JSON line per run ({"code", "timeout", "cpu_seconds",
+"memory_mb"}); the worker writes the code to a fresh temp dir, runs it metered in a new interpreter and
+process group, kills the group afterwards, removes the temp dir and answers with one JSON line. The
+container start is paid once per worker instead of once per run. Containers run with a read-only root
+filesystem and a tmpfs /tmp that the runner cleans after every run. Workers are recycled after
+RESEARCH_SANDBOX_POOL_MAX_RUNS runs, when a run's peak RSS passes RESEARCH_SANDBOX_POOL_MAX_RSS_MB, on an
+OOM kill, when a run left processes behind (e.g. a setsid daemon), or when they stop answering; a
+replacement is started in the background so the next run finds a warm worker.
+
+Enable with RESEARCH_SANDBOX_POOL=1 (docker). RESEARCH_SANDBOX_POOL=local runs the same runner as a
+plain local process (no isolation; tests and development only). Pool size: RESEARCH_SANDBOX_POOL_SIZE.
+
+Experiment and council runs are separate short-lived processes, so the pool is meant to live in one shared
+service (`serve`, e.g. under systemd: scripts/research-sandbox-pool.service.example) that keeps the
+workers warm and answers one JSON request per connection on a Unix socket (RESEARCH_SANDBOX_POOL_SOCKET,
+default research/.sandbox_pool.sock). run_pooled uses the service when its socket is there and falls back
+to a pool inside the calling process otherwise; warm_pool() starts that in-process pool's workers early.
+
+Usage:
+  research_sandbox_pool.py serve                            run the shared pool service (foreground)
+  research_sandbox_pool.py <script.py> [timeout_seconds]   run a file through the pool, print JSON
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import uuid
+from collections import deque
+from dataclasses import asdict, fields
+from pathlib import Path
+
+_OPERATOR_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_OPERATOR_ROOT))
+
+from tools.research_sandbox import (
+    FALLBACK_IMAGE, SandboxResult, image_missing, result_from_meter, sandbox_image, sandbox_memory_mb,
+)
+
+DEFAULT_SIZE = 2
+DEFAULT_MAX_RUNS = 20
+DEFAULT_MAX_RSS_MB = 384
+START_TIMEOUT = 60
+TMPFS = "/tmp:rw,exec,nosuid,size=256m"
+REPLY_GRACE = 5  # seconds on top of the run timeout before the host gives up on a worker
+
+METER_SOURCE = (Path(__file__).resolve().parent / "research_sandbox_meter.py").read_text(encoding="utf-8")
+
+
+def runner(isolated: bool) -> str:
+    """research_sandbox_meter.serve() without its __main__ block (python -c runs as __main__)."""
+    return (
+        f"src = {METER_SOURCE!r}\n"
+        "ns = {'__name__': 'research_sandbox_meter'}\n"
+        "exec(compile(src, 'research_sandbox_meter.py', 'exec'), ns)\n"
+        f"ns['serve'](isolated={isolated!r})\n"
+    )
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def pool_mode() -> str:
+    """"docker", "local" or "" (pool disabled) from RESEARCH_SANDBOX_POOL."""
+    v = os.environ.get("RESEARCH_SANDBOX_POOL", "0").strip().lower()
+    if v in ("1", "true", "yes", "docker"):
+        return "docker"
+    return "local" if v == "local" else ""
+
+
+class LocalBackend:
+    """Runner as a local child process. Same protocol, no network or memory isolation."""
+
+    def command(self, name: str) -> list[str]:
+        return [sys.executable, "-u", "-c", runner(False)]
+
+    def start_failed(self, err: str) -> bool:
+        return False
+
+    def kill(self, name: str) -> None:
+        pass
+
+
+class DockerBackend:
+    """Runner in a long-lived container with the same limits as the one-shot sandbox."""
+
+    def __init__(self, image: str | None = None):
+        self.image = image or sandbox_image()
+
+    def command(self, name: str) -> list[str]:
+        return [
+            "docker", "run", "-i", "--rm", "--init", "--name", name,
+            "--network", "none", "--memory", f"{sandbox_memory_mb()}m", "--cpus", "1.0",
+            "--read-only", "--tmpfs", TMPFS,
+            self.image, "python", "-u", "-c", runner(True),
+        ]
+
+    def start_failed(self, err: str) -> bool:
+        """Switch to the stdlib fallback image when the configured one is missing; True to retry."""
+        if self.image != FALLBACK_IMAGE and image_missing(err):
+            self.image = FALLBACK_IMAGE
+            return True
+        return False
+
+    def kill(self, name: str) -> None:
+        try:
+            subprocess.run(["docker", "kill", name], capture_output=True, timeout=10)
+        except Exception:
+            pass
+
+
+class Worker:
+    def __init__(self, backend, start_timeout: float = START_TIMEOUT):
+        self.backend = backend
+        self.name = f"research-sandbox-{uuid.uuid4().hex[:12]}"
+        self.runs = 0
+        self.lines: queue.Queue = queue.Queue()
+        self.errors: deque = deque(maxlen=50)
+        self.proc = subprocess.Popen(
+            backend.command(self.name), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding="utf-8", errors="replace", bufsize=1,
+        )
+        threading.Thread(target=self._pump, args=(self.proc.stdout, self.lines.put, True), daemon=True).start()
+        threading.Thread(target=self._pump, args=(self.proc.stderr, self.errors.append, False), daemon=True).start()
+        msg = self._recv(start_timeout)
+        if not msg or not msg.get("ready"):
+            self.close()
+            raise RuntimeError(f"sandbox worker failed to start: {self.stderr_tail()}")
+
+    @staticmethod
+    def _pump(stream, sink, eof_marker: bool) -> None:
+        try:
+            for line in iter(stream.readline, ""):
+                sink(line)
+        except (OSError, ValueError):
+            pass
+        if eof_marker:
+            sink(None)
+
+    def _recv(self, timeout: float) -> dict | None:
+        try:
+            line = self.lines.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        if line is None:
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def stderr_tail(self) -> str:
+        return "".join(self.errors)[-500:].strip()
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def run(self, code: str, timeout_seconds: int, cpu_seconds: float = 0, memory_mb: float = 0) -> dict | None:
+        """Runner reply for one execution; None when the worker died or stopped answering."""
+        self.runs += 1
+        req = {"code": code, "timeout": timeout_seconds, "cpu_seconds": cpu_seconds, "memory_mb": memory_mb}
+        try:
+            self.proc.stdin.write(json.dumps(req) + "\n")
+            self.proc.stdin.flush()
+        except (OSError, ValueError):
+            return None
+        return self._recv(timeout_seconds + REPLY_GRACE)
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.backend.kill(self.name)
+            self.proc.kill()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+
+
+class SandboxPool:
+    def __init__(self, backend, size: int | None = None, max_runs: int | None = None, max_rss_mb: int | None = None):
+        self.backend = backend
+        self.size = max(1, size or _env_int("RESEARCH_SANDBOX_POOL_SIZE", DEFAULT_SIZE))
+        self.max_runs = max(1, max_runs or _env_int("RESEARCH_SANDBOX_POOL_MAX_RUNS", DEFAULT_MAX_RUNS))
+        self.max_rss_mb = max_rss_mb or _env_int("RESEARCH_SANDBOX_POOL_MAX_RSS_MB", DEFAULT_MAX_RSS_MB)
+        self._idle: list[Worker] = []
+        self._count = 0  # live workers, idle or busy, plus ones being started
+        self._cond = threading.Condition()
+        self._closed = False
+        self.started = 0
+        self.recycled = 0
+
+    def _spawn(self) -> Worker:
+        try:
+            return Worker(self.backend)
+        except RuntimeError as e:
+            if self.backend.start_failed(str(e)):
+                return Worker(self.backend)
+            raise
+
+    def _acquire(self) -> Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("sandbox pool closed")
+                while self._idle:
+                    w = self._idle.pop()
+                    if w.alive():
+                        return w
+                    self._count -= 1
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                self._cond.wait()
+        try:
+            w = self._spawn()
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+        self.started += 1
+        return w
+
+    def _release(self, w: Worker, retire: bool) -> None:
+        if retire or self._closed or not w.alive():
+            w.close()
+            with self._cond:
+                self._count -= 1
+                self.recycled += 1
+                self._cond.notify()
+            if not self._closed:
+                threading.Thread(target=self.warm, args=(1,), daemon=True).start()
+            return
+        with self._cond:
+            self._idle.append(w)
+            self._cond.notify()
+
+    def warm(self, n: int | None = None) -> None:
+        """Start up to n idle workers (default: fill the pool). Failures are left to the next run."""
+        for _ in range(n or self.size):
+            with self._cond:
+                if self._closed or self._count >= self.size:
+                    return
+                self._count += 1
+            try:
+                w = self._spawn()
+            except Exception:
+                with self._cond:
+                    self._count -= 1
+                    self._cond.notify()
+                return
+            self.started += 1
+            with self._cond:
+                self._idle.append(w)
+                self._cond.notify()
+
+    def run(self, code: str, timeout_seconds: int = 30, cpu_seconds: float = 0, memory_mb: float = 0) -> SandboxResult:
+        """Execute code on a warm worker; raises RuntimeError when no worker can be started."""
+        w = self._acquire()
+        msg = w.run(code, timeout_seconds, cpu_seconds, memory_mb)
+        if msg is None:
+            hung = w.alive()
+            self._release(w, retire=True)
+            if hung:
+                return SandboxResult(stdout="", stderr=f"\n[!] Sandbox Timeout Exceeded ({timeout_seconds}s).",
+                                     exit_code=124, timeout=True, wall_seconds=float(timeout_seconds + REPLY_GRACE))
+            code_ = w.proc.returncode if w.proc.returncode and w.proc.returncode > 0 else 137
+            return SandboxResult(stdout="", stderr=f"[!] Sandbox worker died: {w.stderr_tail()}",
+                                 exit_code=code_, timeout=False)
+        res = result_from_meter(msg, timeout_seconds)
+        retire = (
+            w.runs >= self.max_runs
+            or res.peak_rss_mb > self.max_rss_mb
+            or res.exit_code == 137
+            or bool(msg.get("stray_processes"))
+        )
+        self._release(w, retire)
+        return res
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for w in idle:
+            w.close()
+
+
+_POOLS: dict[str, SandboxPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(mode: str | None = None) -> SandboxPool | None:
+    """Process-wide pool for the configured mode; None when pooling is disabled."""
+    mode = pool_mode() if mode is None else mode
+    if not mode:
+        return None
+    with _POOLS_LOCK:
+        pool = _POOLS.get(mode)
+        if pool is None:
+            pool = SandboxPool(DockerBackend() if mode == "docker" else LocalBackend())
+            _POOLS[mode] = pool
+        return pool
+
+
+def shutdown() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(shutdown)
+
+
+def socket_path() -> Path:
+    return Path(os.environ.get("RESEARCH_SANDBOX_POOL_SOCKET") or _OPERATOR_ROOT / "research" / ".sandbox_pool.sock")
+
+
+def _run_remote(code: str, timeout_seconds: int, cpu_seconds: float, memory_mb: float) -> SandboxResult | None:
+    """Run on the shared pool service; None when it is not running or fails to answer."""
+    path = socket_path()
+    if not path.exists():
+        return None
+    req = {"code": code, "timeout": timeout_seconds, "cpu_seconds": cpu_seconds, "memory_mb": memory_mb}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(START_TIMEOUT + timeout_seconds + REPLY_GRACE)
+            sock.connect(str(path))
+            sock.sendall((json.dumps(req) + "\n").encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8", errors="replace") as f:
+                msg = json.loads(f.readline() or "{}")
+    except (OSError, ValueError):
+        return None
+    if not isinstance(msg, dict) or "exit_code" not in msg:
+        return None
+    known = {f.name for f in fields(SandboxResult)}
+    return SandboxResult(**{k: v for k, v in msg.items() if k in known})
+
+
+def warm_pool() -> None:
+    """Start the in-process pool's workers in the background, unless the shared service is running."""
+    if not pool_mode() or socket_path().exists():
+        return
+    pool = get_pool()
+    threading.Thread(target=pool.warm, daemon=True).start()
+
+
+def run_pooled(code: str, timeout_seconds: int = 30, cpu_seconds: float = 0, memory_mb: float = 0) -> SandboxResult | None:
+    """Run on the shared pool service, else on this process's pool; None when pooling is off or no worker
+    starts (caller runs one-shot)."""
+    if not pool_mode():
+        return None
+    res = _run_remote(code, timeout_seconds, cpu_seconds, memory_mb)
+    if res is not None:
+        return res
+    pool = get_pool()
+    try:
+        return pool.run(code, timeout_seconds, cpu_seconds, memory_mb)
+    except Exception:
+        return None
+
+
+class _PoolServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    pool: SandboxPool
+
+
+class _PoolHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            req = json.loads(self.rfile.readline() or b"{}")
+            res = self.server.pool.run(str(req.get("code") or ""), int(req.get("timeout") or 30),
+                                       float(req.get("cpu_seconds") or 0), float(req.get("memory_mb") or 0))
+            reply = asdict(res)
+        except Exception as e:
+            reply = {"error": str(e)[:500]}
+        try:
+            self.wfile.write((json.dumps(reply, ensure_ascii=False) + "\n").encode("utf-8"))
+        except OSError:
+            pass
+
+
+def serve(mode: str | None = None, path: Path | None = None) -> None:
+    """Shared pool service: warm workers up front, then serve runs on the Unix socket until SIGTERM/SIGINT."""
+    mode = mode or pool_mode() or "docker"
+    path = path or socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                probe.connect(str(path))
+            raise SystemExit(f"sandbox pool service already running on {path}")
+        except OSError:
+            path.unlink()  # stale socket from a service that died
+    pool = SandboxPool(DockerBackend() if mode == "docker" else LocalBackend())
+    server = _PoolServer(str(path), _PoolHandler)
+    server.pool = pool
+    os.chmod(path, 0o600)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    threading.Thread(target=pool.warm, daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        pool.close()
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: research_sandbox_pool.py serve | <script.py> [timeout_seconds]", file=sys.stderr)
+        sys.exit(2)
+    if sys.argv[1] == "serve":
+        serve()
+        return
+    timeout = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    pool = get_pool() or get_pool("docker")
+    res = pool.run(Path(sys.argv[1]).read_text(encoding="utf-8", errors="replace"), timeout)
+    print(json.dumps(asdict(res), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Search result cache for research_web_search (research/search_cache.db, shared by all projects).
+
+Entries are keyed by (provider, normalised query, max_results). The normalised query is a token
+signature (lowercase, stopwords dropped, light stemming, sorted unique terms), so word-order and
+plural variants of a query hit the same entry; an entry fetched with a larger max_results also serves
+smaller requests. Empty result lists are never stored (providers return [] on errors).
+
+Env:
+  RESEARCH_SEARCH_CACHE=0                 disable the cache
+  RESEARCH_SEARCH_CACHE_TTL_HOURS=72      default maximum age of a cache hit
+
+Usage:
+  research_search_cache.py stats | purge
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+CACHE_FILE = "search_cache.db"
+DEFAULT_TTL_HOURS = 72.0
+PURGE_AFTER_DAYS = 30
+
+_STOPWORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "into", "about", "what", "when", "where", "which",
+    "how", "are", "was", "were", "does", "vs", "of", "to", "in", "on", "at", "by", "or", "an", "is", "it",
+    "wie", "und", "der", "die", "das", "den", "dem", "ein", "eine", "einer", "eines", "mit", "auf", "ist",
+    "sind", "von", "als", "zu", "im", "am",
+}
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS search_cache (
+        provider     TEXT NOT NULL,
+        query_key    TEXT NOT NULL,
+        max_results  INTEGER NOT NULL,
+        query        TEXT NOT NULL,
+        results_json TEXT NOT NULL,
+        created_at   REAL NOT NULL,
+        PRIMARY KEY (provider, query_key, max_results)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_search_cache_created ON search_cache(created_at);
+"""
+
+
+def query_signature(query: str) -> str:
+    """Token signature of a search query (modelled on memory_v2's question signature; keeps 2-char terms like "ai")."""
+    tokens = set()
+    for t in re.findall(r"[a-z0-9]{2,}", (query or "").lower()):
+        if t in _STOPWORDS:
+            continue
+        for suf in ("ing", "ed", "es", "s"):
+            if len(t) >= 5 and t.endswith(suf):
+                t = t[: -len(suf)]
+                break
+        tokens.add(t)
+    if not tokens:
+        return " ".join((query or "").lower().split())
+    return " ".join(sorted(tokens))
+
+
+def enabled() -> bool:
+    return os.environ.get("RESEARCH_SEARCH_CACHE", "1").strip().lower() not in ("0", "false", "no")
+
+
+def ttl_hours() -> float:
+    try:
+        return float(os.environ.get("RESEARCH_SEARCH_CACHE_TTL_HOURS", DEFAULT_TTL_HOURS))
+    except ValueError:
+        return DEFAULT_TTL_HOURS
+
+
+def _default_root() -> Path:
+    from tools.research_common import research_root
+    return research_root()
+
+
+class SearchCache:
+    """One connection shared by the search threads of a process (serialised by a lock)."""
+
+    def __init__(self, root: Path | None = None):
+        root = Path(root) if root else _default_root()
+        root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(root / CACHE_FILE), timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def get(self, provider: str, query: str, max_results: int, max_age_hours: float | None = None) -> list[dict] | None:
+        """Cached results no older than max_age_hours (default: TTL), or None. max_age_hours=0 never hits."""
+        max_age = ttl_hours() if max_age_hours is None else max_age_hours
+        if max_age <= 0:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT results_json FROM search_cache
+                   WHERE provider = ? AND query_key = ? AND max_results >= ? AND created_at >= ?
+                   ORDER BY max_results LIMIT 1""",
+                (provider, query_signature(query), max_results, time.time() - max_age * 3600),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])[:max_results]
+        except (json.JSONDecodeError, TypeError):
+            return None
+
+    def put(self, provider: str, query: str, max_results: int, results: list[dict]) -> None:
+        if not results:
+            return
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO search_cache (provider, query_key, max_results, query, results_json, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (provider, query_signature(query), max_results, query, json.dumps(results, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def purge(self, older_than_days: float = PURGE_AFTER_DAYS) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM search_cache WHERE created_at < ?", (time.time() - older_than_days * 86400,))
+            self._conn.commit()
+        return cur.rowcount
+
+    def stats(self) -> dict:
+        rows = self._conn.execute(
+            "SELECT provider, COUNT(*), MIN(created_at), MAX(created_at) FROM search_cache GROUP BY provider"
+        ).fetchall()
+        return {p: {"entries": n, "oldest": oldest, "newest": newest} for p, n, oldest, newest in rows}
+
+
+def open_cache(root: Path | None = None) -> SearchCache | None:
+    """Cache for the research root, or None when disabled or not openable (search then goes uncached)."""
+    if not enabled():
+        return None
+    try:
+        return SearchCache(root)
+    except (sqlite3.Error, OSError):
+        return None
+
+
+def main() -> None:
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    with SearchCache() as cache:
+        if cmd == "purge":
+            print(json.dumps({"deleted": cache.purge()}))
+        elif cmd == "stats":
+            print(json.dumps(cache.stats(), indent=2))
+        else:
+            print("Usage: research_search_cache.py stats | purge", file=sys.stderr)
+            sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
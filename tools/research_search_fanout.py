@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Search fan-out: one query to several backends concurrently, rankings fused with reciprocal-rank fusion.
+
+Backends: web (Brave, else Serper), semantic_scholar, arxiv, pubmed. Each query type has a backend
+profile (RESEARCH_SEARCH_BACKENDS_<TYPE>=comma list overrides it). Every backend runs in its own daemon
+thread with a deadline (RESEARCH_SEARCH_DEADLINE_<BACKEND> seconds); the fused result is returned as
+soon as a quorum of backends answered (RESEARCH_SEARCH_QUORUM, default 2) and there are enough unique
+results, or when the deadlines run out. Backends still running when the quorum returns keep going in
+the background and write their results to the search cache; short-lived callers (the CLIs) call
+wait_stragglers() before exiting so those writes are not lost. Fetches still running past their
+deadline are abandoned. Results are deduplicated by DOI and canonical URL.
+
+Usage:
+  research_search_fanout.py "query" [--type web|academic|medical] [--max 10]
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tools.research_source_identity import canonical_url
+
+RRF_K = 60
+DEFAULT_QUORUM = 2
+
+PROFILES: dict[str, tuple[str, ...]] = {
+    "web": ("web",),
+    "academic": ("semantic_scholar", "arxiv"),
+    "medical": ("pubmed", "semantic_scholar"),
+}
+
+DEFAULT_DEADLINES: dict[str, float] = {
+    "web": 16.0,  # single backend: not below the engines' 15 s HTTP timeout, or slow answers are lost
+    "semantic_scholar": 8.0,
+    "arxiv": 8.0,
+    "pubmed": 12.0,
+}
+
+
+_STRAGGLERS: list[tuple[threading.Thread, float]] = []  # (thread, monotonic deadline)
+_STRAGGLERS_LOCK = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def backends_for(qtype: str) -> tuple[str, ...]:
+    raw = os.environ.get(f"RESEARCH_SEARCH_BACKENDS_{qtype.upper()}", "").strip()
+    if raw:
+        names = tuple(n.strip() for n in raw.split(",") if n.strip() in DEFAULT_DEADLINES)
+        if names:
+            return names
+    return PROFILES.get(qtype, PROFILES["web"])
+
+
+def deadline_for(backend: str) -> float:
+    return _env_float(f"RESEARCH_SEARCH_DEADLINE_{backend.upper()}", DEFAULT_DEADLINES.get(backend, 10.0))
+
+
+def web_provider(secrets: dict) -> str | None:
+    if secrets.get("BRAVE_API_KEY"):
+        return "brave"
+    if secrets.get("SERPER_API_KEY"):
+        return "serper"
+    return None
+
+
+def cache_provider(backend: str, secrets: dict) -> str | None:
+    """Search cache / budget provider name of a backend (web resolves to the configured engine)."""
+    return web_provider(secrets) if backend == "web" else backend
+
+
+def _call_backend(backend: str, query: str, max_results: int, secrets: dict) -> list[dict]:
+    if backend == "web":
+        from tools import research_web_search as ws
+        provider = web_provider(secrets)
+        if provider == "brave":
+            return ws.search_brave(query, max_results)
+        if provider == "serper":
+            return ws.search_serper(query, max_results)
+        return []
+    from tools import research_academic as ra
+    return getattr(ra, backend)(query, max_results)
+
+
+def identity_keys(result: dict) -> list[str]:
+    keys = []
+    doi = (result.get("doi") or "").strip().lower()
+    if doi:
+        keys.append("doi:" + doi)
+    url = (result.get("url") or "").strip()
+    if url:
+        keys.append("url:" + canonical_url(url))
+    return keys
+
+
+def fuse(rankings: dict[str, list[dict]], max_results: int | None = None, k: int = RRF_K) -> list[dict]:
+    """Reciprocal-rank fusion of per-backend rankings; results sharing a DOI or URL are merged."""
+    docs: list[dict] = []
+    scores: list[float] = []
+    by_key: dict[str, int] = {}
+    for backend, ranking in rankings.items():
+        for rank, result in enumerate(ranking, start=1):
+            keys = identity_keys(result)
+            if not keys:
+                continue
+            idx = next((by_key[key] for key in keys if key in by_key), None)
+            if idx is None:
+                idx = len(docs)
+                docs.append({**result, "backends": []})
+                scores.append(0.0)
+            elif not docs[idx].get("doi") and result.get("doi"):
+                docs[idx]["doi"] = result["doi"]
+            for key in keys:
+                by_key.setdefault(key, idx)
+            if backend not in docs[idx]["backends"]:
+                docs[idx]["backends"].append(backend)
+                scores[idx] += 1.0 / (k + rank)
+    order = sorted(range(len(docs)), key=lambda i: (-scores[i], i))
+    fused = []
+    for i in order[: max_results if max_results is not None else len(order)]:
+        docs[i]["rrf_score"] = round(scores[i], 6)
+        fused.append(docs[i])
+    return fused
+
+
+def fan_out(
+    query: str,
+    qtype: str = "web",
+    max_results: int = 10,
+    secrets: dict | None = None,
+    cache=None,
+    max_age: float | None = None,
+    quorum: int | None = None,
+) -> tuple[list[dict], dict[str, dict]]:
+    """Fused results for one query plus a per-backend report {backend: {status, count, ms, provider}}.
+    status: cached | ok | empty | error | timeout (deadline passed) | pending (quorum reached first)."""
+    if secrets is None:
+        from tools.research_common import load_secrets
+        secrets = load_secrets()
+    names = [b for b in backends_for(qtype) if cache_provider(b, secrets)]
+    report: dict[str, dict] = {}
+    rankings: dict[str, list[dict]] = {}
+    pending: list[str] = []
+    for b in names:
+        provider = cache_provider(b, secrets)
+        cached = None
+        if cache is not None:
+            try:
+                cached = cache.get(provider, query, max_results, max_age)
+            except Exception:
+                cached = None
+        if cached is not None:
+            rankings[b] = cached
+            report[b] = {"status": "cached", "count": len(cached), "ms": 0, "provider": provider}
+        else:
+            pending.append(b)
+
+    done: queue.Queue = queue.Queue()
+    start = time.monotonic()
+
+    def worker(backend: str) -> None:
+        t0 = time.monotonic()
+        try:
+            res, err = _call_backend(backend, query, max_results, secrets), None
+        except Exception as e:
+            res, err = [], e
+        if res and cache is not None:
+            try:
+                cache.put(cache_provider(backend, secrets), query, max_results, res)
+            except Exception:
+                pass
+        done.put((backend, res, err, int((time.monotonic() - t0) * 1000)))
+
+    threads: dict[str, threading.Thread] = {}
+    for b in pending:
+        threads[b] = threading.Thread(target=worker, args=(b,), daemon=True, name=f"search-{b}")
+        threads[b].start()
+
+    need = min(quorum if quorum is not None else int(_env_float("RESEARCH_SEARCH_QUORUM", DEFAULT_QUORUM)), len(names))
+    answered = sum(1 for r in report.values() if r["count"])
+    deadlines = {b: start + deadline_for(b) for b in pending}
+    waiting = set(pending)
+    while waiting:
+        now = time.monotonic()
+        for b in [b for b in waiting if now >= deadlines[b]]:
+            waiting.discard(b)
+            report[b] = {"status": "timeout", "count": 0, "ms": int((now - start) * 1000),
+                         "provider": cache_provider(b, secrets)}
+        if not waiting or (answered >= need and len(fuse(rankings)) >= max_results):
+            break
+        try:
+            backend, res, err, ms = done.get(timeout=min(deadlines[b] for b in waiting) - now)
+        except queue.Empty:
+            continue
+        if backend not in waiting:
+            continue  # answered after its deadline: only the cache gets it
+        waiting.discard(backend)
+        status = "error" if err is not None else ("ok" if res else "empty")
+        report[backend] = {"status": status, "count": len(res), "ms": ms, "provider": cache_provider(backend, secrets)}
+        if res:
+            rankings[backend] = res
+            answered += 1
+    for b in waiting:
+        report[b] = {"status": "pending", "count": 0, "ms": int((time.monotonic() - start) * 1000),
+                     "provider": cache_provider(b, secrets)}
+    if waiting:
+        with _STRAGGLERS_LOCK:
+            _STRAGGLERS.extend((threads[b], deadlines[b]) for b in waiting)
+    # keep profile order so fusion ties are broken by backend priority, not arrival order
+    ordered = {b: rankings[b] for b in names if b in rankings}
+    return fuse(ordered, max_results), report
+
+
+def wait_stragglers() -> None:
+    """Join backends still running after their fan-out returned, each until its deadline."""
+    with _STRAGGLERS_LOCK:
+        stragglers = list(_STRAGGLERS)
+        _STRAGGLERS.clear()
+    for thread, deadline in stragglers:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: research_search_fanout.py \"query\" [--type web|academic|medical] [--max 10]", file=sys.stderr)
+        sys.exit(2)
+    query = sys.argv[1]
+    qtype = sys.argv[sys.argv.index("--type") + 1] if "--type" in sys.argv[:-1] else "web"
+    max_results = int(sys.argv[sys.argv.index("--max") + 1]) if "--max" in sys.argv[:-1] else 10
+    results, report = fan_out(query, qtype, max_results)
+    wait_stragglers()
+    print(json.dumps({"results": results, "backends": report}, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Section-aware extraction for academic sources (papers from arXiv / PubMed / PDFs).
+
+split_sections() recognises the usual paper headings (abstract, introduction, methods, results,
+discussion, conclusions, references — numbered, upper-case or "Label:" style as in PubMed structured
+abstracts) and pulls "Table N" blocks out as their own section. Sources with at least two such sections
+are stored as indexed chunks in <project>/sections/<source id>.json (front matter and references are
+dropped), so deep extract, claim verification and synthesis can load the chunks that match their query
+instead of the first N characters, which for papers is mostly front matter. Flat web pages are not
+indexed; callers fall back to the plain text.
+
+Usage:
+  research_sections.py index <project_id>        index all read sources of a project
+  research_sections.py show <project_id> <url>   print the stored chunks of one source
+
+arXiv abstract links are read as their PDF (full_text_url) so the paper body can be sectioned.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.research_context_pack import CHARS_PER_TOKEN, pack_text, split_passages
+from tools.research_source_identity import canonical_url, legacy_source_id, source_id
+
+SECTIONS_DIR = "sections"
+SECTIONS_VERSION = 1
+CHUNK_CHARS = 1500
+MIN_STRUCTURED_KINDS = 2
+
+# kind -> heading words; checked in this order
+_HEADINGS: list[tuple[str, str]] = [
+    ("abstract", r"abstract|summary|background and aims?"),
+    ("introduction", r"introduction|background|objectives?|aims?|motivation|related work"),
+    ("methods", r"methods?|materials and methods|methodology|study design|experimental setup|experiments? setup|"
+                r"data and methods|patients and methods|participants|setting|design|approach"),
+    ("results", r"results?|findings|experiments?|evaluation|results and discussion|outcomes?|measurements?"),
+    ("discussion", r"discussion|analysis|interpretation|limitations?"),
+    ("conclusions", r"conclusions?|concluding remarks|summary and conclusions?|implications|future work"),
+    ("references", r"references|bibliography|literature cited|acknowledge?ments?|funding|conflicts? of interest|"
+                   r"author contributions|supplementary material|appendix"),
+]
+_NUMBERING = r"(?:(?:\d+(?:\.\d+)*|[IVX]+)\.?\s+)?"
+_HEADING_LINE = [(kind, re.compile(rf"^\s*{_NUMBERING}(?:{words})\s*[:.]?\s*$", re.I)) for kind, words in _HEADINGS]
+# "RESULTS: text ..." / "Methods: text ..." (structured abstracts, PubMed labels)
+_INLINE_LABEL = [(kind, re.compile(rf"^\s*(?:{words})\s*:\s+(\S.*)$", re.I)) for kind, words in _HEADINGS]
+_INLINE_SPLIT = re.compile(
+    r"(?<=[.!?])\s+(?=(?:BACKGROUND|OBJECTIVES?|AIMS?|METHODS?|DESIGN|SETTING|PARTICIPANTS|RESULTS?|FINDINGS|"
+    r"CONCLUSIONS?|INTERPRETATION|LIMITATIONS?)\s*:)"
+)
+_TABLE_START = re.compile(r"^\s*(?:Table|TABLE)\s+[A-Z]?\d+[.:]?\s")
+KINDS = ("front",) + tuple(kind for kind, _ in _HEADINGS) + ("tables",)
+
+# Kind weights when selecting chunks: findings live in abstract/results/tables/conclusions.
+KIND_WEIGHTS = {
+    "abstract": 0.35, "results": 0.35, "tables": 0.3, "conclusions": 0.3, "methods": 0.15,
+    "discussion": 0.15, "introduction": 0.05, "front": 0.0,
+}
+
+
+def full_text_url(url: str) -> str:
+    """URL to read for the full paper: arXiv abstract pages -> the PDF (RESEARCH_ARXIV_FULLTEXT=0 keeps the
+    abstract page). Both map to the same canonical source id."""
+    if os.environ.get("RESEARCH_ARXIV_FULLTEXT", "1").strip().lower() in ("0", "false", "no"):
+        return url
+    canon = canonical_url(url)
+    if canon.startswith("https://arxiv.org/abs/"):
+        return "https://arxiv.org/pdf/" + canon[len("https://arxiv.org/abs/"):] + ".pdf"
+    return url
+
+
+def _heading_kind(line: str) -> str | None:
+    if len(line) > 80:
+        return None
+    for kind, rx in _HEADING_LINE:
+        if rx.match(line):
+            return kind
+    return None
+
+
+def split_sections(text: str) -> list[dict]:
+    """[{kind, heading, text}] in document order. Text before the first heading is kind "front"."""
+    sections: list[dict] = []
+    cur = {"kind": "front", "heading": "", "lines": [], "pos": 0}
+    table: dict | None = None
+
+    def close(sec: dict | None) -> None:
+        if sec is not None and "\n".join(sec["lines"]).strip():
+            sections.append({"kind": sec["kind"], "heading": sec["heading"], "text": "\n".join(sec["lines"]).strip(),
+                             "pos": sec["pos"]})
+
+    lines = []
+    for raw in (text or "").replace("\f", "\n").splitlines():
+        lines.extend(_INLINE_SPLIT.split(raw))
+    blank_run = 0
+    for pos, line in enumerate(lines):
+        stripped = line.strip()
+        blank_run = blank_run + 1 if not stripped else 0
+        kind = _heading_kind(stripped) if stripped else None
+        label = None
+        if kind is None and stripped:
+            for k, rx in _INLINE_LABEL:
+                m = rx.match(stripped)
+                if m and len(stripped.split(":", 1)[0]) <= 40:
+                    kind, label = k, m.group(1)
+                    break
+        if kind is not None:
+            close(table)
+            table = None
+            close(cur)
+            heading = stripped.split(":", 1)[0].strip() if label is not None else stripped.rstrip(":.")
+            cur = {"kind": kind, "heading": heading, "lines": [label] if label is not None else [], "pos": pos}
+            continue
+        if stripped and _TABLE_START.match(stripped):
+            close(table)
+            table = {"kind": "tables", "heading": stripped[:80], "lines": [line.rstrip()], "pos": pos}
+            continue
+        if table is not None:
+            if blank_run >= 2:
+                close(table)
+                table = None
+            else:
+                table["lines"].append(line.rstrip())
+                continue
+        cur["lines"].append(line.rstrip())
+    close(table)
+    close(cur)
+    sections.sort(key=lambda sec: sec.pop("pos"))
+    return sections
+
+
+def is_structured(sections: list[dict]) -> bool:
+    kinds = {s["kind"] for s in sections} - {"front", "references", "tables"}
+    return len(kinds) >= MIN_STRUCTURED_KINDS
+
+
+def chunk_sections(sections: list[dict], sid: str, max_chars: int = CHUNK_CHARS) -> list[dict]:
+    """Paragraph-bounded chunks of at most max_chars per section; front matter and references dropped."""
+    chunks: list[dict] = []
+    for sec in sections:
+        if sec["kind"] in ("front", "references"):
+            continue
+        pieces = split_passages(sec["text"], max_chars)
+        for piece in pieces:
+            chunks.append({"id": f"{sid}:{len(chunks)}", "kind": sec["kind"], "heading": sec["heading"], "text": piece})
+    return chunks
+
+
+def _sections_path(proj_dir: Path, sid: str) -> Path:
+    return Path(proj_dir) / SECTIONS_DIR / f"{sid}.json"
+
+
+def _given_sections(data: dict) -> list[dict]:
+    """Sections supplied by the fetcher (e.g. PubMed labelled abstract parts)."""
+    given = data.get("sections") if isinstance(data, dict) else None
+    if not isinstance(given, list):
+        return []
+    out = []
+    for s in given:
+        if isinstance(s, dict) and (s.get("text") or "").strip():
+            kind = s.get("kind") if s.get("kind") in KINDS else "abstract"
+            out.append({"kind": kind, "heading": s.get("heading") or kind, "text": s["text"].strip()})
+    return out
+
+
+def _source_meta(proj_dir: Path, sid: str) -> dict:
+    try:
+        meta = json.loads((Path(proj_dir) / "sources" / f"{sid}.json").read_text())
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def index_source(proj_dir: Path, url: str, data: dict, sid: str | None = None) -> list[dict]:
+    """Split a read source into sections and store its chunks; [] (nothing stored) for unstructured text.
+    Without headings in the text, sections delivered by the search backend (data or the source file) are used."""
+    sid = sid or source_id(url)
+    text = (data.get("text") or data.get("abstract") or "") if isinstance(data, dict) else ""
+    sections = split_sections(text)
+    if not is_structured(sections):
+        given = _given_sections(data) or _given_sections(_source_meta(proj_dir, sid))
+        sections = given + [s for s in sections if s["kind"] == "tables"]
+        if not is_structured(sections):
+            return []
+    chunks = chunk_sections(sections, sid)
+    if not chunks:
+        return []
+    path = _sections_path(proj_dir, sid)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "version": SECTIONS_VERSION, "url": url, "title": data.get("title", ""), "chunks": chunks,
+        }, ensure_ascii=False))
+        tmp.replace(path)
+    except OSError:
+        pass
+    return chunks
+
+
+def load_chunks(proj_dir: Path, url: str = "", sid: str = "") -> list[dict]:
+    """Stored chunks of a source, looked up by id or URL (canonical, then legacy id); [] if not indexed."""
+    ids = [sid] if sid else [source_id(url), legacy_source_id(url)] if url else []
+    for i in ids:
+        try:
+            data = json.loads(_sections_path(proj_dir, i).read_text())
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            continue
+        if isinstance(data, dict) and data.get("version") == SECTIONS_VERSION:
+            return data.get("chunks") or []
+    return []
+
+
+def select_chunks(chunks: list[dict], query: str, max_chars: int, kinds: tuple[str, ...] | None = None,
+                  require_match: bool = False) -> list[dict]:
+    """Best chunks for a query within max_chars: lexical relevance plus a section-kind prior; returned in
+    document order. When the best chunk alone exceeds the budget it is cut down to its query-matching
+    passages instead of being skipped for smaller, less relevant ones. require_match drops chunks that
+    share no term with the query."""
+    from tools.research_relevance import lexical_scores
+    pool = [c for c in chunks if not kinds or c.get("kind") in kinds]
+    if not pool:
+        return []
+    lex = lexical_scores(query or "", [{"excerpt": c["text"], "title": c.get("heading", "")} for c in pool])
+    scored = sorted(
+        (i for i in range(len(pool)) if lex[i] > 0 or not require_match),
+        key=lambda i: (-(lex[i] + KIND_WEIGHTS.get(pool[i].get("kind"), 0.05)), i),
+    )
+    picked: dict[int, dict] = {}
+    used = 0
+    for rank, i in enumerate(scored):
+        size = len(pool[i]["text"]) + 20
+        if used + size > max_chars:
+            if rank == 0 and max_chars > 20:
+                text = pack_text(query, pool[i]["text"], (max_chars - 20) // CHARS_PER_TOKEN)
+                picked[i] = {**pool[i], "text": text[: max_chars - 20]}
+                used += len(picked[i]["text"]) + 20
+            continue
+        picked[i] = pool[i]
+        used += size
+    return [picked[i] for i in sorted(picked)]
+
+
+def format_chunks(chunks: list[dict]) -> str:
+    return "\n\n".join(f"[{c.get('heading') or c.get('kind')}]\n{c['text']}" for c in chunks)
+
+
+def section_context(proj_dir: Path, query: str, max_chars: int, url: str = "", sid: str = "",
+                    data: dict | None = None, require_match: bool = False) -> str:
+    """Relevant section chunks of one source as prompt text; indexes the source on the fly when its
+    content is given. '' when the source has no recognisable sections (or, with require_match, no chunk
+    matching the query)."""
+    chunks = load_chunks(proj_dir, url=url, sid=sid)
+    if not chunks and data is not None:
+        chunks = index_source(proj_dir, url, data, sid or None)
+    if not chunks:
+        return ""
+    return format_chunks(select_chunks(chunks, query, max_chars, require_match=require_match))
+
+
+def index_project(proj_dir: Path) -> dict:
+    indexed = skipped = 0
+    for f in sorted((Path(proj_dir) / "sources").glob("*_content.json")):
+        sid = f.name[: -len("_content.json")]
+        try:
+            data = json.loads(f.read_text())
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            continue
+        if index_source(proj_dir, (data.get("url") or "") if isinstance(data, dict) else "", data, sid):
+            indexed += 1
+        else:
+            skipped += 1
+    return {"indexed": indexed, "unstructured": skipped}
+
+
+def main() -> None:
+    if len(sys.argv) < 3 or sys.argv[1] not in ("index", "show") or (sys.argv[1] == "show" and len(sys.argv) < 4):
+        print("Usage: research_sections.py index <project_id> | show <project_id> <url>", file=sys.stderr)
+        sys.exit(2)
+    from tools.research_common import project_dir
+    proj = project_dir(sys.argv[2])
+    if sys.argv[1] == "index":
+        print(json.dumps(index_project(proj)))
+    else:
+        print(json.dumps(load_chunks(proj, url=sys.argv[3]), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
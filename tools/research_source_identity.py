@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Source identity: canonical URLs, source ids, per-project and global identity index.
+
+canonical_url() maps variants of one source to one URL: http/https, www./m./amp. hosts, default ports,
+fragments, tracking parameters (utm_*, gclid, fbclid, ...), trailing slashes, AMP paths and AMP caches,
+arXiv abs/pdf/version links (-> arxiv.org/abs/<id>) and doi.org/dx.doi.org links (-> https://doi.org/<doi>).
+source_id(url) = sha256(canonical_url)[:12] names sources/<id>.json and sources/<id>_content.json;
+legacy_source_id(url) = sha256(raw url)[:12] is what older projects used and is still read.
+
+Per project, source_identity.json holds canonical URL, DOI and content hash per source file, so
+writers merge a DOI or content duplicate into the existing source and read_state counts identities
+instead of files. research/source_identity.db indexes content already fetched by any project
+(canonical URL, DOI, content hash), so a reader can reuse it instead of fetching again.
+
+Usage:
+  research_source_identity.py canonical <url>
+  research_source_identity.py count <project_id>
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+INDEX_FILE = "source_identity.json"
+INDEX_VERSION = 1
+GLOBAL_DB = "source_identity.db"
+DEFAULT_REUSE_DAYS = 30
+
+_TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "ref_src", "ref_url", "referrer", "spm", "cmpid", "smid", "sr_share", "share", "s_cid",
+    "ncid", "ito", "__twitter_impression", "amp", "outputtype",
+}
+_TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hmb_")
+_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+_DOI_RE = re.compile(r"\b(10\.\d{4,9}/[^\s\"'<>?#]+)", re.I)
+_ARXIV_RE = re.compile(r"^/(?:abs|pdf|html)/(.+?)(?:v\d+)?(?:\.pdf)?/?$", re.I)
+
+
+def extract_doi(value: str) -> str:
+    """Lowercased DOI found in a DOI string, doi.org link or other URL; '' if none."""
+    m = _DOI_RE.search(unquote(value or ""))
+    return m.group(1).rstrip(".,;)").lower() if m else ""
+
+
+def _unwrap_amp_cache(parts) -> str | None:
+    host, path = parts.netloc.lower(), parts.path
+    if host.endswith(".cdn.ampproject.org"):
+        m = re.match(r"^/[a-z]/(s/)?(.+)$", path)
+        if m:
+            return ("https://" if m.group(1) else "http://") + m.group(2)
+    if host in ("www.google.com", "google.com") and path.startswith("/amp/"):
+        rest = path[len("/amp/"):]
+        return "https://" + rest[2:] if rest.startswith("s/") else "http://" + rest
+    return None
+
+
+def canonical_url(url: str) -> str:
+    raw = (url or "").strip()
+    if not raw or "://" not in raw:
+        return raw
+    try:
+        parts = urlsplit(raw)
+    except ValueError:
+        return raw
+    unwrapped = _unwrap_amp_cache(parts)
+    if unwrapped:
+        return canonical_url(unwrapped)
+    host = (parts.hostname or "").lower().rstrip(".")
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "")
+    if host in ("doi.org", "dx.doi.org"):
+        doi = extract_doi(path.lstrip("/"))
+        if doi:
+            return "https://doi.org/" + doi
+    if host in ("arxiv.org", "export.arxiv.org"):
+        m = _ARXIV_RE.match(path)
+        if m:
+            return "https://arxiv.org/abs/" + m.group(1)
+        host = "arxiv.org"
+    if path.endswith("/amp") or path.endswith("/amp/"):
+        path = path[: path.rstrip("/").rfind("/amp")] or "/"
+    elif path.endswith(".amp"):
+        path = path[: -len(".amp")]
+    elif path.startswith("/amp/"):
+        path = path[len("/amp"):]
+    path = path.rstrip("/")
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith(_TRACKING_PREFIXES)
+    ]
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
+
+
+def source_id(url: str) -> str:
+    return hashlib.sha256(canonical_url(url).encode()).hexdigest()[:12]
+
+
+def legacy_source_id(url: str) -> str:
+    return hashlib.sha256((url or "").strip().encode()).hexdigest()[:12]
+
+
+def content_hash(text: str) -> str:
+    """Hash of whitespace/case-normalised text ('' for near-empty text)."""
+    norm = " ".join((text or "").lower().split())
+    if len(norm) < 200:
+        return ""
+    return hashlib.sha256(norm[:20000].encode()).hexdigest()[:16]
+
+
+def item_doi(item: dict) -> str:
+    return extract_doi(item.get("doi") or "") or extract_doi(item.get("url") or "") if isinstance(item, dict) else ""
+
+
+def content_path(proj_dir: Path, url: str) -> Path | None:
+    """sources/<id>_content.json of a URL: canonical id first, then the legacy raw-URL id."""
+    sources = Path(proj_dir) / "sources"
+    for sid in (source_id(url), legacy_source_id(url)):
+        p = sources / f"{sid}_content.json"
+        if p.exists():
+            return p
+    return None
+
+
+class SourceIndex:
+    """<project>/source_identity.json: {file id: {url, doi, hash, meta}} for the source files of one project."""
+
+    def __init__(self, proj_dir: Path, files: dict[str, dict] | None = None):
+        self.proj_dir = Path(proj_dir)
+        self.files: dict[str, dict] = files or {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        return self.proj_dir / INDEX_FILE
+
+    @classmethod
+    def load(cls, proj_dir: Path) -> "SourceIndex":
+        try:
+            data = json.loads((Path(proj_dir) / INDEX_FILE).read_text())
+            if data.get("version") == INDEX_VERSION and isinstance(data.get("files"), dict):
+                return cls(proj_dir, data["files"])
+        except (json.JSONDecodeError, OSError, AttributeError):
+            pass
+        return cls(proj_dir)
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{INDEX_FILE}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": self.files}))
+            tmp.replace(self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
+        return False
+
+    def refresh(self) -> "SourceIndex":
+        """Index source files written without the index (older writers); drop removed ones. Content files
+        without a search-result file (URLs read directly) are indexed too, flagged meta=False."""
+        sources = self.proj_dir / "sources"
+        meta: set[str] = set()
+        content: set[str] = set()
+        try:
+            for e in os.scandir(sources):
+                if e.name.endswith("_content.json"):
+                    content.add(e.name[: -len("_content.json")])
+                elif e.name.endswith(".json"):
+                    meta.add(e.name[:-5])
+        except OSError:
+            pass
+        names = meta | content
+        with self._lock:
+            for fid in [f for f in self.files if f not in names]:
+                del self.files[fid]
+                self._dirty = True
+            for fid in names - set(self.files):
+                name = f"{fid}.json" if fid in meta else f"{fid}_content.json"
+                try:
+                    item = json.loads((sources / name).read_text())
+                except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+                    continue
+                if isinstance(item, dict) and (item.get("url") or "").strip():
+                    self.files[fid] = {"url": canonical_url(item["url"]), "doi": item_doi(item), "hash": ""}
+                    self._dirty = True
+            for fid, e in self.files.items():
+                if e.get("meta") != (fid in meta):
+                    e["meta"] = fid in meta
+                    self._dirty = True
+        return self
+
+    def lookup(self, url: str = "", doi: str = "", chash: str = "") -> str | None:
+        """Id of an existing source file with the same canonical URL, DOI or content hash."""
+        canon = canonical_url(url) if url else ""
+        with self._lock:
+            if canon and source_id(url) in self.files:
+                return source_id(url)
+            for fid, e in self.files.items():
+                if (canon and e.get("url") == canon) or (doi and e.get("doi") == doi) or (chash and e.get("hash") == chash):
+                    return fid
+        return None
+
+    def record(self, fid: str, url: str, doi: str = "", chash: str = "", meta: bool | None = None) -> None:
+        with self._lock:
+            cur = self.files.get(fid) or {}
+            if meta is None:
+                meta = bool(cur.get("meta")) or (self.proj_dir / "sources" / f"{fid}.json").exists()
+            entry = {
+                "url": cur.get("url") or canonical_url(url),
+                "doi": cur.get("doi") or doi,
+                "hash": cur.get("hash") or chash,
+                "meta": meta,
+            }
+            if entry != cur:
+                self.files[fid] = entry
+                self._dirty = True
+
+    def save_source(self, item: dict, **extra) -> str | None:
+        """Write a search result to sources/<id>.json (overwriting like the old writers did). A URL already
+        saved under another id (e.g. a legacy raw-URL id) is written to that file; a result whose DOI is
+        already known under another URL is merged into that source (file left as is). Returns the file id."""
+        url = (item.get("url") or "").strip()
+        if not url:
+            return None
+        doi = item_doi(item)
+        fid = source_id(url)
+        if fid not in self.files:
+            known = self.lookup(url=url)
+            if known:
+                fid = known
+            elif doi:
+                known = self.lookup(doi=doi)
+                if known:
+                    return known
+        out = {**item, **extra, "canonical_url": canonical_url(url)}
+        if doi:
+            out["doi"] = doi
+        path = self.proj_dir / "sources" / f"{fid}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(out, ensure_ascii=False))
+        self.record(fid, url, doi, meta=True)
+        return fid
+
+    def unique_count(self) -> int:
+        """Distinct sources (search-result files): files sharing a canonical URL, DOI or content hash
+        count once. Content-only entries link sources through their hash but are not counted."""
+        with self._lock:
+            files = list(self.files.items())
+        parent = list(range(len(files)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        first: dict[str, int] = {}
+        for i, (_fid, e) in enumerate(files):
+            for key in (f"u:{e.get('url')}" if e.get("url") else "", f"d:{e.get('doi')}" if e.get("doi") else "",
+                        f"h:{e.get('hash')}" if e.get("hash") else ""):
+                if not key:
+                    continue
+                if key in first:
+                    parent[find(i)] = find(first[key])
+                else:
+                    first[key] = i
+        return len({find(i) for i, (_fid, e) in enumerate(files) if e.get("meta", True)})
+
+
+def open_index(proj_dir: Path, refresh: bool = True) -> SourceIndex:
+    index = SourceIndex.load(proj_dir)
+    return index.refresh() if refresh else index
+
+
+def unique_source_count(proj_dir: Path) -> int:
+    with open_index(proj_dir) as index:
+        return index.unique_count()
+
+
+class GlobalSourceIndex:
+    """research/source_identity.db: where fetched content of a canonical URL / DOI / content hash lives."""
+
+    def __init__(self, root: Path | None = None):
+        if root is None:
+            from tools.research_common import research_root
+            root = research_root()
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / GLOBAL_DB), timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sources (
+                canonical_url TEXT PRIMARY KEY,
+                doi           TEXT NOT NULL DEFAULT '',
+                content_hash  TEXT NOT NULL DEFAULT '',
+                project_id    TEXT NOT NULL,
+                source_id     TEXT NOT NULL,
+                updated_at    REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_sources_doi ON sources(doi) WHERE doi != '';
+            CREATE INDEX IF NOT EXISTS idx_sources_hash ON sources(content_hash) WHERE content_hash != '';
+        """)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record(self, url: str, project_id: str, sid: str, doi: str = "", chash: str = "") -> None:
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO sources (canonical_url, doi, content_hash, project_id, source_id, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (canonical_url(url), doi, chash, project_id, sid, time.time()),
+            )
+            self._conn.commit()
+
+    def find_content(self, url: str, doi: str = "", max_age_days: float | None = None) -> dict | None:
+        """Fetched content (the reader's JSON) of this URL or DOI from any project, or None."""
+        if max_age_days is None:
+            try:
+                max_age_days = float(os.environ.get("RESEARCH_SOURCE_REUSE_DAYS", DEFAULT_REUSE_DAYS))
+            except ValueError:
+                max_age_days = DEFAULT_REUSE_DAYS
+        if max_age_days <= 0:
+            return None
+        since = time.time() - max_age_days * 86400
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT project_id, source_id FROM sources
+                   WHERE (canonical_url = ? OR (? != '' AND doi = ?)) AND updated_at >= ?
+                   ORDER BY updated_at DESC LIMIT 5""",
+                (canonical_url(url), doi, doi, since),
+            ).fetchall()
+        for project_id, sid in rows:
+            p = self.root / project_id / "sources" / f"{sid}_content.json"
+            try:
+                data = json.loads(p.read_text())
+            except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+                continue
+            if isinstance(data, dict) and (data.get("text") or data.get("abstract")):
+                return data
+        return None
+
+
+def open_global_index(root: Path | None = None) -> GlobalSourceIndex | None:
+    try:
+        return GlobalSourceIndex(root)
+    except (sqlite3.Error, OSError):
+        return None
+
+
+def main() -> None:
+    if len(sys.argv) < 3 or sys.argv[1] not in ("canonical", "count"):
+        print("Usage: research_source_identity.py canonical <url> | count <project_id>", file=sys.stderr)
+        sys.exit(2)
+    if sys.argv[1] == "canonical":
+        print(json.dumps({"canonical_url": canonical_url(sys.argv[2]), "source_id": source_id(sys.argv[2]),
+                          "doi": extract_doi(sys.argv[2])}))
+        return
+    from tools.research_common import project_dir
+    print(json.dumps({"unique_sources": unique_source_count(project_dir(sys.argv[2]))}))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,7 @@ from typing import Any
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from tools.research_common import project_dir, load_project
 from tools.research_conductor import read_state
+from tools.research_relevance import drift_terms, low_relevance_fraction
 
 
 def _load_previous_state(proj: Path) -> dict | None:
@@ -54,29 +55,22 @@ def _coverage_stagnation(proj: Path, current_state: Any) -> list[dict]:
 
 def _source_relevance_drift(proj: Path, question: str) -> list[dict]:
     """Heuristic: recent sources with low overlap to question terms may indicate drift."""
-    question_terms = set((question or "").lower().split())
-    question_terms = {t.strip(".,;:") for t in question_terms if len(t) >= 4}
-    if not question_terms:
+    if not drift_terms(question):
         return []
     sources_dir = proj / "sources"
     if not sources_dir.exists():
         return []
-    low_relevance = 0
-    total = 0
+    recent: list[dict | None] = []
     for f in list(sources_dir.glob("*.json"))[-20:]:
         if f.name.endswith("_content.json"):
             continue
-        total += 1
         try:
             d = json.loads(f.read_text(encoding="utf-8", errors="replace"))
-            text = f"{d.get('title','')} {d.get('description','')}".lower()
-            overlap = sum(1 for t in question_terms if t in text)
-            if overlap < 2:
-                low_relevance += 1
+            recent.append({"title": d.get("title", ""), "description": d.get("description", "")})
         except Exception:
-            pass
+            recent.append(None)  # counted, never as low relevance
     anomalies = []
-    if total >= 5 and low_relevance / total >= 0.6:
+    if len(recent) >= 5 and low_relevance_fraction(question, recent, min_terms=2) >= 0.6:
         anomalies.append({
             "type": "source_relevance_drift",
             "severity": "high",
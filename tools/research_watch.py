@@ -14,6 +14,9 @@ from datetime import datetime, timezone
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from tools.research_common import project_dir, load_project, ensure_project_layout
 
+# Watch checks look for new sources: only reuse search results younger than this (see research_search_cache)
+WATCH_MAX_AGE_HOURS = 12
+
 
 def _load_sources(proj_path: Path) -> list[dict]:
     sources = []
@@ -41,7 +44,7 @@ def check_for_updates(project_id: str) -> dict:
     tools = Path(__file__).resolve().parent
     import subprocess
     r = subprocess.run(
-        [sys.executable, str(tools / "research_web_search.py"), question, "--max", "15"],
+        [sys.executable, str(tools / "research_web_search.py"), question, "--max", "15", "--max-age", str(WATCH_MAX_AGE_HOURS)],
         capture_output=True, text=True, timeout=30, cwd=str(proj_path),
     )
     new_sources = []
@@ -6,6 +6,13 @@ Single-query mode:
 
 Batch mode:
   research_web_search.py --queries-file <json> [--max-per-query 5]
+
+Results are cached per (provider, normalised query, max results) in research/search_cache.db
+(see research_search_cache.py); --fresh skips cached results, --max-age <hours> overrides the TTL
+(a query entry with "fresh": true in the queries file does the same for that query). Near-duplicate
+queries in a batch are collapsed before dispatch. Each query goes through research_search_fanout:
+web queries to the web engine, academic/medical queries to their scholarly backends concurrently,
+fused by reciprocal rank with per-backend deadlines.
 """
 import json
 import os
@@ -80,32 +87,6 @@ def search_serper(query: str, max_results: int = 20) -> list[dict]:
     return results
 
 
-def _search_academic(query: str, max_results: int = 10) -> list[dict]:
-    try:
-        from tools.research_academic import semantic_scholar, arxiv
-    except Exception:
-        return []
-    per = max(1, max_results // 2)
-    out = []
-    out.extend(semantic_scholar(query, per))
-    out.extend(arxiv(query, max_results - per))
-    return out[:max_results]
-
-
-def _search_medical(query: str, max_results: int = 10) -> list[dict]:
-    """PubMed + Semantic Scholar for medical/biomedical queries."""
-    try:
-        from tools.research_academic import pubmed, semantic_scholar
-    except Exception:
-        return []
-    pm_count = max(1, (max_results * 2) // 3)
-    ss_count = max_results - pm_count
-    out = []
-    out.extend(pubmed(query, pm_count))
-    out.extend(semantic_scholar(query, ss_count))
-    return out[:max_results]
-
-
 def _load_queries(path: str) -> list[dict]:
     raw = json.loads(Path(path).read_text())
     if isinstance(raw, dict) and isinstance(raw.get("queries"), list):
@@ -131,21 +112,81 @@ def _progress_step(message: str, current: int, total: int) -> None:
         pass
 
 
-def _search_web(query: str, max_results: int, secrets: dict) -> list[dict]:
-    if secrets.get("BRAVE_API_KEY"):
-        return search_brave(query, max_results)
-    if secrets.get("SERPER_API_KEY"):
-        return search_serper(query, max_results)
-    print("WARN: No BRAVE_API_KEY or SERPER_API_KEY set; returning empty results", file=sys.stderr)
-    return []
+# provider -> research_budget API_COSTS key (academic APIs are free)
+_BUDGET_API = {"brave": "brave_search", "serper": "serper_search"}
+
+
+def _account(report: dict[str, dict], calls: dict[str, int], hits: dict[str, int]) -> None:
+    """Count cache hits and provider requests (including ones still running at return) of a fan-out."""
+    for info in report.values():
+        provider = info.get("provider")
+        if info["status"] == "cached":
+            hits[provider] = hits.get(provider, 0) + 1
+        elif info["status"] in ("ok", "timeout", "pending"):
+            calls[provider] = calls.get(provider, 0) + 1
+
+
+def _track_calls(calls: dict[str, int], hits: dict[str, int]) -> None:
+    """Charge provider calls and record cache hits (avoided calls) on the current project."""
+    project_id = os.environ.get("RESEARCH_PROJECT_ID", "")
+    if not project_id:
+        return
+    try:
+        from tools.research_budget import track_api_call
+        for provider in set(calls) | set(hits):
+            api_name = _BUDGET_API.get(provider)
+            if api_name and (calls.get(provider) or hits.get(provider)):
+                track_api_call(project_id, api_name, count=calls.get(provider, 0), cache_hits=hits.get(provider, 0))
+    except Exception:
+        pass
+
+
+def collapse_queries(queries: list[tuple[int, dict]]) -> tuple[list[tuple[int, dict]], int]:
+    """Drop near-duplicate queries (same type, topic and token signature) before dispatch; the first one
+    wins. Queries of different topics are kept so coverage can attribute their results. Returns
+    (kept, dropped_count)."""
+    from tools.research_search_cache import query_signature
+    kept: list[tuple[int, dict]] = []
+    seen: set[tuple[str, str, str]] = set()
+    for i, q in queries:
+        key = (
+            str(q.get("type") or "web").lower(),
+            str(q.get("topic_id") or ""),
+            query_signature(str(q.get("query") or "")),
+        )
+        if key in seen:
+            continue
+        seen.add(key)
+        kept.append((i, q))
+    return kept, len(queries) - len(kept)
+
+
+def _max_age_arg() -> float | None:
+    """--fresh (bypass cache reads) or --max-age <hours>; None = cache TTL."""
+    if "--fresh" in sys.argv:
+        return 0.0
+    if "--max-age" in sys.argv:
+        idx = sys.argv.index("--max-age") + 1
+        if idx < len(sys.argv):
+            try:
+                return max(0.0, float(sys.argv[idx]))
+            except ValueError:
+                pass
+    return None
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: research_web_search.py \"query\" [--max 20] | --queries-file <json> [--max-per-query 5]", file=sys.stderr)
+        print("Usage: research_web_search.py \"query\" [--max 20] | --queries-file <json> [--max-per-query 5] [--fresh | --max-age <hours>]", file=sys.stderr)
         sys.exit(2)
 
+    from tools.research_search_cache import open_cache
+    from tools.research_search_fanout import fan_out, wait_stragglers, web_provider
     secrets = load_secrets()
+    max_age = _max_age_arg()
+    cache = None
+    calls: dict[str, int] = {}
+    hits: dict[str, int] = {}
 
     if "--queries-file" in sys.argv:
         idx = sys.argv.index("--queries-file") + 1
@@ -165,46 +206,62 @@ def main():
             if str(q.get("query") or "").strip()
         ]
         total = len(valid_queries)
-        max_workers = min(8, max(5, (total + 1) // 2))
-        all_results: list[dict] = []
-        seen_urls: set[str] = set()
-
-        def run_one(args: tuple) -> tuple[int, str, str, str, str, list[dict]]:
-            i, q = args
-            query = str(q.get("query") or "").strip()
-            qtype = str(q.get("type") or "web").lower()
-            topic_id = str(q.get("topic_id") or "")
-            perspective = str(q.get("perspective") or "")
-            if qtype == "medical":
-                results = _search_medical(query, max_per_query)
-            elif qtype == "academic":
-                results = _search_academic(query, max_per_query)
-            else:
-                results = _search_web(query, max_per_query, secrets)
-            return (i, query, topic_id, perspective, qtype, results)
-
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(run_one, (i, q)): i for i, q in valid_queries}
-            for future in as_completed(futures):
+        valid_queries, collapsed = collapse_queries(valid_queries)
+        if collapsed:
+            print(f"INFO: collapsed {collapsed} near-duplicate queries", file=sys.stderr)
+        if not web_provider(secrets) and any(str(q.get("type") or "web").lower() == "web" for _, q in valid_queries):
+            print("WARN: No BRAVE_API_KEY or SERPER_API_KEY set; web queries return empty results", file=sys.stderr)
+        if web_provider(secrets) or any(str(q.get("type") or "web").lower() != "web" for _, q in valid_queries):
+            cache = open_cache()
+        try:
+            max_workers = min(8, max(5, (total + 1) // 2))
+            all_results: list[dict] = []
+            seen_urls: set[str] = set()
+
+            def run_one(args: tuple) -> tuple[int, str, str, str, str, list[dict], dict]:
+                i, q = args
+                query = str(q.get("query") or "").strip()
+                qtype = str(q.get("type") or "web").lower()
+                topic_id = str(q.get("topic_id") or "")
+                perspective = str(q.get("perspective") or "")
+                results, report = fan_out(
+                    query, qtype, max_per_query, secrets, cache=cache, max_age=0.0 if q.get("fresh") else max_age,
+                )
+                return (i, query, topic_id, perspective, qtype, results, report)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(run_one, (i, q)): i for i, q in valid_queries}
+                for future in as_completed(futures):
+                    try:
+                        i, query, topic_id, perspective, qtype, results, report = future.result()
+                        _account(report, calls, hits)
+                        _progress_step(f"Search {i}/{total}: {query[:80]}", i, total)
+                        for r in results:
+                            url = (r.get("url") or "").strip()
+                            if not url or url in seen_urls:
+                                continue
+                            seen_urls.add(url)
+                            all_results.append(
+                                {
+                                    **r,
+                                    "query": query,
+                                    "topic_id": topic_id,
+                                    "perspective": perspective,
+                                    "query_type": qtype,
+                                }
+                            )
+                    except Exception as e:
+                        print(f"WARN: search failed: {e}", file=sys.stderr)
+            _track_calls(calls, hits)
+            wait_stragglers()  # let backends that missed the quorum store their results before exiting
+            if cache is not None:
                 try:
-                    i, query, topic_id, perspective, qtype, results = future.result()
-                    _progress_step(f"Search {i}/{total}: {query[:80]}", i, total)
-                    for r in results:
-                        url = (r.get("url") or "").strip()
-                        if not url or url in seen_urls:
-                            continue
-                        seen_urls.add(url)
-                        all_results.append(
-                            {
-                                **r,
-                                "query": query,
-                                "topic_id": topic_id,
-                                "perspective": perspective,
-                                "query_type": qtype,
-                            }
-                        )
-                except Exception as e:
-                    print(f"WARN: search failed: {e}", file=sys.stderr)
+                    cache.purge()
+                except Exception:
+                    pass
+        finally:
+            if cache is not None:
+                cache.close()
         print(json.dumps(all_results, indent=2, ensure_ascii=False))
         return
 
@@ -214,15 +271,19 @@ def main():
         idx = sys.argv.index("--max") + 1
         if idx < len(sys.argv):
             max_results = int(sys.argv[idx])
-    results = _search_web(query, max_results, secrets)
-    project_id = os.environ.get("RESEARCH_PROJECT_ID", "")
-    if project_id and results:
+    results: list[dict] = []
+    if web_provider(secrets):
+        cache = open_cache()
         try:
-            from tools.research_budget import track_api_call
-            api_name = "brave_search" if secrets.get("BRAVE_API_KEY") else "serper_search"
-            track_api_call(project_id, api_name, count=1)
-        except Exception:
-            pass
+            results, report = fan_out(query, "web", max_results, secrets, cache=cache, max_age=max_age)
+            _account(report, calls, hits)
+            _track_calls(calls, hits)
+            wait_stragglers()
+        finally:
+            if cache is not None:
+                cache.close()
+    else:
+        print("WARN: No BRAVE_API_KEY or SERPER_API_KEY set; returning empty results", file=sys.stderr)
     print(json.dumps(results, indent=2, ensure_ascii=False))
 
 
@@ -4,7 +4,7 @@ Run a Python file in the research sandbox (Docker: no network, numpy/scipy, time
 Used by ATLAS to execute thesis-validation code safely.
 
 Usage: run_sandbox_file.py <path_to_script.py> [timeout_seconds]
-Output: JSON to stdout with keys: exit_code, timeout, stdout, stderr, success.
+Output: JSON to stdout with keys: exit_code, timeout, stdout, stderr, success, usage, results.
 """
 
 import json
@@ -37,6 +37,8 @@ def main() -> None:
         "stdout": result.stdout,
         "stderr": result.stderr,
         "success": result.exit_code == 0 and not result.timeout,
+        "usage": result.usage(),
+        "results": result.results,
     }
     print(json.dumps(out))
     sys.exit(0 if out["success"] else 1)
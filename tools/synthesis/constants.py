@@ -6,6 +6,7 @@ EXCERPT_CHARS = 2000
 SOURCE_CONTENT_CHARS = 6000
 SECTION_WORDS_MIN, SECTION_WORDS_MAX = 500, 1500
 SYNTHESIZE_CHECKPOINT = "synthesize_checkpoint.json"
+SYNTHESIZE_PARTIAL_REPORT = "synthesize_partial.md"
 
 
 def _model() -> str:
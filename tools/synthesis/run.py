@@ -18,6 +18,13 @@ from tools.synthesis.ledger import (
 )
 from tools.synthesis.outline import _cluster_findings, _outline_sections
 from tools.synthesis.checkpoint import _load_checkpoint, _save_checkpoint, _clear_checkpoint
+from tools.synthesis.stream import (
+    CLOSING_BLOCKS,
+    _clear_partial_report,
+    _emit_section,
+    _render_sections,
+    _write_partial_report,
+)
 from tools.synthesis.sections import (
     _epistemic_profile_from_ledger,
     _extract_section_key_points,
@@ -176,6 +183,16 @@ def run_synthesis(project_id: str) -> str:
         accumulated_claim_refs.update(_extract_used_claim_refs(b))
     tools_dir = Path(__file__).resolve().parent.parent
     operator_root = tools_dir.parent
+    stream_titles = [section_titles[i] if i < len(section_titles) else f"Analysis: Topic {i+1}" for i in range(len(clusters))]
+
+    def _stream_sections() -> None:
+        head = "\n".join(str(p) for p in parts)
+        _write_partial_report(proj_path, head + "\n" + _render_sections(stream_titles, checkpoint_bodies) + "\n\n---\n\n", CLOSING_BLOCKS)
+
+    def _stream_closing(done_blocks: int) -> None:
+        _write_partial_report(proj_path, "\n".join(str(p) for p in parts), CLOSING_BLOCKS[done_blocks:])
+
+    _stream_sections()
     for i in range(start_index, len(clusters)):
         cluster = clusters[i]
         title = section_titles[i] if i < len(section_titles) else f"Analysis: Topic {i+1}"
@@ -189,6 +206,7 @@ def run_synthesis(project_id: str) -> str:
             checkpoint_bodies.append("_No findings for this cluster._")
             deep_parts.append(f"## {title}\n\n_No findings for this cluster._")
             _save_checkpoint(proj_path, clusters, section_titles, checkpoint_bodies)
+            _stream_sections()
             continue
         try:
             from tools.research_progress import step as progress_step
@@ -234,6 +252,8 @@ def run_synthesis(project_id: str) -> str:
         checkpoint_bodies.append(body)
         deep_parts.append(f"## {title}\n\n{body}")
         _save_checkpoint(proj_path, clusters, section_titles, checkpoint_bodies)
+        _stream_sections()
+        _emit_section(project_id, proj_path, title, i + 1, len(clusters), body)
     checkpoint_bodies = _deduplicate_sections(checkpoint_bodies)
     deep_parts = [f"## {section_titles[start_index + j]}\n\n{checkpoint_bodies[j]}" for j in range(len(checkpoint_bodies))]
     parts.append("\n\n".join(deep_parts))
@@ -275,6 +295,7 @@ def run_synthesis(project_id: str) -> str:
         n_src = len(normalize_to_strings(c.get("supporting_source_ids")))
         parts.append(f"| {i} | {text}... | {status} | {n_src} |\n")
     parts.append("\n")
+    _stream_closing(2)
 
     try:
         from tools.research_progress import step as progress_step
@@ -286,6 +307,7 @@ def run_synthesis(project_id: str) -> str:
         parts.append("## Research Situation Map\n\n")
         parts.append(situation_map)
         parts.append("\n\n")
+    _stream_closing(3)
 
     try:
         from tools.research_progress import step as progress_step
@@ -297,6 +319,7 @@ def run_synthesis(project_id: str) -> str:
         parts.append("## Tipping Conditions\n\n")
         parts.append(tipping)
         parts.append("\n\n")
+    _stream_closing(4)
 
     try:
         from tools.research_progress import step as progress_step
@@ -308,6 +331,7 @@ def run_synthesis(project_id: str) -> str:
         parts.append("## Scenario Matrix\n\n")
         parts.append(scenario)
         parts.append("\n\n")
+    _stream_closing(5)
 
     concl, next_steps = _synthesize_conclusions_next_steps(thesis, contradictions, question, project_id, epistemic_profile=epistemic_profile, research_mode=research_mode, discovery_brief=discovery_brief)
     parts.append("## Conclusions & Thesis\n\n")
@@ -315,6 +339,7 @@ def run_synthesis(project_id: str) -> str:
     parts.append("\n\n## Recommended Next Steps\n\n")
     parts.append(next_steps)
     parts.append("\n\n---\n\n")
+    _write_partial_report(proj_path, "\n".join(str(p) for p in parts), ["Executive Summary", "Executive Decision Synthesis"])
 
     _clear_checkpoint(proj_path)
     full_so_far = "\n".join(str(p) for p in parts)
@@ -398,6 +423,7 @@ def run_synthesis(project_id: str) -> str:
             f"tentative_labels_ok={validation.get('tentative_labels_ok')}"
         )
 
+    _clear_partial_report(proj_path)
     return report_body
 
 
@@ -135,7 +135,7 @@ def _synthesize_section(
     urls_in_section = list({(f.get("url") or "").strip() for f in findings_for_section if f.get("url")})[:5]
     full_content = []
     for u in urls_in_section:
-        text = _load_source_content(proj_path, u)
+        text = _load_source_content(proj_path, u, query=f"{section_title} {question}")
         if text:
             full_content.append(f"Source {u}:\n{text[:SOURCE_CONTENT_CHARS]}")
     full_block = "\n\n".join(full_content) if full_content else "(no full content)"
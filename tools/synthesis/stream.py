@@ -0,0 +1,69 @@
+"""Streaming partial report: rewritten after every finished section so readers (UI, critic) see progress
+and a crash late in synthesis still leaves a usable report."""
+from pathlib import Path
+
+from tools.synthesis.constants import SYNTHESIZE_PARTIAL_REPORT
+
+PENDING_MARKER = "_[Section pending — synthesis in progress]_"
+PARTIAL_BANNER = "> **Partial report** — synthesis has not finished; sections marked pending are not yet written.\n\n"
+
+# Closing blocks written after the deep sections, in report order (used for pending markers).
+CLOSING_BLOCKS = [
+    "Methodology",
+    "Verification Summary",
+    "Research Situation Map",
+    "Tipping Conditions",
+    "Scenario Matrix",
+    "Conclusions & Thesis",
+    "Recommended Next Steps",
+]
+
+
+def _partial_report_path(proj_path: Path) -> Path:
+    return proj_path / SYNTHESIZE_PARTIAL_REPORT
+
+
+def _render_sections(section_titles: list, bodies: list) -> str:
+    """Finished sections as written; remaining outline titles with a pending marker."""
+    out = []
+    for i, title in enumerate(section_titles):
+        body = bodies[i] if i < len(bodies) else PENDING_MARKER
+        out.append(f"## {title}\n\n{body}")
+    return "\n\n".join(out)
+
+
+def _write_partial_report(proj_path: Path, body: str, pending: list | None = None) -> None:
+    """Atomically rewrite the partial report: banner + body + pending markers for unfinished blocks."""
+    p = _partial_report_path(proj_path)
+    text = PARTIAL_BANNER + body.rstrip() + "\n\n"
+    for title in pending or []:
+        text += f"## {title}\n\n{PENDING_MARKER}\n\n"
+    try:
+        tmp = p.with_suffix(".md.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(p)
+    except Exception:
+        pass
+
+
+def _emit_section(project_id: str, proj_path: Path, title: str, index: int, total: int, body: str) -> None:
+    """Push a finished section to the progress stream (events.jsonl + progress.json)."""
+    try:
+        from tools.research_progress import report_section
+        report_section(project_id, title, index, total, len(body.split()), str(_partial_report_path(proj_path)))
+    except Exception:
+        pass
+
+
+def _load_partial_report(proj_path: Path) -> str:
+    p = _partial_report_path(proj_path)
+    if not p.exists():
+        return ""
+    try:
+        return p.read_text(encoding="utf-8", errors="replace")
+    except Exception:
+        return ""
+
+
+def _clear_partial_report(proj_path: Path) -> None:
+    _partial_report_path(proj_path).unlink(missing_ok=True)
@@ -5,6 +5,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from tools.research_common import ensure_project_layout, get_principles_for_research
+from tools.research_sections import section_context
 from tools.verify.common import (
     load_findings,
     load_source_metadata,
@@ -12,9 +13,11 @@ from tools.verify.common import (
     llm_json,
     verify_model,
 )
+from tools.verify.dedup import merge_dedupe_claims
 
 CLAIM_EXTRACTION_BATCH_SIZE = 18
 COVE_CLAIM_BATCH_LIMIT = 20
+COVE_EVIDENCE_CHARS = 600
 
 
 def thesis_relevance(claim_text: str, thesis_current: str) -> float:
@@ -62,47 +65,6 @@ Prefer specific, quantitative claims (e.g. "X achieved Y% response rate in phase
     return []
 
 
-def normalize_claim_for_dedup(text: str) -> str:
-    t = " ".join((text or "").lower().split()).strip()
-    t = re.sub(r"[^\w\s\-\.\%]", " ", t)
-    return " ".join(t.split())[:250]
-
-
-def claim_similarity(a: str, b: str) -> float:
-    wa = set(re.findall(r"\b[a-z0-9\-\.\%]{2,}\b", a.lower()))
-    wb = set(re.findall(r"\b[a-z0-9\-\.\%]{2,}\b", b.lower()))
-    if not wa or not wb:
-        return 0.0
-    return len(wa & wb) / len(wa | wb)
-
-
-def merge_dedupe_claims(claims_list: list[dict]) -> list[dict]:
-    merged: list[dict] = []
-    for c in claims_list:
-        text = (c.get("claim") or "").strip()
-        if not text:
-            continue
-        norm = normalize_claim_for_dedup(text)
-        if not norm:
-            continue
-        is_dup = False
-        for m in merged:
-            existing = normalize_claim_for_dedup(m.get("claim") or "")
-            if norm == existing:
-                is_dup = True
-                break
-            if len(norm) >= 30 and len(existing) >= 30 and claim_similarity(norm, existing) >= 0.65:
-                is_dup = True
-                break
-            if norm.startswith(existing[:40]) or existing.startswith(norm[:40]):
-                is_dup = True
-                break
-        if is_dup:
-            continue
-        merged.append(c)
-    return merged
-
-
 def claim_verification(proj_path: Path, project: dict, project_id: str = "") -> dict:
     ensure_project_layout(proj_path)
     question = project.get("question", "")
@@ -154,7 +116,7 @@ def claim_verification(proj_path: Path, project: dict, project_id: str = "") ->
     all_claims: list[dict] = []
     for batch_num in sorted(results_by_batch.keys()):
         all_claims.extend(results_by_batch[batch_num])
-    merged = merge_dedupe_claims(all_claims)
+    merged = merge_dedupe_claims(all_claims, project_id=project_id)
     thesis_current, contradiction_urls = load_connect_context(proj_path)
     if thesis_current:
         merged.sort(
@@ -234,7 +196,11 @@ def run_claim_verification_cove(proj_path: Path, project: dict, project_id: str
         supporting = c.get("supporting_sources") or []
         if isinstance(supporting, str):
             supporting = [supporting] if supporting else []
-        snippets = [url_to_snippet.get(u, "") for u in supporting if u][:3]
+        # indexed papers: the section chunk that matches the claim, else the finding excerpt
+        snippets = [
+            section_context(proj_path, text, COVE_EVIDENCE_CHARS, url=u, require_match=True) or url_to_snippet.get(u, "")
+            for u in supporting if u
+        ][:3]
         ev = " ".join(s for s in snippets if s).strip() or evidence_text[:800]
         pairs.append((text, ev))
 
@@ -1,9 +1,11 @@
 """Shared data loading and LLM helpers for the verify phase."""
 import json
+import os
 import re
 from pathlib import Path
 
 from tools.research_common import llm_call, model_for_lane
+from tools.research_relevance import keyword_score, rank_items
 
 
 def model():
@@ -27,13 +29,7 @@ def load_sources(proj_path: Path, max_items: int = 50) -> list[dict]:
 
 
 def relevance_score(finding: dict, question: str) -> float:
-    q_words = set(re.findall(r'\b[a-z]{3,}\b', question.lower()))
-    text = ((finding.get("excerpt") or "") + " " + (finding.get("title") or "")).lower()
-    f_words = set(re.findall(r'\b[a-z]{3,}\b', text))
-    if not q_words or not f_words:
-        return 0.0
-    overlap = len(q_words & f_words)
-    return overlap / len(q_words)
+    return keyword_score(finding, question)
 
 
 def load_findings(proj_path: Path, max_items: int = 120, question: str = "") -> list[dict]:
@@ -44,7 +40,13 @@ def load_findings(proj_path: Path, max_items: int = 120, question: str = "") ->
         except Exception:
             pass
     if question and findings:
-        findings.sort(key=lambda f: relevance_score(f, question), reverse=True)
+        findings = rank_items(
+            question,
+            findings,
+            semantic=os.environ.get("RESEARCH_VERIFY_SEMANTIC") == "1",
+            proj_path=proj_path,
+            project_id=proj_path.name,
+        )
     return findings[:max_items]
 
 
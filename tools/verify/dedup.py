@@ -0,0 +1,168 @@
+"""Near-duplicate claim merging: exact-normalised hashing, prefix index, MinHash/LSH candidates.
+
+Replaces the pairwise scan over all merged claims. Each claim is normalised and tokenised once;
+candidates for the Jaccard / containment / (optional) embedding checks come from LSH buckets,
+so dedup cost grows with the number of near neighbours, not with the number of merged claims.
+"""
+import hashlib
+import os
+import random
+import re
+from functools import lru_cache
+
+JACCARD_THRESHOLD = 0.65
+CONTAINMENT_THRESHOLD = 0.9
+CONTAINMENT_MIN_TOKENS = 6
+MIN_FUZZY_LEN = 30
+PREFIX_LEN = 40
+# 16 bands x 2 rows: P(candidate) ~ 0.999 at Jaccard 0.65, ~0.78 at 0.3 (candidates are re-checked exactly).
+LSH_BANDS = 16
+LSH_ROWS = 2
+NUM_PERM = LSH_BANDS * LSH_ROWS
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(1729)
+_PERMS = [(_rng.randrange(1, _MERSENNE), _rng.randrange(0, _MERSENNE)) for _ in range(NUM_PERM)]
+_TOKEN_RE = re.compile(r"\b[a-z0-9\-\.\%]{2,}\b")
+_NUM_RE = re.compile(r"\d")
+
+
+def normalize_claim_for_dedup(text: str) -> str:
+    t = " ".join((text or "").lower().split()).strip()
+    t = re.sub(r"[^\w\s\-\.\%]", " ", t)
+    return " ".join(t.split())[:250]
+
+
+@lru_cache(maxsize=8192)
+def claim_tokens(text: str) -> frozenset:
+    """Token set used for claim similarity (cached: each claim is tokenised once)."""
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+
+def claim_similarity(a: str, b: str) -> float:
+    wa = claim_tokens(a)
+    wb = claim_tokens(b)
+    if not wa or not wb:
+        return 0.0
+    return len(wa & wb) / len(wa | wb)
+
+
+@lru_cache(maxsize=32768)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+
+def minhash_signature(tokens: frozenset) -> tuple:
+    hashes = [_token_hash(t) for t in tokens]
+    if not hashes:
+        return ()
+    return tuple(min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMS)
+
+
+def _lsh_keys(sig: tuple) -> list[tuple]:
+    return [(band, sig[band * LSH_ROWS:(band + 1) * LSH_ROWS]) for band in range(LSH_BANDS)] if sig else []
+
+
+def _containment_dup(ta: frozenset, tb: frozenset) -> bool:
+    """Paraphrase rule: the shorter claim's tokens are (almost) all in the longer one, with the same numbers."""
+    small, big = (ta, tb) if len(ta) <= len(tb) else (tb, ta)
+    if len(small) < CONTAINMENT_MIN_TOKENS:
+        return False
+    if {t for t in ta if _NUM_RE.search(t)} != {t for t in tb if _NUM_RE.search(t)}:
+        return False
+    return len(small & big) / len(small) >= CONTAINMENT_THRESHOLD
+
+
+def _unit(vec: list[float]) -> list[float]:
+    n = sum(x * x for x in vec) ** 0.5
+    return [x / n for x in vec] if n else []
+
+
+def _claim_embeddings(texts: list[str], project_id: str = "") -> list[list[float]]:
+    """Unit-normalised embeddings for the optional paraphrase pass; [] when disabled or unavailable."""
+    if os.environ.get("RESEARCH_CLAIM_DEDUP_SEMANTIC") != "1" or not texts:
+        return []
+    try:
+        from tools.research_relevance import embed_texts
+        embs = embed_texts(texts, project_id)
+    except Exception:
+        return []
+    if len(embs) != len(texts):
+        return []
+    return [_unit(e) if e else [] for e in embs]
+
+
+def _semantic_threshold() -> float:
+    try:
+        return float(os.environ.get("RESEARCH_CLAIM_DEDUP_SEMANTIC_THRESHOLD", "0.92"))
+    except ValueError:
+        return 0.92
+
+
+class ClaimDeduper:
+    """Incremental dedup index. add() returns False when the claim duplicates an already-kept one."""
+
+    def __init__(self) -> None:
+        self._exact: set[str] = set()
+        self._heads: set[str] = set()       # norm[:PREFIX_LEN] of kept claims
+        self._prefixes: set[str] = set()    # every prefix (len 1..PREFIX_LEN) of kept claims
+        self._buckets: dict[tuple, list[int]] = {}
+        self._tokens: list[frozenset] = []
+        self._vectors: list[list[float]] = []
+
+    def _prefix_dup(self, norm: str) -> bool:
+        # existing.startswith(norm[:40])  <=>  norm[:40] is a prefix of some kept claim
+        if norm[:PREFIX_LEN] in self._prefixes:
+            return True
+        # norm.startswith(existing[:40])  <=>  some prefix of norm is a kept head
+        return any(norm[:k] in self._heads for k in range(1, min(PREFIX_LEN, len(norm)) + 1))
+
+    def _candidates(self, keys: list[tuple]) -> set[int]:
+        out: set[int] = set()
+        for key in keys:
+            out.update(self._buckets.get(key, ()))
+        return out
+
+    def add(self, norm: str, vector: list[float] | None = None) -> bool:
+        if not norm or norm in self._exact or self._prefix_dup(norm):
+            return False
+        tokens = claim_tokens(norm)
+        keys = _lsh_keys(minhash_signature(tokens)) if len(norm) >= MIN_FUZZY_LEN else []
+        if keys:
+            sem_threshold = _semantic_threshold()
+            for idx in self._candidates(keys):
+                other = self._tokens[idx]
+                if tokens and other and len(tokens & other) / len(tokens | other) >= JACCARD_THRESHOLD:
+                    return False
+                if _containment_dup(tokens, other):
+                    return False
+                ov = self._vectors[idx]
+                if vector and ov and sum(x * y for x, y in zip(vector, ov)) >= sem_threshold:
+                    return False
+        idx = len(self._tokens)
+        self._tokens.append(tokens)
+        self._vectors.append(vector or [])
+        self._exact.add(norm)
+        self._heads.add(norm[:PREFIX_LEN])
+        self._prefixes.update(norm[:k] for k in range(1, min(PREFIX_LEN, len(norm)) + 1))
+        for key in keys:
+            self._buckets.setdefault(key, []).append(idx)
+        return True
+
+
+def merge_dedupe_claims(claims_list: list[dict], project_id: str = "") -> list[dict]:
+    """Keep the first occurrence of each claim; drop exact, prefix, near-duplicate and paraphrased repeats."""
+    prepared = []
+    for c in claims_list:
+        text = (c.get("claim") or "").strip()
+        if not text:
+            continue
+        norm = normalize_claim_for_dedup(text)
+        if norm:
+            prepared.append((c, norm))
+    vectors = _claim_embeddings([n for _, n in prepared], project_id)
+    deduper = ClaimDeduper()
+    merged: list[dict] = []
+    for i, (c, norm) in enumerate(prepared):
+        if deduper.add(norm, vectors[i] if vectors else None):
+            merged.append(c)
+    return merged
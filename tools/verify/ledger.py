@@ -28,14 +28,55 @@ def is_authoritative_source(url: str) -> bool:
     return any(d in u for d in _AUTHORITATIVE_DOMAINS)
 
 
+_FACT_TERM_RE = re.compile(r"\b[a-z0-9\-\.\%]{2,}\b")
+FACT_MATCH_THRESHOLD = 0.4
+
+
+def _fact_terms(text: str) -> frozenset:
+    return frozenset(_FACT_TERM_RE.findall((text or "").lower()))
+
+
 def _claim_fact_similarity(claim_text: str, fact_statement: str) -> float:
-    wa = set(re.findall(r"\b[a-z0-9\-\.\%]{2,}\b", (claim_text or "").lower()))
-    wb = set(re.findall(r"\b[a-z0-9\-\.\%]{2,}\b", (fact_statement or "").lower()))
+    wa = _fact_terms(claim_text)
+    wb = _fact_terms(fact_statement)
     if not wa or not wb:
         return 0.0
     return len(wa & wb) / len(wa | wb)
 
 
+class _FactMatcher:
+    """Term -> fact postings for one verification status group; candidates share >= 1 term, then exact Jaccard."""
+
+    def __init__(self, facts: list[dict], statuses: tuple[str, ...]) -> None:
+        self._terms: list[frozenset] = []
+        self._postings: dict[str, list[int]] = {}
+        for f in facts:
+            if (f.get("verification_status") or "").strip().lower() not in statuses:
+                continue
+            terms = _fact_terms((f.get("statement") or "").strip())
+            if not terms:
+                continue
+            idx = len(self._terms)
+            self._terms.append(terms)
+            for t in terms:
+                self._postings.setdefault(t, []).append(idx)
+
+    def matches(self, claim_text: str, threshold: float = FACT_MATCH_THRESHOLD) -> bool:
+        wa = _fact_terms(claim_text)
+        if not wa:
+            return False
+        seen: set[int] = set()
+        for t in wa:
+            for idx in self._postings.get(t, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                wb = self._terms[idx]
+                if len(wa & wb) / len(wa | wb) >= threshold:
+                    return True
+        return False
+
+
 def build_claim_ledger(proj_path: Path, project: dict) -> dict:
     ensure_project_layout(proj_path)
     verify_dir = proj_path / "verify"
@@ -85,23 +126,14 @@ def build_claim_ledger(proj_path: Path, project: dict) -> dict:
         except Exception:
             pass
 
+    disputed_facts = _FactMatcher(fact_check_facts, ("disputed",))
+    confirmed_facts = _FactMatcher(fact_check_facts, ("confirmed", "supported"))
+
     def _claim_matches_disputed_fact(claim_text: str) -> bool:
-        for f in fact_check_facts:
-            if (f.get("verification_status") or "").strip().lower() != "disputed":
-                continue
-            st = (f.get("statement") or "").strip()
-            if st and _claim_fact_similarity(claim_text, st) >= 0.4:
-                return True
-        return False
+        return disputed_facts.matches(claim_text)
 
     def _claim_matches_confirmed_fact(claim_text: str) -> bool:
-        for f in fact_check_facts:
-            if (f.get("verification_status") or "").strip().lower() not in ("confirmed", "supported"):
-                continue
-            st = (f.get("statement") or "").strip()
-            if st and _claim_fact_similarity(claim_text, st) >= 0.4:
-                return True
-        return False
+        return confirmed_facts.matches(claim_text)
 
     entity_names_list: list[str] = []
     graph_path_ledger = proj_path / "connect" / "entity_graph.json"
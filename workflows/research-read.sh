@@ -55,19 +55,23 @@ for url in "${URLS[@]:0:$MAX_READ}"; do
   else
     python3 "$TOOLS/research_web_reader.py" "$url" > "$ART/read_result.json" 2>> "$PWD/log.txt" || continue
   fi
-  python3 - "$PROJ_DIR" "$ART" "$url" <<'PY'
+  python3 - "$PROJ_DIR" "$ART" "$url" "$OPERATOR_ROOT" <<'PY'
 import json, sys, hashlib
 from pathlib import Path
 proj_dir, art, url = Path(sys.argv[1]), Path(sys.argv[2]), sys.argv[3]
+sys.path.insert(0, sys.argv[4])
+from tools.research_source_identity import canonical_url, content_hash, item_doi, open_index, source_id
 data = json.loads((art / "read_result.json").read_text())
-key = hashlib.sha256(url.encode()).hexdigest()[:12]
+key = source_id(url)
 (proj_dir / "sources" / f"{key}_content.json").write_text(json.dumps(data, indent=2))
+with open_index(proj_dir) as index:
+  index.record(key, url, item_doi({**data, "url": url}), content_hash(data.get("text") or data.get("abstract") or ""))
 # Append one finding per source for synthesize
 findings_dir = proj_dir / "findings"
 findings_dir.mkdir(exist_ok=True)
 text = (data.get("text") or data.get("abstract") or "")[:8000]
 if text:
-  fid = hashlib.sha256((url + text[:200]).encode()).hexdigest()[:12]
+  fid = hashlib.sha256((canonical_url(url) + text[:200]).encode()).hexdigest()[:12]
   (findings_dir / f"{fid}.json").write_text(json.dumps({"url": url, "title": data.get("title",""), "excerpt": text[:2000], "source": "read"}, indent=2))
 PY
   count=$((count+1))
@@ -35,13 +35,16 @@ echo "Searching arXiv..." >> "$PWD/log.txt"
 python3 "$TOOLS/research_academic.py" arxiv "$QUESTION" --max 5 > "$ART/arxiv.json" 2>> "$PWD/log.txt" || true
 
 # Merge results into project sources (append new URLs)
-python3 - "$PROJ_DIR" "$ART" <<'PY'
-import json, sys, hashlib
+python3 - "$PROJ_DIR" "$ART" "$OPERATOR_ROOT" <<'PY'
+import json, sys
 from pathlib import Path
 proj_dir, art = Path(sys.argv[1]), Path(sys.argv[2])
+sys.path.insert(0, sys.argv[3])
+from tools.research_source_identity import canonical_url, open_index
 sources_dir = proj_dir / "sources"
 sources_dir.mkdir(exist_ok=True)
 seen = set()
+index = open_index(proj_dir)
 for name in ["web_search.json", "semantic_scholar.json", "arxiv.json"]:
   p = art / name
   if not p.exists():
@@ -52,11 +55,11 @@ for name in ["web_search.json", "semantic_scholar.json", "arxiv.json"]:
     continue
   for item in (data if isinstance(data, list) else []):
     url = (item.get("url") or "").strip()
-    if not url or url in seen:
+    if not url or canonical_url(url) in seen:
       continue
-    seen.add(url)
-    fid = hashlib.sha256(url.encode()).hexdigest()[:12]
-    (sources_dir / f"{fid}.json").write_text(json.dumps(item, indent=2))
+    seen.add(canonical_url(url))
+    index.save_source(item)
+index.save()
 PY
 
 echo "Search complete. Sources in $PROJ_DIR/sources" >> "$PWD/log.txt"
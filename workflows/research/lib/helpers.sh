@@ -67,17 +67,19 @@ advance_phase() {
     elif [ "$conductor_next" != "$next_phase" ]; then
       if [ "$next_phase" = "focus" ] && [ "$conductor_next" = "explore" ] && [ "${RESEARCH_CONDUCTOR_ALLOW_EXPLORE_OVERRIDE_ON_COVERAGE_PASS:-0}" != "1" ]; then
         local override_allowed
-        override_allowed=$(python3 - "$PROJ_DIR" <<'PY_GUARD'
+        override_allowed=$(python3 - "$PROJ_DIR" "$OPERATOR_ROOT" <<'PY_GUARD'
 import json, sys
 from pathlib import Path
 proj = Path(sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+from tools.research_source_identity import unique_source_count
 # Discovery: never allow focus->explore when we have discovery evidence bar (6 findings, 4 sources)
 try:
     d = json.loads((proj / "project.json").read_text())
     config = d.get("config") or {}
     if (config.get("research_mode") or "").strip().lower() == "discovery":
         findings_count = len(list((proj / "findings").glob("*.json")))
-        source_count = len([f for f in (proj / "sources").glob("*.json") if not f.name.endswith("_content.json")])
+        source_count = unique_source_count(proj)
         if findings_count >= 6 and source_count >= 4:
             print("0", end="")  # block override: enough evidence for discovery
             raise SystemExit(0)
@@ -96,7 +98,7 @@ for name in ("coverage_round3.json", "coverage_round2.json", "coverage_round1.js
     except Exception:
         pass
 findings_count = len(list((proj / "findings").glob("*.json")))
-source_count = len([f for f in (proj / "sources").glob("*.json") if not f.name.endswith("_content.json")])
+source_count = unique_source_count(proj)
 allow = (not coverage_pass) or findings_count < 8 or source_count < 20
 print("1" if allow else "0", end="")
 PY_GUARD
@@ -46,29 +46,30 @@
       mkdir -p "$PROJ_DIR/sources"
       python3 "$TOOLS/research_academic.py" semantic_scholar "$QUESTION" --max 5 > "$ART/academic_round1.json" 2>> "$CYCLE_LOG" || true
       if [ -s "$ART/academic_round1.json" ]; then
-        python3 - "$PROJ_DIR" "$ART/academic_round1.json" <<'MERGE_ACADEMIC' 2>> "$CYCLE_LOG" || true
-import json, sys, hashlib
+        python3 - "$PROJ_DIR" "$ART/academic_round1.json" "$OPERATOR_ROOT" <<'MERGE_ACADEMIC' 2>> "$CYCLE_LOG" || true
+import json, sys
 from pathlib import Path
 proj_dir, path = Path(sys.argv[1]), Path(sys.argv[2])
+sys.path.insert(0, sys.argv[3])
+from tools.research_source_identity import open_index
 data = json.loads(path.read_text()) if path.exists() else []
-for item in (data if isinstance(data, list) else []):
-    url = (item.get("url") or "").strip()
-    if not url: continue
-    fid = hashlib.sha256(url.encode()).hexdigest()[:12]
-    out = dict(item)
-    out.setdefault("title", out.get("abstract", "")[:200])
-    out.setdefault("description", out.get("abstract", ""))
-    out["confidence"] = 0.5
-    out["source_quality"] = "academic"
-    (proj_dir / "sources" / f"{fid}.json").write_text(json.dumps(out))
+with open_index(proj_dir) as index:
+    for item in (data if isinstance(data, list) else []):
+        if not (item.get("url") or "").strip(): continue
+        out = dict(item)
+        out.setdefault("title", out.get("abstract", "")[:200])
+        out.setdefault("description", out.get("abstract", ""))
+        index.save_source(out, confidence=0.5, source_quality="academic")
 MERGE_ACADEMIC
       fi
     fi
 
-    python3 - "$PROJ_DIR" "$ART/research_plan.json" "$ART/web_search_round1.json" <<'FILTER_AND_SAVE'
-import json, sys, hashlib, re
+    python3 - "$PROJ_DIR" "$ART/research_plan.json" "$ART/web_search_round1.json" "$OPERATOR_ROOT" <<'FILTER_AND_SAVE'
+import json, sys, re
 from pathlib import Path
 proj_dir = Path(sys.argv[1]); plan_path = Path(sys.argv[2]); search_path = Path(sys.argv[3])
+sys.path.insert(0, sys.argv[4])
+from tools.research_source_identity import open_index
 plan = json.loads(plan_path.read_text()) if plan_path.exists() else {}
 results = json.loads(search_path.read_text()) if search_path.exists() else []
 q_terms = set()
@@ -81,6 +82,7 @@ for e in plan.get("entities", []):
         q_terms.add(t)
 topic_ids = {str(t.get("id","")) for t in plan.get("topics", [])}
 saved = 0
+index = open_index(proj_dir)
 for item in (results if isinstance(results, list) else []):
     url = (item.get("url") or "").strip()
     if not url:
@@ -90,12 +92,10 @@ for item in (results if isinstance(results, list) else []):
     overlap = sum(1 for w in q_terms if w and w in title_desc)
     if not has_topic and overlap < 2:
         continue
-    fid = hashlib.sha256(url.encode()).hexdigest()[:12]
-    out = dict(item)
-    out["confidence"] = float(out.get("confidence", 0.5))
-    out["source_quality"] = out.get("source_quality", "unknown")
-    (proj_dir / "sources" / f"{fid}.json").write_text(json.dumps(out))
+    index.save_source(item, confidence=float(item.get("confidence", 0.5)),
+                      source_quality=item.get("source_quality", "unknown"))
     saved += 1
+index.save()
 print(saved)
 FILTER_AND_SAVE
 
@@ -164,6 +164,8 @@ except Exception:
     skip_urls = set()
 if not skip_urls:
     sys.exit(0)
+from tools.research_source_identity import canonical_url
+skip_urls = {canonical_url(u) for u in skip_urls}
 filtered = []
 for p in paths:
     path = Path(p)
@@ -171,7 +173,7 @@ for p in paths:
         continue
     try:
         u = (json.loads(path.read_text()).get("url") or "").strip()
-        if u and u not in skip_urls:
+        if u and canonical_url(u) not in skip_urls:
             filtered.append(p)
     except Exception:
         filtered.append(p)
@@ -203,16 +205,17 @@ FILTER_READ_URLS
       REFINEMENT_COUNT=$(python3 -c "import json; d=json.load(open('$ART/refinement_queries.json')) if __import__('pathlib').Path('$ART/refinement_queries.json').exists() else {}; print(len(d.get('queries', [])), end='')" 2>/dev/null || echo "0")
       if [ "$REFINEMENT_COUNT" -gt 0 ] && [ "$SATURATION_DETECTED" != "1" ]; then
       python3 "$TOOLS/research_web_search.py" --queries-file "$ART/refinement_queries.json" --max-per-query 5 > "$ART/refinement_search.json" 2>> "$CYCLE_LOG" || true
-      python3 - "$PROJ_DIR" "$ART/refinement_search.json" <<'SAVE_REFINEMENT'
-import json, sys, hashlib
+      python3 - "$PROJ_DIR" "$ART/refinement_search.json" "$OPERATOR_ROOT" <<'SAVE_REFINEMENT'
+import json, sys
 from pathlib import Path
 proj_dir, in_path = Path(sys.argv[1]), Path(sys.argv[2])
+sys.path.insert(0, sys.argv[3])
+from tools.research_source_identity import open_index
 data = json.loads(in_path.read_text()) if in_path.exists() else []
-for item in (data if isinstance(data, list) else []):
-    u = (item.get("url") or "").strip()
-    if not u: continue
-    sid = hashlib.sha256(u.encode()).hexdigest()[:12]
-    (proj_dir / "sources" / f"{sid}.json").write_text(json.dumps(item))
+with open_index(proj_dir) as index:
+    for item in (data if isinstance(data, list) else []):
+        if (item.get("url") or "").strip():
+            index.save_source(item)
 SAVE_REFINEMENT
       python3 -c "
 import json
@@ -242,16 +245,17 @@ Path('$ART/refinement_urls_to_read.txt').write_text('\n'.join(urls[:10]))
       progress_step "Filling coverage gaps (Round 2)"
       python3 "$TOOLS/research_planner.py" --gap-fill "$ART/coverage_round1.json" "$PROJECT_ID" > "$ART/gap_queries.json"
       python3 "$TOOLS/research_web_search.py" --queries-file "$ART/gap_queries.json" --max-per-query 8 > "$ART/gap_search_round2.json" 2>> "$CYCLE_LOG" || true
-      python3 - "$PROJ_DIR" "$ART/gap_search_round2.json" <<'SAVE_GAP'
-import json, sys, hashlib
+      python3 - "$PROJ_DIR" "$ART/gap_search_round2.json" "$OPERATOR_ROOT" <<'SAVE_GAP'
+import json, sys
 from pathlib import Path
 proj_dir, in_path = Path(sys.argv[1]), Path(sys.argv[2])
+sys.path.insert(0, sys.argv[3])
+from tools.research_source_identity import open_index
 data = json.loads(in_path.read_text()) if in_path.exists() else []
-for item in (data if isinstance(data, list) else []):
-    u = (item.get("url") or "").strip()
-    if not u: continue
-    sid = hashlib.sha256(u.encode()).hexdigest()[:12]
-    (proj_dir / "sources" / f"{sid}.json").write_text(json.dumps(item))
+with open_index(proj_dir) as index:
+    for item in (data if isinstance(data, list) else []):
+        if (item.get("url") or "").strip():
+            index.save_source(item)
 SAVE_GAP
       python3 -c "
 import json
@@ -285,16 +289,17 @@ Path('$ART/gap_urls_to_read.txt').write_text('\n'.join(urls[:10]))
         echo "$THIN_TOPICS" > "$ART/thin_topics.json"
         python3 "$TOOLS/research_planner.py" --perspective-rotate "$ART/thin_topics.json" "$PROJECT_ID" > "$ART/depth_queries.json"
         python3 "$TOOLS/research_web_search.py" --queries-file "$ART/depth_queries.json" --max-per-query 5 > "$ART/depth_search_round3.json" 2>> "$CYCLE_LOG" || true
-        python3 - "$PROJ_DIR" "$ART/depth_search_round3.json" <<'SAVE_DEPTH'
-import json, sys, hashlib
+        python3 - "$PROJ_DIR" "$ART/depth_search_round3.json" "$OPERATOR_ROOT" <<'SAVE_DEPTH'
+import json, sys
 from pathlib import Path
 proj_dir, in_path = Path(sys.argv[1]), Path(sys.argv[2])
+sys.path.insert(0, sys.argv[3])
+from tools.research_source_identity import open_index
 data = json.loads(in_path.read_text()) if in_path.exists() else []
-for item in (data if isinstance(data, list) else []):
-    u = (item.get("url") or "").strip()
-    if not u: continue
-    sid = hashlib.sha256(u.encode()).hexdigest()[:12]
-    (proj_dir / "sources" / f"{sid}.json").write_text(json.dumps(item))
+with open_index(proj_dir) as index:
+    for item in (data if isinstance(data, list) else []):
+        if (item.get("url") or "").strip():
+            index.save_source(item)
 SAVE_DEPTH
         python3 -c "
 import json
@@ -60,23 +60,25 @@ FOCUS_MERGE
     progress_step "Searching for sources (KI)"
     python3 "$TOOLS/research_web_search.py" --queries-file "$ART/focus_queries.json" --max-per-query 8 > "$ART/focus_search.json" 2>> "$CYCLE_LOG" || true
     progress_step "Saving and ranking sources"
-    python3 - "$PROJ_DIR" "$ART/focus_search.json" <<'FOCUS_SAVE'
-import json, sys, hashlib
+    python3 - "$PROJ_DIR" "$ART/focus_search.json" "$OPERATOR_ROOT" <<'FOCUS_SAVE'
+import json, sys
 from pathlib import Path
 proj_dir, src = Path(sys.argv[1]), Path(sys.argv[2])
+sys.path.insert(0, sys.argv[3])
+from tools.research_source_identity import open_index
 data = json.loads(src.read_text()) if src.exists() else []
-for item in (data if isinstance(data, list) else []):
-    url = (item.get("url") or "").strip()
-    if not url:
-        continue
-    sid = hashlib.sha256(url.encode()).hexdigest()[:12]
-    (proj_dir / "sources" / f"{sid}.json").write_text(json.dumps(item))
+with open_index(proj_dir) as index:
+    for item in (data if isinstance(data, list) else []):
+        if (item.get("url") or "").strip():
+            index.save_source(item)
 FOCUS_SAVE
 
-    python3 - "$PROJ_DIR" "$ART/focus_queries.json" "$ART" <<'RANK_FOCUS'
+    python3 - "$PROJ_DIR" "$ART/focus_queries.json" "$ART" "$OPERATOR_ROOT" <<'RANK_FOCUS'
 import json, os, sys
 from pathlib import Path
 proj_dir, qpath, art = Path(sys.argv[1]), Path(sys.argv[2]), Path(sys.argv[3])
+sys.path.insert(0, sys.argv[4])
+from tools.research_source_identity import content_path
 plan = json.loads(qpath.read_text()) if qpath.exists() else {}
 topic_boost = {}
 for i, q in enumerate(plan.get("queries", [])):
@@ -95,14 +97,13 @@ except Exception:
 ranked = []
 for f in (proj_dir / "sources").glob("*.json"):
     if f.name.endswith("_content.json"): continue
-    sid = f.stem
-    if (proj_dir / "sources" / f"{sid}_content.json").exists(): continue
     try:
         d = json.loads(f.read_text())
     except Exception:
         continue
     url = (d.get("url") or "").strip()
     if not url: continue
+    if content_path(proj_dir, url) is not None: continue
     domain = url.split("/")[2].replace("www.","") if "://" in url else ""
     if domain in DOMAIN_BLOCKLIST: continue
     score = DOMAIN_RANK.get(domain, 4) + topic_boost.get(str(d.get("topic_id","")), 0)
@@ -10,6 +10,14 @@
     export OPENAI_API_KEY="${OPENAI_API_KEY:-}"
     # Multi-pass section-by-section synthesis (research-firm-grade report)
     timeout 1800 python3 "$TOOLS/research_synthesize.py" "$PROJECT_ID" > "$ART/report.md" 2>> "$CYCLE_LOG" || true
+    # Synthesis streams finished sections to synthesize_partial.md; keep them if the run died before printing the report.
+    # Stored outside the report_* glob and not as $ART/report.md, so fallback/quality-gate paths still see a missing report.
+    if [ ! -s "$ART/report.md" ] && [ -s "$PROJ_DIR/synthesize_partial.md" ]; then
+      PARTIAL_TS=$(python3 -c "from datetime import datetime, timezone; print(datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ'), end='')")
+      mkdir -p "$PROJ_DIR/reports"
+      cp "$PROJ_DIR/synthesize_partial.md" "$PROJ_DIR/reports/partial_report_${PARTIAL_TS}.md"
+      log "Synthesis incomplete — kept streamed partial report as reports/partial_report_${PARTIAL_TS}.md."
+    fi
     FM=$(python3 -c "import json; d=json.load(open('$PROJ_DIR/project.json')); print((d.get('config') or {}).get('research_mode', 'standard'), end='')" 2>/dev/null || echo "standard")
     # Discovery fallback: never die on synthesis formatting/runtime errors when evidence gate already passed
     if [ "$FM" = "discovery" ]; then
@@ -282,6 +290,10 @@ except Exception:
     print("0", end="")
     sys.exit(0)
 gate = d.get("gate") if isinstance(d.get("gate"), dict) else {}
+# Skipped for lack of sandbox capacity: nothing crashed, so the gate does not fail the project.
+if gate.get("skipped") == "no_capacity":
+    print("1", end="")
+    sys.exit(0)
 execution_success = gate.get("execution_success")
 if execution_success is None:
     execution_success = d.get("success", False)
@@ -48,9 +48,11 @@
     fi
     # Counter-evidence: search for contradicting sources for top 3 verified claims (before gate)
     python3 - "$PROJ_DIR" "$ART" "$TOOLS" "$OPERATOR_ROOT" <<'COUNTER_EVIDENCE' 2>> "$CYCLE_LOG" || true
-import json, sys, hashlib, subprocess
+import json, sys, subprocess
 from pathlib import Path
 proj_dir, art, tools, op_root = Path(sys.argv[1]), Path(sys.argv[2]), Path(sys.argv[3]), Path(sys.argv[4])
+sys.path.insert(0, str(op_root))
+from tools.research_source_identity import canonical_url, open_index
 verify_dir = proj_dir / "verify"
 claims_data = []
 for f in ["claim_ledger.json", "claim_verification.json"]:
@@ -81,16 +83,8 @@ for i, q in enumerate(counter_queries):
     except Exception:
         pass
 # Merge counter results into sources and collect URLs to read
-existing_urls = set()
-for f in (proj_dir / "sources").glob("*.json"):
-    if f.name.endswith("_content.json"):
-        continue
-    try:
-        u = json.loads(f.read_text()).get("url", "").strip()
-        if u:
-            existing_urls.add(u)
-    except Exception:
-        pass
+index = open_index(proj_dir)
+existing_urls = {e.get("url") for e in index.files.values() if e.get("url")}
 urls_to_read = []
 for i in range(6):
     f = art / f"counter_search_{i}.json"
@@ -100,14 +94,14 @@ for i in range(6):
         data = json.loads(f.read_text())
         for item in (data if isinstance(data, list) else []):
             url = (item.get("url") or "").strip()
-            if not url or url in existing_urls:
+            if not url or canonical_url(url) in existing_urls:
                 continue
-            existing_urls.add(url)
-            fid = hashlib.sha256(url.encode()).hexdigest()[:12]
-            (proj_dir / "sources" / f"{fid}.json").write_text(json.dumps({**item, "confidence": 0.5, "source_quality": "counter"}))
+            existing_urls.add(canonical_url(url))
+            index.save_source(item, confidence=0.5, source_quality="counter")
             urls_to_read.append(url)
     except Exception:
         pass
+index.save()
 (art / "counter_urls_to_read.txt").write_text("\n".join(urls_to_read[:9]))
 COUNTER_EVIDENCE
     if [ -f "$ART/counter_urls_to_read.txt" ] && [ -s "$ART/counter_urls_to_read.txt" ]; then
@@ -132,22 +126,23 @@ print(len(unread), end='')" 2>/dev/null) || UNREAD_COUNT=0
         mkdir -p "$PROJ_DIR/verify"
         touch "$RECOVERY_MARKER"
         # Rank unread sources and read up to 10
-        python3 - "$PROJ_DIR" "$QUESTION" "$ART" <<'RANK_RECOVERY'
+        python3 - "$PROJ_DIR" "$QUESTION" "$ART" "$OPERATOR_ROOT" <<'RANK_RECOVERY'
 import json, sys, re
 from pathlib import Path
 proj_dir, question, art = Path(sys.argv[1]), sys.argv[2], Path(sys.argv[3])
+sys.path.insert(0, sys.argv[4])
+from tools.research_source_identity import content_path
 q_words = set(re.sub(r'[^a-z0-9 ]', '', question.lower()).split())
 q_words = {w for w in q_words if len(w) >= 4}
 DOMAIN_RANK = {"nytimes.com":10,"reuters.com":10,"theverge.com":9,"arstechnica.com":9,"techcrunch.com":9,"fortune.com":8,"axios.com":8}
 ranked = []
 for f in (proj_dir / "sources").glob("*.json"):
     if f.name.endswith("_content.json"): continue
-    sid = f.stem
-    if (proj_dir / "sources" / f"{sid}_content.json").exists(): continue
     try:
         d = json.loads(f.read_text())
         url = (d.get("url") or "").strip()
         if not url: continue
+        if content_path(proj_dir, url) is not None: continue
         domain = url.split("/")[2].replace("www.","") if len(url.split("/")) > 2 else ""
         dscore = DOMAIN_RANK.get(domain, 5)
         td = f"{d.get('title','')} {d.get('description','')}".lower()
@@ -316,22 +311,24 @@ d["quality_gate"]["last_evidence_gate_at"] = datetime.now(timezone.utc).strftime
 GATE_PASS
     # Mark low-reliability sources in project
     if [ -f "$ART/source_reliability.json" ]; then
-      python3 - "$PROJ_DIR" "$ART" <<'VERIFY_PY'
+      python3 - "$PROJ_DIR" "$ART" "$OPERATOR_ROOT" <<'VERIFY_PY'
 import json, sys
 from pathlib import Path
 proj_dir, art = Path(sys.argv[1]), Path(sys.argv[2])
+sys.path.insert(0, sys.argv[3])
+from tools.research_source_identity import legacy_source_id, open_index
 try:
   rel = json.loads((art / "source_reliability.json").read_text())
 except Exception:
   sys.exit(0)
 sources_dir = proj_dir / "sources"
+index = open_index(proj_dir)
 for src in rel.get("sources", []):
   if src.get("reliability_score", 1.0) < 0.3:
     url = src.get("url", "")
     if not url:
       continue
-    import hashlib
-    fid = hashlib.sha256(url.encode()).hexdigest()[:12]
+    fid = index.lookup(url=url) or legacy_source_id(url)
     f = sources_dir / f"{fid}.json"
     if f.exists():
       data = json.loads(f.read_text())